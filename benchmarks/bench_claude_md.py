@@ -0,0 +1,113 @@
+"""Benchmark for scanning large CLAUDE.md files for legacy settings.
+
+Compares the memory-mapped single-regex scan in ``read_claude_md`` against
+the previous implementation (kept below as ``legacy_read_claude_md``) on
+generated files of growing size, reporting time and peak traced memory.
+The legacy patterns sit at the end of the file, so both scans cover it all.
+
+Usage:
+    python benchmarks/bench_claude_md.py
+    python benchmarks/bench_claude_md.py --sizes 1 10 100 --repeat 5
+"""
+
+import argparse
+import re
+import statistics
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+
+from context_forge_cli.claude_md import LEGACY_CONTEXT_FORGE_PATTERNS, read_claude_md
+from context_forge_cli.constants import (
+    CLAUDE_MD_END_MARKER,
+    CLAUDE_MD_START_MARKER,
+    CONTEXT_FORGE_MD_REFERENCE,
+)
+
+LINE = "- プロジェクト固有の指示: テストは pytest で実行し、型は mypy で検査する。\n"
+
+
+def generate_claude_md(path: Path, megabytes: int) -> None:
+    """Write a CLAUDE.md of about the given size with a reference block."""
+    repeat = megabytes * 1_000_000 // len(LINE.encode("utf-8"))
+    half = LINE * (repeat // 2)
+    reference = (
+        f"{CLAUDE_MD_START_MARKER}\n{CONTEXT_FORGE_MD_REFERENCE}\n"
+        f"{CLAUDE_MD_END_MARKER}\n"
+    )
+    path.write_text(
+        f"# Project\n\n{half}{reference}{half}## Skill/SubAgent 発動ルール\n",
+        encoding="utf-8",
+    )
+
+
+def legacy_read_claude_md(project_root: Path) -> tuple[bool, bool]:
+    """Previous read_claude_md: full read, copy without the block, N regexes."""
+    content = (project_root / "CLAUDE.md").read_text(encoding="utf-8")
+    start_idx = content.find(CLAUDE_MD_START_MARKER)
+    end_idx = content.find(CLAUDE_MD_END_MARKER)
+    has_reference = start_idx != -1 and end_idx != -1 and end_idx > start_idx
+
+    content_to_check = content
+    if has_reference:
+        end_marker_len = len(CLAUDE_MD_END_MARKER)
+        content_to_check = content[:start_idx] + content[end_idx + end_marker_len :]
+
+    has_legacy_settings = any(
+        re.search(pattern, content_to_check, re.IGNORECASE)
+        for pattern in LEGACY_CONTEXT_FORGE_PATTERNS
+    )
+    return has_reference, has_legacy_settings
+
+
+def _measure(func: Callable[[], object], repeat: int) -> tuple[float, float]:
+    """Median time (ms) and peak traced memory (MB) of func."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return statistics.median(samples), peak / 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 10, 50])
+    parser.add_argument("--repeat", type=int, default=3)
+    options = parser.parse_args()
+
+    print(
+        f"{'size':>6} {'legacy':>10} {'legacy peak':>12} {'mmap':>10} {'mmap peak':>10}"
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        project_root = Path(tmp)
+        for megabytes in options.sizes:
+            generate_claude_md(project_root / "CLAUDE.md", megabytes)
+            result = read_claude_md(project_root)
+            assert result is not None
+            assert legacy_read_claude_md(project_root) == (
+                result.has_reference,
+                result.has_legacy_settings,
+            )
+
+            legacy_ms, legacy_peak = _measure(
+                lambda: legacy_read_claude_md(project_root), options.repeat
+            )
+            mmap_ms, mmap_peak = _measure(
+                lambda: read_claude_md(project_root), options.repeat
+            )
+            print(
+                f"{megabytes:>4}MB {legacy_ms:>8.1f}ms {legacy_peak:>10.1f}MB "
+                f"{mmap_ms:>8.1f}ms {mmap_peak:>8.3f}MB"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""Benchmark for parsing and updating large .claude/context-forge.md files.
+
+Compares the offset-indexed parser against the previous line-splitting
+implementation (kept below as ``legacy_*``) at 10k and 100k rules, including
+a bulk import applied one rule at a time versus as a single batch.
+
+Usage:
+    python benchmarks/bench_context_forge_md.py
+    python benchmarks/bench_context_forge_md.py --rules 10000 100000 --repeat 7
+"""
+
+import argparse
+import statistics
+import time
+from collections.abc import Callable
+
+from context_forge_cli.context_forge_md import (
+    _insert_rules,
+    parse_context_forge_md,
+)
+
+RULES_PER_ROLE = 100
+BATCH_SIZE = 100
+
+
+def generate_content(rule_count: int, rules_per_role: int = RULES_PER_ROLE) -> str:
+    """Generate a context-forge.md with rule_count rules across many roles."""
+    lines = [
+        "# context-forge 設定",
+        "",
+        "## Skill/SubAgent 発動ルール",
+        "",
+    ]
+    for role in range(rule_count // rules_per_role):
+        lines += [f"### role-{role} ロール", ""]
+        lines += [
+            f"- ユーザーが「トリガー {role}-{rule}」と言った場合、agent-{rule} を使用"
+            for rule in range(rules_per_role)
+        ]
+        lines.append("")
+    return "\n".join(lines)
+
+
+def legacy_parse(content: str) -> dict[str, list[str]]:
+    """Previous read_context_forge_md parsing loop."""
+    roles: dict[str, list[str]] = {}
+    current_role: str | None = None
+    current_rules: list[str] = []
+    for line in content.split("\n"):
+        stripped_line = line.rstrip()
+        if stripped_line.startswith("### ") and stripped_line.endswith(" ロール"):
+            if current_role is not None:
+                roles[current_role] = current_rules
+            current_role = stripped_line[4:].removesuffix(" ロール").strip()
+            current_rules = []
+        elif current_role is not None and line.strip().startswith("- "):
+            current_rules.append(line.strip())
+    if current_role is not None:
+        roles[current_role] = current_rules
+    return roles
+
+
+def legacy_insert(content: str, role_name: str, rule: str) -> str:
+    """Previous write_context_forge_md splice (header and next-section scans)."""
+    role_header = f"### {role_name} ロール"
+    header_idx = content.find(role_header)
+    next_section_idx = content.find("\n### ", header_idx + len(role_header))
+    if next_section_idx == -1:
+        if not content.endswith("\n"):
+            content += "\n"
+        return content + f"{rule}\n"
+    return content[:next_section_idx] + f"{rule}\n" + content[next_section_idx:]
+
+
+def legacy_add_many(content: str, rules: list[tuple[str, str]]) -> str:
+    """Previous bulk import: one parse and splice per rule."""
+    for role_name, rule in rules:
+        legacy_parse(content)
+        content = legacy_insert(content, role_name, rule)
+    return content
+
+
+def _time(func: Callable[[], object], repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rules", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    options = parser.parse_args()
+
+    print(f"{'rules':>8} {'size':>9} {'operation':<28} {'legacy':>10} {'indexed':>10}")
+    for rule_count in options.rules:
+        content = generate_content(rule_count)
+        parsed = parse_context_forge_md(content)
+        assert parsed.roles == legacy_parse(content)
+
+        # Insert into the middle role so both implementations must locate it
+        role = f"role-{rule_count // RULES_PER_ROLE // 2}"
+        rule = "- new rule"
+        single = _insert_rules(parsed, [(role, rule)])
+        assert single == legacy_insert(content, role, rule)
+
+        # Bulk import: rules spread over every role, one at a time vs batched
+        roles = [f"role-{i}" for i in range(rule_count // RULES_PER_ROLE)]
+        batch = [(roles[i % len(roles)], f"- bulk {i}") for i in range(BATCH_SIZE)]
+        assert _insert_rules(parsed, batch) == legacy_add_many(content, batch)
+
+        size = f"{len(content.encode()) / 1e6:.1f}MB"
+        rows = [
+            (
+                "parse",
+                lambda: legacy_parse(content),
+                lambda: parse_context_forge_md(content),
+            ),
+            (
+                "locate + splice one rule",
+                lambda: legacy_insert(content, role, rule),
+                lambda: _insert_rules(parsed, [(role, rule)]),
+            ),
+            (
+                "parse + splice one rule",
+                lambda: (legacy_parse(content), legacy_insert(content, role, rule)),
+                lambda: _insert_rules(parse_context_forge_md(content), [(role, rule)]),
+            ),
+            (
+                f"add {BATCH_SIZE} rules",
+                lambda: legacy_add_many(content, batch),
+                lambda: _insert_rules(parse_context_forge_md(content), batch),
+            ),
+        ]
+        for label, legacy, indexed in rows:
+            print(
+                f"{rule_count:>8} {size:>9} {label:<28} "
+                f"{_time(legacy, options.repeat):>8.2f}ms "
+                f"{_time(indexed, options.repeat):>8.2f}ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
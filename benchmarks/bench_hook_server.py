@@ -0,0 +1,132 @@
+"""Latency of a Python hook per tool event: new process vs. hook server.
+
+Creates a project with one role plugin hook handler (a PreToolUse guard that
+imports a few standard modules, like a typical hook script) and times one
+event through each path:
+
+- ``spawn script``: ``python guard.py`` per event, which is what a
+  ``"type": "command"`` Python hook costs today
+- ``hook-client, no server``: the shim running the handler in-process
+- ``hook-client + server``: the shim forwarding to ``hook-server``
+- ``socket round trip``: the server path without the shim's interpreter
+  start, i.e. the floor for a compiled shim
+
+Usage:
+    python benchmarks/bench_hook_server.py
+    python benchmarks/bench_hook_server.py --events 200
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+from context_forge_cli.hook_client import request, socket_path
+from context_forge_cli.hook_server import serve_hooks, stop_server
+
+HANDLER = """\
+import json
+import re
+import shlex
+import sys
+from pathlib import Path
+
+_FORBIDDEN = re.compile(r"\\bgit add (-A|\\.|--all)\\b")
+
+
+def handle(event):
+    command = event.get("tool_input", {}).get("command", "")
+    if _FORBIDDEN.search(command):
+        print(f"Stage files explicitly: {shlex.quote(command)}", file=sys.stderr)
+        sys.exit(2)
+    return {"suppressOutput": True}
+
+
+if __name__ == "__main__":
+    print(json.dumps(handle(json.load(sys.stdin))))
+"""
+
+EVENT = (
+    b'{"hook_event_name": "PreToolUse", "tool_name": "Bash", '
+    b'"tool_input": {"command": "git status"}}'
+)
+
+ENTRY = "import context_forge_cli; context_forge_cli.main()"
+
+
+def _time(func: Callable[[], object], events: int) -> list[float]:
+    samples = []
+    for _ in range(events):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def _spawn(args: list[str], project_root: Path) -> Callable[[], object]:
+    env = {**os.environ, "CLAUDE_PROJECT_DIR": str(project_root)}
+
+    def run() -> None:
+        subprocess.run(
+            args, input=EVENT, env=env, check=True, stdout=subprocess.DEVNULL
+        )
+
+    return run
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=50)
+    options = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        project_root = Path(os.path.realpath(tmp))
+        hooks_dir = project_root / ".claude/plugins/context-forge.role-eng/hooks"
+        hooks_dir.mkdir(parents=True)
+        (hooks_dir / "guard.py").write_text(HANDLER, encoding="utf-8")
+        client = [sys.executable, "-c", ENTRY, "hook-client", "eng/guard"]
+
+        results = {
+            "spawn script": _time(
+                _spawn([sys.executable, str(hooks_dir / "guard.py")], project_root),
+                options.events,
+            ),
+            "hook-client, no server": _time(
+                _spawn(client, project_root), options.events
+            ),
+        }
+
+        ready = threading.Event()
+        server = threading.Thread(
+            target=serve_hooks, args=(project_root, ready), daemon=True
+        )
+        server.start()
+        ready.wait(10)
+        try:
+            path = socket_path(str(project_root))
+            results["hook-client + server"] = _time(
+                _spawn(client, project_root), options.events
+            )
+            results["socket round trip"] = _time(
+                lambda: request(path, "run", str(project_root), "eng/guard", EVENT),
+                options.events,
+            )
+        finally:
+            stop_server(project_root)
+            server.join(10)
+
+    print(f"{'path':<24} {'median':>9} {'p95':>9}   ({options.events} events)")
+    for name, samples in results.items():
+        p95 = statistics.quantiles(samples, n=20)[-1]
+        print(f"{name:<24} {statistics.median(samples):>7.2f}ms {p95:>7.2f}ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,105 @@
+"""Benchmark for installing a large command template set.
+
+Generates a synthetic template set, points the template loader at it, and
+times ``install_commands`` serially and on a thread pool into a cold (empty)
+``.claude/commands`` and a warm one (every file already installed), under the
+``if-changed`` and ``overwrite`` conflict policies.
+
+Usage:
+    python benchmarks/bench_install.py
+    python benchmarks/bench_install.py --templates 2000 --workers 16 --repeat 5
+"""
+
+import argparse
+import shutil
+import statistics
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+from context_forge_cli import command_templates
+from context_forge_cli.command_templates import InstallTarget
+from context_forge_cli.initializer import ConflictPolicy, install_commands
+from context_forge_cli.template_manifest import build_manifest
+
+TEMPLATE_BODY_LINES = 200
+
+
+def generate_templates(templates_dir: Path, count: int) -> list[str]:
+    """Write count command templates of realistic size (~10KB each)."""
+    commands_dir = templates_dir / "commands"
+    commands_dir.mkdir(parents=True)
+    names = [f"bench-{i:05d}" for i in range(count)]
+    for name in names:
+        body = "\n".join(
+            f"- Step {line}: 手順 {line} を実行する ({{{{VERSION}}}})"
+            for line in range(TEMPLATE_BODY_LINES)
+        )
+        (commands_dir / f"{name}.md").write_text(
+            f"---\ndescription: Benchmark command {name}\n---\n\n# {name}\n\n{body}\n",
+            encoding="utf-8",
+        )
+    return names
+
+
+def _time(setup: Callable[[], None], func: Callable[[], object], repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        setup()
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--templates", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--repeat", type=int, default=3)
+    options = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        templates_dir = Path(tmp) / "templates"
+        names = generate_templates(templates_dir, options.templates)
+        command_templates._manifest_cache = build_manifest(templates_dir / "commands")
+        command_templates.get_templates_path = lambda: templates_dir  # type: ignore[assignment]
+
+        target = InstallTarget(project_root=Path(tmp) / "project")
+
+        def cold() -> None:
+            shutil.rmtree(target.commands_dir, ignore_errors=True)
+            target.commands_dir.mkdir(parents=True)
+
+        def warm() -> None:
+            cold()
+            install_commands(names, target, ConflictPolicy.OVERWRITE)
+
+        def run(policy: ConflictPolicy, serial: bool) -> Callable[[], object]:
+            if serial:
+                # One name per call takes install_commands' serial path
+                return lambda: [
+                    install_commands([name], target, policy) for name in names
+                ]
+            return lambda: install_commands(
+                names, target, policy, max_workers=options.workers
+            )
+
+        print(f"{options.templates} templates, {TEMPLATE_BODY_LINES} lines each\n")
+        print(
+            f"{'target':<6} {'policy':<11} {'serial':>10} {'threaded':>10} "
+            f"{'speedup':>8}"
+        )
+        for label, setup in (("cold", cold), ("warm", warm)):
+            for policy in (ConflictPolicy.IF_CHANGED, ConflictPolicy.OVERWRITE):
+                serial = _time(setup, run(policy, serial=True), options.repeat)
+                threaded = _time(setup, run(policy, serial=False), options.repeat)
+                print(
+                    f"{label:<6} {policy.value:<11} {serial:>8.1f}ms "
+                    f"{threaded:>8.1f}ms {serial / threaded:>7.2f}x"
+                )
+
+
+if __name__ == "__main__":
+    main()
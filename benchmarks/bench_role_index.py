@@ -0,0 +1,101 @@
+"""Benchmark for adding rules with and without the role index.
+
+Writes a generated context-forge.md (see ``bench_context_forge_md.py``) to a
+temporary project, then times adding one rule to a middle role through the
+parse-based ``write_context_forge_md_rules`` and through
+``add_rules_indexed`` with a current index, plus rebuilding the index after
+a hand edit. Lookups ("does this role have this rule?") are timed the same
+way.
+
+Usage:
+    python benchmarks/bench_role_index.py
+    python benchmarks/bench_role_index.py --rules 10000 100000 --repeat 7
+"""
+
+import argparse
+import statistics
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+from bench_context_forge_md import RULES_PER_ROLE, generate_content
+
+from context_forge_cli.constants import CONTEXT_FORGE_MD_PATH
+from context_forge_cli.context_forge_md import (
+    filter_new_rules,
+    read_context_forge_md,
+    write_context_forge_md_rules,
+)
+from context_forge_cli.role_index import add_rules_indexed, load_role_index
+
+
+def _time(setup: Callable[[], None], func: Callable[[], object], repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        setup()
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rules", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    options = parser.parse_args()
+
+    print(f"{'rules':>8} {'size':>9} {'operation':<24} {'time':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        project_root = Path(tmp)
+        path = project_root / CONTEXT_FORGE_MD_PATH
+        path.parent.mkdir()
+        for rule_count in options.rules:
+            content = generate_content(rule_count)
+            role = f"role-{rule_count // RULES_PER_ROLE // 2}"
+            rules = [(role, "- new rule")]
+
+            def reset() -> None:
+                path.write_text(content, encoding="utf-8")
+
+            def reset_indexed() -> None:
+                reset()
+                load_role_index(project_root)
+
+            def parse_based() -> None:
+                existing = read_context_forge_md(project_root)
+                assert existing is not None
+                added = filter_new_rules(existing, rules)
+                write_context_forge_md_rules(project_root, existing, added)
+
+            def parse_lookup() -> bool:
+                existing = read_context_forge_md(project_root)
+                return existing is not None and "- new rule" in existing.roles[role]
+
+            def indexed_lookup() -> bool:
+                index = load_role_index(project_root)
+                return index is not None and index.has_rule(role, "- new rule")
+
+            size = f"{len(content.encode()) / 1e6:.1f}MB"
+            for label, setup, func in (
+                ("parse + has rule", reset, parse_lookup),
+                ("indexed has rule", reset_indexed, indexed_lookup),
+                ("parse + add one rule", reset, parse_based),
+                (
+                    "indexed add one rule",
+                    reset_indexed,
+                    lambda: add_rules_indexed(project_root, rules),
+                ),
+                (
+                    "rebuild after edit",
+                    reset,
+                    lambda: load_role_index(project_root),
+                ),
+            ):
+                elapsed = _time(setup, func, options.repeat)
+                print(f"{rule_count:>8} {size:>9} {label:<24} {elapsed:>8.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
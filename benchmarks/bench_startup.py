@@ -0,0 +1,117 @@
+"""Startup benchmark for the context-forge entry point.
+
+Measures wall-clock time of fresh interpreter runs for the fast paths
+(``--version``/``--help``) and for the full typer CLI, both cold (bytecode
+cache redirected to an empty directory, so every module is recompiled) and
+warm (regular ``__pycache__``), and prints a ``-X importtime`` breakdown.
+
+Usage:
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --runs 20 --top 15
+    python benchmarks/bench_startup.py --max-warm-ms 60   # fail on regression
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+SCENARIOS: dict[str, list[str]] = {
+    "--version (fast path)": ["--version"],
+    "--help (fast path)": ["--help"],
+    "init --help (full CLI)": ["init", "--help"],
+}
+
+ENTRY = "import context_forge_cli; context_forge_cli.main()"
+
+
+def _run(args: list[str], env: dict[str, str]) -> float:
+    start = time.perf_counter()
+    subprocess.run(
+        [sys.executable, "-c", ENTRY, *args],
+        env=env,
+        check=True,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    return (time.perf_counter() - start) * 1000
+
+
+def _time_scenario(args: list[str], runs: int, cold: bool) -> list[float]:
+    samples = []
+    for _ in range(runs):
+        env = dict(os.environ)
+        if cold:
+            with tempfile.TemporaryDirectory() as cache_dir:
+                env["PYTHONPYCACHEPREFIX"] = cache_dir
+                samples.append(_run(args, env))
+        else:
+            samples.append(_run(args, env))
+    return samples
+
+
+def _importtime(args: list[str], top: int) -> list[tuple[int, str]]:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", ENTRY, *args],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    rows: list[tuple[int, str]] = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        # Format: "import time: <self us> | <cumulative us> | <module>"
+        _, cumulative, name = line.removeprefix("import time:").split("|")
+        rows.append((int(cumulative), name.rstrip()))
+    rows.sort(reverse=True)
+    return rows[:top]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument(
+        "--max-warm-ms",
+        type=float,
+        default=None,
+        help="Fail if the warm --version median exceeds this many milliseconds.",
+    )
+    options = parser.parse_args()
+
+    # Warm the regular bytecode cache once before measuring.
+    _run(["--version"], dict(os.environ))
+
+    print(f"{'scenario':<26} {'cold median':>12} {'warm median':>12} {'warm min':>10}")
+    warm_version_median = 0.0
+    for label, args in SCENARIOS.items():
+        cold = _time_scenario(args, options.runs, cold=True)
+        warm = _time_scenario(args, options.runs, cold=False)
+        warm_median = statistics.median(warm)
+        if args == ["--version"]:
+            warm_version_median = warm_median
+        print(
+            f"{label:<26} {statistics.median(cold):>10.1f}ms "
+            f"{warm_median:>10.1f}ms {min(warm):>8.1f}ms"
+        )
+
+    for label, args in SCENARIOS.items():
+        print(f"\n-X importtime, top {options.top} cumulative (us): {label}")
+        for cumulative, name in _importtime(args, options.top):
+            print(f"  {cumulative:>8}  {name}")
+
+    if options.max_warm_ms is not None and warm_version_median > options.max_warm_ms:
+        print(
+            f"\nREGRESSION: warm --version median {warm_version_median:.1f}ms "
+            f"exceeds {options.max_warm_ms:.1f}ms"
+        )
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
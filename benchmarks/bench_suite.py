@@ -0,0 +1,281 @@
+"""Benchmark suite over a synthetic large project, with stored baselines.
+
+Generates one large project in a temporary directory: a multi-MB CLAUDE.md
+(see ``bench_claude_md.py``), a context-forge.md with 10k roles (see
+``bench_context_forge_md.py``), a set of command templates the loader is
+pointed at (see ``bench_install.py``) and thousands of role plugins whose
+agents carry trigger phrases. Then it times the main library entry points
+and a full ``init`` on it.
+
+``--save`` writes the medians to a baseline file; ``--compare`` runs the
+suite again and fails when a case got slower than the baseline by more than
+``--tolerance`` (a ratio) and ``--min-delta-ms`` (so sub-millisecond noise
+is not flagged). Baselines depend on the machine: save one per machine, and
+compare only runs with the same ``--scale``.
+
+Usage:
+    python benchmarks/bench_suite.py
+    python benchmarks/bench_suite.py --save benchmarks/baseline.json
+    python benchmarks/bench_suite.py --compare benchmarks/baseline.json
+    python benchmarks/bench_suite.py --scale 0.1 --repeat 3   # quick run
+"""
+
+import argparse
+import json
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+from bench_claude_md import generate_claude_md
+from bench_context_forge_md import generate_content
+from bench_install import generate_templates
+
+from context_forge_cli import command_templates
+from context_forge_cli.claude_md import read_claude_md
+from context_forge_cli.command_templates import (
+    list_available_templates,
+    load_template,
+)
+from context_forge_cli.constants import CONTEXT_FORGE_MD_PATH, PLUGINS_DIR
+from context_forge_cli.context_forge_md import (
+    read_context_forge_md,
+    write_context_forge_md,
+)
+from context_forge_cli.initializer import ConflictPolicy, init_project
+from context_forge_cli.role_plugins import scan_role_plugins
+from context_forge_cli.template_manifest import build_manifest
+from context_forge_cli.trigger_index import load_trigger_index
+
+# Bump when cases or inputs change so old baselines are not compared
+BASELINE_VERSION = 2
+
+# Input sizes at --scale 1
+CLAUDE_MD_MB = 20
+ROLES = 10_000
+RULES_PER_ROLE = 5
+TEMPLATES = 500
+ROLE_PLUGINS = 2_000
+
+
+def generate_role_plugins(project_root: Path, count: int) -> None:
+    """Write count role plugins with a manifest, agents, a skill and hooks."""
+    hooks = json.dumps({"hooks": {"PostToolUse": [{"matcher": "Edit", "hooks": []}]}})
+    for i in range(count):
+        plugin_dir = project_root / PLUGINS_DIR / f"context-forge.role-role-{i}"
+        (plugin_dir / ".claude-plugin").mkdir(parents=True)
+        (plugin_dir / ".claude-plugin" / "plugin.json").write_text(
+            json.dumps({"name": plugin_dir.name, "version": "0.1.0"}),
+            encoding="utf-8",
+        )
+        (plugin_dir / "agents").mkdir()
+        for agent in range(3):
+            (plugin_dir / "agents" / f"agent-{agent}.md").write_text(
+                f"---\nname: agent-{i}-{agent}\ndescription: >\n"
+                f"  ユーザーが「レビュー {i}-{agent}」「確認して {i}-{agent}」"
+                f"「調査 {i}-{agent}」と言った場合に使用すること。\n---\n\n"
+                f"# Agent {agent}\n",
+                encoding="utf-8",
+            )
+        (plugin_dir / "skills" / "skill").mkdir(parents=True)
+        (plugin_dir / "hooks").mkdir()
+        (plugin_dir / "hooks" / "hooks.json").write_text(hooks, encoding="utf-8")
+
+
+def _time(setup: Callable[[], None], func: Callable[[], object], repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        setup()
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def run_suite(scale: float, repeat: int) -> dict[str, float]:
+    """Generate the project and time every case.
+
+    Returns:
+        Case name -> median time in milliseconds.
+    """
+    megabytes = max(1, round(CLAUDE_MD_MB * scale))
+    roles = max(1, round(ROLES * scale))
+    templates = max(1, round(TEMPLATES * scale))
+    plugins = max(1, round(ROLE_PLUGINS * scale))
+    print(
+        f"CLAUDE.md {megabytes}MB, {roles} roles x {RULES_PER_ROLE} rules, "
+        f"{templates} templates, {plugins} role plugins\n"
+    )
+
+    results: dict[str, float] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        project_root = Path(tmp) / "project"
+        (project_root / ".claude").mkdir(parents=True)
+        generate_claude_md(project_root / "CLAUDE.md", megabytes)
+        content = generate_content(roles * RULES_PER_ROLE, RULES_PER_ROLE)
+        context_forge_md = project_root / CONTEXT_FORGE_MD_PATH
+        generate_role_plugins(project_root, plugins)
+
+        templates_dir = Path(tmp) / "templates"
+        names = generate_templates(templates_dir, templates)
+        command_templates._manifest_cache = build_manifest(templates_dir / "commands")
+        command_templates.get_templates_path = lambda: templates_dir  # type: ignore[assignment]
+
+        def reset_context_forge_md() -> None:
+            context_forge_md.write_text(content, encoding="utf-8")
+
+        def add_rule() -> None:
+            existing = read_context_forge_md(project_root)
+            write_context_forge_md(
+                project_root, existing, f"role-{roles // 2}", "- new rule"
+            )
+
+        init_root = Path(tmp) / "init"
+
+        def cold_init() -> None:
+            shutil.rmtree(init_root, ignore_errors=True)
+            init_root.mkdir()
+
+        def no_setup() -> None:
+            pass
+
+        prompt = f"このPRのレビュー {plugins // 2}-1 と、ログの調査をお願いします" * 4
+        trigger_index = load_trigger_index(project_root)
+
+        cases: list[tuple[str, Callable[[], None], Callable[[], object]]] = [
+            ("read_claude_md", no_setup, lambda: read_claude_md(project_root)),
+            (
+                "read_context_forge_md",
+                reset_context_forge_md,
+                lambda: read_context_forge_md(project_root),
+            ),
+            ("write_context_forge_md", reset_context_forge_md, add_rule),
+            (
+                "load_template (all)",
+                no_setup,
+                lambda: [load_template(name) for name in names],
+            ),
+            ("list_available_templates", no_setup, list_available_templates),
+            (
+                "scan_role_plugins (uncached)",
+                no_setup,
+                lambda: scan_role_plugins(project_root, use_cache=False),
+            ),
+            (
+                "scan_role_plugins (cached)",
+                lambda: scan_role_plugins(project_root),
+                lambda: scan_role_plugins(project_root),
+            ),
+            (
+                "load_trigger_index (uncached)",
+                no_setup,
+                lambda: load_trigger_index(project_root, use_cache=False),
+            ),
+            (
+                "load_trigger_index (cached)",
+                lambda: load_trigger_index(project_root),
+                lambda: load_trigger_index(project_root),
+            ),
+            ("TriggerIndex.match", no_setup, lambda: trigger_index.match(prompt)),
+            ("init (cold)", cold_init, lambda: init_project(init_root)),
+            (
+                "init (warm)",
+                lambda: init_project(init_root),
+                lambda: init_project(init_root, on_conflict=ConflictPolicy.IF_CHANGED),
+            ),
+        ]
+        for name, setup, func in cases:
+            results[name] = _time(setup, func, repeat)
+            print(f"{name:<30} {results[name]:>10.2f}ms")
+    return results
+
+
+def compare(
+    results: dict[str, float],
+    baseline: dict[str, float],
+    tolerance: float,
+    min_delta_ms: float,
+) -> list[str]:
+    """Print results next to the baseline and list the regressed cases."""
+    regressions = []
+    print(f"{'case':<30} {'baseline':>10} {'current':>10} {'ratio':>7}")
+    for name, current in results.items():
+        before = baseline.get(name)
+        if before is None:
+            print(f"{name:<30} {'-':>10} {current:>8.2f}ms {'new':>7}")
+            continue
+        ratio = current / before if before else float("inf")
+        regressed = ratio > tolerance and current - before > min_delta_ms
+        if regressed:
+            regressions.append(name)
+        mark = "  REGRESSION" if regressed else ""
+        print(f"{name:<30} {before:>8.2f}ms {current:>8.2f}ms {ratio:>6.2f}x{mark}")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", type=float, default=1.0)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--save", type=Path, help="Write the results as a baseline.")
+    parser.add_argument(
+        "--compare", type=Path, help="Fail on regressions against a baseline."
+    )
+    parser.add_argument("--tolerance", type=float, default=1.5)
+    parser.add_argument("--min-delta-ms", type=float, default=1.0)
+    options = parser.parse_args()
+
+    baseline = None
+    if options.compare:
+        baseline = json.loads(options.compare.read_text(encoding="utf-8"))
+        if baseline.get("version") != BASELINE_VERSION:
+            print(f"{options.compare}: baseline is for another suite version")
+            return 2
+        if baseline.get("scale") != options.scale:
+            print(
+                f"{options.compare}: baseline was saved with --scale "
+                f"{baseline.get('scale')}"
+            )
+            return 2
+
+    results = run_suite(options.scale, options.repeat)
+
+    if options.save:
+        options.save.write_text(
+            json.dumps(
+                {
+                    "version": BASELINE_VERSION,
+                    "scale": options.scale,
+                    "python": platform.python_version(),
+                    "machine": f"{platform.system()} {platform.machine()}",
+                    "results": {k: round(v, 3) for k, v in results.items()},
+                },
+                indent=2,
+            )
+            + "\n",
+            encoding="utf-8",
+        )
+        print(f"Saved baseline to {options.save}")
+
+    if baseline is None:
+        return 0
+
+    print()
+    regressions = compare(
+        results, baseline["results"], options.tolerance, options.min_delta_ms
+    )
+    if regressions:
+        print(
+            f"\nREGRESSION: {len(regressions)} cases slower than "
+            f"{options.tolerance:.2f}x the baseline: {', '.join(regressions)}"
+        )
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
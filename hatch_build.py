@@ -0,0 +1,33 @@
+"""Hatch build hook that precompiles the command template manifest."""
+
+import importlib.util
+from pathlib import Path
+from typing import Any
+
+from hatchling.builders.hooks.plugin.interface import BuildHookInterface
+
+PACKAGE_DIR = Path("src") / "context_forge_cli"
+
+
+class TemplateManifestBuildHook(BuildHookInterface):  # type: ignore[misc]
+    """Write src/context_forge_cli/_template_manifest.py before building."""
+
+    PLUGIN_NAME = "custom"
+
+    def initialize(self, version: str, build_data: dict[str, Any]) -> None:
+        package_dir = Path(self.root) / PACKAGE_DIR
+
+        # Load the builder from the source tree without importing the package
+        spec = importlib.util.spec_from_file_location(
+            "_context_forge_template_manifest", package_dir / "template_manifest.py"
+        )
+        assert spec is not None and spec.loader is not None
+        builder = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(builder)
+
+        manifest = builder.build_manifest(package_dir / "templates" / "commands")
+        output = package_dir / builder.MANIFEST_MODULE_NAME
+        output.write_text(builder.render_manifest_module(manifest), encoding="utf-8")
+        build_data["artifacts"].append(
+            f"/{PACKAGE_DIR.as_posix()}/{builder.MANIFEST_MODULE_NAME}"
+        )
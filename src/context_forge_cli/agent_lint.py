@@ -0,0 +1,404 @@
+"""Linter for the Sub Agent quality rules of add-role-knowledge.
+
+Phase 5.5 of ``add-role-knowledge.md`` lists the checks every generated agent
+must pass. They run here over the ``agents/*.md`` files of all role plugins:
+
+- ``placeholder``: ``<xxx>`` / ``{xxx}`` placeholders in code blocks
+- ``unquoted-variable``: ``$VAR`` outside double quotes in shell code
+- ``git-add-all``: ``git add -A``, ``git add .`` or ``git add --all``
+- ``missing-troubleshooting`` / ``missing-notes``: required sections
+- ``missing-error-handling``: ``VAR=$(...)`` never checked for emptiness
+
+The spec marks placeholders, quoting and the two sections as auto-fixable:
+placeholders become quoted shell variables (``<run-id>`` -> ``"$RUN_ID"``),
+variables are quoted and sections are added with the template defaults.
+Results are cached in ``.claude/context-forge.lint.json`` by content hash.
+"""
+
+import json
+import os
+import re
+from collections.abc import Iterator, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from enum import StrEnum
+from pathlib import Path
+from typing import Any
+
+from context_forge_cli.constants import LINT_CACHE_PATH
+from context_forge_cli.fileio import content_digest, write_if_changed
+from context_forge_cli.plugin_migration import migrate_agent_sections
+from context_forge_cli.role_plugins import find_role_plugins
+
+# Bump when a rule changes, so cached results are discarded
+RULES_VERSION = 1
+
+SHELL_LANGUAGES = frozenset({"bash", "sh", "shell", "zsh"})
+
+
+class LintRule(StrEnum):
+    """Sub Agent quality rules."""
+
+    PLACEHOLDER = "placeholder"
+    UNQUOTED_VARIABLE = "unquoted-variable"
+    GIT_ADD_ALL = "git-add-all"
+    MISSING_TROUBLESHOOTING = "missing-troubleshooting"
+    MISSING_NOTES = "missing-notes"
+    MISSING_ERROR_HANDLING = "missing-error-handling"
+
+
+_SECTION_RULES = {
+    LintRule.MISSING_TROUBLESHOOTING: "## トラブルシューティング",
+    LintRule.MISSING_NOTES: "## 注意事項",
+}
+
+_FENCE = re.compile(r"^\s*(```+|~~~+)\s*([\w+-]*)")
+# <run-id> or {owner}, but not ${VAR} or {{TEMPLATE}}
+_PLACEHOLDER = re.compile(r"<[a-z][a-z0-9_-]*>|(?<![$\w{])\{[a-z][a-z0-9_]*\}(?!\})")
+_VARIABLE = re.compile(r"\$(?:[A-Za-z_]\w*|\{[A-Za-z_]\w*\})")
+_GIT_ADD_ALL = re.compile(r"\bgit add (?:-A|\.|--all)(?=\s|$|;|&|\|)")
+_COMMAND_ASSIGNMENT = re.compile(r"^\s*(?:export\s+|local\s+)?([A-Za-z_]\w*)=\$\(")
+
+
+@dataclass
+class LintIssue:
+    """One rule violation."""
+
+    rule: LintRule
+    line: int  # 1-based
+    message: str
+    fixable: bool = False
+
+    def to_dict(self) -> dict[str, Any]:
+        """Get the issue as JSON-serializable data."""
+        return {**vars(self), "rule": self.rule.value}
+
+
+@dataclass
+class FileLintResult:
+    """Lint outcome of one agent file."""
+
+    path: Path
+    issues: list[LintIssue] = field(default_factory=list)
+    fixed: int = 0  # issues fixed by --fix
+    cached: bool = False
+    error: str | None = None
+
+
+# =============================================================================
+# Rules
+# =============================================================================
+
+
+def _code_blocks(lines: list[str]) -> Iterator[tuple[str, list[int]]]:
+    """Yield (language, line indices) of every fenced code block."""
+    fence: str | None = None
+    language = ""
+    body: list[int] = []
+    for index, line in enumerate(lines):
+        match = _FENCE.match(line)
+        if fence is None:
+            if match:
+                fence, language, body = match.group(1), match.group(2).lower(), []
+        elif match and match.group(1).startswith(fence) and not match.group(2):
+            yield language, body
+            fence = None
+        else:
+            body.append(index)
+
+
+def _shell_spans(line: str) -> Iterator[tuple[int, int, str, bool]]:
+    """Yield (start, end, kind, double_quoted) of variables and placeholders.
+
+    Tracks quoting the way the shell does, including nested ``$(...)``.
+    Nothing inside single quotes or comments is reported, and variables on
+    the right-hand side of an assignment are not either (no word splitting).
+    """
+    quotes: list[str | None] = [None]  # quote state per $(...) nesting level
+    i = 0
+    while i < len(line):
+        char, quote = line[i], quotes[-1]
+        if quote == "'":
+            if char == "'":
+                quotes[-1] = None
+        elif char == "\\":
+            i += 1
+        elif char == "$" and line.startswith("$(", i) and not line.startswith("$((", i):
+            quotes.append(None)
+            i += 1
+        elif char == ")" and quote is None and len(quotes) > 1:
+            quotes.pop()
+        elif quote == '"' and char == '"':
+            quotes[-1] = None
+        elif quote is None and char in "'\"":
+            quotes[-1] = char
+        elif quote is None and char == "#" and (i == 0 or line[i - 1].isspace()):
+            return
+        elif char == "$" and (match := _VARIABLE.match(line, i)):
+            assignment = re.search(r"(?:^|\s)[A-Za-z_]\w*=$", line[:i])
+            if not assignment:
+                yield i, match.end(), "variable", quote == '"'
+            i = match.end()
+            continue
+        elif char in "<{" and (match := _PLACEHOLDER.match(line, i)):
+            if not (char == "{" and i > 0 and line[i - 1] in "$\\"):
+                yield i, match.end(), "placeholder", quote == '"'
+            i = match.end()
+            continue
+        i += 1
+
+
+def _has_error_handling(name: str, line: str, block: str) -> bool:
+    """Whether a command-substitution result is checked before use."""
+    return (
+        "||" in line
+        or re.search(r"^\s*set -\w*e", block, re.MULTILINE) is not None
+        or re.search(rf'-[nz]\s+"?\$\{{?{name}\b', block) is not None
+        or re.search(rf"\$\{{{name}:[?-]", block) is not None
+    )
+
+
+def _variable_name(placeholder: str) -> str:
+    """Turn a placeholder like ``<run-id>`` into a shell name like ``RUN_ID``."""
+    return re.sub(r"\W", "_", placeholder.strip("<>{}")).upper()
+
+
+def lint_agent(text: str) -> list[LintIssue]:
+    """Check an agent file against the Sub Agent quality rules.
+
+    Args:
+        text: Agent file content.
+
+    Returns:
+        Issues sorted by line.
+    """
+    lines = text.split("\n")
+    issues: list[LintIssue] = []
+    for language, body in _code_blocks(lines):
+        shell = language in SHELL_LANGUAGES
+        block = "\n".join(lines[index] for index in body)
+        for index in body:
+            line, number = lines[index], index + 1
+            if shell:
+                for start, end, kind, quoted in _shell_spans(line):
+                    token = line[start:end]
+                    if kind == "placeholder":
+                        issues.append(
+                            LintIssue(
+                                LintRule.PLACEHOLDER,
+                                number,
+                                f"Placeholder {token}: use ${_variable_name(token)} "
+                                "set by a command",
+                                fixable=True,
+                            )
+                        )
+                    elif not quoted:
+                        issues.append(
+                            LintIssue(
+                                LintRule.UNQUOTED_VARIABLE,
+                                number,
+                                f'Quote {token} as "{token}"',
+                                fixable=True,
+                            )
+                        )
+                match = _COMMAND_ASSIGNMENT.match(line)
+                if match and not _has_error_handling(match.group(1), line, block):
+                    issues.append(
+                        LintIssue(
+                            LintRule.MISSING_ERROR_HANDLING,
+                            number,
+                            f'Check {match.group(1)} before use (if [ -n "$'
+                            f'{match.group(1)}" ]; then ...)',
+                        )
+                    )
+            else:
+                issues += [
+                    LintIssue(
+                        LintRule.PLACEHOLDER,
+                        number,
+                        f"Placeholder {match.group()} left in a code block",
+                    )
+                    for match in _PLACEHOLDER.finditer(line)
+                ]
+            if _GIT_ADD_ALL.search(line):
+                issues.append(
+                    LintIssue(
+                        LintRule.GIT_ADD_ALL,
+                        number,
+                        "Stage the modified files by name, not everything",
+                    )
+                )
+
+    headings = {line.rstrip() for line in lines if line.startswith("## ")}
+    for rule, heading in _SECTION_RULES.items():
+        if heading not in headings:
+            issues.append(
+                LintIssue(rule, len(lines), f"Missing {heading} section", fixable=True)
+            )
+    return sorted(issues, key=lambda issue: issue.line)
+
+
+def fix_agent(text: str) -> str:
+    """Apply the fixes of the auto-fixable rules.
+
+    Placeholders and unquoted variables are rewritten in shell code blocks
+    only; missing sections are added as :func:`migrate_agent_sections` does.
+
+    Args:
+        text: Agent file content.
+
+    Returns:
+        The fixed content.
+    """
+    lines = text.split("\n")
+    for language, body in _code_blocks(lines):
+        if language not in SHELL_LANGUAGES:
+            continue
+        for index in body:
+            line = lines[index]
+            # Rewrite right to left so earlier offsets stay valid
+            for start, end, kind, quoted in reversed(list(_shell_spans(line))):
+                token = line[start:end]
+                if kind == "placeholder":
+                    token = f"${_variable_name(token)}"
+                elif quoted:
+                    continue
+                replacement = token if quoted else f'"{token}"'
+                line = line[:start] + replacement + line[end:]
+            lines[index] = line
+    fixed, _ = migrate_agent_sections("\n".join(lines))
+    return fixed
+
+
+# =============================================================================
+# Files
+# =============================================================================
+
+
+def find_agent_files(project_root: Path) -> list[Path]:
+    """List the agent files of every role plugin, sorted by path."""
+    return [
+        path
+        for plugin_dir in find_role_plugins(project_root)
+        for path in sorted((plugin_dir / "agents").glob("*.md"))
+    ]
+
+
+def _lint_text(text: str, fix: bool) -> tuple[list[LintIssue], str | None, int]:
+    """Worker: lint (and fix) one file's content.
+
+    Returns:
+        Remaining issues, the fixed content (None if unchanged) and the
+        number of fixed issues.
+    """
+    issues = lint_agent(text)
+    if not fix or not any(issue.fixable for issue in issues):
+        return issues, None, 0
+    fixed = fix_agent(text)
+    remaining = lint_agent(fixed)
+    return remaining, fixed, len(issues) - len(remaining)
+
+
+def _load_cache(path: Path) -> dict[str, Any]:
+    """Get the cached results by content hash, or nothing if unusable."""
+    try:
+        raw = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(raw, dict) or raw.get("version") != RULES_VERSION:
+        return {}
+    results = raw.get("results")
+    return results if isinstance(results, dict) else {}
+
+
+def _from_cache(entry: Any) -> list[LintIssue] | None:
+    try:
+        return [
+            LintIssue(
+                LintRule(item["rule"]), item["line"], item["message"], item["fixable"]
+            )
+            for item in entry
+        ]
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def lint_agents(
+    project_root: Path,
+    paths: Sequence[Path],
+    fix: bool = False,
+    jobs: int | None = None,
+    prune_cache: bool = True,
+) -> list[FileLintResult]:
+    """Lint agent files in worker processes, skipping cached ones.
+
+    Files whose content hash has a cached result are not linted again
+    (unless ``fix`` is set and the result has fixable issues). New results
+    are added to the cache, and (with ``prune_cache``) entries of files that
+    were not linted are dropped.
+
+    Args:
+        project_root: Path to the project root directory.
+        paths: Agent files to lint (see :func:`find_agent_files`).
+        fix: Apply the auto-fixes and write the files.
+        jobs: Number of worker processes (default: CPU count). With one job,
+            or a single file to lint, everything runs in this process.
+        prune_cache: Drop cache entries of other files. Pass False when
+            linting only some of the agent files.
+
+    Returns:
+        One FileLintResult per path, in the order given.
+    """
+    cache_path = project_root / LINT_CACHE_PATH
+    cache = _load_cache(cache_path)
+    new_cache: dict[str, Any] = {} if prune_cache else dict(cache)
+    results = [FileLintResult(path=path) for path in paths]
+    pending: list[tuple[FileLintResult, str, str]] = []
+
+    for result in results:
+        try:
+            data = result.path.read_bytes()
+        except OSError as e:
+            result.error = f"Cannot read file ({e.strerror})"
+            continue
+        digest = content_digest(data)
+        cached = _from_cache(cache.get(digest))
+        if cached is not None and not (fix and any(i.fixable for i in cached)):
+            result.issues, result.cached = cached, True
+            new_cache[digest] = cache[digest]
+        else:
+            pending.append((result, digest, data.decode("utf-8", errors="replace")))
+
+    texts = [text for _, _, text in pending]
+    workers = min(jobs or os.cpu_count() or 1, len(pending))
+    if workers <= 1:
+        outcomes = [_lint_text(text, fix) for text in texts]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            outcomes = list(pool.map(_lint_text, texts, [fix] * len(texts)))
+
+    for (result, digest, _), (issues, fixed_text, fixed) in zip(
+        pending, outcomes, strict=True
+    ):
+        result.issues = issues
+        if fixed_text is not None:
+            try:
+                write_if_changed(result.path, fixed_text)
+            except OSError as e:
+                result.error = f"Cannot write file ({e.strerror})"
+                continue
+            result.fixed = fixed
+            digest = content_digest(fixed_text.encode("utf-8"))
+        new_cache[digest] = [issue.to_dict() for issue in issues]
+
+    if new_cache != cache:
+        text = json.dumps(
+            {"version": RULES_VERSION, "results": new_cache},
+            ensure_ascii=False,
+            separators=(",", ":"),
+        )
+        try:
+            write_if_changed(cache_path, text + "\n")
+        except OSError:
+            pass  # the cache is optional
+    return results
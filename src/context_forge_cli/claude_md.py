@@ -0,0 +1,197 @@
+"""CLAUDE.md helpers: reference block detection and legacy settings scan."""
+
+import mmap
+import os
+import re
+from dataclasses import dataclass
+from pathlib import Path
+
+from context_forge_cli.constants import (
+    CLAUDE_MD_END_MARKER,
+    CLAUDE_MD_START_MARKER,
+    CONTEXT_FORGE_MD_REFERENCE,
+)
+from context_forge_cli.fileio import atomic_append_bytes, write_if_changed
+from context_forge_cli.profiling import count, span
+
+# Patterns to detect legacy context-forge settings in CLAUDE.md
+LEGACY_CONTEXT_FORGE_PATTERNS = [
+    r"context-forge",
+    r"@\.claude/plugins/context-forge\.role-",
+    r"Skill/SubAgent\s*発動",
+]
+
+# Characters matched by \s in a str pattern. The scan runs on raw UTF-8 bytes,
+# where \s is ASCII-only, so the non-ASCII ones (e.g. the ideographic space
+# common in Japanese text) are spelled out.
+_UNICODE_WHITESPACE = (
+    "\x1c\x1d\x1e\x1f\x85\xa0\u1680"
+    "\u2000\u2001\u2002\u2003\u2004\u2005\u2006\u2007\u2008\u2009\u200a"
+    "\u2028\u2029\u202f\u205f\u3000"
+)
+
+
+def _compile_legacy_pattern(patterns: list[str]) -> re.Pattern[bytes]:
+    """Combine the legacy patterns into one bytes regex for the mmap scan.
+
+    A case-insensitive alternation gives the regex engine nothing to skip
+    ahead with, so it tries every branch at every byte. Pulling the first
+    character of each pattern out into a leading character class lets it
+    jump between candidate positions instead (about 4x faster on large
+    files); each branch then re-checks its own first character with a
+    lookbehind.
+    """
+    whitespace = b"|".join(re.escape(c.encode("utf-8")) for c in _UNICODE_WHITESPACE)
+    alternatives = [
+        p.encode("utf-8").replace(rb"\s", rb"(?:\s|" + whitespace + b")")
+        for p in patterns
+    ]
+    if any(not p or p[:1] in rb"\.^$*+?{}[]|()" for p in alternatives):
+        return re.compile(b"|".join(alternatives), re.IGNORECASE)
+
+    leads = []
+    branches = []
+    for p in alternatives:
+        first = p[:1].lower() + p[:1].upper() if p[:1].isalpha() else p[:1]
+        leads.append(first)
+        branches.append(b"(?<=[" + re.escape(first) + b"])(?i:" + p[1:] + b")")
+    lead = b"[" + re.escape(b"".join(sorted(set(leads)))) + b"]"
+    return re.compile(lead + b"(?:" + b"|".join(branches) + b")")
+
+
+_LEGACY_PATTERN = _compile_legacy_pattern(LEGACY_CONTEXT_FORGE_PATTERNS)
+
+
+@dataclass
+class ClaudeMdContent:
+    """Represents a scanned CLAUDE.md file with context-forge reference info.
+
+    Only offsets are kept: spans are byte offsets into the file, and the text
+    itself is read from disk on demand (see ``full_content``).
+    """
+
+    path: Path
+    size: int
+    has_reference: bool
+    reference_start_index: int | None = None
+    reference_end_index: int | None = None  # just past the end marker
+    has_legacy_settings: bool = False
+    legacy_settings_span: tuple[int, int] | None = None  # first legacy match
+    ends_with_newline: bool = False
+
+    @property
+    def full_content(self) -> str:
+        """Read the full CLAUDE.md text from disk."""
+        return self.path.read_text(encoding="utf-8")
+
+    @property
+    def legacy_settings_content(self) -> str | None:
+        """Read the content outside the reference block, if it has legacy settings."""
+        if not self.has_legacy_settings:
+            return None
+        data = self.path.read_bytes()
+        if self.reference_start_index is not None:
+            data = data[: self.reference_start_index] + data[self.reference_end_index :]
+        return data.decode("utf-8")
+
+
+def read_claude_md(project_root: Path) -> ClaudeMdContent | None:
+    """Scan CLAUDE.md for the context-forge reference and legacy settings.
+
+    The file is memory-mapped and searched in place: the markers with
+    ``mmap.find`` and every legacy pattern with one combined regex over the
+    ranges before and after the reference block. Nothing is decoded or
+    copied, so memory use does not grow with the size of the file.
+
+    Args:
+        project_root: Path to the project root directory.
+
+    Returns:
+        ClaudeMdContent if file exists and was read successfully,
+        None if file doesn't exist.
+        Raises IOError on permission errors.
+    """
+    claude_md_path = project_root / "CLAUDE.md"
+
+    try:
+        f = claude_md_path.open("rb")
+    except FileNotFoundError:
+        return None
+
+    count("files read")
+    with f, span("read CLAUDE.md"):
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return ClaudeMdContent(path=claude_md_path, size=0, has_reference=False)
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            return _scan_claude_md(claude_md_path, buffer)
+
+
+def _scan_claude_md(path: Path, buffer: mmap.mmap) -> ClaudeMdContent:
+    """Locate the reference block and legacy settings in a mapped CLAUDE.md."""
+    size = len(buffer)
+
+    # Check for existing context-forge reference
+    start_idx = buffer.find(CLAUDE_MD_START_MARKER.encode("utf-8"))
+    end_idx = buffer.find(CLAUDE_MD_END_MARKER.encode("utf-8"))
+    has_reference = start_idx != -1 and end_idx != -1 and end_idx > start_idx
+
+    # T025: Detect legacy context-forge settings (outside of the reference block)
+    ranges = [(0, size)]
+    ref_end_idx = None
+    if has_reference:
+        ref_end_idx = end_idx + len(CLAUDE_MD_END_MARKER.encode("utf-8"))
+        ranges = [(0, start_idx), (ref_end_idx, size)]
+
+    legacy_span = None
+    with span("legacy settings scan"):
+        for pos, endpos in ranges:
+            match = _LEGACY_PATTERN.search(buffer, pos, endpos)
+            if match is not None:
+                legacy_span = match.span()
+                break
+
+    return ClaudeMdContent(
+        path=path,
+        size=size,
+        has_reference=has_reference,
+        reference_start_index=start_idx if has_reference else None,
+        reference_end_index=ref_end_idx,
+        has_legacy_settings=legacy_span is not None,
+        legacy_settings_span=legacy_span,
+        ends_with_newline=buffer[size - 1 :] == b"\n",
+    )
+
+
+def write_claude_md_reference(
+    project_root: Path, claude_md: ClaudeMdContent | None
+) -> bool:
+    """Add or update context-forge reference in CLAUDE.md.
+
+    Args:
+        project_root: Path to the project root directory.
+        claude_md: Existing CLAUDE.md content, or None if file doesn't exist.
+
+    Returns:
+        True if file was updated/created, False if reference already exists.
+        Raises IOError on permission errors.
+    """
+    claude_md_path = project_root / "CLAUDE.md"
+
+    reference_block = f"""{CLAUDE_MD_START_MARKER}
+{CONTEXT_FORGE_MD_REFERENCE}
+{CLAUDE_MD_END_MARKER}"""
+
+    if claude_md is None:
+        # Create new CLAUDE.md with reference
+        write_if_changed(claude_md_path, reference_block + "\n")
+        return True
+
+    if claude_md.has_reference:
+        # Reference already exists
+        return False
+
+    # Append reference to existing content, streaming the file into the copy
+    separator = "\n" if claude_md.ends_with_newline else "\n\n"
+    atomic_append_bytes(claude_md.path, f"{separator}{reference_block}\n".encode())
+    return True
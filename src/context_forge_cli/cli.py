@@ -0,0 +1,1740 @@
+"""Typer application and commands for the context-forge CLI.
+
+Importing this module pulls in typer and rich, so the package root only
+loads it on demand (see ``context_forge_cli.main``).
+"""
+
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import typer
+from rich.console import Console
+from rich.panel import Panel
+
+from context_forge_cli import __version__
+from context_forge_cli.claude_md import read_claude_md
+from context_forge_cli.command_templates import (
+    InstallResult,
+    InstallTarget,
+    list_available_templates,
+)
+from context_forge_cli.constants import (
+    CLAUDE_GITIGNORE_PATH,
+    CONTEXT_FORGE_MD_PATH,
+    CONTEXT_FORGE_MD_REFERENCE,
+    CONTEXT_FORGE_ROLES_DIR,
+    EXIT_BUDGET_EXCEEDED,
+    EXIT_ERROR,
+    EXIT_FILE_ERROR,
+    EXIT_PARTIAL_FAILURE,
+    TEMPLATE_PACKS_ENV,
+)
+from context_forge_cli.fileio import WriteOutcome
+from context_forge_cli.initializer import (
+    ConflictPolicy,
+    ProjectInitResult,
+    ensure_claude_gitignore,
+    ensure_claude_md_reference,
+    ensure_context_forge_md,
+    ensure_project_dirs,
+    install_commands,
+)
+from context_forge_cli.role_shards import RulesLayout
+
+if TYPE_CHECKING:
+    from context_forge_cli.context_stats import ContextStats
+    from context_forge_cli.profiling import Profile
+    from context_forge_cli.scopes import ScopeSyncResult
+
+# Rich console for output
+console = Console()
+err_console = Console(stderr=True)
+
+
+# =============================================================================
+# Error Handling (T032)
+# =============================================================================
+
+
+def show_error(message: str, hint: str | None = None) -> None:
+    """Display an error message in a Rich panel.
+
+    Args:
+        message: The error message to display.
+        hint: Optional hint for resolving the error.
+    """
+    content = f"[red bold]Error:[/red bold] {message}"
+    if hint:
+        content += f"\n\n[dim]Hint: {hint}[/dim]"
+
+    err_console.print(Panel(content, title="Error", border_style="red"))
+
+
+# =============================================================================
+# Typer App (T007)
+# =============================================================================
+
+
+def version_callback(value: bool) -> None:
+    """Display version information and exit."""
+    if value:
+        console.print(f"context-forge-cli v{__version__}")
+        raise typer.Exit()
+
+
+app = typer.Typer(
+    name="context-forge",
+    help="A CLI tool to manage context for AI coding assistants like Claude Code.",
+    add_completion=False,
+)
+
+
+def _print_profile(profile: "Profile") -> None:
+    """Print the spans and counters of a profile to stderr."""
+    from rich.table import Table
+
+    table = Table(title=f"Profile ({profile.total_ms:.1f}ms total)")
+    table.add_column("Phase")
+    table.add_column("Start", justify="right", no_wrap=True)
+    table.add_column("Time", justify="right", no_wrap=True)
+    table.add_column("Thread", style="dim")
+    for span in sorted(profile.spans, key=lambda s: s.start_ms):
+        table.add_row(
+            "  " * span.depth + span.name,
+            f"{span.start_ms:.2f}ms",
+            f"{span.duration_ms:.2f}ms",
+            span.thread,
+        )
+    err_console.print(table)
+    if profile.counters:
+        err_console.print(
+            ", ".join(f"{name}: {n}" for name, n in sorted(profile.counters.items())),
+            highlight=False,
+        )
+
+
+def _start_profiling(
+    ctx: typer.Context,
+    show: bool,
+    json_path: Path | None,
+    cprofile_path: Path | None,
+) -> None:
+    """Record spans (and cProfile data) until the command finishes."""
+    from context_forge_cli.profiling import start_profile, stop_profile
+
+    profiler = None
+    if cprofile_path is not None:
+        import cProfile
+
+        profiler = cProfile.Profile()
+    start_profile()
+    if profiler is not None:
+        profiler.enable()
+
+    def finish() -> None:
+        if profiler is not None and cprofile_path is not None:
+            profiler.disable()
+            profiler.dump_stats(cprofile_path)
+        profile = stop_profile()
+        if profile is None:
+            return
+        if json_path is not None:
+            import json
+
+            json_path.write_text(
+                json.dumps(profile.to_dict(), indent=2, ensure_ascii=False) + "\n",
+                encoding="utf-8",
+            )
+        if show:
+            _print_profile(profile)
+
+    ctx.call_on_close(finish)
+
+
+@app.callback()
+def main_callback(
+    ctx: typer.Context,
+    version: bool = typer.Option(
+        False,
+        "--version",
+        "-v",
+        help="Show version information and exit.",
+        callback=version_callback,
+        is_eager=True,
+    ),
+    profile: bool = typer.Option(
+        False,
+        "--profile",
+        help="Print how long each phase took and how many files were touched.",
+    ),
+    profile_json: Path | None = typer.Option(
+        None,
+        "--profile-json",
+        dir_okay=False,
+        help="Write the profile as JSON to this file.",
+    ),
+    cprofile: Path | None = typer.Option(
+        None,
+        "--cprofile",
+        dir_okay=False,
+        help="Dump cProfile statistics to this file (read with pstats).",
+    ),
+) -> None:
+    """context-forge CLI - Manage context for AI coding assistants."""
+    if profile or profile_json is not None or cprofile is not None:
+        _start_profiling(ctx, profile, profile_json, cprofile)
+
+
+# =============================================================================
+# Init Command (T027-T030)
+# =============================================================================
+
+
+def _resolve_conflict_policy(
+    on_conflict: ConflictPolicy | None, force: bool, interactive: bool
+) -> ConflictPolicy:
+    """Pick the conflict policy for init from --on-conflict and --force.
+
+    An explicit --on-conflict wins; --force rewrites files that differ;
+    otherwise a single project prompts and a workspace skips.
+    """
+    if on_conflict is not None:
+        return on_conflict
+    if force:
+        return ConflictPolicy.IF_CHANGED
+    return ConflictPolicy.PROMPT if interactive else ConflictPolicy.SKIP
+
+
+def _confirm_overwrite(target_path: Path) -> bool:
+    """Ask whether an existing command file may be overwritten."""
+    return typer.confirm(
+        f"File '{target_path}' already exists. Overwrite?",
+        default=False,
+    )
+
+
+def _fold_pending_rules(project_root: Path) -> None:
+    """Fold rules an interrupted add-rules left in the journal, if possible.
+
+    Read-only commands call this first so they see every rule; when the
+    fold fails they go on with the rule files as they are.
+    """
+    import contextlib
+
+    from context_forge_cli.rule_journal import fold_rule_journal
+
+    with contextlib.suppress(OSError, ValueError):
+        fold_rule_journal(project_root)
+
+
+def _print_install_result(result: InstallResult) -> None:
+    """Print one line for a command install (internal helper for init)."""
+    if not result.success:
+        console.print(f"[red]Failed[/red] '{result.command_name}': {result.error}")
+    elif result.unchanged:
+        console.print(f"[dim]Unchanged '{result.command_name}'.[/dim]")
+    elif result.skipped:
+        console.print(f"[yellow]Skipped '{result.command_name}'.[/yellow]")
+    else:
+        how = f" [dim]({result.link_method})[/dim]" if result.link_method else ""
+        console.print(f"[green]Installed[/green] '{result.command_name}'{how}")
+
+
+@app.command()
+def init(
+    skip_install: bool = typer.Option(
+        False,
+        "--skip-install",
+        "-s",
+        help="Skip automatic installation of all available commands.",
+    ),
+    force: bool = typer.Option(
+        False,
+        "--force",
+        "-f",
+        help="Overwrite existing files without prompting.",
+    ),
+    on_conflict: ConflictPolicy | None = typer.Option(
+        None,
+        "--on-conflict",
+        case_sensitive=False,
+        help=(
+            "What to do with existing command files that differ from the "
+            "template: prompt, skip, overwrite, if-changed or fail "
+            "(default: prompt, or skip with --workspace)."
+        ),
+    ),
+    workspace: Path | None = typer.Option(
+        None,
+        "--workspace",
+        "-w",
+        help=(
+            "Initialize every project (directory containing .git or CLAUDE.md) "
+            "under this root, without prompting."
+        ),
+        exists=True,
+        file_okay=False,
+        resolve_path=True,
+    ),
+    jobs: int | None = typer.Option(
+        None,
+        "--jobs",
+        "-j",
+        min=1,
+        help="Number of worker processes for --workspace (default: CPU count).",
+    ),
+    as_json: bool = typer.Option(
+        False,
+        "--json",
+        help=(
+            "Print one JSON result (files, commands, errors) without prompting "
+            "or rich output."
+        ),
+    ),
+    template_pack: list[Path] | None = typer.Option(
+        None,
+        "--template-pack",
+        exists=True,
+        dir_okay=False,
+        help=(
+            "Also install the commands of this zip/tar template pack "
+            "(repeatable; adds to $CONTEXT_FORGE_TEMPLATE_PACKS)."
+        ),
+    ),
+    link: bool = typer.Option(
+        False,
+        "--link",
+        help=(
+            "Install commands as hardlinks to a shared content-addressed store "
+            "($CONTEXT_FORGE_STORE, default ~/.cache/context-forge/store)."
+        ),
+    ),
+    no_gitignore: bool = typer.Option(
+        False,
+        "--no-gitignore",
+        help="Do not list context-forge's caches in .claude/.gitignore.",
+    ),
+) -> None:
+    """Initialize a project for context-forge.
+
+    Creates the .claude/ and .claude/commands/ directories for storing
+    Claude Code slash commands. Creates .claude/context-forge.md for
+    activation rules and adds a reference to CLAUDE.md. Lists the caches
+    context-forge keeps under .claude/ in .claude/.gitignore.
+    By default, installs all available commands.
+
+    Examples:
+        context-forge init                  # Initialize and install all commands
+        context-forge init --skip-install   # Initialize without installing commands
+        context-forge init --force          # Overwrite existing files
+        context-forge init --on-conflict=fail   # Never prompt; fail on conflicts
+        context-forge init -w ~/src -j 8    # Initialize all projects under ~/src
+        context-forge init --json           # Machine-readable result
+        context-forge init -w ~/src --link  # Share one copy of each command
+        context-forge init --template-pack team.zip  # Add a team's commands
+        context-forge init --no-gitignore   # Leave .claude/.gitignore alone
+    """
+    if template_pack or os.environ.get(TEMPLATE_PACKS_ENV):
+        from context_forge_cli.template_packs import (
+            register_template_pack,
+            registered_template_packs,
+        )
+
+        try:
+            for pack_path in template_pack or []:
+                register_template_pack(pack_path)
+            registered_template_packs()
+        except ValueError as e:
+            show_error(str(e), hint="Template packs must be zip or tar archives.")
+            raise typer.Exit(EXIT_FILE_ERROR)
+
+    store = None
+    if link:
+        from context_forge_cli.template_store import default_store_path
+
+        store = default_store_path()
+
+    if as_json:
+        import json
+
+        from context_forge_cli.init_json import build_init_report
+
+        report = build_init_report(
+            Path.cwd(),
+            skip_install,
+            _resolve_conflict_policy(on_conflict, force, interactive=False),
+            workspace,
+            jobs,
+            store,
+            not no_gitignore,
+        )
+        typer.echo(json.dumps(report, indent=2, ensure_ascii=False))
+        if report["exit_code"]:
+            raise typer.Exit(report["exit_code"])
+        return
+
+    policy = _resolve_conflict_policy(on_conflict, force, interactive=workspace is None)
+    if workspace is not None:
+        _init_workspace(workspace, jobs, skip_install, policy, store, not no_gitignore)
+        return
+    if jobs is not None:
+        show_error(
+            "--jobs can only be used together with --workspace.",
+            hint="Run 'context-forge init --workspace <root> --jobs N'.",
+        )
+        raise typer.Exit(EXIT_ERROR)
+
+    project_root = Path.cwd()
+
+    # Track what we created/updated
+    created_dirs: list[Path] = []
+    created_files: list[Path] = []
+    updated_files: list[Path] = []
+
+    try:
+        # Create .claude/ and .claude/commands/ directories
+        created_dirs.extend(ensure_project_dirs(project_root))
+    except PermissionError:
+        show_error(
+            f"Cannot create directory in: {project_root}",
+            hint="Check write permissions for the project directory.",
+        )
+        raise typer.Exit(EXIT_FILE_ERROR)
+
+    # T009: Create .claude/context-forge.md if not exists
+    context_forge_md_path = project_root / CONTEXT_FORGE_MD_PATH
+    try:
+        context_forge_created = ensure_context_forge_md(project_root)
+    except PermissionError:
+        show_error(
+            f"Cannot write file: {context_forge_md_path}",
+            hint="Check write permissions for the .claude directory.",
+        )
+        raise typer.Exit(EXIT_FILE_ERROR)
+    if context_forge_created:
+        created_files.append(context_forge_md_path)
+
+    gitignore_path = project_root / CLAUDE_GITIGNORE_PATH
+    gitignore_outcome = WriteOutcome.UNCHANGED
+    try:
+        if not no_gitignore:
+            gitignore_outcome = ensure_claude_gitignore(project_root)
+    except PermissionError:
+        show_error(
+            f"Cannot write file: {gitignore_path}",
+            hint="Check write permissions for the .claude directory.",
+        )
+        raise typer.Exit(EXIT_FILE_ERROR)
+    if gitignore_outcome == WriteOutcome.CREATED:
+        created_files.append(gitignore_path)
+    elif gitignore_outcome == WriteOutcome.UPDATED:
+        updated_files.append(gitignore_path)
+
+    # T010-T012: Add @ reference to CLAUDE.md with markers
+    claude_md = read_claude_md(project_root)
+
+    # T025-T027: Migration detection and handling
+    if claude_md is not None and claude_md.has_legacy_settings:
+        # T026: Confirmation prompt for migration
+        console.print()
+        console.print(
+            "[yellow]既存の context-forge 設定が CLAUDE.md で検出されました。[/yellow]"
+        )
+        migrate = typer.confirm(
+            "既存の設定を .claude/context-forge.md に移行しますか？",
+            default=True,
+        )
+        if migrate:
+            # T027: Migration - add reference and inform user about manual steps
+            # Note: Full content migration is not implemented due to parsing
+            # complexity. Users need to manually move activation rules.
+            console.print()
+            console.print(
+                "[yellow]注意: @ 参照は自動で追加されますが、"
+                "発動ルールの移行は手動で行ってください。[/yellow]"
+            )
+            console.print(
+                "[dim]CLAUDE.md 内の context-forge 関連の設定を "
+                ".claude/context-forge.md にコピーしてください。[/dim]"
+            )
+
+    try:
+        # T011: Create CLAUDE.md with reference, or add the reference to it.
+        # T012: Reference already exists - skip (no action needed)
+        if ensure_claude_md_reference(project_root, claude_md):
+            if claude_md is None:
+                created_files.append(project_root / "CLAUDE.md")
+            else:
+                updated_files.append(project_root / "CLAUDE.md")
+    except PermissionError:
+        show_error(
+            f"Cannot write file: {project_root / 'CLAUDE.md'}",
+            hint="Check write permissions for the project directory.",
+        )
+        raise typer.Exit(EXIT_FILE_ERROR)
+
+    # T028: Warning when context-forge.md is missing but @ reference exists
+    has_ref = claude_md is not None and claude_md.has_reference
+    if has_ref and context_forge_created:
+        console.print()
+        console.print(
+            "[yellow]警告: CLAUDE.md に @ 参照がありますが、"
+            ".claude/context-forge.md が見つかりません。[/yellow]"
+        )
+        console.print("[dim]新しい context-forge.md を作成しました。[/dim]")
+
+    # T013: Success message showing created/updated files
+    if created_dirs or created_files or updated_files:
+        console.print("[green]Success![/green] Initialized context-forge project.")
+
+        if created_dirs:
+            console.print("Created directories:")
+            for d in created_dirs:
+                console.print(f"  - {d.relative_to(project_root)}")
+
+        if created_files:
+            console.print("\nCreated files:")
+            for f in created_files:
+                console.print(f"  - {f.relative_to(project_root)}")
+
+        if updated_files:
+            console.print("\nUpdated files:")
+            for f in updated_files:
+                desc = ""
+                if f.name == "CLAUDE.md":
+                    desc = f" (added {CONTEXT_FORGE_MD_REFERENCE} reference)"
+                console.print(f"  - {f.relative_to(project_root)}{desc}")
+    else:
+        console.print(
+            "[yellow]Project already initialized.[/yellow] "
+            "All required directories and files exist."
+        )
+
+    # Install all available commands by default
+    if not skip_install:
+        available_commands = list_available_templates()
+        if available_commands:
+            console.print()  # Blank line before install output
+            console.print("Installing commands...")
+            target = InstallTarget(project_root=project_root, store=store)
+            results = install_commands(
+                available_commands, target, policy, confirm=_confirm_overwrite
+            )
+            for result in results:
+                _print_install_result(result)
+            failed_commands = [r.command_name for r in results if not r.success]
+
+            installed = [r for r in results if r.success]
+            unchanged = [r for r in installed if r.unchanged]
+            skipped = [r for r in installed if r.skipped]
+            console.print(
+                f"[dim]Commands: "
+                f"{len(installed) - len(unchanged) - len(skipped)} installed, "
+                f"{len(unchanged)} unchanged, {len(skipped)} skipped.[/dim]"
+            )
+
+            if failed_commands:
+                console.print()
+                show_error(
+                    f"Failed to install: {', '.join(failed_commands)}",
+                    hint=(
+                        "Use --on-conflict=if-changed to replace files that "
+                        "differ from the templates."
+                        if policy == ConflictPolicy.FAIL
+                        else "Check the command names and try again."
+                    ),
+                )
+                raise typer.Exit(EXIT_ERROR)
+
+            console.print()
+            console.print(
+                "[dim]Installed commands are available as "
+                "'/context-forge.<command>' in Claude Code.[/dim]"
+            )
+        else:
+            console.print("\n[dim]No commands available to install.[/dim]")
+    else:
+        console.print(
+            "\n[dim]You can install commands later by running "
+            "'context-forge init' without --skip-install.[/dim]"
+        )
+
+
+# =============================================================================
+# Add Rules Command
+# =============================================================================
+
+
+@app.command("add-rules")
+def add_rules(
+    source: str = typer.Argument(
+        "-",
+        help="JSON or YAML file with role/rule pairs, or '-' to read stdin.",
+    ),
+    compact: bool = typer.Option(
+        False,
+        "--compact",
+        help="Also remove duplicate rules and merge duplicate role sections.",
+    ),
+) -> None:
+    """Add many activation rules to .claude/context-forge.md at once.
+
+    The input maps role names to rules, or lists {role, rule} entries.
+    Existing role sections are extended and new ones created in a single
+    pass, and the file is written once. Rules a role already has are
+    skipped.
+
+    Examples:
+        context-forge add-rules rules.yaml
+        echo '{"software-engineer": ["- ..."]}' | context-forge add-rules
+    """
+    import sys
+
+    from context_forge_cli.context_forge_md import (
+        load_rule_batch,
+        read_context_forge_md,
+    )
+    from context_forge_cli.role_index import load_role_index
+    from context_forge_cli.role_shards import is_sharded
+    from context_forge_cli.rule_journal import add_rules_journaled
+
+    try:
+        if source == "-":
+            text = sys.stdin.read()
+        else:
+            text = Path(source).read_text(encoding="utf-8")
+    except OSError as e:
+        show_error(f"Cannot read rules from: {source} ({e.strerror})")
+        raise typer.Exit(EXIT_FILE_ERROR)
+
+    try:
+        rules = load_rule_batch(text)
+    except ValueError as e:
+        show_error(
+            str(e),
+            hint='Use e.g. {"role-name": ["- rule", ...]} or a list of {role, rule}.',
+        )
+        raise typer.Exit(EXIT_ERROR)
+
+    if not rules:
+        console.print("[yellow]No rules to add.[/yellow]")
+        return
+
+    project_root = Path.cwd()
+    context_forge_md_path = project_root / CONTEXT_FORGE_MD_PATH
+    sharded = is_sharded(project_root)
+    try:
+        if sharded:
+            existing = read_context_forge_md(project_root)
+            existing_roles = set(existing.roles) if existing is not None else set()
+        else:
+            index = load_role_index(project_root)
+            existing_roles = set(index.roles) if index is not None else set()
+        new_rules = add_rules_journaled(project_root, rules, compact)
+    except PermissionError:
+        show_error(
+            f"Cannot write file: {context_forge_md_path}",
+            hint="Check write permissions for the .claude directory.",
+        )
+        raise typer.Exit(EXIT_FILE_ERROR)
+    except ValueError as e:
+        show_error(str(e), hint="Or switch back with 'context-forge layout single'.")
+        raise typer.Exit(EXIT_ERROR)
+
+    new_roles = {role for role, _ in new_rules if role not in existing_roles}
+    destination = CONTEXT_FORGE_ROLES_DIR if sharded else CONTEXT_FORGE_MD_PATH
+    console.print(
+        f"[green]Added[/green] {len(new_rules)} rules to {destination} "
+        f"({len(new_roles)} new roles, {len(rules) - len(new_rules)} already "
+        "present)."
+    )
+
+
+# =============================================================================
+# Compact Command
+# =============================================================================
+
+
+@app.command()
+def compact(
+    dry_run: bool = typer.Option(
+        False,
+        "--dry-run",
+        "-n",
+        help="Report what would be removed without writing the file.",
+    ),
+) -> None:
+    """Remove duplicate rules from .claude/context-forge.md.
+
+    Rules that repeat within a role (ignoring case and extra whitespace) are
+    dropped, and repeated sections of the same role are merged into the
+    first one. Manually added content is kept. In the sharded layout every
+    role file is compacted.
+
+    Examples:
+        context-forge compact
+        context-forge compact --dry-run
+    """
+    from context_forge_cli.context_forge_md import compact_context_forge_md
+    from context_forge_cli.fileio import write_if_changed
+    from context_forge_cli.role_shards import compact_role_files, is_sharded
+    from context_forge_cli.rule_journal import locked_rule_files
+
+    project_root = Path.cwd()
+    context_forge_md_path = project_root / CONTEXT_FORGE_MD_PATH
+    location = CONTEXT_FORGE_MD_PATH
+    try:
+        with locked_rule_files(project_root):
+            if is_sharded(project_root):
+                location = CONTEXT_FORGE_ROLES_DIR
+                result = compact_role_files(project_root, dry_run)
+            else:
+                content = context_forge_md_path.read_text(encoding="utf-8")
+                result = compact_context_forge_md(content)
+                if result.changed and not dry_run:
+                    write_if_changed(context_forge_md_path, result.content)
+    except FileNotFoundError:
+        show_error(
+            f"File not found: {CONTEXT_FORGE_MD_PATH}",
+            hint="Run 'context-forge init' first.",
+        )
+        raise typer.Exit(EXIT_FILE_ERROR)
+    except PermissionError as e:
+        show_error(
+            f"Cannot write file: {e.filename}",
+            hint="Check write permissions for the .claude directory.",
+        )
+        raise typer.Exit(EXIT_FILE_ERROR)
+
+    if not result.changed:
+        console.print(f"[dim]{location} is already compact.[/dim]")
+        return
+
+    remove, merge, save = (
+        ("Would remove", "merge", "save")
+        if dry_run
+        else ("[green]Removed[/green]", "merged", "saved")
+    )
+    console.print(
+        f"{remove} {result.removed_rules} duplicate rules and {merge} "
+        f"{result.merged_sections} duplicate role sections: {save} "
+        f"{result.bytes_saved:,} bytes (~{result.tokens_saved:,} tokens)."
+    )
+
+
+# =============================================================================
+# Layout Command
+# =============================================================================
+
+
+@app.command()
+def layout(
+    target: RulesLayout | None = typer.Argument(
+        None, help="Layout to switch to (default: show the current layout)."
+    ),
+) -> None:
+    """Show or change how activation rules are stored.
+
+    'single' keeps every role section in .claude/context-forge.md.
+    'sharded' stores each role in .claude/context-forge/roles/<role>.md,
+    referenced from context-forge.md, so adding rules rewrites only the
+    files of the roles concerned.
+
+    Examples:
+        context-forge layout
+        context-forge layout sharded
+        context-forge layout single
+    """
+    from context_forge_cli.role_shards import (
+        is_sharded,
+        shard_context_forge_md,
+        unshard_context_forge_md,
+    )
+    from context_forge_cli.rule_journal import locked_rule_files
+
+    project_root = Path.cwd()
+    current = RulesLayout.SHARDED if is_sharded(project_root) else RulesLayout.SINGLE
+    if target is None:
+        console.print(f"Layout: {current}", highlight=False)
+        return
+
+    try:
+        with locked_rule_files(project_root):
+            if target == RulesLayout.SHARDED:
+                moved = shard_context_forge_md(project_root)
+                destination = f"{CONTEXT_FORGE_ROLES_DIR}/"
+            elif current == RulesLayout.SHARDED:
+                moved = unshard_context_forge_md(project_root)
+                destination = CONTEXT_FORGE_MD_PATH
+            else:
+                moved, destination = [], ""
+    except ValueError as e:
+        show_error(str(e), hint="Rename the role, or keep the single-file layout.")
+        raise typer.Exit(EXIT_ERROR) from None
+    except OSError as e:
+        show_error(f"Cannot write file: {e.filename} ({e.strerror})")
+        raise typer.Exit(EXIT_FILE_ERROR) from None
+
+    if moved:
+        console.print(
+            f"[green]Moved[/green] {len(moved)} roles to {destination}",
+            highlight=False,
+        )
+    console.print(f"Layout: {target}", highlight=False)
+
+
+# =============================================================================
+# Stats Command
+# =============================================================================
+
+
+@app.command()
+def stats(
+    as_json: bool = typer.Option(False, "--json", help="Print the report as JSON."),
+    max_always_tokens: int | None = typer.Option(
+        None,
+        "--max-always-tokens",
+        min=0,
+        help="Fail if the always-loaded context exceeds this many tokens.",
+    ),
+    max_on_demand_tokens: int | None = typer.Option(
+        None,
+        "--max-on-demand-tokens",
+        min=0,
+        help="Fail if the on-demand context exceeds this many tokens.",
+    ),
+    max_role_tokens: int | None = typer.Option(
+        None,
+        "--max-role-tokens",
+        min=0,
+        help="Fail if any role adds more than this many always-loaded tokens.",
+    ),
+) -> None:
+    """Measure how much context the project adds to every request.
+
+    Always-loaded context is CLAUDE.md with the files it imports (such as
+    .claude/context-forge.md) and the descriptions of commands, skills and
+    agents; their bodies are loaded on demand. Sizes are reported in bytes
+    and approximate tokens, per role, plugin and file.
+
+    Examples:
+        context-forge stats
+        context-forge stats --json
+        context-forge stats --max-always-tokens 8000   # fail CI over budget
+    """
+    import json
+
+    from context_forge_cli.context_stats import collect_context_stats
+
+    project_root = Path.cwd()
+    _fold_pending_rules(project_root)
+    try:
+        context_stats = collect_context_stats(project_root)
+    except OSError as e:
+        show_error(f"Cannot read file: {e.filename} ({e.strerror})")
+        raise typer.Exit(EXIT_FILE_ERROR)
+
+    total = context_stats.total
+    by_role = context_stats.breakdown("role")
+    checks = [
+        ("always-loaded tokens", max_always_tokens, total.always_tokens),
+        ("on-demand tokens", max_on_demand_tokens, total.on_demand_tokens),
+    ]
+    checks += [
+        (f"always-loaded tokens of role '{role}'", max_role_tokens, u.always_tokens)
+        for role, u in by_role.items()
+    ]
+    budgets = [
+        {"name": name, "limit": limit, "actual": actual, "exceeded": actual > limit}
+        for name, limit, actual in checks
+        if limit is not None
+    ]
+    exceeded = [b for b in budgets if b["exceeded"]]
+
+    if as_json:
+        report = context_stats.to_dict()
+        report["budgets"] = budgets
+        typer.echo(json.dumps(report, indent=2, ensure_ascii=False))
+    else:
+        _print_stats(context_stats)
+
+    if exceeded:
+        show_error(
+            "Context budget exceeded: "
+            + "; ".join(f"{b['name']} {b['actual']} > {b['limit']}" for b in exceeded),
+            hint="Run 'context-forge stats' to see which files are the largest.",
+        )
+        raise typer.Exit(EXIT_BUDGET_EXCEEDED)
+
+
+def _print_stats(context_stats: "ContextStats") -> None:
+    """Render a context stats report as tables."""
+    from rich.table import Table
+
+    total = context_stats.total
+    console.print(
+        f"[bold]Always loaded:[/bold] {total.always_bytes:,} bytes, "
+        f"~{total.always_tokens:,} tokens"
+    )
+    console.print(
+        f"[bold]On demand:[/bold] {total.on_demand_bytes:,} bytes, "
+        f"~{total.on_demand_tokens:,} tokens"
+    )
+
+    for title, key in (("Role", "role"), ("Plugin", "plugin"), ("File", "path")):
+        groups = context_stats.breakdown(key)
+        if not groups:
+            continue
+        table = Table(title=f"By {title.lower()}", title_justify="left")
+        table.add_column(title, overflow="fold")
+        table.add_column("Always", justify="right")
+        table.add_column("~Tokens", justify="right")
+        table.add_column("On demand", justify="right")
+        table.add_column("~Tokens", justify="right")
+        for name, usage in groups.items():
+            table.add_row(
+                name,
+                f"{usage.always_bytes:,}",
+                f"{usage.always_tokens:,}",
+                f"{usage.on_demand_bytes:,}",
+                f"{usage.on_demand_tokens:,}",
+            )
+        console.print()
+        console.print(table)
+    console.print("[dim]Always/On demand are bytes; ~Tokens are rough estimates.[/dim]")
+
+
+# =============================================================================
+# Roles Command
+# =============================================================================
+
+roles_app = typer.Typer(
+    help="Inspect the role plugins generated by add-role-knowledge.",
+    no_args_is_help=True,
+)
+app.add_typer(roles_app, name="roles")
+
+
+@roles_app.command("list")
+def list_roles(
+    as_json: bool = typer.Option(
+        False, "--json", help="Print the role plugins as JSON."
+    ),
+) -> None:
+    """List role plugins and count their knowledge items.
+
+    Scans .claude/plugins/context-forge.role-*/ and reads each plugin.json.
+    Unchanged plugins are served from a cache keyed by directory mtimes.
+
+    Examples:
+        context-forge roles list
+        context-forge roles list --json
+    """
+    import json
+
+    from context_forge_cli.role_plugins import scan_role_plugins
+
+    plugins = scan_role_plugins(Path.cwd())
+
+    if as_json:
+        typer.echo(
+            json.dumps([p.to_dict() for p in plugins], indent=2, ensure_ascii=False)
+        )
+        return
+
+    if not plugins:
+        console.print("[dim]No role plugins found in .claude/plugins/.[/dim]")
+        return
+
+    from rich.table import Table
+
+    table = Table()
+    table.add_column("#", justify="right")
+    table.add_column("Role", no_wrap=True)
+    for column in ("Commands", "Agents", "Skills", "Hooks", "Total"):
+        table.add_column(column, justify="right", no_wrap=True)
+    table.add_column("Description", overflow="fold")
+    for number, plugin in enumerate(plugins, 1):
+        table.add_row(
+            str(number),
+            plugin.role,
+            str(plugin.commands),
+            str(plugin.agents),
+            str(plugin.skills),
+            str(plugin.hooks),
+            str(plugin.knowledge_count),
+            plugin.description,
+        )
+    console.print(table)
+    for plugin in plugins:
+        if plugin.error:
+            console.print(f"[yellow]Warning:[/yellow] {plugin.name}: {plugin.error}")
+
+
+# =============================================================================
+# Migrate Command
+# =============================================================================
+
+
+@app.command()
+def migrate(
+    roles: list[str] | None = typer.Argument(
+        None,
+        help="Role names or plugin names to migrate (default: all role plugins).",
+    ),
+    dry_run: bool = typer.Option(
+        False,
+        "--dry-run",
+        "-n",
+        help="Report what would change without writing files.",
+    ),
+    as_json: bool = typer.Option(
+        False, "--json", help="Print the migration report as JSON."
+    ),
+) -> None:
+    """Update role plugins to the current plugin spec.
+
+    Sets plugin.json versions, normalizes command, skill and agent
+    frontmatter and adds missing agent sections. Problems that need judgment,
+    such as missing trigger phrases, are reported for the migrate slash
+    command. Plugins unchanged since their last migration are skipped.
+
+    Examples:
+        context-forge migrate
+        context-forge migrate software-engineer --dry-run
+    """
+    import json
+
+    from context_forge_cli.constants import ROLE_PLUGIN_PREFIX
+    from context_forge_cli.plugin_migration import migrate_plugins
+    from context_forge_cli.role_plugins import find_role_plugins
+
+    project_root = Path.cwd()
+    plugin_dirs = find_role_plugins(project_root)
+    if roles:
+        wanted = {
+            ROLE_PLUGIN_PREFIX + role.removeprefix(ROLE_PLUGIN_PREFIX) for role in roles
+        }
+        missing = wanted - {p.name for p in plugin_dirs}
+        if missing:
+            available = ", ".join(p.name for p in plugin_dirs) or "none"
+            show_error(
+                f"Plugin not found: {', '.join(sorted(missing))}",
+                hint=f"Available plugins: {available}",
+            )
+            raise typer.Exit(EXIT_ERROR)
+        plugin_dirs = [p for p in plugin_dirs if p.name in wanted]
+
+    results = migrate_plugins(project_root, plugin_dirs, dry_run=dry_run)
+    errors = [r for r in results if r.error]
+
+    if as_json:
+        typer.echo(
+            json.dumps([r.to_dict() for r in results], indent=2, ensure_ascii=False)
+        )
+    elif not results:
+        console.print("[dim]No role plugins found in .claude/plugins/.[/dim]")
+    else:
+        verb = "Would update" if dry_run else "[green]Updated[/green]"
+        for result in results:
+            if result.error:
+                console.print(f"[red]Failed[/red] {result.name}: {result.error}")
+                continue
+            if result.migrated:
+                console.print(f"{verb} {result.name}")
+                for change in result.changes:
+                    console.print(f"  - {change}")
+            else:
+                console.print(f"[dim]Current[/dim] {result.name}")
+            for warning in result.warnings:
+                console.print(f"  [yellow]![/yellow] {warning}")
+
+        migrated = sum(r.migrated for r in results)
+        console.print(
+            f"\n{len(results)} plugins: {migrated} "
+            f"{'to update' if dry_run else 'updated'}, "
+            f"{len(results) - migrated - len(errors)} current, {len(errors)} failed."
+        )
+        if any(r.warnings for r in results):
+            console.print(
+                "[dim]Warnings need judgment: run /context-forge.migrate "
+                "in Claude Code to fix them.[/dim]"
+            )
+
+    if errors:
+        raise typer.Exit(EXIT_PARTIAL_FAILURE)
+
+
+# =============================================================================
+# Lint Command
+# =============================================================================
+
+
+@app.command()
+def lint(
+    paths: list[Path] | None = typer.Argument(
+        None, help="Agent files to check (default: agents of all role plugins)."
+    ),
+    fix: bool = typer.Option(
+        False, "--fix", help="Fix placeholders, quoting and missing sections."
+    ),
+    as_json: bool = typer.Option(False, "--json", help="Print the issues as JSON."),
+    jobs: int | None = typer.Option(
+        None,
+        "--jobs",
+        "-j",
+        min=1,
+        help="Number of worker processes (default: CPU count).",
+    ),
+) -> None:
+    """Check Sub Agent files against the add-role-knowledge quality rules.
+
+    Reports placeholders, unquoted variables, git add -A, missing
+    troubleshooting/notes sections and unchecked command results. Files
+    unchanged since they were last checked come from a cache.
+
+    Examples:
+        context-forge lint
+        context-forge lint --fix
+        context-forge lint --json
+    """
+    import json
+
+    from context_forge_cli.agent_lint import find_agent_files, lint_agents
+
+    project_root = Path.cwd()
+    files = list(paths) if paths else find_agent_files(project_root)
+    results = lint_agents(project_root, files, fix=fix, jobs=jobs)
+
+    def relative(path: Path) -> str:
+        try:
+            return path.resolve().relative_to(project_root.resolve()).as_posix()
+        except ValueError:
+            return str(path)
+
+    issue_count = sum(len(r.issues) for r in results)
+    fixable = sum(i.fixable for r in results for i in r.issues)
+    fixed = sum(r.fixed for r in results)
+    errors = [r for r in results if r.error]
+
+    if as_json:
+        report = {
+            "files": [
+                {
+                    "path": relative(r.path),
+                    "issues": [issue.to_dict() for issue in r.issues],
+                    "fixed": r.fixed,
+                    "cached": r.cached,
+                    "error": r.error,
+                }
+                for r in results
+            ],
+            "summary": {
+                "files": len(results),
+                "issues": issue_count,
+                "fixable": fixable,
+                "fixed": fixed,
+                "errors": len(errors),
+            },
+        }
+        typer.echo(json.dumps(report, indent=2, ensure_ascii=False))
+    else:
+        for result in results:
+            if result.error:
+                console.print(f"[red]{relative(result.path)}[/red]: {result.error}")
+            for issue in result.issues:
+                mark = " [cyan]\\[*][/cyan]" if issue.fixable else ""
+                console.print(
+                    f"{relative(result.path)}:{issue.line}: "
+                    f"[bold]{issue.rule.value}[/bold] {issue.message}{mark}",
+                    highlight=False,
+                    soft_wrap=True,
+                )
+        if fixed:
+            console.print(f"[green]Fixed[/green] {fixed} issues.")
+        if issue_count:
+            hint = f" ({fixable} fixable with --fix)" if fixable else ""
+            console.print(
+                f"Found {issue_count} issues in "
+                f"{sum(bool(r.issues) for r in results)} of {len(results)} "
+                f"agent files{hint}."
+            )
+        elif not errors:
+            console.print(f"[green]All {len(results)} agent files passed.[/green]")
+
+    if issue_count or errors:
+        raise typer.Exit(EXIT_ERROR)
+
+
+# =============================================================================
+# Watch Command
+# =============================================================================
+
+
+@app.command()
+def watch(
+    interval: float = typer.Option(
+        0.5, "--interval", "-i", min=0.05, help="Seconds between polls."
+    ),
+    once: bool = typer.Option(
+        False, "--once", help="Check the current state once and exit."
+    ),
+) -> None:
+    """Watch .claude/ and revalidate files as they change.
+
+    Polls CLAUDE.md and .claude/ and, for each changed file, restores the
+    CLAUDE.md reference, rebuilds the role index or lints the changed Sub
+    Agents. The first poll checks everything. Stop with Ctrl+C.
+
+    Examples:
+        context-forge watch
+        context-forge watch --interval 2
+        context-forge watch --once
+    """
+    from context_forge_cli.watcher import Watcher, WatchReport
+
+    project_root = Path.cwd()
+    if not (project_root / ".claude").is_dir():
+        show_error(
+            "No .claude directory in the current directory",
+            hint="Run 'context-forge init' first.",
+        )
+        raise typer.Exit(EXIT_ERROR)
+
+    problems = 0
+
+    def print_report(report: WatchReport) -> None:
+        nonlocal problems
+        problems = len(report.problems)
+        console.print(
+            f"[dim]{len(report.changes)} changed, "
+            f"checked in {report.elapsed_ms:.1f}ms[/dim]"
+        )
+        for message in report.messages:
+            console.print(f"  [green]✓[/green] {message}", highlight=False)
+        for problem in report.problems:
+            console.print(f"  [red]✗[/red] {problem}", highlight=False, soft_wrap=True)
+
+    watcher = Watcher(project_root)
+    if once:
+        watcher.run(print_report, cycles=1)
+        if problems:
+            raise typer.Exit(EXIT_ERROR)
+        return
+
+    console.print(f"Watching {project_root} (Ctrl+C to stop)")
+    try:
+        watcher.run(print_report, interval=interval)
+    except KeyboardInterrupt:
+        console.print("Stopped.")
+
+
+# =============================================================================
+# Store Garbage Collection
+# =============================================================================
+
+
+@app.command()
+def gc(
+    min_age: float = typer.Option(
+        3600.0,
+        "--min-age",
+        min=0,
+        help="Keep blobs used within this many seconds (protects running inits).",
+    ),
+    dry_run: bool = typer.Option(
+        False, "--dry-run", "-n", help="Show what would be removed."
+    ),
+    as_json: bool = typer.Option(False, "--json", help="Print the result as JSON."),
+) -> None:
+    """Remove template store blobs that no project links to.
+
+    The store holds the command files installed with 'init --link'. A blob
+    is removed once no .claude/commands file is a hardlink to it any more.
+
+    Examples:
+        context-forge gc
+        context-forge gc --dry-run
+        context-forge gc --min-age 0 --json
+    """
+    from context_forge_cli.template_store import default_store_path, gc_store
+
+    result = gc_store(default_store_path(), min_age=min_age, dry_run=dry_run)
+
+    if as_json:
+        import json
+
+        typer.echo(json.dumps(result.to_dict(), indent=2, ensure_ascii=False))
+    else:
+        verb = "Would remove" if dry_run else "Removed"
+        console.print(
+            f"{verb} {len(result.removed)} unreferenced blobs "
+            f"({result.freed_bytes / 1024:.1f} KiB) from {result.store}; "
+            f"{result.kept} kept.",
+            highlight=False,
+        )
+        for error in result.errors:
+            console.print(f"[red]Cannot remove[/red] {error}")
+
+    if result.errors:
+        raise typer.Exit(EXIT_ERROR)
+
+
+# =============================================================================
+# Match Command
+# =============================================================================
+
+
+@app.command("match")
+def match_prompt(
+    prompt: str = typer.Argument(
+        ..., help="Prompt to match, or '-' to read it from stdin."
+    ),
+    limit: int | None = typer.Option(
+        None, "--limit", "-n", min=1, help="Show at most this many matches."
+    ),
+    as_json: bool = typer.Option(False, "--json", help="Print the matches as JSON."),
+) -> None:
+    """Show which Skills and SubAgents a prompt would activate.
+
+    Matches the prompt against every trigger phrase (「...」) in the role
+    plugins' skill and agent descriptions and in the activation rules of
+    .claude/context-forge.md. The phrase index is cached and only rebuilt
+    when one of those files changes.
+
+    Examples:
+        context-forge match "このPRをレビューして"
+        context-forge match --json --limit 3 "Reactのベストプラクティスは？"
+        echo "コードレビューお願い" | context-forge match -
+    """
+    import sys
+
+    from context_forge_cli.trigger_index import load_trigger_index
+
+    if prompt == "-":
+        prompt = sys.stdin.read()
+    _fold_pending_rules(Path.cwd())
+    matches = load_trigger_index(Path.cwd()).match(prompt, limit)
+
+    if as_json:
+        import json
+
+        typer.echo(
+            json.dumps([m.to_dict() for m in matches], indent=2, ensure_ascii=False)
+        )
+        return
+
+    if not matches:
+        console.print("[dim]No skill or agent matches the prompt.[/dim]")
+        return
+
+    from rich.table import Table
+
+    table = Table()
+    table.add_column("#", justify="right")
+    table.add_column("Kind", no_wrap=True)
+    table.add_column("Name", no_wrap=True)
+    table.add_column("Role", no_wrap=True)
+    table.add_column("Score", justify="right", no_wrap=True)
+    table.add_column("Phrases", overflow="fold")
+    for number, match in enumerate(matches, 1):
+        table.add_row(
+            str(number),
+            match.kind,
+            match.name,
+            match.role,
+            str(match.score),
+            "、".join(f"「{phrase}」" for phrase in match.phrases),
+        )
+    console.print(table)
+
+
+# =============================================================================
+# Scope Commands
+# =============================================================================
+
+scope_app = typer.Typer(
+    help="Load the rules of some roles only in parts of a monorepo.",
+    no_args_is_help=True,
+)
+app.add_typer(scope_app, name="scope")
+
+
+def _print_scope_sync(result: "ScopeSyncResult") -> None:
+    """Report what a sync moved and linked."""
+    for directory, roles in result.moved.items():
+        console.print(
+            f"[green]Moved[/green] {', '.join(roles)} to "
+            f"{directory}/{CONTEXT_FORGE_MD_PATH}",
+            highlight=False,
+        )
+    for directory in result.linked:
+        console.print(
+            f"[green]Added[/green] context-forge reference to {directory}/CLAUDE.md",
+            highlight=False,
+        )
+    if not result.moved and not result.linked:
+        console.print("[dim]Scoped rules are already in place.[/dim]")
+
+
+@scope_app.command("add")
+def scope_add(
+    directory: Path = typer.Argument(..., help="Subdirectory of the project."),
+    roles: list[str] = typer.Argument(..., help="Roles to load only there."),
+) -> None:
+    """Assign roles to a subdirectory and move their rules there.
+
+    The role sections leave .claude/context-forge.md for
+    DIR/.claude/context-forge.md, which DIR/CLAUDE.md references, so
+    sessions only load them when working under DIR.
+
+    Examples:
+        context-forge scope add frontend frontend-engineer
+        context-forge scope add services/api backend-engineer sre
+    """
+    from context_forge_cli.rule_journal import locked_rule_files
+    from context_forge_cli.scopes import assign_roles
+
+    try:
+        with locked_rule_files(Path.cwd()):
+            result = assign_roles(Path.cwd(), directory, roles)
+    except ValueError as e:
+        show_error(str(e))
+        raise typer.Exit(EXIT_ERROR) from None
+    except OSError as e:
+        show_error(f"Cannot write file: {e.filename} ({e.strerror})")
+        raise typer.Exit(EXIT_FILE_ERROR) from None
+    _print_scope_sync(result)
+
+
+@scope_app.command("remove")
+def scope_remove(
+    directory: Path = typer.Argument(..., help="Subdirectory of the project."),
+    roles: list[str] | None = typer.Argument(
+        None, help="Roles to unassign (default: all roles of the directory)."
+    ),
+) -> None:
+    """Unassign roles from a subdirectory.
+
+    Rules of roles that are no longer scoped anywhere move back to
+    .claude/context-forge.md.
+
+    Examples:
+        context-forge scope remove frontend
+        context-forge scope remove services/api sre
+    """
+    from context_forge_cli.role_shards import is_sharded
+    from context_forge_cli.rule_journal import locked_rule_files
+    from context_forge_cli.scopes import unassign_roles
+
+    try:
+        with locked_rule_files(Path.cwd()):
+            returned = unassign_roles(Path.cwd(), directory, roles or None)
+    except ValueError as e:
+        show_error(str(e), hint="Run 'context-forge scope report' to list scopes.")
+        raise typer.Exit(EXIT_ERROR) from None
+    except OSError as e:
+        show_error(f"Cannot write file: {e.filename} ({e.strerror})")
+        raise typer.Exit(EXIT_FILE_ERROR) from None
+    if returned:
+        sharded = is_sharded(Path.cwd())
+        console.print(
+            f"[green]Moved[/green] {', '.join(returned)} back to "
+            f"{CONTEXT_FORGE_ROLES_DIR if sharded else CONTEXT_FORGE_MD_PATH}",
+            highlight=False,
+        )
+    else:
+        console.print("[green]Unassigned.[/green]")
+
+
+@scope_app.command("sync")
+def scope_sync() -> None:
+    """Move new rules of scoped roles into their directories.
+
+    add-rules and add-role-knowledge write to .claude/context-forge.md;
+    run this afterwards to move the rules of scoped roles on.
+
+    Examples:
+        context-forge scope sync
+    """
+    from context_forge_cli.rule_journal import locked_rule_files
+    from context_forge_cli.scopes import sync_scopes
+
+    try:
+        with locked_rule_files(Path.cwd()):
+            result = sync_scopes(Path.cwd())
+    except ValueError as e:
+        show_error(str(e))
+        raise typer.Exit(EXIT_ERROR) from None
+    except OSError as e:
+        show_error(f"Cannot write file: {e.filename} ({e.strerror})")
+        raise typer.Exit(EXIT_FILE_ERROR) from None
+    _print_scope_sync(result)
+
+
+@scope_app.command("report")
+def show_scope_report(
+    as_json: bool = typer.Option(False, "--json", help="Print the report as JSON."),
+) -> None:
+    """Show the always-loaded rule bytes saved in each directory.
+
+    For the project root and every scoped directory, compares the
+    context-forge rules a session working there loads with what it would
+    load if every rule were in .claude/context-forge.md.
+
+    Examples:
+        context-forge scope report
+        context-forge scope report --json
+    """
+    from context_forge_cli.scopes import scope_report
+
+    try:
+        usages = scope_report(Path.cwd())
+    except ValueError as e:
+        show_error(str(e))
+        raise typer.Exit(EXIT_ERROR) from None
+
+    if as_json:
+        import json
+
+        typer.echo(
+            json.dumps([u.to_dict() for u in usages], indent=2, ensure_ascii=False)
+        )
+        return
+
+    from rich.table import Table
+
+    table = Table()
+    table.add_column("Directory", overflow="fold")
+    table.add_column("Roles", overflow="fold")
+    table.add_column("Always", justify="right")
+    table.add_column("~Tokens", justify="right")
+    table.add_column("Saved", justify="right")
+    table.add_column("~Tokens", justify="right")
+    for usage in usages:
+        table.add_row(
+            usage.directory,
+            ", ".join(usage.roles),
+            f"{usage.always_bytes:,}",
+            f"{usage.always_tokens:,}",
+            f"{usage.saved_bytes:,}",
+            f"{usage.saved_tokens:,}",
+        )
+    console.print(table)
+    console.print(
+        "[dim]Always/Saved are bytes of context-forge rules; "
+        "~Tokens are rough estimates.[/dim]"
+    )
+
+
+# =============================================================================
+# Hook Server Commands
+# =============================================================================
+
+hook_server_app = typer.Typer(
+    help="Run role plugin hook handlers in a long-lived server.",
+    no_args_is_help=True,
+)
+app.add_typer(hook_server_app, name="hook-server")
+
+
+@hook_server_app.command("start")
+def hook_server_start(
+    foreground: bool = typer.Option(
+        False, "--foreground", help="Run in this terminal until Ctrl+C."
+    ),
+) -> None:
+    """Start the hook server of the current project.
+
+    The server imports the hooks/*.py handlers of every role plugin once and
+    runs them for 'context-forge hook-client ROLE/HANDLER' hooks over a Unix
+    socket, instead of a new Python process per tool event.
+
+    Examples:
+        context-forge hook-server start
+        context-forge hook-server start --foreground
+    """
+    from context_forge_cli.hook_server import log_path, serve_hooks, start_server
+
+    try:
+        if foreground:
+            console.print("Serving hooks (Ctrl+C to stop)")
+            try:
+                serve_hooks(Path.cwd())
+            except KeyboardInterrupt:
+                console.print("Stopped.")
+            return
+        status = start_server(Path.cwd())
+    except (RuntimeError, OSError) as e:
+        show_error(str(e), hint="Stop a running server with 'hook-server stop'.")
+        raise typer.Exit(EXIT_ERROR) from None
+
+    console.print(
+        f"[green]Hook server started[/green] (pid {status.pid}, "
+        f"{len(status.handlers)} handlers) on {status.socket}",
+        highlight=False,
+    )
+    console.print(f"[dim]Log: {log_path(Path.cwd())}[/dim]", highlight=False)
+
+
+@hook_server_app.command("stop")
+def hook_server_stop() -> None:
+    """Stop the hook server of the current project.
+
+    Examples:
+        context-forge hook-server stop
+    """
+    from context_forge_cli.hook_server import stop_server
+
+    try:
+        stopped = stop_server(Path.cwd())
+    except RuntimeError as e:
+        show_error(str(e))
+        raise typer.Exit(EXIT_ERROR) from None
+    if stopped:
+        console.print("[green]Hook server stopped.[/green]")
+    else:
+        console.print("[dim]No hook server is running for this project.[/dim]")
+
+
+@hook_server_app.command("status")
+def hook_server_status(
+    as_json: bool = typer.Option(
+        False, "--json", help="Print the status as JSON (null if not running)."
+    ),
+) -> None:
+    """Show whether the hook server runs, and what it has served.
+
+    Exits with status 1 when no server is running.
+
+    Examples:
+        context-forge hook-server status
+        context-forge hook-server status --json
+    """
+    from context_forge_cli.hook_server import server_status
+
+    status = server_status(Path.cwd())
+
+    if as_json:
+        import json
+
+        data = status.to_dict() if status is not None else None
+        typer.echo(json.dumps(data, indent=2, ensure_ascii=False))
+    elif status is None:
+        console.print("[dim]No hook server is running for this project.[/dim]")
+    else:
+        console.print(
+            f"Hook server running (pid {status.pid}, up {status.uptime_s:.0f}s) "
+            f"on {status.socket}\n"
+            f"{status.requests} events served, "
+            f"{status.mean_handler_ms:.2f}ms mean handler time\n"
+            f"Handlers: {', '.join(status.handlers) or '-'}",
+            highlight=False,
+        )
+
+    if status is None:
+        raise typer.Exit(EXIT_ERROR)
+
+
+@app.command(
+    "hook-client",
+    context_settings={"ignore_unknown_options": True},
+)
+def run_hook_handler(
+    handler: str = typer.Argument(
+        ..., help="Handler to run, ROLE/HANDLER (hooks/HANDLER.py of the role)."
+    ),
+) -> None:
+    """Run a role plugin hook handler for the event on stdin.
+
+    Meant for hooks.json: forwards the event to the project's hook server,
+    or runs the handler in-process when no server is running, and exits
+    with the handler's exit code.
+
+    Examples:
+        context-forge hook-client software-engineer/check-commit < event.json
+    """
+    from context_forge_cli.hook_client import main as hook_client_main
+
+    exit_code = hook_client_main([handler])
+    if exit_code:
+        raise typer.Exit(exit_code)
+
+
+# =============================================================================
+# Workspace Mode
+# =============================================================================
+
+
+def _describe_project_result(result: ProjectInitResult) -> str:
+    """Summarize a successful project result in one line."""
+    parts = []
+    created = len(result.created_dirs) + len(result.created_files)
+    if created:
+        parts.append(f"created {created}")
+    if result.updated_files:
+        parts.append(f"updated {len(result.updated_files)}")
+    if result.installed_commands:
+        parts.append(f"installed {len(result.installed_commands)}")
+    if result.unchanged_commands:
+        parts.append(f"unchanged {len(result.unchanged_commands)}")
+    if result.skipped_commands:
+        parts.append(f"skipped {len(result.skipped_commands)}")
+    return ", ".join(parts) or "already initialized"
+
+
+def _init_workspace(
+    workspace: Path,
+    jobs: int | None,
+    skip_install: bool,
+    on_conflict: ConflictPolicy,
+    store: Path | None = None,
+    gitignore: bool = True,
+) -> None:
+    """Initialize every project under a workspace root (init --workspace)."""
+    from context_forge_cli.workspace import find_project_roots, run_workspace_init
+
+    project_roots = find_project_roots(workspace)
+    if not project_roots:
+        show_error(
+            f"No projects found under: {workspace}",
+            hint="Projects are directories containing .git or CLAUDE.md.",
+        )
+        raise typer.Exit(EXIT_ERROR)
+
+    console.print(f"Initializing {len(project_roots)} projects under {workspace}")
+    failed: list[ProjectInitResult] = []
+    legacy: list[ProjectInitResult] = []
+
+    for result in run_workspace_init(
+        project_roots, jobs, skip_install, on_conflict, store, gitignore
+    ):
+        name = result.project_root.relative_to(workspace).as_posix()
+        if result.success:
+            console.print(
+                f"[green]✓[/green] {name} [dim]({_describe_project_result(result)})"
+                "[/dim]"
+            )
+        else:
+            failed.append(result)
+            console.print(f"[red]✗[/red] {name}: {result.error}")
+        if result.has_legacy_settings:
+            legacy.append(result)
+
+    console.print()
+    succeeded = len(project_roots) - len(failed)
+    console.print(
+        f"[bold]Summary:[/bold] {succeeded} succeeded, {len(failed)} failed "
+        f"({len(project_roots)} projects)"
+    )
+    if legacy:
+        console.print(
+            f"[yellow]{len(legacy)} projects have legacy context-forge settings "
+            "in CLAUDE.md; move them to .claude/context-forge.md manually.[/yellow]"
+        )
+
+    if failed:
+        if len(failed) == len(project_roots):
+            raise typer.Exit(EXIT_ERROR)
+        raise typer.Exit(EXIT_PARTIAL_FAILURE)
@@ -0,0 +1,251 @@
+"""Command templates packaged with context-forge and their install models."""
+
+import importlib
+import os
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from context_forge_cli import __version__
+from context_forge_cli.constants import TEMPLATE_PACKS_ENV
+from context_forge_cli.fileio import content_digest
+from context_forge_cli.profiling import count, span
+from context_forge_cli.template_manifest import (
+    TemplateManifestEntry,
+    build_manifest,
+    build_manifest_entry,
+)
+
+if TYPE_CHECKING:
+    from context_forge_cli.template_packs import TemplatePack
+
+# =============================================================================
+# Validation (T033)
+# =============================================================================
+
+# Command name pattern: alphanumeric, hyphens, underscores only
+COMMAND_NAME_PATTERN = re.compile(r"^[a-zA-Z0-9_-]+$")
+COMMAND_NAME_MAX_LENGTH = 64
+
+
+def validate_command_name(name: str) -> str | None:
+    """Validate command name format.
+
+    Args:
+        name: Command name to validate.
+
+    Returns:
+        Error message if invalid, None if valid.
+    """
+    if not name:
+        return "Command name cannot be empty."
+
+    if len(name) > COMMAND_NAME_MAX_LENGTH:
+        return f"Command name too long (max {COMMAND_NAME_MAX_LENGTH} characters)."
+
+    if not COMMAND_NAME_PATTERN.match(name):
+        return (
+            "Command name can only contain letters, numbers, "
+            "hyphens (-), and underscores (_)."
+        )
+
+    return None
+
+
+# =============================================================================
+# Data Models (T005)
+# =============================================================================
+
+
+@dataclass
+class Command:
+    """Represents an installable command template."""
+
+    name: str
+    description: str
+    content: str
+    metadata: dict[str, Any]
+
+
+@dataclass
+class CommandTemplate:
+    """Represents a command template file packaged with context-forge."""
+
+    path: Path
+    command: Command
+    source: str | None = None  # raw file content, when already read
+
+    @property
+    def target_filename(self) -> str:
+        """Generate target filename with context-forge prefix."""
+        return f"context-forge.{self.command.name}.md"
+
+
+@dataclass
+class InstallTarget:
+    """Represents the installation target directory."""
+
+    project_root: Path
+    store: Path | None = None  # shared template store to link from (init --link)
+
+    @property
+    def commands_dir(self) -> Path:
+        """Get the commands directory path."""
+        return self.project_root / ".claude" / "commands"
+
+    @property
+    def exists(self) -> bool:
+        """Check if commands directory exists."""
+        return self.commands_dir.exists()
+
+
+@dataclass
+class InstallResult:
+    """Represents the result of an install operation."""
+
+    success: bool
+    command_name: str
+    target_path: Path
+    overwritten: bool = False
+    skipped: bool = False
+    unchanged: bool = False
+    error: str | None = None
+    link_method: str | None = None  # "hardlink", "reflink" or "copy" with a store
+
+
+# =============================================================================
+# Template Loading (T006)
+# =============================================================================
+
+
+def get_templates_path() -> Path:
+    """Get the path to embedded templates using importlib.resources."""
+    import importlib.resources
+
+    return Path(str(importlib.resources.files("context_forge_cli"))) / "templates"
+
+
+_manifest_cache: dict[str, TemplateManifestEntry] | None = None
+
+
+def get_template_manifest() -> dict[str, TemplateManifestEntry]:
+    """Get the manifest of packaged command templates.
+
+    Uses the manifest generated at build time. In a source tree that was never
+    built, the manifest is built from the template files once per process.
+
+    Returns:
+        Mapping of command name to manifest entry.
+    """
+    global _manifest_cache
+    if _manifest_cache is None:
+        with span("load template manifest"):
+            try:
+                generated = importlib.import_module(
+                    "context_forge_cli._template_manifest"
+                )
+                _manifest_cache = generated.TEMPLATES
+            except ImportError:
+                _manifest_cache = build_manifest(get_templates_path() / "commands")
+    return _manifest_cache
+
+
+def load_template(command_name: str) -> CommandTemplate | None:
+    """Load a command template by name.
+
+    Description, metadata and body offsets come from the template manifest,
+    so the file is read once and its frontmatter is not parsed again. If the
+    file no longer matches the manifest (e.g. edited in a development
+    checkout), it is parsed from scratch instead.
+
+    Commands of registered template packs (see
+    :mod:`context_forge_cli.template_packs`) take precedence over the
+    packaged ones and are read from their archive.
+
+    Args:
+        command_name: Name of the command template to load.
+
+    Returns:
+        CommandTemplate if found, None otherwise.
+        Raises ValueError if a registered template pack cannot be read.
+    """
+    pack = next((p for p in reversed(_registered_packs()) if command_name in p), None)
+    if pack is not None:
+        pack_entry = pack.entry(command_name)
+        data = pack.read(command_name)
+        if pack_entry is None or data is None:
+            return None
+        return _make_template(
+            command_name, pack.member_path(command_name), data, pack_entry
+        )
+
+    entry = get_template_manifest().get(command_name)
+    if entry is None:
+        return None
+
+    template_path = get_templates_path() / "commands" / f"{command_name}.md"
+    try:
+        data = template_path.read_bytes()
+    except FileNotFoundError:
+        return None
+    count("templates read")
+
+    if len(data) != entry["size"] or content_digest(data) != entry["sha256"]:
+        entry = build_manifest_entry(data)
+
+    return _make_template(command_name, template_path, data, entry)
+
+
+def _registered_packs() -> list["TemplatePack"]:
+    """Get the registered template packs; zipfile/tarfile load only if any."""
+    if not os.environ.get(TEMPLATE_PACKS_ENV):
+        return []
+    from context_forge_cli.template_packs import registered_template_packs
+
+    return registered_template_packs()
+
+
+def _make_template(
+    command_name: str, path: Path, data: bytes, entry: TemplateManifestEntry
+) -> CommandTemplate:
+    """Build a CommandTemplate from file content and its manifest entry."""
+    content = data.decode("utf-8")
+    command = Command(
+        name=command_name,
+        description=entry["description"],
+        content=content[entry["body_start"] : entry["body_end"]],
+        metadata=dict(entry["metadata"]),
+    )
+    return CommandTemplate(path=path, command=command, source=content)
+
+
+def list_available_templates() -> list[str]:
+    """List all available command template names.
+
+    Returns:
+        List of command names available for installation: the packaged
+        ones, then those only found in registered template packs.
+        Raises ValueError if a registered template pack cannot be read.
+    """
+    names = list(get_template_manifest())
+    packs = _registered_packs()
+    if packs:
+        packaged = set(names)
+        names += sorted({name for pack in packs for name in pack.commands} - packaged)
+    return names
+
+
+def render_template(template: CommandTemplate) -> str:
+    """Render a template for installation.
+
+    Args:
+        template: Template to render.
+
+    Returns:
+        Template file content with the {{VERSION}} placeholder replaced.
+    """
+    original_content = template.source
+    if original_content is None:
+        original_content = template.path.read_text(encoding="utf-8")
+    return original_content.replace("{{VERSION}}", __version__)
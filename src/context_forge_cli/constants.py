@@ -0,0 +1,58 @@
+"""Shared constants for context-forge.
+
+This module must stay free of heavy imports: it is loaded on the CLI fast
+path and by every helper module.
+"""
+
+# Exit codes
+EXIT_SUCCESS = 0
+EXIT_ERROR = 1
+EXIT_FILE_ERROR = 2
+EXIT_USER_CANCEL = 3
+EXIT_PARTIAL_FAILURE = 4  # Workspace mode: some projects failed
+EXIT_BUDGET_EXCEEDED = 5  # stats: a context budget was exceeded
+
+# CLAUDE.md reference markers for context-forge settings
+CLAUDE_MD_START_MARKER = "<!-- context-forge settings -->"
+CLAUDE_MD_END_MARKER = "<!-- end context-forge settings -->"
+CONTEXT_FORGE_MD_REFERENCE = "@.claude/context-forge.md"
+CONTEXT_FORGE_MD_PATH = ".claude/context-forge.md"
+CONTEXT_FORGE_INDEX_PATH = ".claude/context-forge.index.json"
+# Rule additions not yet folded into context-forge.md, and the lock that
+# serializes rewrites of the rule files
+RULE_JOURNAL_PATH = ".claude/context-forge.journal"
+RULES_LOCK_PATH = ".claude/context-forge.lock"
+# Sharded layout: one file per role, referenced from context-forge.md
+CONTEXT_FORGE_ROLES_DIR = ".claude/context-forge/roles"
+
+# Role section markers for context-forge.md parsing
+ROLE_HEADER_PREFIX = "### "
+ROLE_HEADER_SUFFIX = " ロール"
+
+# Role plugins generated by add-role-knowledge
+PLUGINS_DIR = ".claude/plugins"
+ROLE_PLUGIN_PREFIX = "context-forge.role-"
+ROLE_PLUGINS_CACHE_PATH = ".claude/context-forge.roles.json"
+MIGRATE_STATE_PATH = ".claude/context-forge.migrate.json"
+LINT_CACHE_PATH = ".claude/context-forge.lint.json"
+TRIGGER_INDEX_PATH = ".claude/context-forge.triggers.json"
+
+# Caches and runtime files under .claude/ that init lists in .claude/.gitignore
+# (the index stores an mtime, so committing it would churn on every checkout)
+CLAUDE_GITIGNORE_PATH = ".claude/.gitignore"
+GITIGNORE_COMMENT = "# context-forge caches and runtime files"
+GENERATED_PATHS = (
+    CONTEXT_FORGE_INDEX_PATH,
+    ROLE_PLUGINS_CACHE_PATH,
+    MIGRATE_STATE_PATH,
+    LINT_CACHE_PATH,
+    TRIGGER_INDEX_PATH,
+    RULES_LOCK_PATH,
+    RULE_JOURNAL_PATH,
+)
+
+# Roles assigned to subdirectories (per-directory context-forge.md shards)
+SCOPES_PATH = ".claude/context-forge.scopes.json"
+
+# Template packs: zip/tar archives of extra command templates
+TEMPLATE_PACKS_ENV = "CONTEXT_FORGE_TEMPLATE_PACKS"
@@ -0,0 +1,652 @@
+""".claude/context-forge.md helpers: role sections and activation rules."""
+
+from collections.abc import Collection, Mapping, Sequence
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from context_forge_cli.constants import (
+    CONTEXT_FORGE_MD_PATH,
+    CONTEXT_FORGE_ROLES_DIR,
+    ROLE_HEADER_PREFIX,
+    ROLE_HEADER_SUFFIX,
+)
+from context_forge_cli.fileio import write_if_changed
+from context_forge_cli.profiling import count
+
+ROLE_SECTION_SEPARATOR = "\n" + ROLE_HEADER_PREFIX
+
+
+@dataclass
+class RoleSection:
+    """Offsets of one role section within the context-forge.md content.
+
+    Offsets are string indices into ``ContextForgeMdContent.full_content``.
+    """
+
+    name: str
+    header_start: int  # start of the "### {role} ロール" line
+    body_start: int  # first character after the header line
+    end: int  # where new rules are inserted: blank line before the next "### " or EOF
+    rules_end: int  # start of the next role header or EOF
+
+
+@dataclass
+class ContextForgeMdContent:
+    """Represents parsed .claude/context-forge.md content."""
+
+    full_content: str
+    roles: Mapping[str, list[str]]  # role_name -> list of activation rules
+    sections: dict[str, RoleSection] = field(default_factory=dict)
+
+    def rule_spans(self, role_name: str) -> list[tuple[int, int]]:
+        """Get the (start, end) offsets of each rule in a role section.
+
+        Computed on demand from the section offsets, so parsing does not pay
+        for per-rule bookkeeping that most callers never use.
+
+        Args:
+            role_name: Role whose rules to locate.
+
+        Returns:
+            Offsets of the stripped rule text, in file order.
+        """
+        section = self.sections.get(role_name)
+        if section is None:
+            return []
+
+        spans: list[tuple[int, int]] = []
+        offset = section.body_start
+        body = self.full_content[section.body_start : section.rules_end]
+        for line in body.split("\n"):
+            rule = line.strip()
+            if rule.startswith("- "):
+                start = offset + line.find("- ")
+                spans.append((start, start + len(rule)))
+            offset += len(line) + 1
+        return spans
+
+
+def _find_header_starts(content: str) -> list[int]:
+    """Find the start offset of every "### " header line."""
+    starts = [0] if content.startswith(ROLE_HEADER_PREFIX) else []
+    idx = content.find(ROLE_SECTION_SEPARATOR)
+    while idx != -1:
+        starts.append(idx + 1)
+        idx = content.find(ROLE_SECTION_SEPARATOR, idx + 1)
+    return starts
+
+
+def parse_context_forge_md(content: str) -> ContextForgeMdContent:
+    """Parse context-forge.md content in a single pass.
+
+    Header lines are located with ``str.find`` and only the text between
+    them is split into lines, so text before the first role is never
+    examined line by line. Role sections start at a ``### {role-name} ロール``
+    header; their rules are the ``- `` lines up to the next role header,
+    while new rules are inserted before the next ``### `` header of any kind.
+    When a role header appears more than once, ``roles`` holds the rules of
+    all its sections in file order and ``sections`` the offsets of the
+    first, where rules are added.
+
+    Args:
+        content: Raw context-forge.md content.
+
+    Returns:
+        ContextForgeMdContent with rules and per-role offsets.
+    """
+    roles: dict[str, list[str]] = {}
+    sections: dict[str, RoleSection] = {}
+    content_length = len(content)
+    header_starts = _find_header_starts(content)
+
+    current_rules: list[str] | None = None
+    current_section: RoleSection | None = None
+    for i, header_start in enumerate(header_starts):
+        header_end = content.find("\n", header_start)
+        if header_end == -1:
+            header_end = content_length
+        next_header = (
+            header_starts[i + 1] if i + 1 < len(header_starts) else content_length + 1
+        )
+
+        # Handle trailing whitespace by stripping the header first
+        header = content[header_start:header_end].rstrip()
+        if header.endswith(ROLE_HEADER_SUFFIX):
+            if current_section is not None:
+                current_section.rules_end = header_start
+
+            # Extract role name by removing prefix and suffix
+            role_name = (
+                header[len(ROLE_HEADER_PREFIX) :]
+                .removesuffix(ROLE_HEADER_SUFFIX)
+                .strip()
+            )
+            current_rules = roles.setdefault(role_name, [])
+            body_start = min(header_end + 1, content_length)
+            end = next_header - 1
+            if end < content_length and (end < body_start or content[end - 1] != "\n"):
+                # No blank line before the next header: inserting before its
+                # "\n" would join the rule to the previous line
+                end = next_header
+            current_section = RoleSection(
+                name=role_name,
+                header_start=header_start,
+                body_start=body_start,
+                end=end,
+                rules_end=content_length,
+            )
+            sections.setdefault(role_name, current_section)
+
+        if current_rules is None or header_end >= content_length:
+            continue
+
+        # Activation rules: "- " lines, surrounding whitespace stripped
+        body = content[header_end + 1 : next_header - 1]
+        current_rules += [
+            line for line in map(str.strip, body.split("\n")) if line[:2] == "- "
+        ]
+
+    return ContextForgeMdContent(full_content=content, roles=roles, sections=sections)
+
+
+def read_context_forge_md(project_root: Path) -> ContextForgeMdContent | None:
+    """Read and parse .claude/context-forge.md content.
+
+    Args:
+        project_root: Path to the project root directory.
+
+    Returns:
+        ContextForgeMdContent if file exists, None if file doesn't exist.
+        In the sharded layout (see :mod:`context_forge_cli.role_shards`) the
+        content is the root file and each role file is read when its rules
+        are first looked up.
+        Raises IOError on permission errors.
+    """
+    context_forge_md_path = project_root / CONTEXT_FORGE_MD_PATH
+
+    if (project_root / CONTEXT_FORGE_ROLES_DIR).is_dir():
+        from context_forge_cli.role_shards import read_sharded_context_forge_md
+
+        return read_sharded_context_forge_md(project_root)
+    if not context_forge_md_path.exists():
+        return None
+
+    content = context_forge_md_path.read_text(encoding="utf-8")
+    count("files read")
+    return parse_context_forge_md(content)
+
+
+def write_context_forge_md(
+    project_root: Path,
+    existing: ContextForgeMdContent | None,
+    role_name: str | None = None,
+    activation_rule: str | None = None,
+) -> bool:
+    """Write or update .claude/context-forge.md content.
+
+    Args:
+        project_root: Path to the project root directory.
+        existing: Existing content, or None to create from template.
+        role_name: Optional role name to add/update activation rule for.
+        activation_rule: Optional activation rule to add for the role.
+
+    Returns:
+        True if file was created/updated successfully.
+        Raises IOError on permission errors.
+    """
+    rules: list[tuple[str, str]] = []
+    if role_name is not None and activation_rule is not None:
+        rules.append((role_name, activation_rule))
+    return write_context_forge_md_rules(project_root, existing, rules)
+
+
+def write_context_forge_md_rules(
+    project_root: Path,
+    existing: ContextForgeMdContent | None,
+    rules: Sequence[tuple[str, str]],
+    compact: bool = False,
+) -> bool:
+    """Add many activation rules to .claude/context-forge.md in one write.
+
+    Rules for existing roles are spliced in at their section offsets and
+    new roles get a section appended at the end of the file, all while
+    building the new content once. In the sharded layout only the files of
+    the roles concerned are written instead (see
+    :func:`context_forge_cli.role_shards.write_role_rules`).
+
+    Args:
+        project_root: Path to the project root directory.
+        existing: Existing content, or None to create from template.
+        rules: (role_name, activation_rule) pairs, applied in order. Rules
+            a role already has are skipped.
+        compact: Also compact the whole file (see compact_context_forge_md).
+
+    Returns:
+        True if file was created/updated successfully.
+        Raises IOError on permission errors, and ValueError in the sharded
+        layout for a role name that cannot be a file name.
+    """
+    if (project_root / CONTEXT_FORGE_ROLES_DIR).is_dir():
+        from context_forge_cli.role_shards import write_role_rules
+
+        write_role_rules(project_root, rules, compact)
+        return True
+
+    context_forge_md_path = project_root / CONTEXT_FORGE_MD_PATH
+
+    # Ensure .claude directory exists
+    context_forge_md_path.parent.mkdir(parents=True, exist_ok=True)
+
+    created = existing is None
+    if existing is None:
+        # Create from template
+        template_content = _get_context_forge_md_template()
+        existing = ContextForgeMdContent(full_content=template_content, roles={})
+    elif any(r in existing.roles and r not in existing.sections for r, _ in rules):
+        # Built by hand without offsets: index it once
+        existing = parse_context_forge_md(existing.full_content)
+
+    if rules:
+        content = _insert_rules(existing, rules)
+    elif created or compact:
+        content = existing.full_content
+    else:
+        return True
+
+    if compact:
+        content = compact_context_forge_md(content).content
+    write_if_changed(context_forge_md_path, content)
+    return True
+
+
+def filter_new_rules(
+    existing: ContextForgeMdContent, rules: Sequence[tuple[str, str]]
+) -> list[tuple[str, str]]:
+    """Drop rules a role already has, in the file or earlier in the batch.
+
+    Rules are compared after :func:`normalize_rule`.
+
+    Args:
+        existing: Parsed content.
+        rules: (role_name, activation_rule) pairs.
+
+    Returns:
+        The pairs that would add a new rule, in input order.
+    """
+    known: dict[str, set[str]] = {}
+    new_rules: list[tuple[str, str]] = []
+    for role_name, rule in rules:
+        if role_name not in known:
+            known[role_name] = {
+                normalize_rule(r) for r in existing.roles.get(role_name, [])
+            }
+        key = normalize_rule(rule)
+        if key not in known[role_name]:
+            known[role_name].add(key)
+            new_rules.append((role_name, rule))
+    return new_rules
+
+
+def _insert_rules(
+    existing: ContextForgeMdContent, rules: Sequence[tuple[str, str]]
+) -> str:
+    """Splice activation rules into the content at the recorded offsets.
+
+    Produces the same result as inserting the rules one at a time, but walks
+    the content once: rules for existing roles are inserted at each section's
+    end in file order, and new role sections are appended after them. Rules
+    the role already has are skipped.
+
+    Args:
+        existing: Parsed content with section offsets.
+        rules: (role_name, activation_rule) pairs.
+
+    Returns:
+        The new file content.
+    """
+    content = existing.full_content
+
+    # Group rules per role, keeping input order within each role
+    rules_by_role: dict[str, list[str]] = {}
+    for role_name, rule in filter_new_rules(existing, rules):
+        rules_by_role.setdefault(role_name, []).append(rule)
+
+    insertions = sorted(
+        (existing.sections[role_name].end, role_name)
+        for role_name in rules_by_role
+        if role_name in existing.sections
+    )
+
+    pieces: list[str] = []
+    eof_pieces: list[str] = []
+    position = 0
+    for end, role_name in insertions:
+        block = "".join(f"{rule}\n" for rule in rules_by_role[role_name])
+        if end >= len(content):
+            # Role section is the last one: append at end of file
+            eof_pieces.append(block)
+        else:
+            # Insert before next section
+            pieces += [content[position:end], block]
+            position = end
+    pieces.append(content[position:])
+
+    # Create new role sections
+    for role_name, role_rules in rules_by_role.items():
+        if role_name not in existing.sections:
+            role_header = f"{ROLE_HEADER_PREFIX}{role_name}{ROLE_HEADER_SUFFIX}"
+            block = "".join(f"{rule}\n" for rule in role_rules)
+            eof_pieces.append(f"\n{role_header}\n\n{block}")
+
+    if eof_pieces and not content.endswith("\n"):
+        pieces.append("\n")
+    return "".join(pieces + eof_pieces)
+
+
+def normalize_rule(rule: str) -> str:
+    """Normalize a rule for duplicate detection.
+
+    Surrounding whitespace is dropped, inner whitespace runs collapse to one
+    space and case is folded, so "- Use X" and "-  use x " are duplicates.
+
+    Args:
+        rule: Activation rule line.
+
+    Returns:
+        Comparison key for the rule.
+    """
+    return " ".join(rule.split()).casefold()
+
+
+@dataclass
+class CompactResult:
+    """Outcome of compacting context-forge.md content."""
+
+    original: str
+    content: str
+    removed_rules: int = 0
+    merged_sections: int = 0
+
+    @property
+    def changed(self) -> bool:
+        """Whether compaction changed the content."""
+        return self.content != self.original
+
+    @property
+    def bytes_saved(self) -> int:
+        """UTF-8 bytes removed from the file."""
+        return len(self.original.encode("utf-8")) - len(self.content.encode("utf-8"))
+
+    @property
+    def tokens_saved(self) -> int:
+        """Approximate tokens removed from the always-loaded context."""
+        from context_forge_cli.context_stats import estimate_tokens
+
+        return estimate_tokens(self.original.encode("utf-8")) - estimate_tokens(
+            self.content.encode("utf-8")
+        )
+
+
+def compact_context_forge_md(content: str) -> CompactResult:
+    """Remove duplicate rules and merge duplicate role sections.
+
+    A rule is a duplicate when it matches an earlier rule of the same role
+    after :func:`normalize_rule`; the first occurrence is kept. When a role
+    header appears more than once, the later sections are folded into the
+    first one: their remaining rules and any manually added lines move to
+    the end of the first section's rules. All other content is kept as is.
+
+    Args:
+        content: Raw context-forge.md content.
+
+    Returns:
+        CompactResult with the new content and what was removed.
+    """
+    # Split into the text before the first role and one segment per role
+    # header, each running to the next role header (as parsing does)
+    role_starts = role_header_starts(content)
+    if not role_starts:
+        return CompactResult(original=content, content=content)
+
+    preamble = content[: role_starts[0][0]]
+    bodies: dict[str, list[str]] = {}  # role -> kept body lines, first section
+    headers: dict[str, str] = {}
+    seen: dict[str, set[str]] = {}
+    order: list[str] = []
+    removed_rules = 0
+    merged_sections = 0
+
+    for i, (start, role_name) in enumerate(role_starts):
+        end = role_starts[i + 1][0] if i + 1 < len(role_starts) else len(content)
+        header, _, body = content[start:end].partition("\n")
+        lines = body.split("\n")
+
+        duplicate_section = role_name in bodies
+        if duplicate_section:
+            merged_sections += 1
+        else:
+            order.append(role_name)
+            headers[role_name] = header
+            bodies[role_name] = []
+            seen[role_name] = set()
+
+        kept: list[str] = []
+        for line in lines:
+            stripped = line.strip()
+            if stripped.startswith("- "):
+                key = normalize_rule(stripped)
+                if key in seen[role_name]:
+                    removed_rules += 1
+                    continue
+                seen[role_name].add(key)
+            kept.append(line)
+
+        if duplicate_section:
+            # Merge rules and manual lines; blank spacing stays with the first
+            extra = [line for line in kept if line.strip()]
+            bodies[role_name] = _append_lines(bodies[role_name], extra)
+        else:
+            bodies[role_name] = kept
+
+    pieces = [preamble]
+    for role_name in order:
+        pieces.append(headers[role_name] + "\n" + "\n".join(bodies[role_name]))
+    compacted = "".join(pieces)
+    if duplicate_section:
+        # The file ended with a merged duplicate: drop the blank lines that
+        # separated it from the section before. The newline is kept even when
+        # the file had none, since the section it ends with now may be a bare
+        # header, which is always written with one (compacting again must not
+        # change the file)
+        compacted = compacted.rstrip("\n") + "\n"
+
+    return CompactResult(
+        original=content,
+        content=compacted,
+        removed_rules=removed_rules,
+        merged_sections=merged_sections,
+    )
+
+
+def _append_lines(lines: list[str], extra: list[str]) -> list[str]:
+    """Insert lines where new rules go in a role section body.
+
+    That is after the last non-blank line before the first non-role ``### ``
+    header, or before the trailing blank lines of the section.
+    """
+    if not extra:
+        return lines
+    last = next(
+        (i for i, line in enumerate(lines) if line.startswith(ROLE_HEADER_PREFIX)),
+        len(lines),
+    )
+    while last > 0 and not lines[last - 1].strip():
+        last -= 1
+    return lines[:last] + extra + lines[last:]
+
+
+def role_header_starts(content: str) -> list[tuple[int, str]]:
+    """Find the start offset and role name of every role header."""
+    role_starts: list[tuple[int, str]] = []
+    for header_start in _find_header_starts(content):
+        header_end = content.find("\n", header_start)
+        header = content[header_start : None if header_end == -1 else header_end]
+        header = header.rstrip()
+        if header.endswith(ROLE_HEADER_SUFFIX):
+            name = header[len(ROLE_HEADER_PREFIX) :].removesuffix(ROLE_HEADER_SUFFIX)
+            role_starts.append((header_start, name.strip()))
+    return role_starts
+
+
+def split_role_sections(
+    content: str, roles: Collection[str]
+) -> tuple[str, dict[str, str]]:
+    """Cut the sections of some roles out of context-forge.md content.
+
+    A section runs from its role header to the next role header, as in
+    parsing. Repeated sections of a role are cut out together and merged
+    (see :func:`compact_context_forge_md`).
+
+    Args:
+        content: Raw context-forge.md content.
+        roles: Roles whose sections to cut out.
+
+    Returns:
+        The remaining content and the section text of each role found, in
+        file order. Every section text starts with the role header and ends
+        with one newline.
+    """
+    role_starts = role_header_starts(content)
+    pieces: list[str] = []
+    cut: dict[str, list[str]] = {}
+    position = 0
+    for i, (start, role_name) in enumerate(role_starts):
+        if role_name not in roles:
+            continue
+        end = role_starts[i + 1][0] if i + 1 < len(role_starts) else len(content)
+        pieces.append(content[position:start])
+        cut.setdefault(role_name, []).append(content[start:end].rstrip("\n") + "\n")
+        position = end
+    if not cut:
+        return content, {}
+
+    pieces.append(content[position:])
+    remaining = "".join(pieces)
+    if position == len(content):
+        # The last section was cut: drop the blank lines that preceded it
+        remaining = remaining.rstrip("\n") + "\n" if remaining.strip() else ""
+    sections = {
+        role_name: compact_context_forge_md("\n".join(texts)).content
+        for role_name, texts in cut.items()
+    }
+    return remaining, sections
+
+
+def merge_role_sections(content: str, sections: Mapping[str, str]) -> str:
+    """Add role sections cut out by :func:`split_role_sections` to content.
+
+    A section of a new role is appended as is. For a role the content
+    already has, only the section's rules are added to the existing section,
+    skipping rules it already has.
+
+    Args:
+        content: Raw context-forge.md content.
+        sections: Section text per role.
+
+    Returns:
+        The new content.
+    """
+    parsed = parse_context_forge_md(content)
+    rules: list[tuple[str, str]] = []
+    appended: list[str] = []
+    for role_name, text in sections.items():
+        if role_name in parsed.sections:
+            role_rules = parse_context_forge_md(text).roles.get(role_name, [])
+            rules += [(role_name, rule) for rule in role_rules]
+        else:
+            appended.append(text)
+    if rules:
+        content = _insert_rules(parsed, rules)
+    for text in appended:
+        if content and not content.endswith("\n\n"):
+            content += "\n" if content.endswith("\n") else "\n\n"
+        content += text
+    return content
+
+
+def load_rule_batch(text: str) -> list[tuple[str, str]]:
+    """Parse a JSON or YAML document of activation rules.
+
+    Accepted shapes are a mapping of role name to a rule or list of rules,
+    or a list of ``{"role": ..., "rule": ...}`` / ``{"role": ..., "rules":
+    [...]}`` entries. Rules are single lines; a missing ``- `` list marker
+    is added.
+
+    Args:
+        text: Document text. JSON is tried first since it is much faster to
+            parse; anything else is read as YAML.
+
+    Returns:
+        (role_name, activation_rule) pairs in document order.
+        Raises ValueError if the document is malformed.
+    """
+    import json
+
+    data: Any
+    try:
+        data = json.loads(text)
+    except json.JSONDecodeError:
+        import yaml
+
+        try:
+            data = yaml.safe_load(text)
+        except yaml.YAMLError as e:
+            raise ValueError(f"Invalid JSON/YAML: {e}") from e
+
+    entries: list[tuple[Any, Any]] = []
+    if isinstance(data, dict):
+        entries = list(data.items())
+    elif isinstance(data, list):
+        for item in data:
+            if not isinstance(item, dict) or "role" not in item:
+                raise ValueError("Each list entry needs a 'role' and a 'rule'.")
+            entries.append((item["role"], item.get("rules", item.get("rule"))))
+    elif data is not None:
+        raise ValueError("Expected a mapping of roles to rules or a list of entries.")
+
+    rules: list[tuple[str, str]] = []
+    for role_name, role_rules in entries:
+        if not isinstance(role_name, str) or not role_name.strip() or "\n" in role_name:
+            raise ValueError(f"Invalid role name: {role_name!r}")
+        if isinstance(role_rules, str):
+            role_rules = [role_rules]
+        if not isinstance(role_rules, list) or not role_rules:
+            raise ValueError(f"Role '{role_name}' has no rules.")
+        for rule in role_rules:
+            if not isinstance(rule, str) or not rule.strip() or "\n" in rule.strip():
+                raise ValueError(f"Invalid rule for role '{role_name}': {rule!r}")
+            rule = rule.strip()
+            if not rule.startswith("- "):
+                rule = f"- {rule}"
+            rules.append((role_name.strip(), rule))
+    return rules
+
+
+def _get_context_forge_md_template() -> str:
+    """Get the template content for context-forge.md.
+
+    Returns:
+        Template string for context-forge.md.
+    """
+    return """# context-forge 設定
+
+このファイルは context-forge によって自動生成されます。
+`add-role-knowledge` コマンド実行時に新しいルールが追記されます。
+手動で追加した内容は保持されます。
+
+## Skill/SubAgent 発動ルール
+
+以下のルールに従って、適切な Skill または SubAgent を使用してください。
+
+"""
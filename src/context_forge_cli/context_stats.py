@@ -0,0 +1,337 @@
+"""Context budget analysis for ``context-forge stats``.
+
+Claude Code loads some project files into every request and others only when
+they are used. This module measures both, in bytes and approximate tokens:
+
+- Always loaded: CLAUDE.md and every file it imports with ``@path`` (such as
+  ``.claude/context-forge.md``), plus the frontmatter (name and description)
+  of installed commands and of role-plugin skills, agents and commands.
+- On demand: the bodies of those commands, skills and agents.
+
+Nothing here prints; the CLI renders the resulting :class:`ContextStats`.
+"""
+
+import os
+import re
+from collections.abc import Iterator
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+from context_forge_cli.constants import (
+    CONTEXT_FORGE_MD_PATH,
+    CONTEXT_FORGE_ROLES_DIR,
+    PLUGINS_DIR,
+    ROLE_PLUGIN_PREFIX,
+)
+from context_forge_cli.context_forge_md import role_header_starts
+
+# Rough token estimate: ~4 ASCII characters per token, while other characters
+# (kana, kanji, ...) are close to one token each.
+ASCII_CHARS_PER_TOKEN = 4
+
+# Claude Code follows @imports at most this many levels deep
+MAX_IMPORT_DEPTH = 5
+
+ALWAYS = "always"
+ON_DEMAND = "on-demand"
+
+# "@path" imports: an @ at the start of a word, followed by a path
+_IMPORT_PATTERN = re.compile(rb"(?<![^\s(\[])@((?:~/|\.{0,2}/)?[\w.\-/]+)")
+
+
+def estimate_tokens(data: bytes) -> int:
+    """Estimate the token count of UTF-8 text.
+
+    Args:
+        data: Text as UTF-8 bytes.
+
+    Returns:
+        Approximate number of tokens.
+    """
+    if data.isascii():
+        return -(-len(data) // ASCII_CHARS_PER_TOKEN)
+    text = data.decode("utf-8", errors="replace")
+    ascii_chars = len(text.encode("ascii", errors="ignore"))
+    non_ascii_chars = len(text) - ascii_chars
+    return -(-ascii_chars // ASCII_CHARS_PER_TOKEN) + non_ascii_chars
+
+
+@dataclass
+class ContextEntry:
+    """Bytes and tokens one file (or part of one) adds to the context."""
+
+    path: str  # relative to the project root when inside it
+    kind: str  # memory, rules, command, skill, agent
+    loading: str  # ALWAYS or ON_DEMAND
+    bytes: int
+    tokens: int
+    role: str | None = None
+    plugin: str | None = None
+
+
+@dataclass
+class Usage:
+    """Bytes and approximate tokens, split by how they are loaded."""
+
+    always_bytes: int = 0
+    always_tokens: int = 0
+    on_demand_bytes: int = 0
+    on_demand_tokens: int = 0
+
+    def add(self, entry: ContextEntry) -> None:
+        """Add an entry to the totals."""
+        if entry.loading == ALWAYS:
+            self.always_bytes += entry.bytes
+            self.always_tokens += entry.tokens
+        else:
+            self.on_demand_bytes += entry.bytes
+            self.on_demand_tokens += entry.tokens
+
+
+@dataclass
+class ContextStats:
+    """Context usage of a project, per file part."""
+
+    project_root: Path
+    entries: list[ContextEntry] = field(default_factory=list)
+
+    @property
+    def total(self) -> Usage:
+        """Totals over every entry."""
+        usage = Usage()
+        for entry in self.entries:
+            usage.add(entry)
+        return usage
+
+    def breakdown(self, key: str) -> dict[str, Usage]:
+        """Group usage by an entry attribute ("path", "role" or "plugin").
+
+        Entries without a role or plugin are left out of those groupings.
+
+        Args:
+            key: ContextEntry attribute to group by.
+
+        Returns:
+            Usage per value, largest always-loaded token count first.
+        """
+        groups: dict[str, Usage] = {}
+        for entry in self.entries:
+            value = getattr(entry, key)
+            if value is not None:
+                groups.setdefault(value, Usage()).add(entry)
+        return dict(
+            sorted(
+                groups.items(),
+                key=lambda item: (-item[1].always_tokens, -item[1].on_demand_tokens),
+            )
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        """Get a JSON-serializable report."""
+        return {
+            "project_root": str(self.project_root),
+            "total": asdict(self.total),
+            "by_role": {k: asdict(v) for k, v in self.breakdown("role").items()},
+            "by_plugin": {k: asdict(v) for k, v in self.breakdown("plugin").items()},
+            "by_file": {k: asdict(v) for k, v in self.breakdown("path").items()},
+        }
+
+
+# =============================================================================
+# Collection
+# =============================================================================
+
+
+def _frontmatter_end(data: bytes) -> int:
+    """Get the offset just past the closing ``---`` of YAML frontmatter (or 0)."""
+    if not data.startswith(b"---"):
+        return 0
+    close = data.find(b"\n---", 3)
+    if close == -1:
+        return 0
+    line_end = data.find(b"\n", close + 4)
+    return len(data) if line_end == -1 else line_end + 1
+
+
+def _relative(project_root: Path, path: Path) -> str:
+    try:
+        return path.relative_to(project_root).as_posix()
+    except ValueError:
+        return str(path)
+
+
+def _split_entries(
+    project_root: Path,
+    path: Path,
+    kind: str,
+    role: str | None = None,
+    plugin: str | None = None,
+) -> list[ContextEntry]:
+    """Measure a command/skill/agent file: frontmatter always, body on demand."""
+    data = path.read_bytes()
+    split = _frontmatter_end(data)
+    name = _relative(project_root, path)
+    parts = [(ALWAYS, data[:split]), (ON_DEMAND, data[split:])]
+    return [
+        ContextEntry(
+            name, kind, loading, len(part), estimate_tokens(part), role, plugin
+        )
+        for loading, part in parts
+        if part
+    ]
+
+
+def _memory_entries(project_root: Path, path: Path, data: bytes) -> list[ContextEntry]:
+    """Measure an always-loaded memory file, splitting rule files by role.
+
+    Rule files are context-forge.md and, in the sharded layout, its role files.
+    Every section of a repeated role header counts toward that role.
+    """
+    name = _relative(project_root, path)
+    if (
+        path != project_root / CONTEXT_FORGE_MD_PATH
+        and path.parent != project_root / CONTEXT_FORGE_ROLES_DIR
+    ):
+        return [ContextEntry(name, "memory", ALWAYS, len(data), estimate_tokens(data))]
+
+    content = data.decode("utf-8", errors="replace")
+    starts = role_header_starts(content)
+    sections: dict[str, list[str]] = {}  # role -> text of each of its sections
+    outside = [content[: starts[0][0]] if starts else content]
+    for i, (start, role_name) in enumerate(starts):
+        end = starts[i + 1][0] if i + 1 < len(starts) else len(content)
+        sections.setdefault(role_name, []).append(content[start:end])
+
+    entries: list[ContextEntry] = []
+    for role_name, texts in sections.items():
+        part = "".join(texts).encode("utf-8")
+        entries.append(
+            ContextEntry(
+                name,
+                "rules",
+                ALWAYS,
+                len(part),
+                estimate_tokens(part),
+                role=role_name,
+                plugin=f"{ROLE_PLUGIN_PREFIX}{role_name}",
+            )
+        )
+
+    rest = "".join(outside).encode("utf-8")
+    if rest:
+        entries.insert(
+            0, ContextEntry(name, "memory", ALWAYS, len(rest), estimate_tokens(rest))
+        )
+    return entries
+
+
+def _iter_imports(data: bytes, base_dir: Path) -> Iterator[Path]:
+    """Yield existing files referenced with ``@path`` in a memory file."""
+    for match in _IMPORT_PATTERN.finditer(data):
+        raw = match.group(1).decode("utf-8", errors="replace").rstrip(".")
+        path = Path(raw).expanduser()
+        if not path.is_absolute():
+            path = base_dir / path
+        if path.is_file():
+            yield path
+
+
+def collect_memory(project_root: Path) -> list[ContextEntry]:
+    """Measure CLAUDE.md and every file it imports, recursively.
+
+    Args:
+        project_root: Path to the project root directory.
+
+    Returns:
+        Always-loaded entries, one per file (context-forge.md per role).
+    """
+    entries: list[ContextEntry] = []
+    root = project_root.resolve()
+    seen: set[Path] = set()
+    pending = [(project_root / "CLAUDE.md", 0)]
+    while pending:
+        path, depth = pending.pop(0)
+        resolved = path.resolve()
+        if resolved in seen or not resolved.is_file():
+            continue
+        seen.add(resolved)
+
+        data = resolved.read_bytes()
+        # Imports are resolved relative to the importing file
+        if depth < MAX_IMPORT_DEPTH:
+            pending += [(p, depth + 1) for p in _iter_imports(data, path.parent)]
+        if resolved.is_relative_to(root):
+            path = project_root / resolved.relative_to(root)
+        entries += _memory_entries(project_root, path, data)
+    return entries
+
+
+def _iter_markdown(directory: Path) -> Iterator[Path]:
+    """Yield the ``*.md`` files directly in a directory, sorted by name."""
+    try:
+        with os.scandir(directory) as it:
+            names = sorted(e.name for e in it if e.name.endswith(".md") and e.is_file())
+    except OSError:
+        return
+    for name in names:
+        yield directory / name
+
+
+def collect_plugins(project_root: Path) -> list[ContextEntry]:
+    """Measure the commands, skills and agents of every project plugin.
+
+    Args:
+        project_root: Path to the project root directory.
+
+    Returns:
+        Entries tagged with their plugin, and with their role for
+        context-forge role plugins.
+    """
+    plugins_dir = project_root / PLUGINS_DIR
+    try:
+        with os.scandir(plugins_dir) as it:
+            plugin_names = sorted(
+                e.name for e in it if e.is_dir() and not e.name.startswith(".")
+            )
+    except OSError:
+        return []
+
+    entries: list[ContextEntry] = []
+    for plugin in plugin_names:
+        plugin_dir = plugins_dir / plugin
+        role = plugin.removeprefix(ROLE_PLUGIN_PREFIX)
+        role_name = role if role != plugin else None
+        for path in _iter_markdown(plugin_dir / "commands"):
+            entries += _split_entries(project_root, path, "command", role_name, plugin)
+        for path in _iter_markdown(plugin_dir / "agents"):
+            entries += _split_entries(project_root, path, "agent", role_name, plugin)
+        try:
+            with os.scandir(plugin_dir / "skills") as it:
+                skill_dirs = sorted(e.path for e in it if e.is_dir())
+        except OSError:
+            skill_dirs = []
+        for skill_dir in skill_dirs:
+            skill = Path(skill_dir) / "SKILL.md"
+            if skill.is_file():
+                entries += _split_entries(
+                    project_root, skill, "skill", role_name, plugin
+                )
+    return entries
+
+
+def collect_context_stats(project_root: Path) -> ContextStats:
+    """Measure the always-loaded and on-demand context of a project.
+
+    Args:
+        project_root: Path to the project root directory.
+
+    Returns:
+        ContextStats with one entry per measured file part.
+        Raises OSError if a file cannot be read.
+    """
+    entries = collect_memory(project_root)
+    for path in _iter_markdown(project_root / ".claude" / "commands"):
+        entries += _split_entries(project_root, path, "command")
+    entries += collect_plugins(project_root)
+    return ContextStats(project_root=project_root, entries=entries)
@@ -0,0 +1,166 @@
+"""Shared file write layer for generated files.
+
+Every file context-forge generates goes through :func:`write_if_changed`:
+identical content is detected from the size and a SHA-256 digest and never
+rewritten (so mtimes, build caches and editor watchers are left alone), and
+real changes are written to a temporary file and renamed into place so
+readers never see a partially written file.
+"""
+
+import contextlib
+import hashlib
+import os
+import secrets
+import shutil
+import stat
+from collections.abc import Callable
+from enum import StrEnum
+from pathlib import Path
+from typing import BinaryIO
+
+from context_forge_cli.profiling import count
+
+
+class WriteOutcome(StrEnum):
+    """What write_if_changed did with a file."""
+
+    CREATED = "created"
+    UPDATED = "updated"
+    UNCHANGED = "unchanged"
+
+
+def content_digest(data: bytes) -> str:
+    """Get the hex SHA-256 digest of some content."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def file_digest(path: Path) -> str:
+    """Get the hex SHA-256 digest of a file, reading it in chunks."""
+    count("files hashed")
+    with path.open("rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+def has_content(path: Path, content: str | bytes, encoding: str = "utf-8") -> bool:
+    """Check whether a file already holds exactly this content.
+
+    Args:
+        path: File to check.
+        content: Expected content; text is encoded with ``encoding``.
+        encoding: Encoding for text content.
+
+    Returns:
+        True if the file exists with the same size and digest.
+    """
+    data = content.encode(encoding) if isinstance(content, str) else content
+    try:
+        size = path.stat().st_size
+    except FileNotFoundError:
+        return False
+    return size == len(data) and file_digest(path) == content_digest(data)
+
+
+def _write_through_temp(
+    path: Path,
+    write: Callable[[BinaryIO], object],
+    fallback: Callable[[], object],
+    mode: int | None,
+) -> None:
+    """Run ``write`` on a temporary file next to ``path``, then rename it."""
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{secrets.token_hex(4)}.tmp")
+    try:
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+    except PermissionError:
+        if not path.exists():
+            raise
+        # Writable file in a read-only directory: fall back to an in-place write
+        fallback()
+        return
+
+    try:
+        with os.fdopen(fd, "wb") as f:
+            write(f)
+        if mode is not None:
+            os.chmod(tmp_path, stat.S_IMODE(mode))
+        os.replace(tmp_path, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(tmp_path)
+        raise
+
+
+def atomic_write_bytes(path: Path, data: bytes, mode: int | None = None) -> None:
+    """Write a file through a temporary file in the same directory.
+
+    Args:
+        path: Destination file.
+        data: Bytes to write.
+        mode: Permission bits for the file. Defaults to 0o666 minus umask,
+            the same as a plain open().
+        Raises OSError if the file cannot be written.
+    """
+    count("files written")
+    _write_through_temp(
+        path, lambda f: f.write(data), lambda: path.write_bytes(data), mode
+    )
+
+
+def atomic_append_bytes(path: Path, data: bytes) -> None:
+    """Append to a file through a temporary copy in the same directory.
+
+    The existing content is streamed into the copy in chunks, so memory use
+    does not grow with the size of the file.
+
+    Args:
+        path: Existing file to extend. Symlinks are followed.
+        data: Bytes to append.
+        Raises OSError if the file cannot be read or written.
+    """
+    if path.is_symlink():
+        path = path.resolve()
+
+    def copy_and_append(f: BinaryIO) -> None:
+        with path.open("rb") as src:
+            shutil.copyfileobj(src, f)
+        f.write(data)
+
+    def append_in_place() -> None:
+        with path.open("ab") as f:
+            f.write(data)
+
+    _write_through_temp(path, copy_and_append, append_in_place, path.stat().st_mode)
+
+
+def write_if_changed(
+    path: Path, content: str | bytes, encoding: str = "utf-8"
+) -> WriteOutcome:
+    """Write a file unless it already holds exactly this content.
+
+    The existing file is only read when its size matches, and then only to
+    compare digests. Symlinks are followed so the link itself is preserved.
+
+    Args:
+        path: Destination file.
+        content: New file content; text is encoded with ``encoding``.
+        encoding: Encoding for text content.
+
+    Returns:
+        WriteOutcome.UNCHANGED if nothing was written, otherwise CREATED or
+        UPDATED. Raises OSError if the file cannot be written.
+    """
+    data = content.encode(encoding) if isinstance(content, str) else content
+    if path.is_symlink():
+        path = path.resolve()
+
+    try:
+        current = path.stat()
+    except FileNotFoundError:
+        atomic_write_bytes(path, data)
+        return WriteOutcome.CREATED
+
+    if current.st_size == len(data) and file_digest(path) == content_digest(data):
+        count("writes skipped (unchanged)")
+        return WriteOutcome.UNCHANGED
+
+    atomic_write_bytes(path, data, mode=current.st_mode)
+    return WriteOutcome.UPDATED
@@ -0,0 +1,194 @@
+"""Client shim between Claude Code hook events and the hook server.
+
+A role plugin hook that is a Python handler is registered in ``hooks.json`` as
+``context-forge hook-client <role>/<handler>``. The package entry point
+routes that command here before anything else is imported, and this module
+imports little beyond C extension modules: it forwards the event on stdin to the
+project's hook server (see :mod:`context_forge_cli.hook_server`) and relays
+the handler's stdout, stderr and exit code, so an event costs one bare
+interpreter start and a socket round trip. When no server is running the
+handler is run in this process instead, so hooks keep working either way.
+
+Wire format, one request per connection:
+
+- request: ``op``, project root and handler name, one per line, then the
+  raw event; the client then shuts down its sending side
+- response: ``"<exit code> <stdout length>\\n"``, then stdout, then stderr,
+  or only ``"wrong-project\\n"`` from the server of another project whose
+  socket name collides with this one's
+
+Whoever can create the socket decides which tool calls a hook approves, so
+the client only connects through a socket directory that belongs to the
+current user, is not a symlink and is closed to group and others (a
+directory under ``/tmp`` may have been created by another user in advance).
+"""
+
+# The _socket C module rather than socket: socket imports enum and selectors,
+# which would double the startup time of the shim
+import _socket
+import hashlib
+import os
+import stat
+import sys
+
+USAGE = "usage: context-forge hook-client ROLE/HANDLER < event.json\n"
+
+# Seconds to wait for the server to answer one event
+REQUEST_TIMEOUT = 60.0
+
+# Response status of a server that serves a different project
+WRONG_PROJECT = b"wrong-project"
+
+
+class UntrustedSocketError(PermissionError):
+    """The socket directory could have been prepared by another user."""
+
+
+class WrongProjectError(ConnectionError):
+    """The server listening on the socket serves a different project."""
+
+
+def project_root_from_env() -> str:
+    """Get the project a hook runs for: ``$CLAUDE_PROJECT_DIR`` or the cwd."""
+    return os.path.realpath(os.environ.get("CLAUDE_PROJECT_DIR") or os.getcwd())
+
+
+def socket_path(project_root: str) -> str:
+    """Get the Unix socket path of a project's hook server.
+
+    Sockets live in a per-user directory under ``$XDG_RUNTIME_DIR`` (or
+    ``$TMPDIR``, ``/tmp``) rather than in the project, since socket paths
+    are limited to about 100 bytes.
+
+    Args:
+        project_root: Real path of the project root directory.
+
+    Returns:
+        ``<runtime dir>/context-forge-<uid>/hooks-<digest>.sock``, the digest
+        being the first 16 hex digits of the SHA-256 of the root.
+    """
+    base = os.environ.get("XDG_RUNTIME_DIR") or os.environ.get("TMPDIR") or "/tmp"
+    uid = os.getuid() if hasattr(os, "getuid") else 0
+    root = project_root.encode("utf-8", "surrogateescape")
+    digest = hashlib.sha256(root).hexdigest()[:16]
+    return os.path.join(base, f"context-forge-{uid}", f"hooks-{digest}.sock")
+
+
+def check_socket_dir(directory: str) -> None:
+    """Make sure that only the current user can place sockets in a directory.
+
+    Args:
+        directory: Directory of a hook server socket.
+        Raises UntrustedSocketError if it is a symlink or not a directory,
+        belongs to another user or grants any permission to group or
+        others, and FileNotFoundError if it does not exist.
+    """
+    info = os.lstat(directory)
+    getuid = getattr(os, "getuid", None)
+    if (
+        not stat.S_ISDIR(info.st_mode)
+        or (getuid is not None and info.st_uid != getuid())
+        or info.st_mode & 0o077
+    ):
+        raise UntrustedSocketError(
+            f"Refusing to use hook server sockets in {directory}: it must be a "
+            "directory owned by the current user with mode 0700"
+        )
+
+
+def request(
+    path: str,
+    op: str,
+    project_root: str,
+    handler: str = "",
+    payload: bytes = b"",
+    timeout: float = REQUEST_TIMEOUT,
+) -> tuple[int, bytes, bytes]:
+    """Send one request to a hook server.
+
+    Args:
+        path: Server socket path.
+        op: "run", "status" or "stop".
+        project_root: Project the request is for; the server rejects others.
+        handler: Handler name for "run".
+        payload: Event for "run".
+        timeout: Seconds to wait for the connection and the response.
+
+    Returns:
+        (exit code, stdout, stderr) of the request.
+        Raises FileNotFoundError or ConnectionRefusedError if no server
+        listens on the socket, UntrustedSocketError if the socket directory
+        is not safe to use (see :func:`check_socket_dir`), WrongProjectError
+        if the server serves another project, NotImplementedError without
+        Unix sockets, and OSError on other failures (the event may have
+        been handled).
+    """
+    if not hasattr(_socket, "AF_UNIX"):
+        raise NotImplementedError("Unix sockets are not supported on this platform")
+    check_socket_dir(os.path.dirname(path))
+    sock = _socket.socket(_socket.AF_UNIX, _socket.SOCK_STREAM)
+    try:
+        sock.settimeout(timeout)
+        sock.connect(path)
+        header = f"{op}\n{project_root}\n{handler}\n"
+        sock.sendall(header.encode("utf-8", "surrogateescape") + payload)
+        sock.shutdown(_socket.SHUT_WR)
+        chunks = []
+        while chunk := sock.recv(65536):
+            chunks.append(chunk)
+    finally:
+        sock.close()
+
+    data = b"".join(chunks)
+    status, _, body = data.partition(b"\n")
+    if status == WRONG_PROJECT:
+        raise WrongProjectError(f"The hook server on {path} is for another project")
+    try:
+        exit_code, stdout_length = map(int, status.split())
+    except ValueError:
+        raise OSError(f"Malformed hook server response: {status[:80]!r}") from None
+    return exit_code, body[:stdout_length], body[stdout_length:]
+
+
+def main(argv: list[str]) -> int:
+    """Run a hook handler for the event on stdin.
+
+    Args:
+        argv: Command line arguments after ``hook-client``.
+
+    Returns:
+        The handler's exit code (2 blocks the tool call in Claude Code).
+    """
+    if len(argv) != 1 or argv[0].startswith("-"):
+        sys.stderr.write(USAGE)
+        return 1
+    handler = argv[0]
+    event = sys.stdin.buffer.read()
+    project_root = project_root_from_env()
+    try:
+        exit_code, stdout, stderr = request(
+            socket_path(project_root), "run", project_root, handler, event
+        )
+    except (
+        FileNotFoundError,
+        ConnectionRefusedError,
+        UntrustedSocketError,
+        WrongProjectError,
+        NotImplementedError,
+    ):
+        # No (usable) server for this project: run the handler here instead
+        from context_forge_cli.hook_server import run_handler
+
+        response = run_handler(project_root, handler, event)
+        exit_code = response.exit_code
+        stdout = response.stdout.encode()
+        stderr = response.stderr.encode()
+    except OSError as e:
+        sys.stderr.write(f"context-forge hook-client: {e}\n")
+        return 1
+
+    sys.stdout.buffer.write(stdout)
+    sys.stdout.flush()
+    sys.stderr.buffer.write(stderr)
+    sys.stderr.flush()
+    return exit_code
@@ -0,0 +1,444 @@
+"""Long-lived server for the Python hook handlers of role plugins.
+
+Claude Code runs every ``"type": "command"`` hook as a new process, so a hook
+written in Python pays interpreter startup and its own imports on every tool
+event. A role plugin can instead ship its hook as a handler module,
+``hooks/<handler>.py`` defining ``handle(event)``, and register it in
+``hooks.json`` as ``context-forge hook-client <role>/<handler>``. The hook
+server imports every handler of the project once, listens on a Unix socket
+and runs handlers for the client shim (:mod:`context_forge_cli.hook_client`)
+as events arrive.
+
+A handler behaves like a hook script: it gets the event (parsed JSON), may
+print to stdout and stderr and may call ``sys.exit(2)`` to block the tool
+call. A returned dict is printed as JSON, a returned string as is. Handlers
+run one at a time, since their output is captured by redirecting
+``sys.stdout`` and ``sys.stderr``, and they are imported again when their
+file changes.
+"""
+
+import contextlib
+import importlib.util
+import io
+import json
+import os
+import re
+import signal
+import socketserver
+import subprocess
+import sys
+import threading
+import time
+import traceback
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from context_forge_cli.constants import PLUGINS_DIR, ROLE_PLUGIN_PREFIX
+from context_forge_cli.hook_client import (
+    WRONG_PROJECT,
+    WrongProjectError,
+    check_socket_dir,
+    request,
+    socket_path,
+)
+
+# Role and handler names: no path separators or leading dots
+_NAME_PART = re.compile(r"^[\w][\w.-]*$")
+
+
+@dataclass
+class HookResponse:
+    """Outcome of one handler run, as a hook command would report it."""
+
+    exit_code: int = 0
+    stdout: str = ""
+    stderr: str = ""
+
+    def to_dict(self) -> dict[str, Any]:
+        """Get the response as JSON-serializable data."""
+        return dict(vars(self))
+
+
+@dataclass
+class HookServerStatus:
+    """State of a running hook server."""
+
+    pid: int
+    project_root: str
+    socket: str
+    uptime_s: float
+    handlers: list[str] = field(default_factory=list)  # loaded so far
+    requests: int = 0
+    mean_handler_ms: float = 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        """Get the status as JSON-serializable data."""
+        return dict(vars(self))
+
+
+# =============================================================================
+# Handlers
+# =============================================================================
+
+
+def handler_path(project_root: Path, name: str) -> Path:
+    """Get the module file of a handler.
+
+    Args:
+        project_root: Path to the project root directory.
+        name: Handler name, ``<role>/<handler>``.
+
+    Returns:
+        ``.claude/plugins/context-forge.role-<role>/hooks/<handler>.py``.
+        Raises ValueError if the name is malformed.
+    """
+    role, _, handler = name.partition("/")
+    if not (_NAME_PART.match(role) and _NAME_PART.match(handler)):
+        raise ValueError(f"Invalid hook handler name {name!r}: expected ROLE/HANDLER")
+    plugin_dir = project_root / PLUGINS_DIR / f"{ROLE_PLUGIN_PREFIX}{role}"
+    return plugin_dir / "hooks" / f"{handler}.py"
+
+
+def find_hook_handlers(project_root: Path) -> list[str]:
+    """List the handler names of every role plugin, sorted.
+
+    Args:
+        project_root: Path to the project root directory.
+
+    Returns:
+        ``<role>/<handler>`` for each ``hooks/*.py`` of a role plugin.
+    """
+    from context_forge_cli.role_plugins import find_role_plugins
+
+    names = []
+    for plugin_dir in find_role_plugins(project_root):
+        role = plugin_dir.name.removeprefix(ROLE_PLUGIN_PREFIX)
+        hooks_dir = plugin_dir / "hooks"
+        names += [f"{role}/{path.stem}" for path in hooks_dir.glob("*.py")]
+    return sorted(names)
+
+
+class HookHandlers:
+    """The handler modules of a project, imported once and run on demand."""
+
+    def __init__(self, project_root: Path) -> None:
+        self.project_root = project_root
+        self._lock = threading.Lock()
+        self._handlers: dict[str, tuple[int, Callable[[Any], Any]]] = {}
+
+    @property
+    def loaded(self) -> list[str]:
+        """Names of the handlers imported so far, sorted."""
+        return sorted(self._handlers)
+
+    def load(self, name: str) -> Callable[[Any], Any]:
+        """Get the ``handle`` function of a handler, importing it if needed.
+
+        The module is imported again when its file's mtime changed.
+
+        Args:
+            name: Handler name, ``<role>/<handler>``.
+
+        Returns:
+            The handler's ``handle`` function.
+            Raises ValueError for a bad name or module, OSError if the file
+            cannot be read, and whatever the module raises while importing.
+        """
+        path = handler_path(self.project_root, name)
+        mtime = path.stat().st_mtime_ns
+        cached = self._handlers.get(name)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+        module_name = "context_forge_hook_" + re.sub(r"\W", "_", name)
+        spec = importlib.util.spec_from_file_location(module_name, path)
+        if spec is None or spec.loader is None:
+            raise ValueError(f"Cannot load hook handler {name}: {path}")
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        handle: Callable[[Any], Any] | None = getattr(module, "handle", None)
+        if not callable(handle):
+            raise ValueError(f"Hook handler {name} does not define handle(event)")
+        self._handlers[name] = (mtime, handle)
+        return handle
+
+    def run(self, name: str, event: bytes) -> HookResponse:
+        """Run a handler on an event.
+
+        Args:
+            name: Handler name, ``<role>/<handler>``.
+            event: Event JSON, as Claude Code writes it to a hook's stdin.
+
+        Returns:
+            HookResponse with the handler's output and exit code: 0 on
+            success, the code passed to ``sys.exit``, or 1 if loading or
+            running the handler failed.
+        """
+        stdout, stderr = io.StringIO(), io.StringIO()
+        exit_code = 0
+        with (
+            self._lock,
+            contextlib.redirect_stdout(stdout),
+            contextlib.redirect_stderr(stderr),
+        ):
+            try:
+                handle = self.load(name)
+                result = handle(json.loads(event) if event.strip() else {})
+                if isinstance(result, str):
+                    stdout.write(result)
+                elif result is not None:
+                    stdout.write(json.dumps(result, ensure_ascii=False))
+            except SystemExit as e:
+                if e.code is None or isinstance(e.code, int):
+                    exit_code = e.code or 0
+                else:
+                    stderr.write(f"{e.code}\n")
+                    exit_code = 1
+            except Exception as e:
+                stderr.write(f"Hook handler {name} failed: ")
+                stderr.write("".join(traceback.format_exception_only(e)))
+                exit_code = 1
+        return HookResponse(exit_code, stdout.getvalue(), stderr.getvalue())
+
+
+def run_handler(project_root: str | Path, name: str, event: bytes) -> HookResponse:
+    """Run a handler once, in this process (the shim's no-server fallback).
+
+    Args:
+        project_root: Path to the project root directory.
+        name: Handler name, ``<role>/<handler>``.
+        event: Event JSON.
+
+    Returns:
+        HookResponse of the run.
+    """
+    return HookHandlers(Path(project_root)).run(name, event)
+
+
+# =============================================================================
+# Server
+# =============================================================================
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    server: "HookServer"
+
+    def handle(self) -> None:
+        data = self.rfile.read()
+        op, root, name, event = (data.split(b"\n", 3) + [b"", b"", b""])[:4]
+        server = self.server
+        if root.decode("utf-8", "surrogateescape") != str(server.project_root):
+            # Two roots with the same socket name: the client runs the
+            # handler itself
+            self.wfile.write(WRONG_PROJECT + b"\n")
+            return
+        if op == b"run":
+            start = time.perf_counter()
+            response = server.handlers.run(name.decode("utf-8", "replace"), event)
+            with server.stats_lock:
+                server.requests += 1
+                server.handler_ms += (time.perf_counter() - start) * 1000
+        elif op == b"status":
+            response = HookResponse(stdout=json.dumps(server.status().to_dict()))
+        elif op == b"stop":
+            response = HookResponse(stdout="stopping\n")
+            threading.Thread(target=server.shutdown, daemon=True).start()
+        else:
+            response = HookResponse(1, "", f"Unknown request: {op[:20]!r}\n")
+
+        stdout = response.stdout.encode()
+        self.wfile.write(f"{response.exit_code} {len(stdout)}\n".encode())
+        self.wfile.write(stdout + response.stderr.encode())
+
+
+class HookServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Unix socket server that runs the hook handlers of one project."""
+
+    daemon_threads = True
+
+    def __init__(self, project_root: Path, path: str) -> None:
+        self.project_root = project_root
+        self.handlers = HookHandlers(project_root)
+        self.started = time.time()
+        self.stats_lock = threading.Lock()
+        self.requests = 0
+        self.handler_ms = 0.0
+        super().__init__(path, _RequestHandler)
+
+    def status(self) -> HookServerStatus:
+        """Describe the server."""
+        with self.stats_lock:
+            requests, handler_ms = self.requests, self.handler_ms
+        return HookServerStatus(
+            pid=os.getpid(),
+            project_root=str(self.project_root),
+            socket=str(self.server_address),
+            uptime_s=round(time.time() - self.started, 3),
+            handlers=self.handlers.loaded,
+            requests=requests,
+            mean_handler_ms=round(handler_ms / requests, 3) if requests else 0.0,
+        )
+
+
+def _project_root(project_root: Path) -> Path:
+    # The client hashes the real path, so the server must use it too
+    return Path(os.path.realpath(project_root))
+
+
+def server_status(project_root: Path) -> HookServerStatus | None:
+    """Ask a project's hook server for its status.
+
+    Args:
+        project_root: Path to the project root directory.
+
+    Returns:
+        HookServerStatus, or None if no server is running.
+    """
+    root = str(_project_root(project_root))
+    try:
+        exit_code, stdout, _ = request(socket_path(root), "status", root, timeout=5)
+    except (OSError, NotImplementedError):
+        return None
+    if exit_code != 0:
+        return None
+    return HookServerStatus(**json.loads(stdout))
+
+
+def serve_hooks(project_root: Path, ready: threading.Event | None = None) -> None:
+    """Run a project's hook server until it is stopped.
+
+    Every handler is imported up front; one that fails to import is
+    reported on stderr and retried when an event needs it. SIGTERM stops
+    the server when it runs in the main thread.
+
+    Args:
+        project_root: Path to the project root directory.
+        ready: Set once the server accepts connections.
+        Raises RuntimeError if a server is already running for the project
+        (or for another project whose socket name collides with its own)
+        and UntrustedSocketError if the socket directory is not the current
+        user's alone.
+    """
+    project_root = _project_root(project_root)
+    path = socket_path(str(project_root))
+    os.makedirs(os.path.dirname(path), mode=0o700, exist_ok=True)
+    check_socket_dir(os.path.dirname(path))
+    try:
+        request(path, "status", str(project_root), timeout=5)
+    except WrongProjectError:
+        raise RuntimeError(
+            f"The hook socket {path} is in use by another project's server"
+        ) from None
+    except (OSError, NotImplementedError):
+        pass  # no server running
+    else:
+        raise RuntimeError(f"A hook server is already running for {project_root}")
+    with contextlib.suppress(FileNotFoundError):
+        os.unlink(path)  # left behind by a server that was killed
+
+    server = HookServer(project_root, path)
+    try:
+        os.chmod(path, 0o600)
+        for name in find_hook_handlers(project_root):
+            try:
+                server.handlers.load(name)
+            except Exception as e:
+                print(f"Cannot load hook handler {name}: {e}", file=sys.stderr)
+        if threading.current_thread() is threading.main_thread():
+            signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+        if ready is not None:
+            ready.set()
+        server.serve_forever()
+    finally:
+        server.server_close()
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(path)
+
+
+# =============================================================================
+# Lifecycle
+# =============================================================================
+
+
+def log_path(project_root: Path) -> Path:
+    """Get the file a background server writes its stderr to."""
+    return Path(socket_path(str(_project_root(project_root)))).with_suffix(".log")
+
+
+def start_server(project_root: Path, timeout: float = 10.0) -> HookServerStatus:
+    """Start a project's hook server in the background.
+
+    Args:
+        project_root: Path to the project root directory.
+        timeout: Seconds to wait for the server to accept connections.
+
+    Returns:
+        Status of the new server.
+        Raises RuntimeError if a server is already running or the new one
+        does not come up, and UntrustedSocketError if the socket directory
+        is not the current user's alone.
+    """
+    project_root = _project_root(project_root)
+    log = log_path(project_root)
+    log.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+    check_socket_dir(str(log.parent))
+    if server_status(project_root) is not None:
+        raise RuntimeError(f"A hook server is already running for {project_root}")
+    with log.open("ab") as log_file:
+        process = subprocess.Popen(
+            [sys.executable, "-m", "context_forge_cli.hook_server", str(project_root)],
+            cwd=project_root,
+            stdin=subprocess.DEVNULL,
+            stdout=log_file,
+            stderr=log_file,
+            start_new_session=True,
+        )
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        status = server_status(project_root)
+        if status is not None:
+            return status
+        if process.poll() is not None:
+            raise RuntimeError(
+                f"Hook server exited with code {process.returncode}; see {log}"
+            )
+        time.sleep(0.02)
+    process.terminate()
+    raise RuntimeError(f"Hook server did not start within {timeout:g}s; see {log}")
+
+
+def stop_server(project_root: Path, timeout: float = 10.0) -> bool:
+    """Stop a project's hook server.
+
+    Args:
+        project_root: Path to the project root directory.
+        timeout: Seconds to wait for the server to exit.
+
+    Returns:
+        True if a server was stopped, False if none was running.
+        Raises RuntimeError if the server does not stop in time.
+    """
+    root = str(_project_root(project_root))
+    path = socket_path(root)
+    try:
+        exit_code, _, stderr = request(path, "stop", root, timeout=timeout)
+    except (OSError, NotImplementedError):
+        return False
+    if exit_code != 0:
+        raise RuntimeError(stderr.decode("utf-8", "replace").strip())
+    deadline = time.monotonic() + timeout
+    while os.path.exists(path):
+        if time.monotonic() > deadline:
+            raise RuntimeError(f"Hook server did not stop within {timeout:g}s")
+        time.sleep(0.02)
+    return True
+
+
+if __name__ == "__main__":
+    try:
+        serve_hooks(Path(sys.argv[1]))
+    except (KeyboardInterrupt, SystemExit):
+        pass
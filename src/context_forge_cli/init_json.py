@@ -0,0 +1,203 @@
+"""Machine-readable ``init --json``.
+
+Orchestration scripts that initialize many repositories want one structured
+result per run, not rich-rendered text. ``context-forge init --json ...`` is
+routed here by the package entry point before typer or rich are imported:
+the options of ``init`` are parsed with argparse and the result is written
+to stdout as a single JSON document::
+
+    {
+      "version": "0.1.0",
+      "projects": [ProjectInitResult.to_dict(), ...],
+      "summary": {"projects": 1, "succeeded": 1, "failed": 0, ...},
+      "error": null,
+      "exit_code": 0
+    }
+
+The typer ``init --json`` option (used by ``--help`` and the test runner)
+produces the same document through :func:`build_init_report`.
+"""
+
+import argparse
+import json
+import os
+import sys
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Any, NoReturn
+
+from context_forge_cli import __version__
+from context_forge_cli.constants import (
+    EXIT_ERROR,
+    EXIT_PARTIAL_FAILURE,
+    EXIT_SUCCESS,
+    TEMPLATE_PACKS_ENV,
+)
+from context_forge_cli.initializer import (
+    ConflictPolicy,
+    ProjectInitResult,
+    init_project,
+)
+
+
+def _report(
+    results: list[ProjectInitResult], error: str | None, exit_code: int
+) -> dict[str, Any]:
+    failed = sum(not r.success for r in results)
+    return {
+        "version": __version__,
+        "projects": [r.to_dict() for r in results],
+        "summary": {
+            "projects": len(results),
+            "succeeded": len(results) - failed,
+            "failed": failed,
+            "installed_commands": sum(len(r.installed_commands) for r in results),
+            "unchanged_commands": sum(len(r.unchanged_commands) for r in results),
+            "skipped_commands": sum(len(r.skipped_commands) for r in results),
+            "failed_commands": sum(len(r.failed_commands) for r in results),
+            "legacy_settings": sum(r.has_legacy_settings for r in results),
+        },
+        "error": error,
+        "exit_code": exit_code,
+    }
+
+
+def build_init_report(
+    project_root: Path,
+    skip_install: bool = False,
+    on_conflict: ConflictPolicy = ConflictPolicy.SKIP,
+    workspace: Path | None = None,
+    jobs: int | None = None,
+    store: Path | None = None,
+    gitignore: bool = True,
+) -> dict[str, Any]:
+    """Initialize a project (or a workspace) and describe the outcome.
+
+    Nothing prompts: PROMPT is treated as SKIP, and legacy CLAUDE.md settings
+    are reported but not migrated.
+
+    Args:
+        project_root: Project to initialize when no workspace is given.
+        skip_install: Skip installation of the available commands.
+        on_conflict: Policy for existing command files with different content.
+        workspace: Initialize every project under this root instead.
+        jobs: Number of worker processes for a workspace.
+        store: Shared template store to hardlink command files from.
+        gitignore: List context-forge's caches in .claude/.gitignore.
+
+    Returns:
+        The JSON report; its ``exit_code`` is the process exit code.
+    """
+    if workspace is None:
+        if jobs is not None:
+            return _report(
+                [], "--jobs can only be used together with --workspace.", EXIT_ERROR
+            )
+        result = init_project(project_root, skip_install, on_conflict, store, gitignore)
+        return _report([result], result.error, result.exit_code)
+
+    from context_forge_cli.workspace import find_project_roots, run_workspace_init
+
+    project_roots = find_project_roots(workspace)
+    if not project_roots:
+        return _report([], f"No projects found under: {workspace}", EXIT_ERROR)
+
+    results = sorted(
+        run_workspace_init(
+            project_roots, jobs, skip_install, on_conflict, store, gitignore
+        ),
+        key=lambda r: r.project_root,
+    )
+    failed = sum(not r.success for r in results)
+    if not failed:
+        exit_code = EXIT_SUCCESS
+    elif failed == len(results):
+        exit_code = EXIT_ERROR
+    else:
+        exit_code = EXIT_PARTIAL_FAILURE
+    error = f"{failed} of {len(results)} projects failed" if failed else None
+    return _report(results, error, exit_code)
+
+
+class _UsageError(Exception):
+    pass
+
+
+class _Parser(argparse.ArgumentParser):
+    """ArgumentParser that raises instead of printing usage and exiting."""
+
+    def error(self, message: str) -> NoReturn:
+        raise _UsageError(message)
+
+
+def _positive_int(value: str) -> int:
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"{value} is smaller than 1")
+    return number
+
+
+def run_init_json(argv: Sequence[str]) -> int:
+    """Run ``init --json`` with the arguments that follow ``init``.
+
+    Args:
+        argv: Command line arguments after ``init`` (including ``--json``).
+
+    Returns:
+        Process exit code. The report (or a usage error) is written to stdout.
+    """
+    parser = _Parser(prog="context-forge init", add_help=False)
+    parser.add_argument("--json", action="store_true")
+    parser.add_argument("--skip-install", "-s", action="store_true")
+    parser.add_argument("--force", "-f", action="store_true")
+    parser.add_argument(
+        "--on-conflict", type=str.lower, choices=[p.value for p in ConflictPolicy]
+    )
+    parser.add_argument("--workspace", "-w", type=Path)
+    parser.add_argument("--jobs", "-j", type=_positive_int)
+    parser.add_argument("--link", action="store_true")
+    parser.add_argument("--no-gitignore", action="store_true")
+    parser.add_argument("--template-pack", type=Path, action="append", default=[])
+
+    try:
+        options = parser.parse_args(argv)
+        workspace = options.workspace
+        if workspace is not None:
+            workspace = workspace.resolve()
+            if not workspace.is_dir():
+                raise _UsageError(f"Workspace is not a directory: {workspace}")
+        if options.template_pack or os.environ.get(TEMPLATE_PACKS_ENV):
+            from context_forge_cli.template_packs import (
+                register_template_pack,
+                registered_template_packs,
+            )
+
+            for pack_path in options.template_pack:
+                register_template_pack(pack_path)
+            registered_template_packs()
+    except (_UsageError, ValueError) as e:
+        report = _report([], str(e), EXIT_ERROR)
+    else:
+        if options.on_conflict is not None:
+            policy = ConflictPolicy(options.on_conflict)
+        elif options.force:
+            policy = ConflictPolicy.IF_CHANGED
+        else:
+            policy = ConflictPolicy.SKIP
+        store = None
+        if options.link:
+            from context_forge_cli.template_store import default_store_path
+
+            store = default_store_path()
+        report = build_init_report(
+            Path.cwd(),
+            options.skip_install,
+            policy,
+            workspace,
+            options.jobs,
+            store,
+            not options.no_gitignore,
+        )
+
+    sys.stdout.write(json.dumps(report, indent=2, ensure_ascii=False) + "\n")
+    return int(report["exit_code"])
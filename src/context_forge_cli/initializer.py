@@ -0,0 +1,431 @@
+"""Non-interactive project initialization steps.
+
+These are the building blocks of ``context-forge init``. The interactive
+single-project command composes them with prompts and rich output, while
+workspace mode runs :func:`init_project` in worker processes, so nothing in
+this module may prompt or print.
+"""
+
+from collections.abc import Callable, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from enum import StrEnum
+from pathlib import Path
+from typing import Any
+
+from context_forge_cli.claude_md import (
+    ClaudeMdContent,
+    read_claude_md,
+    write_claude_md_reference,
+)
+from context_forge_cli.command_templates import (
+    InstallResult,
+    InstallTarget,
+    list_available_templates,
+    load_template,
+    render_template,
+    validate_command_name,
+)
+from context_forge_cli.constants import (
+    CLAUDE_GITIGNORE_PATH,
+    CONTEXT_FORGE_MD_PATH,
+    EXIT_ERROR,
+    EXIT_FILE_ERROR,
+    EXIT_SUCCESS,
+    GENERATED_PATHS,
+    GITIGNORE_COMMENT,
+)
+from context_forge_cli.context_forge_md import write_context_forge_md
+from context_forge_cli.fileio import (
+    WriteOutcome,
+    atomic_write_bytes,
+    has_content,
+    write_if_changed,
+)
+from context_forge_cli.profiling import count, span
+from context_forge_cli.template_store import install_from_store
+
+
+@dataclass
+class ProjectInitResult:
+    """Represents the outcome of initializing a single project."""
+
+    project_root: Path
+    created_dirs: list[Path] = field(default_factory=list)
+    created_files: list[Path] = field(default_factory=list)
+    updated_files: list[Path] = field(default_factory=list)
+    unchanged_files: list[Path] = field(default_factory=list)
+    installed_commands: list[str] = field(default_factory=list)
+    skipped_commands: list[str] = field(default_factory=list)
+    unchanged_commands: list[str] = field(default_factory=list)
+    failed_commands: list[str] = field(default_factory=list)
+    command_errors: dict[str, str] = field(default_factory=dict)
+    has_legacy_settings: bool = False
+    error: str | None = None
+    exit_code: int = EXIT_SUCCESS
+
+    @property
+    def success(self) -> bool:
+        """Whether the project was initialized without errors."""
+        return self.exit_code == EXIT_SUCCESS
+
+    def to_dict(self) -> dict[str, Any]:
+        """Get the result as JSON-serializable data.
+
+        File and directory paths are relative to the project root.
+        """
+
+        def relative(paths: list[Path]) -> list[str]:
+            return [p.relative_to(self.project_root).as_posix() for p in paths]
+
+        return {
+            **vars(self),
+            "project_root": str(self.project_root),
+            "created_dirs": relative(self.created_dirs),
+            "created_files": relative(self.created_files),
+            "updated_files": relative(self.updated_files),
+            "unchanged_files": relative(self.unchanged_files),
+            "success": self.success,
+        }
+
+
+def ensure_project_dirs(project_root: Path) -> list[Path]:
+    """Create the .claude/ and .claude/commands/ directories.
+
+    Args:
+        project_root: Path to the project root directory.
+
+    Returns:
+        Directories that were created (empty if all existed).
+        Raises PermissionError if a directory cannot be created.
+    """
+    created_dirs: list[Path] = []
+    claude_dir = project_root / ".claude"
+    with span("create directories"):
+        for directory in (claude_dir, claude_dir / "commands"):
+            if not directory.exists():
+                directory.mkdir(parents=True)
+                count("directories created")
+                created_dirs.append(directory)
+    return created_dirs
+
+
+def ensure_context_forge_md(project_root: Path) -> bool:
+    """Create .claude/context-forge.md from the template if it is missing.
+
+    Args:
+        project_root: Path to the project root directory.
+
+    Returns:
+        True if the file was created, False if it already existed.
+        Raises IOError on permission errors.
+    """
+    with span("write context-forge.md"):
+        if (project_root / CONTEXT_FORGE_MD_PATH).exists():
+            return False
+        write_context_forge_md(project_root, None)
+        return True
+
+
+def ensure_claude_gitignore(project_root: Path) -> WriteOutcome:
+    """List the files context-forge generates in .claude/.gitignore.
+
+    .claude/ is usually committed, but its caches and runtime files are
+    per-checkout. Entries already in the file are kept and missing ones are
+    appended, so a hand-edited .gitignore survives.
+
+    Args:
+        project_root: Path to the project root directory.
+
+    Returns:
+        WriteOutcome for .claude/.gitignore.
+        Raises IOError on permission errors.
+    """
+    path = project_root / CLAUDE_GITIGNORE_PATH
+    try:
+        content = path.read_text(encoding="utf-8")
+    except FileNotFoundError:
+        content = ""
+    present = {line.strip().lstrip("/") for line in content.splitlines()}
+    missing = [
+        name for name in (Path(p).name for p in GENERATED_PATHS) if name not in present
+    ]
+    if not missing:
+        return WriteOutcome.UNCHANGED
+
+    if content and not content.endswith("\n"):
+        content += "\n"
+    if GITIGNORE_COMMENT not in present:
+        content += ("\n" if content else "") + f"{GITIGNORE_COMMENT}\n"
+    content += "".join(f"{name}\n" for name in missing)
+    with span("write .claude/.gitignore"):
+        return write_if_changed(path, content)
+
+
+def ensure_claude_md_reference(
+    project_root: Path, claude_md: ClaudeMdContent | None
+) -> bool:
+    """Add the context-forge reference to CLAUDE.md unless already present.
+
+    Args:
+        project_root: Path to the project root directory.
+        claude_md: Existing CLAUDE.md content, or None if file doesn't exist.
+
+    Returns:
+        True if CLAUDE.md was created or updated, False if unchanged.
+        Raises IOError on permission errors.
+    """
+    if claude_md is not None and claude_md.has_reference:
+        return False
+    with span("write CLAUDE.md reference"):
+        return write_claude_md_reference(project_root, claude_md)
+
+
+class ConflictPolicy(StrEnum):
+    """What to do when a command file exists with different content."""
+
+    PROMPT = "prompt"  # ask through the confirm callback (interactive init)
+    SKIP = "skip"  # leave the existing file alone
+    OVERWRITE = "overwrite"  # always rewrite, even identical files
+    IF_CHANGED = "if-changed"  # rewrite only files that differ
+    FAIL = "fail"  # report the command as failed
+
+
+def install_command_file(
+    command_name: str,
+    target: InstallTarget,
+    on_conflict: ConflictPolicy,
+    confirm: Callable[[Path], bool] | None = None,
+) -> InstallResult:
+    """Install a single command.
+
+    Args:
+        command_name: Name of the command to install.
+        target: Installation target.
+        on_conflict: Policy for an existing file whose content differs from
+            the rendered template. Identical files are always left alone
+            (reported unchanged) unless the policy is OVERWRITE.
+        confirm: Asked whether to overwrite under the PROMPT policy; without
+            it, PROMPT behaves like SKIP.
+
+    Returns:
+        InstallResult describing what happened.
+    """
+    target_path = target.commands_dir / f"context-forge.{command_name}.md"
+
+    validation_error = validate_command_name(command_name)
+    if validation_error:
+        return InstallResult(
+            success=False,
+            command_name=command_name,
+            target_path=target_path,
+            error=validation_error,
+        )
+
+    try:
+        template = load_template(command_name)
+    except ValueError as e:  # an unreadable template pack
+        return InstallResult(
+            success=False,
+            command_name=command_name,
+            target_path=target_path,
+            error=str(e),
+        )
+    if template is None:
+        return InstallResult(
+            success=False,
+            command_name=command_name,
+            target_path=target_path,
+            error=f"Command '{command_name}' not found.",
+        )
+
+    target_path = target.commands_dir / template.target_filename
+    content = render_template(template)
+    exists = target_path.exists()
+
+    if exists and on_conflict != ConflictPolicy.OVERWRITE:
+        if has_content(target_path, content):
+            link_method = None
+            if target.store is not None:
+                # Identical copies are swapped for links to the shared blob
+                try:
+                    link_method = install_from_store(
+                        target.store, content.encode("utf-8"), target_path
+                    )
+                except OSError:
+                    pass  # the copy already has the right content
+            return InstallResult(
+                success=True,
+                command_name=command_name,
+                target_path=target_path,
+                unchanged=True,
+                link_method=link_method,
+            )
+
+        if on_conflict == ConflictPolicy.FAIL:
+            return InstallResult(
+                success=False,
+                command_name=command_name,
+                target_path=target_path,
+                error=f"File '{target_path}' already exists with different content.",
+            )
+
+        keep = on_conflict == ConflictPolicy.SKIP or (
+            on_conflict == ConflictPolicy.PROMPT
+            and (confirm is None or not confirm(target_path))
+        )
+        if keep:
+            return InstallResult(
+                success=True,
+                command_name=command_name,
+                target_path=target_path,
+                skipped=True,
+            )
+
+    link_method = None
+    try:
+        if target.store is not None:
+            link_method = install_from_store(
+                target.store, content.encode("utf-8"), target_path
+            )
+        elif on_conflict == ConflictPolicy.OVERWRITE:
+            atomic_write_bytes(target_path, content.encode("utf-8"))
+        else:
+            write_if_changed(target_path, content)
+    except OSError as e:
+        return InstallResult(
+            success=False,
+            command_name=command_name,
+            target_path=target_path,
+            error=f"Cannot write file: {target_path} ({e.strerror})",
+        )
+
+    return InstallResult(
+        success=True,
+        command_name=command_name,
+        target_path=target_path,
+        overwritten=exists,
+        link_method=link_method,
+    )
+
+
+def install_commands(
+    command_names: Sequence[str],
+    target: InstallTarget,
+    on_conflict: ConflictPolicy,
+    confirm: Callable[[Path], bool] | None = None,
+    max_workers: int | None = None,
+) -> list[InstallResult]:
+    """Install several commands, concurrently when no prompts are needed.
+
+    Installs are I/O bound (read template, hash target, write), so they run
+    on a thread pool. Under the PROMPT policy they run one at a time so the
+    questions appear in a stable order.
+
+    Args:
+        command_names: Commands to install.
+        target: Installation target.
+        on_conflict: Policy for existing files with different content.
+        confirm: Overwrite question for the PROMPT policy.
+        max_workers: Thread pool size (default: ThreadPoolExecutor's).
+
+    Returns:
+        One InstallResult per command, in the order given.
+    """
+
+    def install(command_name: str) -> InstallResult:
+        with span(f"install {command_name}"):
+            return install_command_file(command_name, target, on_conflict, confirm)
+
+    with span("install commands"):
+        if on_conflict == ConflictPolicy.PROMPT or len(command_names) <= 1:
+            return [install(command_name) for command_name in command_names]
+
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            return list(pool.map(install, command_names))
+
+
+def init_project(
+    project_root: Path,
+    skip_install: bool = False,
+    on_conflict: ConflictPolicy = ConflictPolicy.SKIP,
+    store: Path | None = None,
+    gitignore: bool = True,
+) -> ProjectInitResult:
+    """Initialize one project non-interactively.
+
+    Legacy settings in CLAUDE.md are reported but never migrated, and existing
+    command files are handled according to ``on_conflict``.
+
+    Args:
+        project_root: Path to the project root directory.
+        skip_install: Skip installation of the available commands.
+        on_conflict: Policy for existing command files with different
+            content. PROMPT is treated as SKIP since nothing may prompt here.
+        store: Shared template store to hardlink command files from.
+        gitignore: List context-forge's caches in .claude/.gitignore.
+
+    Returns:
+        ProjectInitResult with the per-project outcome. Errors are recorded
+        on the result instead of being raised.
+    """
+    result = ProjectInitResult(project_root=project_root)
+
+    try:
+        result.created_dirs = ensure_project_dirs(project_root)
+
+        context_forge_md_path = project_root / CONTEXT_FORGE_MD_PATH
+        if ensure_context_forge_md(project_root):
+            result.created_files.append(context_forge_md_path)
+        else:
+            result.unchanged_files.append(context_forge_md_path)
+
+        if gitignore:
+            outcome = ensure_claude_gitignore(project_root)
+            {
+                WriteOutcome.CREATED: result.created_files,
+                WriteOutcome.UPDATED: result.updated_files,
+                WriteOutcome.UNCHANGED: result.unchanged_files,
+            }[outcome].append(project_root / CLAUDE_GITIGNORE_PATH)
+
+        claude_md = read_claude_md(project_root)
+        result.has_legacy_settings = (
+            claude_md is not None and claude_md.has_legacy_settings
+        )
+        claude_md_path = project_root / "CLAUDE.md"
+        if ensure_claude_md_reference(project_root, claude_md):
+            if claude_md is None:
+                result.created_files.append(claude_md_path)
+            else:
+                result.updated_files.append(claude_md_path)
+        else:
+            result.unchanged_files.append(claude_md_path)
+    except OSError as e:
+        result.error = f"{e.strerror or e}: {e.filename or project_root}"
+        result.exit_code = EXIT_FILE_ERROR
+        return result
+
+    if not skip_install:
+        if on_conflict == ConflictPolicy.PROMPT:
+            on_conflict = ConflictPolicy.SKIP
+        target = InstallTarget(project_root=project_root, store=store)
+        install_results = install_commands(
+            list_available_templates(), target, on_conflict
+        )
+        for install_result in install_results:
+            command_name = install_result.command_name
+            if not install_result.success:
+                result.failed_commands.append(command_name)
+                result.command_errors[command_name] = install_result.error or ""
+            elif install_result.skipped:
+                result.skipped_commands.append(command_name)
+            elif install_result.unchanged:
+                result.unchanged_commands.append(command_name)
+            else:
+                result.installed_commands.append(command_name)
+
+        if result.failed_commands:
+            result.error = f"Failed to install: {', '.join(result.failed_commands)}"
+            result.exit_code = EXIT_ERROR
+
+    return result
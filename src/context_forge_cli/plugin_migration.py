@@ -0,0 +1,390 @@
+"""Mechanical migration of role plugins to the current context-forge spec.
+
+The ``migrate`` slash command used to have the assistant re-read every spec
+and plugin file. The deterministic parts now run here:
+
+- ``plugin.json``: ``version`` is set to the running context-forge version.
+- Skill, agent and command frontmatter: CRLF line endings and trailing
+  whitespace are normalized, a missing ``name`` is added from the file name
+  and ``name``/``description`` are moved to the top. Other keys keep their
+  text and order.
+- Agents: missing ``## トラブルシューティング`` and ``## 注意事項`` sections
+  are added from the add-role-knowledge template.
+
+What needs judgment (trigger phrases, descriptions, placeholders in command
+examples, ``hooks.json`` structure) is reported as a warning and left to the
+slash command. A plugin whose ``plugin.json`` version is current and whose
+content hash matches the last migration is skipped without being read
+further; the hashes live in ``.claude/context-forge.migrate.json``.
+"""
+
+import json
+import re
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from context_forge_cli import __version__
+from context_forge_cli.constants import MIGRATE_STATE_PATH, ROLE_PLUGIN_PREFIX
+from context_forge_cli.fileio import content_digest, write_if_changed
+
+# Bump when the migration rules change, so every plugin is migrated again
+STATE_VERSION = 1
+
+# Description endings required by the add-role-knowledge templates
+SKILL_TRIGGER = "について質問・相談した場合に参照すること"
+AGENT_TRIGGER = "と言った場合に"
+
+# Sections every agent must have, with the template's default content
+AGENT_SECTIONS = {
+    "## トラブルシューティング": """\
+### コマンドが失敗する場合
+
+1. エラーメッセージを確認する
+2. 必要な権限があるか確認する
+3. 環境変数が正しく設定されているか確認する
+""",
+    "## 注意事項": """\
+- **ユーザー確認**: 修正を行う前に、必ずユーザーに確認を取ること
+- **`git add -A` 禁止**: 必ず修正ファイルを個別に指定すること
+- **変更確認**: プッシュ前に `git diff --staged` で変更内容を確認すること
+""",
+}
+
+_KEY_LINE = re.compile(r"^([A-Za-z0-9_-]+):")
+_PLACEHOLDER = re.compile(r"<[a-z][a-z0-9_-]*>|(?<![$\w])\{[a-z][a-z0-9_]*\}")
+_GIT_ADD_ALL = re.compile(r"git add (?:-A|\.|--all)(?:\s|$)", re.MULTILINE)
+
+
+@dataclass
+class PluginMigration:
+    """Outcome of migrating one role plugin."""
+
+    name: str  # plugin directory name
+    changes: list[str] = field(default_factory=list)  # "path: what changed"
+    warnings: list[str] = field(default_factory=list)  # "path: what to fix"
+    skipped: bool = False  # already current
+    error: str | None = None
+
+    @property
+    def role(self) -> str:
+        """Get the role name of the plugin."""
+        return self.name.removeprefix(ROLE_PLUGIN_PREFIX)
+
+    @property
+    def migrated(self) -> bool:
+        """Whether any file was (or, in a dry run, would be) changed."""
+        return bool(self.changes) and self.error is None
+
+    def to_dict(self) -> dict[str, Any]:
+        """Get the outcome as JSON-serializable data."""
+        status = "error" if self.error else "migrated" if self.migrated else "current"
+        return {"role": self.role, "status": status, **vars(self)}
+
+
+# =============================================================================
+# File Rules
+# =============================================================================
+
+
+def _frontmatter_blocks(lines: list[str]) -> list[tuple[str | None, list[str]]]:
+    """Group frontmatter lines by top-level key, keeping each block's text."""
+    blocks: list[tuple[str | None, list[str]]] = []
+    for line in lines:
+        match = _KEY_LINE.match(line)
+        if match or not blocks:
+            blocks.append((match.group(1) if match else None, [line]))
+        else:
+            blocks[-1][1].append(line)
+    return blocks
+
+
+def normalize_frontmatter(text: str, name: str) -> tuple[str, list[str], str]:
+    """Normalize the frontmatter of a command, skill or agent file.
+
+    Args:
+        text: File content.
+        name: Default for a missing ``name`` key (file or directory name).
+
+    Returns:
+        The new content, descriptions of what changed, and the description
+        with its line breaks removed ("" if there is none).
+    """
+    changes: list[str] = []
+    if "\r\n" in text:
+        text = text.replace("\r\n", "\n")
+        changes.append("改行コードを LF に統一")
+
+    lines = text.split("\n")
+    close = next((i for i in range(1, len(lines)) if lines[i].rstrip() == "---"), None)
+    if lines[0].rstrip() != "---" or close is None:
+        changes.append("frontmatter を追加")
+        return f"---\nname: {name}\n---\n\n{text}", changes, ""
+
+    frontmatter = [line.rstrip() for line in lines[1:close]]
+    if frontmatter != lines[1:close]:
+        changes.append("frontmatter の行末空白を削除")
+
+    blocks = _frontmatter_blocks(frontmatter)
+    if all(key != "name" for key, _ in blocks):
+        blocks.insert(0, ("name", [f"name: {name}"]))
+        changes.append("name を追加")
+
+    rank = {"name": 0, "description": 1}
+    ordered = sorted(blocks, key=lambda block: rank.get(block[0] or "", 2))
+    if ordered != blocks:
+        changes.append("name/description を先頭に移動")
+
+    description = next(
+        (
+            "".join(line.strip() for line in block)
+            .removeprefix("description:")
+            .lstrip(">|-+ ")
+            for key, block in ordered
+            if key == "description"
+        ),
+        "",
+    )
+    new_lines = ["---", *(line for _, block in ordered for line in block)]
+    return "\n".join(new_lines + lines[close:]), changes, description
+
+
+def migrate_agent_sections(text: str) -> tuple[str, list[str]]:
+    """Add the required agent sections that are missing.
+
+    A missing troubleshooting section goes before an existing notes section;
+    otherwise missing sections are appended in template order.
+
+    Returns:
+        The new content and descriptions of what changed.
+    """
+    changes: list[str] = []
+    headings = {line.rstrip() for line in text.split("\n") if line.startswith("## ")}
+    for heading, default in AGENT_SECTIONS.items():
+        if heading in headings:
+            continue
+        section = f"{heading}\n\n{default}"
+        notes = "\n## 注意事項"
+        position = text.find(notes) if heading != "## 注意事項" else -1
+        if position != -1:
+            text = f"{text[: position + 1]}{section}\n{text[position + 1 :]}"
+        else:
+            text = f"{text.rstrip()}\n\n{section}"
+        changes.append(f"{heading.removeprefix('## ')} セクションを追加")
+    return text, changes
+
+
+def _agent_warnings(text: str, description: str) -> list[str]:
+    """Problems of an agent file that need judgment to fix."""
+    warnings = []
+    if AGENT_TRIGGER not in description:
+        warnings.append("description にトリガー表現がありません")
+    if not re.search(r"^## 実行手順\s*$", text, re.MULTILINE):
+        warnings.append("実行手順 セクションがありません")
+    code = "\n".join(re.findall(r"```[^\n]*\n(.*?)```", text, re.DOTALL))
+    if _PLACEHOLDER.search(code):
+        warnings.append("コマンド例にプレースホルダーが残っています")
+    if _GIT_ADD_ALL.search(code):
+        warnings.append("git add -A / git add . を使用しています")
+    return warnings
+
+
+def _hooks_warnings(data: bytes) -> list[str]:
+    """Structural problems of a hooks.json file."""
+    try:
+        hooks = json.loads(data)
+    except ValueError as e:
+        return [f"JSON として読めません ({e})"]
+    events = hooks.get("hooks") if isinstance(hooks, dict) else None
+    if not isinstance(events, dict):
+        return ['"hooks" オブジェクトがありません']
+    warnings = []
+    for event, groups in events.items():
+        if not isinstance(groups, list) or not all(
+            isinstance(group, dict) and isinstance(group.get("hooks"), list)
+            for group in groups
+        ):
+            warnings.append(f"{event} の構造が不正です")
+    return warnings
+
+
+# =============================================================================
+# Plugins
+# =============================================================================
+
+
+def _plugin_files(plugin_dir: Path) -> list[tuple[str, Path]]:
+    """List the (kind, path) of every file the migration looks at."""
+    files = [("plugin", plugin_dir / ".claude-plugin" / "plugin.json")]
+    for kind in ("commands", "agents"):
+        files += [(kind, path) for path in sorted((plugin_dir / kind).glob("*.md"))]
+    files += [("skills", path) for path in sorted(plugin_dir.glob("skills/*/SKILL.md"))]
+    hooks = plugin_dir / "hooks" / "hooks.json"
+    if hooks.is_file():
+        files.append(("hooks", hooks))
+    return files
+
+
+def _content_hash(plugin_dir: Path, contents: dict[Path, bytes]) -> str:
+    """Hash the plugin's files together with their relative paths."""
+    parts = [
+        f"{path.relative_to(plugin_dir).as_posix()}\0{content_digest(data)}\n"
+        for path, data in sorted(contents.items())
+    ]
+    return content_digest("".join(parts).encode("utf-8"))
+
+
+def migrate_plugin(
+    plugin_dir: Path,
+    state: dict[str, Any] | None = None,
+    dry_run: bool = False,
+) -> tuple[PluginMigration, dict[str, Any] | None]:
+    """Migrate one role plugin.
+
+    Args:
+        plugin_dir: Path to a ``context-forge.role-*`` directory.
+        state: The plugin's entry from the migration state, if any.
+        dry_run: Report changes without writing files.
+
+    Returns:
+        The outcome, and the state entry to record (None after an error).
+    """
+    result = PluginMigration(name=plugin_dir.name)
+    try:
+        files = _plugin_files(plugin_dir)
+        contents = {path: path.read_bytes() for _, path in files}
+        manifest = json.loads(contents[files[0][1]])
+        if not isinstance(manifest, dict):
+            raise ValueError("plugin.json is not a JSON object")
+    except FileNotFoundError as e:
+        result.error = f"File not found: {e.filename}"
+        return result, None
+    except (OSError, ValueError) as e:
+        result.error = f"Cannot read plugin.json: {e}"
+        return result, None
+
+    digest = _content_hash(plugin_dir, contents)
+    if (
+        manifest.get("version") == __version__
+        and state is not None
+        and state.get("version") == __version__
+        and state.get("sha256") == digest
+    ):
+        result.skipped = True
+        result.warnings = list(state.get("warnings", []))
+        return result, state
+
+    updates: dict[Path, str] = {}
+    for kind, path in files[1:]:
+        relative = path.relative_to(plugin_dir).as_posix()
+        if kind == "hooks":
+            hooks_warnings = _hooks_warnings(contents[path])
+            result.warnings += [f"{relative}: {w}" for w in hooks_warnings]
+            continue
+
+        text = contents[path].decode("utf-8", errors="replace")
+        name = path.parent.name if kind == "skills" else path.stem
+        new_text, changes, description = normalize_frontmatter(text, name)
+        warnings = [] if description else ["description がありません"]
+        if kind == "agents":
+            new_text, section_changes = migrate_agent_sections(new_text)
+            changes += section_changes
+            warnings += _agent_warnings(new_text, description)
+        elif kind == "skills" and description and SKILL_TRIGGER not in description:
+            warnings.append("description にトリガー表現がありません")
+
+        if new_text != text:
+            updates[path] = new_text
+        result.changes += [f"{relative}: {change}" for change in changes]
+        result.warnings += [f"{relative}: {warning}" for warning in warnings]
+
+    manifest_path = files[0][1]
+    if manifest.get("version") != __version__:
+        result.changes.append(
+            f".claude-plugin/plugin.json: version {manifest.get('version')} → "
+            f"{__version__}"
+        )
+        manifest["version"] = __version__
+        manifest_text = json.dumps(manifest, indent=2, ensure_ascii=False)
+        updates[manifest_path] = manifest_text + "\n"
+
+    if dry_run:
+        return result, None
+    try:
+        for path, new_text in updates.items():
+            write_if_changed(path, new_text)
+            contents[path] = new_text.encode("utf-8")
+    except OSError as e:
+        result.error = f"Cannot write file: {e.filename} ({e.strerror})"
+        return result, None
+
+    new_state = {
+        "version": __version__,
+        "sha256": _content_hash(plugin_dir, contents),
+        "warnings": result.warnings,
+    }
+    return result, new_state
+
+
+def _load_state(path: Path) -> dict[str, Any]:
+    """Get the per-plugin migration state, or nothing if it is unusable."""
+    try:
+        raw = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(raw, dict) or raw.get("version") != STATE_VERSION:
+        return {}
+    plugins = raw.get("plugins")
+    return plugins if isinstance(plugins, dict) else {}
+
+
+def migrate_plugins(
+    project_root: Path,
+    plugin_dirs: Sequence[Path],
+    dry_run: bool = False,
+    max_workers: int | None = None,
+) -> list[PluginMigration]:
+    """Migrate several role plugins on a thread pool.
+
+    Args:
+        project_root: Path to the project root directory.
+        plugin_dirs: Plugins to migrate (see
+            :func:`~context_forge_cli.role_plugins.find_role_plugins`).
+        dry_run: Report changes without writing files or state.
+        max_workers: Thread pool size (default: ThreadPoolExecutor's).
+
+    Returns:
+        One PluginMigration per plugin, in the order given.
+    """
+    state_path = project_root / MIGRATE_STATE_PATH
+    state = _load_state(state_path)
+
+    def migrate(plugin_dir: Path) -> tuple[PluginMigration, dict[str, Any] | None]:
+        return migrate_plugin(plugin_dir, state.get(plugin_dir.name), dry_run)
+
+    if len(plugin_dirs) <= 1:
+        outcomes = [migrate(plugin_dir) for plugin_dir in plugin_dirs]
+    else:
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            outcomes = list(pool.map(migrate, plugin_dirs))
+
+    if not dry_run:
+        new_state = dict(state)
+        for result, entry in outcomes:
+            if entry is None:
+                new_state.pop(result.name, None)
+            else:
+                new_state[result.name] = entry
+        if new_state != state:
+            text = json.dumps(
+                {"version": STATE_VERSION, "plugins": new_state},
+                indent=2,
+                ensure_ascii=False,
+            )
+            try:
+                write_if_changed(state_path, text + "\n")
+            except OSError:
+                pass  # plugins are just hashed again next time
+    return [result for result, _ in outcomes]
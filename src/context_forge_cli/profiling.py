@@ -0,0 +1,119 @@
+"""Timing spans and I/O counters for ``--profile``.
+
+Library code marks its phases with :func:`span` and its file operations with
+:func:`count`. Both do nothing until :func:`start_profile` is called, so the
+instrumentation stays in place at no measurable cost. Spans may be opened
+from several threads (command installs run on a thread pool); each records
+the thread it ran on and its nesting depth within that thread.
+
+Worker processes (``init --workspace``) are not profiled: their work shows
+up as the span around the whole pool.
+"""
+
+import threading
+import time
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any
+
+
+@dataclass
+class ProfileSpan:
+    """One timed phase."""
+
+    name: str
+    start_ms: float  # since the profile was started
+    duration_ms: float
+    depth: int  # nesting level within its thread
+    thread: str
+
+
+@dataclass
+class Profile:
+    """Spans and counters recorded while profiling was active."""
+
+    started: float = field(default_factory=time.perf_counter)
+    spans: list[ProfileSpan] = field(default_factory=list)
+    counters: Counter[str] = field(default_factory=Counter)
+    total_ms: float = 0.0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+    _local: threading.local = field(default_factory=threading.local, repr=False)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Get the profile as JSON-serializable data."""
+        return {
+            "total_ms": round(self.total_ms, 3),
+            "spans": [
+                {
+                    **vars(s),
+                    "start_ms": round(s.start_ms, 3),
+                    "duration_ms": round(s.duration_ms, 3),
+                }
+                for s in sorted(self.spans, key=lambda s: s.start_ms)
+            ],
+            "counters": dict(sorted(self.counters.items())),
+        }
+
+
+_active: Profile | None = None
+
+
+def start_profile() -> Profile:
+    """Start recording spans and counters.
+
+    Returns:
+        The new active Profile.
+    """
+    global _active
+    _active = Profile()
+    return _active
+
+
+def stop_profile() -> Profile | None:
+    """Stop recording.
+
+    Returns:
+        The Profile that was active, with ``total_ms`` set, or None.
+    """
+    global _active
+    profile, _active = _active, None
+    if profile is not None:
+        profile.total_ms = (time.perf_counter() - profile.started) * 1000
+    return profile
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """Time the enclosed block as a span named ``name`` when profiling."""
+    profile = _active
+    if profile is None:
+        yield
+        return
+
+    depth = getattr(profile._local, "depth", 0)
+    profile._local.depth = depth + 1
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        end = time.perf_counter()
+        profile._local.depth = depth
+        recorded = ProfileSpan(
+            name=name,
+            start_ms=(start - profile.started) * 1000,
+            duration_ms=(end - start) * 1000,
+            depth=depth,
+            thread=threading.current_thread().name,
+        )
+        with profile._lock:
+            profile.spans.append(recorded)
+
+
+def count(name: str, amount: int = 1) -> None:
+    """Add to the counter ``name`` (e.g. "files read") when profiling."""
+    profile = _active
+    if profile is not None:
+        with profile._lock:
+            profile.counters[name] += amount
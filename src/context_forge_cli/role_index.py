@@ -0,0 +1,374 @@
+"""Sidecar role index for .claude/context-forge.md.
+
+``.claude/context-forge.index.json`` records the SHA-256, size and mtime of
+context-forge.md together with, per role, the byte range of its section, its
+rule count and the hashes of its normalized rules. While the index matches the
+file, "does this role/rule exist" is a dictionary lookup and new rules are
+spliced in at the recorded byte offsets without parsing the file. When the
+file was edited by hand the index no longer matches, and it is rebuilt from a
+full parse.
+"""
+
+import json
+import os
+from collections import Counter
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from context_forge_cli.constants import (
+    CONTEXT_FORGE_INDEX_PATH,
+    CONTEXT_FORGE_MD_PATH,
+    CONTEXT_FORGE_ROLES_DIR,
+    ROLE_HEADER_PREFIX,
+    ROLE_HEADER_SUFFIX,
+)
+from context_forge_cli.context_forge_md import (
+    ContextForgeMdContent,
+    filter_new_rules,
+    normalize_rule,
+    parse_context_forge_md,
+    read_context_forge_md,
+    role_header_starts,
+    write_context_forge_md_rules,
+)
+from context_forge_cli.fileio import content_digest, file_digest, write_if_changed
+
+# Bump when the index layout changes; older indexes are rebuilt
+# (2: rule hashes cover every section of a repeated role)
+INDEX_VERSION = 2
+
+
+def rule_hash(rule: str) -> str:
+    """Get the index key of a rule: a short digest of its normalized text."""
+    return content_digest(normalize_rule(rule).encode("utf-8"))[:16]
+
+
+@dataclass
+class RoleIndexEntry:
+    """Byte offsets and rule hashes of one role section.
+
+    Offsets mirror RoleSection, as UTF-8 byte offsets into the file.
+    """
+
+    header_start: int
+    body_start: int
+    end: int  # where new rules are inserted
+    rules_end: int
+    rule_count: int
+    rule_hashes: list[str] = field(default_factory=list)
+    sections: int = 1  # sections with this role's header
+
+
+@dataclass
+class RoleIndex:
+    """Index of the role sections in context-forge.md."""
+
+    sha256: str
+    size: int
+    mtime_ns: int
+    roles: dict[str, RoleIndexEntry] = field(default_factory=dict)
+    version: int = INDEX_VERSION
+
+    def has_role(self, role_name: str) -> bool:
+        """Check whether a role section exists."""
+        return role_name in self.roles
+
+    def has_rule(self, role_name: str, rule: str) -> bool:
+        """Check whether a role already has a rule (after normalization)."""
+        entry = self.roles.get(role_name)
+        return entry is not None and rule_hash(rule) in entry.rule_hashes
+
+
+# =============================================================================
+# Building and Loading
+# =============================================================================
+
+
+def build_role_index(data: bytes, stat: os.stat_result) -> RoleIndex:
+    """Build an index from the full file content.
+
+    Args:
+        data: Raw context-forge.md content.
+        stat: stat() of the file the content was read from.
+
+    Returns:
+        RoleIndex for the content.
+    """
+    content = data.decode("utf-8")
+    parsed = parse_context_forge_md(content)
+
+    # Convert str offsets to byte offsets in one pass over the sections
+    offsets = sorted(
+        {
+            offset
+            for section in parsed.sections.values()
+            for offset in (
+                section.header_start,
+                section.body_start,
+                section.end,
+                section.rules_end,
+            )
+        }
+    )
+    byte_offsets: dict[int, int] = {}
+    position = byte_position = 0
+    for offset in offsets:
+        byte_position += len(content[position:offset].encode("utf-8"))
+        byte_offsets[offset] = byte_position
+        position = offset
+
+    section_counts = Counter(name for _, name in role_header_starts(content))
+    roles: dict[str, RoleIndexEntry] = {}
+    for name, section in parsed.sections.items():
+        # Like _insert_rules, duplicates are judged against the rules of
+        # every section of the role, while rules go into the first section
+        rules = parsed.roles[name]
+        roles[name] = RoleIndexEntry(
+            header_start=byte_offsets[section.header_start],
+            body_start=byte_offsets[section.body_start],
+            end=byte_offsets[section.end],
+            rules_end=byte_offsets[section.rules_end],
+            rule_count=len(rules),
+            rule_hashes=[rule_hash(rule) for rule in rules],
+            sections=section_counts[name],
+        )
+
+    return RoleIndex(
+        sha256=content_digest(data),
+        size=len(data),
+        mtime_ns=stat.st_mtime_ns,
+        roles=roles,
+    )
+
+
+def _parse_index(text: str) -> RoleIndex | None:
+    """Deserialize an index, or None if it is malformed or outdated."""
+    try:
+        raw = json.loads(text)
+        if raw.get("version") != INDEX_VERSION:
+            return None
+        roles = {name: RoleIndexEntry(**entry) for name, entry in raw["roles"].items()}
+        return RoleIndex(
+            sha256=raw["sha256"],
+            size=raw["size"],
+            mtime_ns=raw["mtime_ns"],
+            roles=roles,
+        )
+    except (ValueError, KeyError, TypeError, AttributeError):
+        return None
+
+
+def save_role_index(project_root: Path, index: RoleIndex) -> None:
+    """Write the index next to context-forge.md.
+
+    The index is only a cache, so a file that cannot be written is ignored.
+
+    Args:
+        project_root: Path to the project root directory.
+        index: Index to save.
+    """
+    # vars() rather than asdict(): asdict deep-copies every rule hash
+    raw = {**vars(index), "roles": {k: vars(v) for k, v in index.roles.items()}}
+    text = json.dumps(raw, ensure_ascii=False, separators=(",", ":"))
+    try:
+        write_if_changed(project_root / CONTEXT_FORGE_INDEX_PATH, text + "\n")
+    except OSError:
+        pass
+
+
+def load_role_index(project_root: Path) -> RoleIndex | None:
+    """Get the role index, rebuilding it if context-forge.md changed.
+
+    The index is trusted without reading context-forge.md when the file's
+    size and mtime are unchanged; otherwise its SHA-256 decides. A stale,
+    missing or corrupt index is rebuilt from a full parse and saved.
+
+    Args:
+        project_root: Path to the project root directory.
+
+    Returns:
+        RoleIndex matching the current file, or None if context-forge.md
+        doesn't exist.
+        Raises IOError on permission errors.
+    """
+    context_forge_md_path = project_root / CONTEXT_FORGE_MD_PATH
+    try:
+        stat = context_forge_md_path.stat()
+    except FileNotFoundError:
+        return None
+
+    index_path = project_root / CONTEXT_FORGE_INDEX_PATH
+    try:
+        index = _parse_index(index_path.read_text(encoding="utf-8"))
+    except OSError:
+        index = None
+
+    if index is not None and index.size == stat.st_size:
+        if index.mtime_ns == stat.st_mtime_ns:
+            return index
+        if file_digest(context_forge_md_path) == index.sha256:
+            # Touched but not changed: remember the new mtime
+            index.mtime_ns = stat.st_mtime_ns
+            save_role_index(project_root, index)
+            return index
+
+    index = build_role_index(context_forge_md_path.read_bytes(), stat)
+    save_role_index(project_root, index)
+    return index
+
+
+# =============================================================================
+# Indexed Writes
+# =============================================================================
+
+
+def _splice(
+    data: bytes, index: RoleIndex, rules_by_role: dict[str, list[str]]
+) -> tuple[bytes, list[tuple[int, int]], bool]:
+    """Insert rules at the indexed offsets, as _insert_rules does on text.
+
+    Returns:
+        The new content, the (offset, length) of every insertion inside the
+        file, and whether anything was appended at the end of the file.
+    """
+    insertions = sorted(
+        (index.roles[role_name].end, role_name)
+        for role_name in rules_by_role
+        if role_name in index.roles
+    )
+
+    pieces: list[bytes] = []
+    eof_pieces: list[bytes] = []
+    shifts: list[tuple[int, int]] = []
+    position = 0
+    for end, role_name in insertions:
+        block = "".join(f"{rule}\n" for rule in rules_by_role[role_name]).encode()
+        if end >= len(data):
+            # Role section is the last one: append at end of file
+            eof_pieces.append(block)
+        else:
+            pieces += [data[position:end], block]
+            shifts.append((end, len(block)))
+            position = end
+    pieces.append(data[position:])
+
+    for role_name, role_rules in rules_by_role.items():
+        if role_name not in index.roles:
+            role_header = f"{ROLE_HEADER_PREFIX}{role_name}{ROLE_HEADER_SUFFIX}"
+            lines = "".join(f"{rule}\n" for rule in role_rules)
+            eof_pieces.append(f"\n{role_header}\n\n{lines}".encode())
+
+    if eof_pieces and not data.endswith(b"\n"):
+        pieces.append(b"\n")
+    return b"".join(pieces + eof_pieces), shifts, bool(eof_pieces)
+
+
+def _shift_index(
+    index: RoleIndex, shifts: list[tuple[int, int]], rules_by_role: dict[str, list[str]]
+) -> None:
+    """Move the offsets of an index past insertions made inside the file."""
+
+    def shifted(offset: int, inclusive: bool = True) -> int:
+        return offset + sum(
+            length
+            for at, length in shifts
+            if at < offset or (inclusive and at == offset)
+        )
+
+    for entry in index.roles.values():
+        entry.header_start = shifted(entry.header_start)
+        # Rules go after the header line, so a body starting at the insertion
+        # point keeps its offset
+        entry.body_start = shifted(entry.body_start, inclusive=False)
+        entry.end = shifted(entry.end)
+        entry.rules_end = shifted(entry.rules_end)
+    for role_name, role_rules in rules_by_role.items():
+        entry = index.roles[role_name]
+        entry.rule_count += len(role_rules)
+        entry.rule_hashes += [rule_hash(rule) for rule in role_rules]
+
+
+def add_rules_indexed(
+    project_root: Path,
+    rules: Sequence[tuple[str, str]],
+    compact: bool = False,
+    index: RoleIndex | None = None,
+) -> list[tuple[str, str]]:
+    """Add activation rules to context-forge.md using the role index.
+
+    With a current index, duplicates are found by hash and the rules are
+    spliced in at the recorded byte offsets; the index is then shifted
+    rather than rebuilt. New role sections, rules for the last section and
+    compaction change the end of the file, so the index is rebuilt from the
+    new content instead. Without context-forge.md this behaves like
+    :func:`write_context_forge_md_rules`.
+
+    Args:
+        project_root: Path to the project root directory.
+        rules: (role_name, activation_rule) pairs, applied in order.
+        compact: Also compact the whole file.
+        index: Index just returned by :func:`load_role_index`, to avoid
+            loading it twice.
+
+    Returns:
+        The pairs that were added (rules a role already had are skipped).
+        Raises IOError on permission errors.
+    """
+    context_forge_md_path = project_root / CONTEXT_FORGE_MD_PATH
+    if (project_root / CONTEXT_FORGE_ROLES_DIR).is_dir():
+        # Sharded layout: each role file is small, no index needed
+        existing = read_context_forge_md(project_root)
+        added = filter_new_rules(
+            existing or ContextForgeMdContent(full_content="", roles={}), rules
+        )
+        write_context_forge_md_rules(project_root, existing, added, compact)
+        return added
+    if index is None:
+        index = load_role_index(project_root)
+    data = context_forge_md_path.read_bytes() if index is not None else b""
+    if index is None or compact or len(data) != index.size:
+        existing = read_context_forge_md(project_root)
+        added = filter_new_rules(
+            existing or ContextForgeMdContent(full_content="", roles={}), rules
+        )
+        write_context_forge_md_rules(project_root, existing, added, compact)
+        save_role_index(
+            project_root,
+            build_role_index(
+                context_forge_md_path.read_bytes(), context_forge_md_path.stat()
+            ),
+        )
+        return added
+
+    new_rules: list[tuple[str, str]] = []
+    known: dict[str, set[str]] = {}
+    for role_name, rule in rules:
+        if role_name not in known:
+            entry = index.roles.get(role_name)
+            known[role_name] = set(entry.rule_hashes) if entry is not None else set()
+        key = rule_hash(rule)
+        if key not in known[role_name]:
+            known[role_name].add(key)
+            new_rules.append((role_name, rule))
+    if not new_rules:
+        return []
+
+    rules_by_role: dict[str, list[str]] = {}
+    for role_name, rule in new_rules:
+        rules_by_role.setdefault(role_name, []).append(rule)
+
+    new_data, shifts, appended = _splice(data, index, rules_by_role)
+    write_if_changed(context_forge_md_path, new_data)
+    stat = context_forge_md_path.stat()
+
+    if appended or any(index.roles[r].sections > 1 for r in rules_by_role):
+        # Rules of a repeated role are hashed in file order, not add order
+        index = build_role_index(new_data, stat)
+    else:
+        _shift_index(index, shifts, rules_by_role)
+        index.sha256 = content_digest(new_data)
+        index.size = len(new_data)
+        index.mtime_ns = stat.st_mtime_ns
+    save_role_index(project_root, index)
+    return new_rules
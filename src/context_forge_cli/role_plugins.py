@@ -0,0 +1,221 @@
+"""Scanner for the role plugins generated by add-role-knowledge.
+
+Role plugins live in ``.claude/plugins/context-forge.role-{role}/``. For each
+one, :func:`scan_role_plugins` reads ``.claude-plugin/plugin.json`` and counts
+its commands, agents, skills and hooks. Results are cached in
+``.claude/context-forge.roles.json`` keyed by the mtimes of the plugin's
+directories and JSON files, so an unchanged plugin costs a handful of stat()
+calls instead of a directory walk.
+"""
+
+import json
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from context_forge_cli.constants import (
+    PLUGINS_DIR,
+    ROLE_PLUGIN_PREFIX,
+    ROLE_PLUGINS_CACHE_PATH,
+)
+from context_forge_cli.fileio import write_if_changed
+
+# Bump when the cache layout or the counting rules change
+CACHE_VERSION = 1
+
+# Paths inside a plugin whose mtimes decide whether its cache entry is fresh:
+# adding or removing an item changes its directory's mtime, editing a JSON
+# file changes the file's own
+_STAMP_PATHS = (
+    "",
+    ".claude-plugin/plugin.json",
+    "commands",
+    "agents",
+    "skills",
+    "hooks/hooks.json",
+)
+
+
+@dataclass
+class RolePlugin:
+    """A context-forge role plugin and the knowledge items it holds."""
+
+    role: str
+    name: str  # plugin directory name, "context-forge.role-{role}"
+    description: str = ""
+    version: str | None = None
+    commands: int = 0
+    agents: int = 0
+    skills: int = 0
+    hooks: int = 0
+    error: str | None = None  # problem reading plugin.json or hooks.json
+
+    @property
+    def knowledge_count(self) -> int:
+        """Total number of knowledge items."""
+        return self.commands + self.agents + self.skills + self.hooks
+
+    def to_dict(self) -> dict[str, Any]:
+        """Get the plugin as JSON-serializable data."""
+        return {**vars(self), "knowledge_count": self.knowledge_count}
+
+
+# =============================================================================
+# Scanning
+# =============================================================================
+
+
+def _count_entries(directory: Path, suffix: str | None = None) -> int:
+    """Count the files with a suffix, or the subdirectories, of a directory."""
+    try:
+        with os.scandir(directory) as it:
+            if suffix is None:
+                return sum(1 for e in it if e.is_dir() and not e.name.startswith("."))
+            return sum(1 for e in it if e.name.endswith(suffix) and e.is_file())
+    except OSError:
+        return 0
+
+
+def _read_json(path: Path) -> tuple[Any, str | None]:
+    """Read a JSON file; (None, None) if it is missing, (None, error) if bad."""
+    try:
+        return json.loads(path.read_text(encoding="utf-8")), None
+    except FileNotFoundError:
+        return None, None
+    except (OSError, ValueError) as e:
+        return None, f"Cannot read {path.parent.name}/{path.name}: {e}"
+
+
+def _count_hooks(hooks: Any) -> int:
+    """Count the matcher groups of a hooks.json document."""
+    events = hooks.get("hooks") if isinstance(hooks, dict) else None
+    if not isinstance(events, dict):
+        return 0
+    return sum(len(groups) for groups in events.values() if isinstance(groups, list))
+
+
+def scan_role_plugin(plugin_dir: Path) -> RolePlugin:
+    """Read one role plugin directory.
+
+    Commands and agents are the ``*.md`` files of ``commands/`` and
+    ``agents/``, skills the directories of ``skills/``, and hooks the
+    matcher groups of ``hooks/hooks.json``.
+
+    Args:
+        plugin_dir: Path to a ``context-forge.role-*`` directory.
+
+    Returns:
+        RolePlugin with its metadata and counts.
+    """
+    plugin = RolePlugin(
+        role=plugin_dir.name.removeprefix(ROLE_PLUGIN_PREFIX),
+        name=plugin_dir.name,
+        commands=_count_entries(plugin_dir / "commands", ".md"),
+        agents=_count_entries(plugin_dir / "agents", ".md"),
+        skills=_count_entries(plugin_dir / "skills"),
+    )
+
+    manifest, manifest_error = _read_json(plugin_dir / ".claude-plugin" / "plugin.json")
+    if isinstance(manifest, dict):
+        plugin.description = str(manifest.get("description") or "")
+        version = manifest.get("version")
+        plugin.version = str(version) if version is not None else None
+    elif manifest_error is None and manifest is not None:
+        manifest_error = "plugin.json is not a JSON object"
+
+    hooks, hooks_error = _read_json(plugin_dir / "hooks" / "hooks.json")
+    plugin.hooks = _count_hooks(hooks)
+    plugin.error = manifest_error or hooks_error
+    return plugin
+
+
+def _stamp(plugin_dir: Path) -> list[int | None]:
+    """Get the mtimes that decide whether a cached scan is still valid."""
+    stamp: list[int | None] = []
+    for relative in _STAMP_PATHS:
+        try:
+            stamp.append((plugin_dir / relative).stat().st_mtime_ns)
+        except OSError:
+            stamp.append(None)
+    return stamp
+
+
+def _load_cache(path: Path) -> dict[str, Any]:
+    """Get the cached plugin entries, or nothing if the cache is unusable."""
+    try:
+        raw = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(raw, dict) or raw.get("version") != CACHE_VERSION:
+        return {}
+    plugins = raw.get("plugins")
+    return plugins if isinstance(plugins, dict) else {}
+
+
+def find_role_plugins(project_root: Path) -> list[Path]:
+    """List the role plugin directories of a project, sorted by name.
+
+    Args:
+        project_root: Path to the project root directory.
+
+    Returns:
+        ``context-forge.role-*`` directories in ``.claude/plugins``; empty if
+        there are none.
+    """
+    plugins_dir = project_root / PLUGINS_DIR
+    try:
+        with os.scandir(plugins_dir) as it:
+            return sorted(
+                plugins_dir / e.name
+                for e in it
+                if e.name.startswith(ROLE_PLUGIN_PREFIX) and e.is_dir()
+            )
+    except OSError:
+        return []
+
+
+def scan_role_plugins(project_root: Path, use_cache: bool = True) -> list[RolePlugin]:
+    """Find and read every role plugin of a project.
+
+    Args:
+        project_root: Path to the project root directory.
+        use_cache: Reuse and update the mtime-keyed scan cache.
+
+    Returns:
+        Role plugins sorted by role name; empty if there are none.
+    """
+    plugin_dirs = find_role_plugins(project_root)
+    if not plugin_dirs:
+        return []
+
+    cache_path = project_root / ROLE_PLUGINS_CACHE_PATH
+    cached = _load_cache(cache_path) if use_cache else {}
+    entries: dict[str, Any] = {}
+    plugins: list[RolePlugin] = []
+    for plugin_dir in plugin_dirs:
+        name = plugin_dir.name
+        stamp = _stamp(plugin_dir)
+        entry = cached.get(name)
+        plugin = None
+        if isinstance(entry, dict) and entry.get("stamp") == stamp:
+            try:
+                plugin = RolePlugin(**entry["plugin"])
+            except (KeyError, TypeError):
+                plugin = None
+        if plugin is None:
+            plugin = scan_role_plugin(plugin_dir)
+        plugins.append(plugin)
+        entries[name] = {"stamp": stamp, "plugin": vars(plugin)}
+
+    if use_cache and entries != cached:
+        text = json.dumps(
+            {"version": CACHE_VERSION, "plugins": entries},
+            ensure_ascii=False,
+            separators=(",", ":"),
+        )
+        try:
+            write_if_changed(cache_path, text + "\n")
+        except OSError:
+            pass  # the cache is optional
+    return plugins
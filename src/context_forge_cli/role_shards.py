@@ -0,0 +1,385 @@
+"""Per-role storage of activation rules.
+
+In the single-file layout every role section lives in
+``.claude/context-forge.md``, so adding one rule rewrites the whole file and
+every writer contends on it. In the sharded layout each section lives in its
+own file, ``.claude/context-forge/roles/<role>.md``, and the root
+context-forge.md only keeps its preamble and one ``@`` reference per role::
+
+    @context-forge/roles/software-engineer.md
+    @context-forge/roles/frontend.md
+
+Claude Code follows the references, so sessions load the same rules. Adding
+rules then rewrites only the file of each role concerned (and the root file
+when a role is new), and :func:`read_context_forge_md
+<context_forge_cli.context_forge_md.read_context_forge_md>` reads a role's
+file only when its rules are looked up. The layout is sharded while the roles
+directory exists.
+"""
+
+import os
+import re
+from collections.abc import Collection, Iterator, Mapping, Sequence
+from enum import StrEnum
+from pathlib import Path
+
+from context_forge_cli.constants import (
+    CONTEXT_FORGE_MD_PATH,
+    CONTEXT_FORGE_ROLES_DIR,
+    ROLE_HEADER_PREFIX,
+    ROLE_HEADER_SUFFIX,
+)
+from context_forge_cli.context_forge_md import (
+    CompactResult,
+    ContextForgeMdContent,
+    compact_context_forge_md,
+    merge_role_sections,
+    parse_context_forge_md,
+    split_role_sections,
+)
+from context_forge_cli.fileio import write_if_changed
+from context_forge_cli.profiling import count
+
+# References in the root file are relative to it, i.e. to .claude/
+ROLE_REFERENCE_PREFIX = "@context-forge/roles/"
+
+_REFERENCE_LINE = re.compile(
+    rf"^{re.escape(ROLE_REFERENCE_PREFIX)}(.+)\.md[ \t]*(?:\n|$)", re.MULTILINE
+)
+
+# Role names that can be used as file names as they are
+_ROLE_FILE_NAME = re.compile(r"^\w[\w.-]*$")
+
+
+class RulesLayout(StrEnum):
+    """Where the role sections of context-forge.md are stored."""
+
+    SINGLE = "single"  # every section in .claude/context-forge.md
+    SHARDED = "sharded"  # one file per role under .claude/context-forge/roles/
+
+
+def is_sharded(project_root: Path) -> bool:
+    """Check whether a project stores its roles one file per role."""
+    return (project_root / CONTEXT_FORGE_ROLES_DIR).is_dir()
+
+
+def role_path(project_root: Path, role_name: str) -> Path:
+    """Get the file of a role in the sharded layout.
+
+    Args:
+        project_root: Path to the project root directory.
+        role_name: Role name.
+
+    Returns:
+        ``.claude/context-forge/roles/<role>.md``.
+        Raises ValueError if the role name cannot be used as a file name.
+    """
+    if not _ROLE_FILE_NAME.match(role_name):
+        raise ValueError(
+            f"Role name {role_name!r} cannot be stored in its own file: use "
+            "letters, digits, '_', '-' and '.'"
+        )
+    return project_root / CONTEXT_FORGE_ROLES_DIR / f"{role_name}.md"
+
+
+def referenced_roles(content: str) -> list[str]:
+    """Get the roles referenced by a sharded root file, in file order."""
+    return _REFERENCE_LINE.findall(content)
+
+
+def role_files(project_root: Path) -> list[str]:
+    """List the role files referenced by the root file.
+
+    Args:
+        project_root: Path to the project root directory.
+
+    Returns:
+        Paths relative to the project root, in POSIX form (empty in the
+        single-file layout).
+    """
+    if not is_sharded(project_root):
+        return []
+    root = _read(project_root / CONTEXT_FORGE_MD_PATH)
+    return [f"{CONTEXT_FORGE_ROLES_DIR}/{name}.md" for name in referenced_roles(root)]
+
+
+def _read(path: Path) -> str:
+    try:
+        return path.read_text(encoding="utf-8")
+    except FileNotFoundError:
+        return ""
+
+
+def _with_references(content: str, role_names: Sequence[str]) -> str:
+    """Replace the role references of root content with these ones."""
+    base = _REFERENCE_LINE.sub("", content).rstrip("\n")
+    references = "".join(f"{ROLE_REFERENCE_PREFIX}{name}.md\n" for name in role_names)
+    return f"{base}\n\n{references}" if base else references
+
+
+def _section(role_name: str, rules: Sequence[str]) -> str:
+    header = f"{ROLE_HEADER_PREFIX}{role_name}{ROLE_HEADER_SUFFIX}"
+    return f"{header}\n\n" + "".join(f"{rule}\n" for rule in rules)
+
+
+# =============================================================================
+# Reading
+# =============================================================================
+
+
+class RoleFiles(Mapping[str, list[str]]):
+    """Rules per role of a sharded project, each file read on first lookup.
+
+    Iterating lists the referenced roles without reading their files.
+    """
+
+    def __init__(self, project_root: Path, role_names: Sequence[str]) -> None:
+        self.project_root = project_root
+        self._names = dict.fromkeys(role_names)
+        self._rules: dict[str, list[str]] = {}
+
+    def __getitem__(self, role_name: str) -> list[str]:
+        rules = self._rules.get(role_name)
+        if rules is None:
+            if role_name not in self._names:
+                raise KeyError(role_name)
+            content = _read(role_path(self.project_root, role_name))
+            count("files read")
+            rules = parse_context_forge_md(content).roles.get(role_name, [])
+            self._rules[role_name] = rules
+        return rules
+
+    def __contains__(self, role_name: object) -> bool:
+        return role_name in self._names
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._names)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+
+def read_sharded_context_forge_md(project_root: Path) -> ContextForgeMdContent:
+    """Read the root file of a sharded project, deferring the role files.
+
+    Args:
+        project_root: Path to the project root directory.
+
+    Returns:
+        ContextForgeMdContent of the root file, whose ``roles`` reads each
+        role file when it is first looked up. ``sections`` is empty: the
+        root file has none.
+    """
+    content = _read(project_root / CONTEXT_FORGE_MD_PATH)
+    count("files read")
+    roles = RoleFiles(project_root, referenced_roles(content))
+    return ContextForgeMdContent(full_content=content, roles=roles)
+
+
+def read_role_sections(project_root: Path, roles: Collection[str]) -> dict[str, str]:
+    """Read the section text of some roles of a sharded project.
+
+    Args:
+        project_root: Path to the project root directory.
+        roles: Role names; roles without a file are left out.
+
+    Returns:
+        Section text per role, in the order of the root file.
+    """
+    root = _read(project_root / CONTEXT_FORGE_MD_PATH)
+    sections: dict[str, str] = {}
+    for role_name in referenced_roles(root):
+        if role_name in roles:
+            text = _read(role_path(project_root, role_name))
+            if text.strip():
+                sections[role_name] = text
+    return sections
+
+
+# =============================================================================
+# Writing
+# =============================================================================
+
+
+def write_role_rules(
+    project_root: Path, rules: Sequence[tuple[str, str]], compact: bool = False
+) -> None:
+    """Add activation rules to the role files of a sharded project.
+
+    Only the files of the roles in ``rules`` are rewritten; the root file
+    only when a role is new.
+
+    Args:
+        project_root: Path to the project root directory.
+        rules: (role_name, activation_rule) pairs, applied in order. Rules
+            a role already has are skipped.
+        compact: Also compact the files of every role.
+        Raises ValueError for a role name that cannot be a file name and
+        OSError if a file cannot be written.
+    """
+    rules_by_role: dict[str, list[str]] = {}
+    for role_name, rule in rules:
+        rules_by_role.setdefault(role_name, []).append(rule)
+
+    root_path = project_root / CONTEXT_FORGE_MD_PATH
+    root = _read(root_path)
+    known = referenced_roles(root)
+    targets = list(known) if compact else []
+    targets += [role_name for role_name in rules_by_role if role_name not in targets]
+    # Validate every name before the first write
+    paths = {role_name: role_path(project_root, role_name) for role_name in targets}
+
+    (project_root / CONTEXT_FORGE_ROLES_DIR).mkdir(parents=True, exist_ok=True)
+    for role_name, path in paths.items():
+        content = _read(path)
+        role_rules = rules_by_role.get(role_name)
+        if role_rules:
+            content = merge_role_sections(
+                content, {role_name: _section(role_name, role_rules)}
+            )
+        if compact:
+            content = compact_context_forge_md(content).content
+        write_if_changed(path, content)
+
+    new_roles = [role_name for role_name in rules_by_role if role_name not in known]
+    if new_roles:
+        write_if_changed(root_path, _with_references(root, known + new_roles))
+
+
+def compact_role_files(project_root: Path, dry_run: bool = False) -> CompactResult:
+    """Compact the file of every role of a sharded project.
+
+    Args:
+        project_root: Path to the project root directory.
+        dry_run: Only report what would be removed.
+
+    Returns:
+        CompactResult over all role files: ``original`` and ``content`` are
+        the files joined in the order of the root file.
+        Raises OSError if a file cannot be written.
+    """
+    root = _read(project_root / CONTEXT_FORGE_MD_PATH)
+    results: list[CompactResult] = []
+    for role_name in referenced_roles(root):
+        path = role_path(project_root, role_name)
+        result = compact_context_forge_md(_read(path))
+        if result.changed and not dry_run:
+            write_if_changed(path, result.content)
+        results.append(result)
+    return CompactResult(
+        original="".join(r.original for r in results),
+        content="".join(r.content for r in results),
+        removed_rules=sum(r.removed_rules for r in results),
+        merged_sections=sum(r.merged_sections for r in results),
+    )
+
+
+def remove_role_sections(project_root: Path, roles: Collection[str]) -> None:
+    """Delete the files of some roles of a sharded project.
+
+    Args:
+        project_root: Path to the project root directory.
+        roles: Role names.
+    """
+    root_path = project_root / CONTEXT_FORGE_MD_PATH
+    root = _read(root_path)
+    known = referenced_roles(root)
+    removed = [role_name for role_name in known if role_name in roles]
+    if not removed:
+        return
+    write_if_changed(
+        root_path, _with_references(root, [r for r in known if r not in roles])
+    )
+    for role_name in removed:
+        role_path(project_root, role_name).unlink(missing_ok=True)
+
+
+def merge_role_files(project_root: Path, sections: Mapping[str, str]) -> None:
+    """Add role sections to the role files of a sharded project.
+
+    Args:
+        project_root: Path to the project root directory.
+        sections: Section text per role (see :func:`split_role_sections`).
+    """
+    root_path = project_root / CONTEXT_FORGE_MD_PATH
+    root = _read(root_path)
+    known = referenced_roles(root)
+    paths = {role_name: role_path(project_root, role_name) for role_name in sections}
+    (project_root / CONTEXT_FORGE_ROLES_DIR).mkdir(parents=True, exist_ok=True)
+    for role_name, text in sections.items():
+        path = paths[role_name]
+        write_if_changed(path, merge_role_sections(_read(path), {role_name: text}))
+    new_roles = [role_name for role_name in sections if role_name not in known]
+    if new_roles:
+        write_if_changed(root_path, _with_references(root, known + new_roles))
+
+
+# =============================================================================
+# Layout Conversion
+# =============================================================================
+
+
+def shard_context_forge_md(project_root: Path) -> list[str]:
+    """Move every role section of the root file into its own file.
+
+    Also moves sections that were added to the root file of a project that
+    is already sharded. Other content of the root file is kept.
+
+    Args:
+        project_root: Path to the project root directory.
+
+    Returns:
+        The roles moved, in file order.
+        Raises ValueError for a role name that cannot be a file name (and
+        then nothing is changed) and OSError if a file cannot be written.
+    """
+    from context_forge_cli.context_forge_md import write_context_forge_md
+
+    root_path = project_root / CONTEXT_FORGE_MD_PATH
+    if not root_path.exists():
+        write_context_forge_md(project_root, None)
+    content = _read(root_path)
+    parsed = parse_context_forge_md(content)
+    for role_name in parsed.roles:
+        role_path(project_root, role_name)
+
+    remaining, sections = split_role_sections(content, parsed.roles)
+    (project_root / CONTEXT_FORGE_ROLES_DIR).mkdir(parents=True, exist_ok=True)
+    for role_name, text in sections.items():
+        path = role_path(project_root, role_name)
+        write_if_changed(path, merge_role_sections(_read(path), {role_name: text}))
+
+    known = referenced_roles(remaining)
+    known += [role_name for role_name in sections if role_name not in known]
+    write_if_changed(root_path, _with_references(remaining, known))
+    return list(sections)
+
+
+def unshard_context_forge_md(project_root: Path) -> list[str]:
+    """Move the role files back into the root file and remove them.
+
+    Args:
+        project_root: Path to the project root directory.
+
+    Returns:
+        The roles moved, in the order of the root file.
+        Raises OSError if a file cannot be written.
+    """
+    root_path = project_root / CONTEXT_FORGE_MD_PATH
+    content = _read(root_path)
+    role_names = referenced_roles(content)
+    sections = read_role_sections(project_root, role_names)
+    base = _with_references(content, [])
+    if sections:
+        base = merge_role_sections(base.rstrip("\n") + "\n\n", sections)
+    write_if_changed(root_path, base)
+
+    roles_dir = project_root / CONTEXT_FORGE_ROLES_DIR
+    for role_name in role_names:
+        role_path(project_root, role_name).unlink(missing_ok=True)
+    for directory in (roles_dir, roles_dir.parent):
+        try:
+            os.rmdir(directory)
+        except OSError:
+            break  # not empty: something else lives there
+    return list(sections)
@@ -0,0 +1,292 @@
+"""Append-only journal for concurrent activation rule writes.
+
+Several sessions on one checkout may add rules at the same time. A plain
+read-modify-write of context-forge.md then loses updates: two writers read
+the same content and the second rename wins. Writers therefore only append
+one record to ``.claude/context-forge.journal``, one JSON line::
+
+    {"rules": [["frontend", "- ..."], ...], "compact": false}
+
+and then fold the journal: under an exclusive lock on
+``.claude/context-forge.lock``, every pending record is applied to the rule
+files in one write and the journal is removed. Appends hold the lock shared,
+so they never block each other but cannot land between the fold reading the
+journal and removing it. A writer that waited for the lock usually finds its
+record already folded by another writer and returns without rewriting
+anything, so N concurrent writers cost far fewer than N rewrites.
+
+Commands that rewrite the rule files in other ways hold the same lock (see
+:func:`rules_lock`) and fold pending records first, so rules left in the
+journal by an interrupted writer are applied on the next such command.
+"""
+
+import contextlib
+import json
+import os
+import sys
+import threading
+from collections.abc import Collection, Iterator, Sequence
+from pathlib import Path
+
+from context_forge_cli.constants import (
+    CONTEXT_FORGE_MD_PATH,
+    RULE_JOURNAL_PATH,
+    RULES_LOCK_PATH,
+)
+from context_forge_cli.context_forge_md import read_context_forge_md
+from context_forge_cli.profiling import count
+from context_forge_cli.role_index import add_rules_indexed, load_role_index, rule_hash
+from context_forge_cli.role_shards import is_sharded, role_path
+
+# Locks this process holds: (lock path, thread) -> (depth, shared)
+_held: dict[tuple[str, int], tuple[int, bool]] = {}
+_held_guard = threading.Lock()
+
+if sys.platform == "win32":
+    import msvcrt
+
+    def _acquire(fd: int, shared: bool) -> None:
+        """Block until the lock file is locked (always exclusively)."""
+        while True:
+            try:
+                # Retries for about 10 seconds before failing
+                msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+                return
+            except OSError:
+                continue
+
+else:
+    import fcntl
+
+    def _acquire(fd: int, shared: bool) -> None:
+        """Block until the lock file is locked."""
+        fcntl.flock(fd, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+
+
+@contextlib.contextmanager
+def rules_lock(project_root: Path, shared: bool = False) -> Iterator[None]:
+    """Hold the lock that serializes rewrites of the rule files.
+
+    The lock is an ``flock`` (``msvcrt.locking`` on Windows) on
+    ``.claude/context-forge.lock``, so it is released when the process
+    exits, however it exits. It is reentrant within a thread: nested uses
+    keep the outer lock. The ``.claude`` directory is never created for it.
+
+    Args:
+        project_root: Path to the project root directory.
+        shared: Take a shared lock, as journal appends do, instead of an
+            exclusive one.
+        Raises RuntimeError when asking for the exclusive lock while only
+        holding the shared one, and OSError if the lock file cannot be
+        created (FileNotFoundError without a ``.claude`` directory).
+    """
+    lock_path = project_root / RULES_LOCK_PATH
+    key = (os.path.realpath(lock_path), threading.get_ident())
+    with _held_guard:
+        held = _held.get(key)
+        if held is not None:
+            if held[1] and not shared:
+                raise RuntimeError("Cannot upgrade a shared rules lock")
+            _held[key] = (held[0] + 1, held[1])
+    if held is not None:
+        try:
+            yield
+        finally:
+            with _held_guard:
+                depth, was_shared = _held[key]
+                _held[key] = (depth - 1, was_shared)
+        return
+
+    fd = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o666)
+    try:
+        _acquire(fd, shared)
+        count("rule locks taken")
+        with _held_guard:
+            _held[key] = (1, shared)
+        try:
+            yield
+        finally:
+            with _held_guard:
+                del _held[key]
+    finally:
+        # Closing the descriptor releases the lock
+        os.close(fd)
+
+
+# =============================================================================
+# Journal
+# =============================================================================
+
+
+def append_rule_record(
+    project_root: Path, rules: Sequence[tuple[str, str]], compact: bool = False
+) -> None:
+    """Append one record of rule additions to the journal.
+
+    Args:
+        project_root: Path to the project root directory.
+        rules: (role_name, activation_rule) pairs.
+        compact: Also compact the rule files when the record is folded.
+        Raises OSError if the journal cannot be written.
+    """
+    record = {"rules": [list(pair) for pair in rules], "compact": compact}
+    data = (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+    journal_path = project_root / RULE_JOURNAL_PATH
+    with rules_lock(project_root, shared=True):
+        fd = os.open(journal_path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o666)
+        try:
+            # One write of the whole record: O_APPEND keeps concurrent
+            # records from overwriting each other
+            written = os.write(fd, data)
+            while written < len(data):
+                written += os.write(fd, data[written:])
+        finally:
+            os.close(fd)
+    count("journal records appended")
+
+
+def read_rule_journal(project_root: Path) -> tuple[list[tuple[str, str]], bool]:
+    """Read the rule additions pending in the journal.
+
+    Lines that are not complete records (a writer killed mid-append) are
+    skipped.
+
+    Args:
+        project_root: Path to the project root directory.
+
+    Returns:
+        (pending (role_name, activation_rule) pairs in append order,
+        whether any record asked for compaction).
+        Raises OSError if the journal exists but cannot be read.
+    """
+    try:
+        data = (project_root / RULE_JOURNAL_PATH).read_bytes()
+    except FileNotFoundError:
+        return [], False
+    count("files read")
+
+    rules: list[tuple[str, str]] = []
+    compact = False
+    for line in data.splitlines():
+        try:
+            record = json.loads(line)
+            pairs = [(str(role), str(rule)) for role, rule in record["rules"]]
+        except (ValueError, TypeError, KeyError):
+            continue
+        rules += pairs
+        compact = compact or bool(record.get("compact"))
+    return rules, compact
+
+
+def fold_rule_journal(project_root: Path) -> list[tuple[str, str]]:
+    """Apply the rule additions pending in the journal and remove it.
+
+    Args:
+        project_root: Path to the project root directory.
+
+    Returns:
+        The pairs that were added (rules a role already had are skipped).
+        Raises OSError if a file cannot be written (the journal is then
+        kept for the next fold) and ValueError in the sharded layout for a
+        role name that cannot be a file name.
+    """
+    journal_path = project_root / RULE_JOURNAL_PATH
+    if not journal_path.exists():
+        return []
+    with rules_lock(project_root):
+        if not journal_path.exists():  # folded by another writer meanwhile
+            return []
+        rules, compact = read_rule_journal(project_root)
+        added = add_rules_indexed(project_root, rules, compact)
+        journal_path.unlink()
+    count("journal folds")
+    return added
+
+
+@contextlib.contextmanager
+def locked_rule_files(project_root: Path) -> Iterator[None]:
+    """Hold the exclusive rules lock, with pending journal records folded.
+
+    For commands that rewrite the rule files other than by adding rules.
+    Without context-forge.md there is nothing to protect yet, so no lock is
+    taken and the command reports the missing file as usual.
+
+    Args:
+        project_root: Path to the project root directory.
+        Raises OSError and ValueError as :func:`fold_rule_journal` does.
+    """
+    if not (project_root / CONTEXT_FORGE_MD_PATH).exists():
+        yield
+        return
+    with rules_lock(project_root):
+        fold_rule_journal(project_root)
+        yield
+
+
+def _known_rule_hashes(
+    project_root: Path, role_names: Collection[str]
+) -> dict[str, set[str]]:
+    """Get the rule hashes of some roles without parsing context-forge.md.
+
+    The single-file layout answers from the role index, which is only
+    rebuilt when the file changed; the sharded layout reads only the files
+    of these roles.
+    """
+    if is_sharded(project_root):
+        content = read_context_forge_md(project_root)
+        roles = content.roles if content is not None else {}
+        return {
+            role_name: {rule_hash(rule) for rule in roles.get(role_name, [])}
+            for role_name in role_names
+        }
+    index = load_role_index(project_root)
+    entries = index.roles if index is not None else {}
+    return {
+        role_name: set(entries[role_name].rule_hashes if role_name in entries else [])
+        for role_name in role_names
+    }
+
+
+def add_rules_journaled(
+    project_root: Path, rules: Sequence[tuple[str, str]], compact: bool = False
+) -> list[tuple[str, str]]:
+    """Add activation rules through the journal, safely under concurrency.
+
+    The rules are appended to the journal and the journal is folded before
+    returning, so the rule files hold them afterwards, whether this writer
+    or a concurrent one did the fold.
+
+    Args:
+        project_root: Path to the project root directory.
+        rules: (role_name, activation_rule) pairs, applied in order.
+        compact: Also compact the rule files.
+
+    Returns:
+        The pairs that were new when they were appended: not in the rule
+        files nor earlier in the journal.
+        Raises OSError if a file cannot be written and ValueError in the
+        sharded layout for a role name that cannot be a file name.
+    """
+    if is_sharded(project_root):
+        # A record the fold cannot apply would block every later fold
+        for role_name, _ in rules:
+            role_path(project_root, role_name)
+    # The fold creates context-forge.md if needed, so .claude/ is due anyway
+    (project_root / CONTEXT_FORGE_MD_PATH).parent.mkdir(parents=True, exist_ok=True)
+
+    with rules_lock(project_root, shared=True):
+        pending, _ = read_rule_journal(project_root)
+        known = _known_rule_hashes(
+            project_root, {role_name for role_name, _ in [*pending, *rules]}
+        )
+        for role_name, rule in pending:
+            known[role_name].add(rule_hash(rule))
+        new_rules: list[tuple[str, str]] = []
+        for role_name, rule in rules:
+            key = rule_hash(rule)
+            if key not in known[role_name]:
+                known[role_name].add(key)
+                new_rules.append((role_name, rule))
+        append_rule_record(project_root, rules, compact)
+    fold_rule_journal(project_root)
+    return new_rules
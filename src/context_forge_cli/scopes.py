@@ -0,0 +1,433 @@
+"""Directory-scoped context-forge.md shards for monorepos.
+
+Claude Code loads the root CLAUDE.md, and with it ``.claude/context-forge.md``,
+into every session, while a CLAUDE.md in a subdirectory is only loaded when
+the session works in that part of the tree. Roles can be assigned to
+subdirectories in ``.claude/context-forge.scopes.json``::
+
+    {"version": 1, "scopes": {"frontend": ["frontend-engineer"]}}
+
+Syncing moves the sections of those roles from the root context-forge.md (or
+from their role files, see :mod:`context_forge_cli.role_shards`) into
+``<dir>/.claude/context-forge.md`` and adds the usual reference block to
+``<dir>/CLAUDE.md``. The root file stays where new rules are written (by
+``add-rules`` and ``add-role-knowledge``); syncing again moves them on. A role
+assigned to several directories gets a copy of its section in each.
+"""
+
+import json
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from pathlib import Path, PurePosixPath
+from typing import Any
+
+from context_forge_cli.constants import (
+    CLAUDE_MD_END_MARKER,
+    CLAUDE_MD_START_MARKER,
+    CONTEXT_FORGE_MD_PATH,
+    CONTEXT_FORGE_MD_REFERENCE,
+    SCOPES_PATH,
+)
+from context_forge_cli.context_forge_md import (
+    merge_role_sections,
+    parse_context_forge_md,
+    split_role_sections,
+)
+from context_forge_cli.fileio import write_if_changed
+from context_forge_cli.role_shards import (
+    is_sharded,
+    merge_role_files,
+    read_role_sections,
+    referenced_roles,
+    remove_role_sections,
+    role_files,
+    role_path,
+)
+
+# Bump when the scopes file layout changes
+SCOPES_VERSION = 1
+
+# Root directory key in reports
+ROOT_SCOPE = "."
+
+
+# A shard costs its preamble and the reference block in its CLAUDE.md on top
+# of its rules, so both are kept short
+_REFERENCE_BLOCK = (
+    f"{CLAUDE_MD_START_MARKER}\n{CONTEXT_FORGE_MD_REFERENCE}\n"
+    f"{CLAUDE_MD_END_MARKER}\n".encode()
+)
+
+
+def _shard_template(directory: str) -> str:
+    """Get the preamble of a new shard."""
+    return f"# context-forge 設定（{directory}/ 配下、scope sync で生成）\n\n"
+
+
+@dataclass
+class ScopeSyncResult:
+    """What syncing the shards changed."""
+
+    moved: dict[str, list[str]] = field(default_factory=dict)  # dir -> roles
+    linked: list[str] = field(default_factory=list)  # dirs given a reference
+
+    def to_dict(self) -> dict[str, Any]:
+        """Get a JSON-serializable representation."""
+        return dict(vars(self))
+
+
+@dataclass
+class ScopeUsage:
+    """Always-loaded context-forge rules when working in one directory."""
+
+    directory: str
+    roles: list[str]  # roles whose rules are loaded here
+    always_bytes: int
+    always_tokens: int
+    unscoped_bytes: int  # the same, with every rule in the root file
+    unscoped_tokens: int
+
+    @property
+    def saved_bytes(self) -> int:
+        """Bytes kept out of the context by scoping."""
+        return self.unscoped_bytes - self.always_bytes
+
+    @property
+    def saved_tokens(self) -> int:
+        """Approximate tokens kept out of the context by scoping."""
+        return self.unscoped_tokens - self.always_tokens
+
+    def to_dict(self) -> dict[str, Any]:
+        """Get a JSON-serializable representation."""
+        return {
+            **vars(self),
+            "saved_bytes": self.saved_bytes,
+            "saved_tokens": self.saved_tokens,
+        }
+
+
+# =============================================================================
+# Scopes File
+# =============================================================================
+
+
+def normalize_scope_dir(project_root: Path, directory: str | Path) -> str:
+    """Get the key of a directory in the scopes file.
+
+    Args:
+        project_root: Path to the project root directory.
+        directory: Directory, relative to the project root or absolute.
+
+    Returns:
+        The directory relative to the project root, in POSIX form.
+        Raises ValueError if it is the root itself or outside the project.
+    """
+    path = Path(directory)
+    if path.is_absolute():
+        try:
+            path = path.resolve().relative_to(project_root.resolve())
+        except ValueError:
+            raise ValueError(f"Not inside the project: {directory}") from None
+    key = PurePosixPath(path.as_posix())
+    if key.parts[:1] == ("/",) or ".." in key.parts:
+        raise ValueError(f"Not inside the project: {directory}")
+    if str(key) == ".":
+        raise ValueError("The project root cannot be a scope.")
+    return str(key)
+
+
+def load_scopes(project_root: Path) -> dict[str, list[str]]:
+    """Read the role assignments of a project.
+
+    Args:
+        project_root: Path to the project root directory.
+
+    Returns:
+        Roles per directory, sorted by directory (empty without the file).
+        Raises ValueError if the file is malformed.
+    """
+    try:
+        text = (project_root / SCOPES_PATH).read_text(encoding="utf-8")
+    except FileNotFoundError:
+        return {}
+    try:
+        data = json.loads(text)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Invalid {SCOPES_PATH}: {e}") from e
+
+    scopes = data.get("scopes") if isinstance(data, dict) else None
+    if not isinstance(scopes, dict) or not all(
+        isinstance(roles, list) and all(isinstance(r, str) for r in roles)
+        for roles in scopes.values()
+    ):
+        raise ValueError(
+            f'Invalid {SCOPES_PATH}: expected {{"scopes": {{dir: [role, ...]}}}}'
+        )
+    return {
+        normalize_scope_dir(project_root, directory): roles
+        for directory, roles in sorted(scopes.items())
+    }
+
+
+def save_scopes(project_root: Path, scopes: dict[str, list[str]]) -> None:
+    """Write the role assignments of a project.
+
+    Args:
+        project_root: Path to the project root directory.
+        scopes: Roles per directory; directories without roles are dropped.
+        Raises OSError if the file cannot be written.
+    """
+    data = {
+        "version": SCOPES_VERSION,
+        "scopes": {d: sorted(roles) for d, roles in sorted(scopes.items()) if roles},
+    }
+    path = project_root / SCOPES_PATH
+    path.parent.mkdir(parents=True, exist_ok=True)
+    write_if_changed(path, json.dumps(data, indent=2, ensure_ascii=False) + "\n")
+
+
+def scoped_rule_files(project_root: Path) -> list[str]:
+    """List the files holding the activation rules of a project.
+
+    That is the root context-forge.md, its role files in the sharded
+    layout, then the shards of the scoped directories. A malformed scopes
+    file is ignored here.
+
+    Args:
+        project_root: Path to the project root directory.
+
+    Returns:
+        Paths relative to the project root, in POSIX form.
+    """
+    try:
+        directories = list(load_scopes(project_root))
+    except (OSError, ValueError):
+        directories = []
+    return [CONTEXT_FORGE_MD_PATH, *role_files(project_root)] + [
+        f"{directory}/{CONTEXT_FORGE_MD_PATH}" for directory in directories
+    ]
+
+
+# =============================================================================
+# Sync
+# =============================================================================
+
+
+def _read(path: Path) -> str:
+    try:
+        return path.read_text(encoding="utf-8")
+    except FileNotFoundError:
+        return ""
+
+
+def _write_shard(project_root: Path, directory: str, sections: dict[str, str]) -> None:
+    """Merge sections into a directory's shard, creating it if needed."""
+    path = project_root / directory / CONTEXT_FORGE_MD_PATH
+    content = _read(path) or _shard_template(directory)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    write_if_changed(path, merge_role_sections(content, sections))
+
+
+def _link_claude_md(project_root: Path, directory: str) -> bool:
+    """Add the shard reference to a directory's CLAUDE.md."""
+    from context_forge_cli.claude_md import read_claude_md, write_claude_md_reference
+
+    scope_root = project_root / directory
+    return write_claude_md_reference(scope_root, read_claude_md(scope_root))
+
+
+def sync_scopes(project_root: Path) -> ScopeSyncResult:
+    """Move the sections of scoped roles from the root file into the shards.
+
+    Args:
+        project_root: Path to the project root directory.
+
+    Returns:
+        ScopeSyncResult listing the moved roles and newly linked CLAUDE.md.
+        Raises ValueError if the scopes file is malformed and OSError if a
+        file cannot be written.
+    """
+    result = ScopeSyncResult()
+    scopes = load_scopes(project_root)
+    if not scopes:
+        return result
+
+    missing = [d for d in scopes if not (project_root / d).is_dir()]
+    if missing:
+        raise ValueError(f"Scope directory not found: {', '.join(missing)}")
+
+    root_path = project_root / CONTEXT_FORGE_MD_PATH
+    scoped_roles = {role for roles in scopes.values() for role in roles}
+    sharded = is_sharded(project_root)
+    if sharded:
+        remaining, sections = "", read_role_sections(project_root, scoped_roles)
+    else:
+        remaining, sections = split_role_sections(_read(root_path), scoped_roles)
+
+    # A role newly assigned to another directory is copied from its shard
+    shards = {d: _read(project_root / d / CONTEXT_FORGE_MD_PATH) for d in scopes}
+    shard_roles = {d: parse_context_forge_md(c).roles for d, c in shards.items()}
+    copies: dict[str, str] = {}
+    for directory, content in shards.items():
+        for role, text in split_role_sections(content, scoped_roles)[1].items():
+            copies.setdefault(role, text)
+
+    for directory, roles in scopes.items():
+        shard_sections = {role: sections[role] for role in roles if role in sections}
+        shard_sections |= {
+            role: copies[role]
+            for role in roles
+            if role in copies
+            and role not in shard_sections
+            and role not in shard_roles[directory]
+        }
+        if shard_sections or not shards[directory]:
+            _write_shard(project_root, directory, shard_sections)
+        if shard_sections:
+            result.moved[directory] = sorted(shard_sections)
+        if _link_claude_md(project_root, directory):
+            result.linked.append(directory)
+
+    # The root file is rewritten last, once every section has a new home
+    if sections and sharded:
+        remove_role_sections(project_root, sections)
+    elif sections:
+        write_if_changed(root_path, remaining)
+    return result
+
+
+def assign_roles(
+    project_root: Path, directory: str | Path, roles: Iterable[str]
+) -> ScopeSyncResult:
+    """Assign roles to a directory and sync the shards.
+
+    Args:
+        project_root: Path to the project root directory.
+        directory: Directory, relative to the project root or absolute.
+        roles: Role names.
+
+    Returns:
+        ScopeSyncResult of the sync.
+        Raises ValueError for a directory that does not exist or is not
+        inside the project, and OSError if a file cannot be written.
+    """
+    key = normalize_scope_dir(project_root, directory)
+    if not (project_root / key).is_dir():
+        raise ValueError(f"Not a directory: {directory}")
+    scopes = load_scopes(project_root)
+    scopes[key] = sorted({*scopes.get(key, []), *roles})
+    save_scopes(project_root, scopes)
+    return sync_scopes(project_root)
+
+
+def unassign_roles(
+    project_root: Path, directory: str | Path, roles: Iterable[str] | None = None
+) -> list[str]:
+    """Remove roles from a directory, moving their rules back if needed.
+
+    The sections of the roles are cut out of the directory's shard; those
+    of roles no longer scoped anywhere go back to the root file (or to their
+    role files in the sharded layout). A shard
+    left without roles is deleted, while the reference in the directory's
+    CLAUDE.md is kept (an import of a missing file is skipped).
+
+    Args:
+        project_root: Path to the project root directory.
+        directory: Directory, relative to the project root or absolute.
+        roles: Roles to remove (default: every role of the directory).
+
+    Returns:
+        Roles whose rules moved back to the root file, sorted.
+        Raises ValueError if the directory has none of the roles.
+    """
+    key = normalize_scope_dir(project_root, directory)
+    scopes = load_scopes(project_root)
+    assigned = scopes.get(key, [])
+    removed = set(assigned) if roles is None else set(roles) & set(assigned)
+    if not removed:
+        raise ValueError(f"No such roles are assigned to {key}")
+
+    scopes[key] = [role for role in assigned if role not in removed]
+    still_scoped = {role for roles in scopes.values() for role in roles}
+    shard_path = project_root / key / CONTEXT_FORGE_MD_PATH
+    remaining, sections = split_role_sections(_read(shard_path), removed)
+    returned = {
+        role: text for role, text in sections.items() if role not in still_scoped
+    }
+
+    root_path = project_root / CONTEXT_FORGE_MD_PATH
+    if returned and is_sharded(project_root):
+        merge_role_files(project_root, returned)
+    elif returned:
+        root_path.parent.mkdir(parents=True, exist_ok=True)
+        write_if_changed(root_path, merge_role_sections(_read(root_path), returned))
+    if not scopes[key] and not parse_context_forge_md(remaining).sections:
+        shard_path.unlink(missing_ok=True)
+    elif sections:
+        write_if_changed(shard_path, remaining)
+    save_scopes(project_root, scopes)
+    return sorted(returned)
+
+
+# =============================================================================
+# Report
+# =============================================================================
+
+
+def scope_report(project_root: Path) -> list[ScopeUsage]:
+    """Measure the always-loaded rules per directory, with and without scopes.
+
+    Working in a directory loads the root context-forge.md and the shard of
+    that directory and of each scoped directory above it, each with the
+    reference block of its CLAUDE.md. Without scopes, every role section
+    would be in the root file instead.
+
+    Args:
+        project_root: Path to the project root directory.
+
+    Returns:
+        ScopeUsage for the project root, then for each scoped directory.
+        Raises ValueError if the scopes file is malformed.
+    """
+    from context_forge_cli.context_stats import estimate_tokens
+
+    root = _read(project_root / CONTEXT_FORGE_MD_PATH)
+    if is_sharded(project_root):
+        # The root file loads every role file it references
+        root_roles = referenced_roles(root)
+        root += "".join(_read(role_path(project_root, r)) for r in root_roles)
+    else:
+        root_roles = list(parse_context_forge_md(root).sections)
+    root_data = root.encode("utf-8")
+    shards: dict[str, tuple[bytes, list[str]]] = {}
+    moved: dict[str, bytes] = {}  # role -> section, as it would be in the root
+    for directory in load_scopes(project_root):
+        content = _read(project_root / directory / CONTEXT_FORGE_MD_PATH)
+        present = parse_context_forge_md(content).roles
+        _, sections = split_role_sections(content, present)
+        shards[directory] = (content.encode("utf-8"), list(sections))
+        for role, text in sections.items():
+            moved.setdefault(role, ("\n" + text).encode("utf-8"))
+
+    unscoped = root_data + b"".join(moved.values())
+    usages: list[ScopeUsage] = []
+    for directory in [ROOT_SCOPE, *shards]:
+        loaded = [root_data]
+        roles = list(root_roles)
+        for shard_dir, (data, shard_roles) in shards.items():
+            if data and (
+                directory == shard_dir or directory.startswith(shard_dir + "/")
+            ):
+                loaded += [data, _REFERENCE_BLOCK]
+                roles += [role for role in shard_roles if role not in roles]
+        usages.append(
+            ScopeUsage(
+                directory=directory,
+                roles=roles,
+                always_bytes=sum(map(len, loaded)),
+                always_tokens=sum(map(estimate_tokens, loaded)),
+                unscoped_bytes=len(unscoped),
+                unscoped_tokens=estimate_tokens(unscoped),
+            )
+        )
+    return usages
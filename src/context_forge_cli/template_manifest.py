@@ -0,0 +1,114 @@
+"""Precompiled manifest of the packaged command templates.
+
+At build time the hatch hook in ``hatch_build.py`` parses every template under
+``templates/commands/`` once and writes the result to ``_template_manifest.py``,
+so listing and loading templates at runtime needs neither a directory glob
+nor PyYAML.
+
+This module is also loaded straight from the source tree by the build hook,
+so it must not import anything from the rest of the package.
+"""
+
+import ast
+import hashlib
+import pprint
+from pathlib import Path
+from typing import Any, TypedDict
+
+# Generated module, next to this file, holding the TEMPLATES mapping
+MANIFEST_MODULE_NAME = "_template_manifest.py"
+
+
+class TemplateManifestEntry(TypedDict):
+    """Precomputed facts about one command template file."""
+
+    description: str
+    metadata: dict[str, Any]
+    sha256: str
+    size: int  # in bytes, of the UTF-8 file content
+    body_start: int  # str offsets of the body after the YAML frontmatter
+    body_end: int
+
+
+def build_manifest_entry(data: bytes) -> TemplateManifestEntry:
+    """Parse one template file into a manifest entry.
+
+    Args:
+        data: Raw template file content.
+
+    Returns:
+        TemplateManifestEntry for the template.
+    """
+    content = data.decode("utf-8")
+
+    # Parse YAML frontmatter if present
+    metadata: dict[str, Any] = {}
+    description = ""
+    body_start, body_end = 0, len(content)
+
+    if content.startswith("---"):
+        parts = content.split("---", 2)
+        if len(parts) >= 3:
+            import yaml
+
+            try:
+                metadata = yaml.safe_load(parts[1]) or {}
+                description = metadata.get("description", "")
+                # Offsets of parts[2].strip() within content
+                rest_start = len(parts[0]) + len(parts[1]) + 6
+                body_start = rest_start + len(parts[2]) - len(parts[2].lstrip())
+                body_end = max(body_start, rest_start + len(parts[2].rstrip()))
+            except yaml.YAMLError:
+                # If YAML parsing fails, use content as-is
+                metadata, description = {}, ""
+
+    return TemplateManifestEntry(
+        description=description,
+        metadata=metadata,
+        sha256=hashlib.sha256(data).hexdigest(),
+        size=len(data),
+        body_start=body_start,
+        body_end=body_end,
+    )
+
+
+def build_manifest(commands_dir: Path) -> dict[str, TemplateManifestEntry]:
+    """Build manifest entries for every template in a directory.
+
+    Args:
+        commands_dir: Directory holding ``<command>.md`` templates.
+
+    Returns:
+        Mapping of command name to manifest entry, sorted by name.
+    """
+    if not commands_dir.exists():
+        return {}
+    return {
+        path.stem: build_manifest_entry(path.read_bytes())
+        for path in sorted(commands_dir.glob("*.md"))
+    }
+
+
+def render_manifest_module(manifest: dict[str, TemplateManifestEntry]) -> str:
+    """Render a manifest as the source of the generated Python module.
+
+    Args:
+        manifest: Manifest to render.
+
+    Returns:
+        Python source defining ``TEMPLATES``.
+        Raises ValueError if frontmatter holds values that are not literals.
+    """
+    literal = pprint.pformat(manifest, sort_dicts=True, width=88)
+    try:
+        ast.literal_eval(literal)
+    except (ValueError, SyntaxError) as e:
+        raise ValueError(
+            "Template frontmatter may only contain plain YAML values"
+        ) from e
+
+    return (
+        "# This file is generated at build time by hatch_build.py. Do not edit.\n"
+        "# fmt: off\n"
+        f"TEMPLATES = {literal}\n"
+    )
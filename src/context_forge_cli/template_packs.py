@@ -0,0 +1,240 @@
+"""Command templates read from zip and tar archives ("template packs").
+
+An organization can ship its own commands as one archive holding
+``commands/<command>.md`` (optionally inside a single top-level directory).
+Packs are registered through ``$CONTEXT_FORGE_TEMPLATE_PACKS`` (paths joined
+with ``os.pathsep``) or ``init --template-pack``, and their commands are
+listed and installed next to the built-in ones; a pack command with the
+same name as a built-in one replaces it, and later packs win over earlier
+ones.
+
+Archives are read in place, never extracted:
+
+- zip: listing reads only the central directory, and loading a command
+  decompresses only its member
+- uncompressed tar: listing walks the member headers once, and loading a
+  command seeks straight to its data
+- compressed tar (``.tar.gz``, ``.tgz``, ...): the stream has no index, so
+  the first listing decompresses it once and keeps the command files it
+  passes; nothing else is held
+
+Decoded templates and their parsed manifest entries are cached on the pack,
+so installing into many projects reads each member once per process.
+
+An open archive handle is never shared across processes: the workers that
+``init --workspace`` forks would share its file offset and corrupt each
+other's reads, so a pack reopens its archive in a process other than the
+one that opened it.
+"""
+
+import os
+import tarfile
+import threading
+import zipfile
+import zlib
+from pathlib import Path, PurePosixPath
+
+from context_forge_cli.constants import TEMPLATE_PACKS_ENV
+from context_forge_cli.profiling import count
+from context_forge_cli.template_manifest import (
+    TemplateManifestEntry,
+    build_manifest_entry,
+)
+
+
+def _command_name(member: str) -> str | None:
+    """Get the command name of a ``[top/]commands/<name>.md`` member."""
+    path = PurePosixPath(member)
+    if (
+        path.suffix == ".md"
+        and len(path.parts) in (2, 3)
+        and path.parts[-2] == "commands"
+    ):
+        return path.stem
+    return None
+
+
+class TemplatePack:
+    """A zip or tar archive of command templates, read in place."""
+
+    def __init__(self, path: Path) -> None:
+        """Open a pack and read its index.
+
+        Args:
+            path: Archive file.
+            Raises ValueError if it is not a readable zip or tar archive.
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._data: dict[str, bytes] = {}
+        self._entries: dict[str, TemplateManifestEntry] = {}
+        self._zip: zipfile.ZipFile | None = None
+        self._tar: tarfile.TarFile | None = None
+        self._members: dict[str, str | tarfile.TarInfo] = {}
+        self._pid = os.getpid()
+
+        try:
+            if zipfile.is_zipfile(path):
+                self._zip = zipfile.ZipFile(path)
+                members: dict[str, str | tarfile.TarInfo] = {}
+                for info in self._zip.infolist():
+                    name = _command_name(info.filename)
+                    if name is not None and not info.is_dir():
+                        members[name] = info.filename
+                self._members = members
+            elif tarfile.is_tarfile(path):
+                self._read_tar_index()
+            else:
+                raise ValueError(f"Not a zip or tar archive: {path}")
+        except (OSError, zipfile.BadZipFile, tarfile.TarError) as e:
+            raise ValueError(f"Cannot read template pack {path}: {e}") from e
+        count("template packs opened")
+
+    def _read_tar_index(self) -> None:
+        try:
+            tar = tarfile.open(self.path, "r:")
+            compressed = False
+        except tarfile.ReadError:
+            tar = tarfile.open(self.path, "r:*")
+            compressed = True
+        for info in tar:
+            name = _command_name(info.name)
+            if name is None or not info.isfile():
+                continue
+            if compressed:
+                # Keep the member now: going back for it later would restart
+                # the decompression from the start of the stream
+                extracted = tar.extractfile(info)
+                if extracted is not None:
+                    self._data[name] = extracted.read()
+            self._members[name] = info
+        if compressed:
+            tar.close()
+        else:
+            self._tar = tar
+
+    def _reopen_after_fork(self) -> None:
+        """Give this process its own archive handle (caller holds the lock)."""
+        if self._pid == os.getpid():
+            return
+        if self._zip is not None:
+            self._zip = zipfile.ZipFile(self.path)
+        if self._tar is not None:
+            self._tar = tarfile.open(self.path, "r:")
+        self._pid = os.getpid()
+        count("template packs reopened")
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._members
+
+    @property
+    def commands(self) -> list[str]:
+        """Names of the commands in the pack, sorted."""
+        return sorted(self._members)
+
+    def read(self, name: str) -> bytes | None:
+        """Get the raw content of a command template.
+
+        Args:
+            name: Command name.
+
+        Returns:
+            Template file content, or None if the pack has no such command.
+            Raises ValueError if the member cannot be read (a damaged or
+            changed archive).
+        """
+        member = self._members.get(name)
+        if member is None:
+            return None
+        with self._lock:
+            data = self._data.get(name)
+            if data is None:
+                try:
+                    self._reopen_after_fork()
+                    if self._zip is not None and isinstance(member, str):
+                        data = self._zip.read(member)
+                    elif self._tar is not None and isinstance(member, tarfile.TarInfo):
+                        extracted = self._tar.extractfile(member)
+                        data = extracted.read() if extracted is not None else b""
+                    else:
+                        return None
+                except (
+                    OSError,
+                    EOFError,
+                    zlib.error,
+                    zipfile.BadZipFile,
+                    tarfile.TarError,
+                ) as e:
+                    raise ValueError(
+                        f"Cannot read template pack {self.path}: {e}"
+                    ) from e
+                self._data[name] = data
+                count("template pack members read")
+        return data
+
+    def entry(self, name: str) -> TemplateManifestEntry | None:
+        """Get the manifest entry of a command, parsing it on first use."""
+        entry = self._entries.get(name)
+        if entry is None:
+            data = self.read(name)
+            if data is None:
+                return None
+            entry = self._entries.setdefault(name, build_manifest_entry(data))
+        return entry
+
+    def member_path(self, name: str) -> Path:
+        """Get a display path for a command: the archive path plus member."""
+        member = self._members[name]
+        member_name = member if isinstance(member, str) else member.name
+        return self.path / member_name
+
+
+# =============================================================================
+# Registry
+# =============================================================================
+
+_packs: dict[Path, TemplatePack] = {}
+_packs_lock = threading.Lock()
+
+
+def registered_template_packs() -> list[TemplatePack]:
+    """Get the registered template packs, in registration order.
+
+    Packs named in ``$CONTEXT_FORGE_TEMPLATE_PACKS`` are opened on first use
+    and kept open for the rest of the process.
+
+    Returns:
+        Open packs. Raises ValueError if a registered pack cannot be read.
+    """
+    value = os.environ.get(TEMPLATE_PACKS_ENV, "")
+    paths = [Path(p).resolve() for p in value.split(os.pathsep) if p]
+    if not paths:
+        return []
+    with _packs_lock:
+        for path in paths:
+            if path not in _packs:
+                _packs[path] = TemplatePack(path)
+        return [_packs[path] for path in paths]
+
+
+def register_template_pack(path: Path) -> TemplatePack:
+    """Open a template pack and add it to the registered ones.
+
+    The pack is added to ``$CONTEXT_FORGE_TEMPLATE_PACKS``, so worker
+    processes started afterwards (``init --workspace``) use it as well.
+
+    Args:
+        path: Archive file.
+
+    Returns:
+        The opened pack. Raises ValueError if it cannot be read.
+    """
+    path = path.resolve()
+    with _packs_lock:
+        pack = _packs.get(path) or TemplatePack(path)
+        _packs[path] = pack
+    value = os.environ.get(TEMPLATE_PACKS_ENV, "")
+    registered = [p for p in value.split(os.pathsep) if p]
+    if str(path) not in registered:
+        os.environ[TEMPLATE_PACKS_ENV] = os.pathsep.join([*registered, str(path)])
+    return pack
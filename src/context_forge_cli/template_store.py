@@ -0,0 +1,234 @@
+"""Content-addressed store shared by the command files of many projects.
+
+With ``init --link``, each rendered command template is written once to a
+user-level store, ``<store>/blobs/<sha256[:2]>/<sha256[2:]>``, and installed
+into ``.claude/commands/`` as a hardlink to that blob. Where a hardlink is
+not possible (the project is on another filesystem), a reflink is tried on
+Linux, and the file is copied as a last resort.
+
+Blobs are read-only, since editing one in place would change the command in
+every project that links to it; editors that save through a temporary file
+replace the link instead. A blob no project links to any more has a link
+count of one, which is what :func:`gc_store` looks for.
+
+The store lives in ``$CONTEXT_FORGE_STORE``, or else in
+``$XDG_CACHE_HOME/context-forge/store`` (``~/.cache/context-forge/store``).
+"""
+
+import contextlib
+import os
+import secrets
+import shutil
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from context_forge_cli.fileio import atomic_write_bytes, content_digest
+from context_forge_cli.profiling import count
+
+STORE_ENV = "CONTEXT_FORGE_STORE"
+
+# Blob permissions: read-only for everyone
+BLOB_MODE = 0o444
+
+# Linux ioctl that clones a file's extents (btrfs, XFS, ...)
+_FICLONE = 0x40049409
+
+
+def default_store_path() -> Path:
+    """Get the store directory from the environment.
+
+    Returns:
+        ``$CONTEXT_FORGE_STORE`` if set, otherwise the ``context-forge/store``
+        directory of the user cache directory.
+    """
+    configured = os.environ.get(STORE_ENV)
+    if configured:
+        return Path(configured).expanduser()
+    cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache_home) / "context-forge" / "store"
+
+
+def blob_path(store: Path, digest: str) -> Path:
+    """Get the path of the blob with a SHA-256 hex digest."""
+    return store / "blobs" / digest[:2] / digest[2:]
+
+
+def store_blob(store: Path, data: bytes) -> Path:
+    """Add content to the store unless it is already there.
+
+    An existing blob's mtime is refreshed, so a concurrent :func:`gc_store`
+    with a minimum age does not remove it before it is linked.
+
+    Args:
+        store: Store directory.
+        data: Content to store.
+
+    Returns:
+        Path of the blob. Raises OSError if it cannot be written.
+    """
+    path = blob_path(store, content_digest(data))
+    try:
+        os.utime(path)
+        return path
+    except FileNotFoundError:
+        pass
+    except PermissionError:
+        return path  # stored by another user of a shared store
+    path.parent.mkdir(parents=True, exist_ok=True)
+    atomic_write_bytes(path, data, mode=BLOB_MODE)
+    count("store blobs written")
+    return path
+
+
+def _temp_name(target: Path) -> Path:
+    return target.with_name(f".{target.name}.{os.getpid()}.{secrets.token_hex(4)}.tmp")
+
+
+def _reflink(source: Path, temp: Path) -> None:
+    """Clone source to temp with the FICLONE ioctl (Linux only)."""
+    if not sys.platform.startswith("linux"):
+        raise OSError("reflinks are not supported on this platform")
+    import fcntl
+
+    with source.open("rb") as src, temp.open("xb") as dst:
+        fcntl.ioctl(dst.fileno(), _FICLONE, src.fileno())
+
+
+def link_blob(blob: Path, target: Path) -> str:
+    """Replace target with a hardlink to a blob, or failing that a reflink/copy.
+
+    The link is created under a temporary name and renamed over ``target``,
+    so readers never see a missing or partial file.
+
+    Args:
+        blob: Blob in the store.
+        target: File to create or replace.
+
+    Returns:
+        "hardlink", "reflink" or "copy". Raises OSError if even copying fails.
+    """
+    with contextlib.suppress(OSError):
+        if os.path.samefile(blob, target):
+            return "hardlink"
+
+    temp = _temp_name(target)
+    method = "hardlink"
+    try:
+        try:
+            os.link(blob, temp)
+        except OSError:  # other filesystem, or no hardlink support
+            with contextlib.suppress(OSError):
+                os.unlink(temp)
+            method = "reflink"
+            try:
+                _reflink(blob, temp)
+            except OSError:
+                with contextlib.suppress(OSError):
+                    os.unlink(temp)
+                method = "copy"
+                shutil.copyfile(blob, temp)
+        os.replace(temp, target)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(temp)
+        raise
+    count(f"store {method}s")
+    return method
+
+
+def install_from_store(store: Path, data: bytes, target: Path) -> str:
+    """Store content and link it into place.
+
+    Args:
+        store: Store directory.
+        data: Rendered file content.
+        target: File to create or replace.
+
+    Returns:
+        How the file was installed (see :func:`link_blob`).
+        Raises OSError if the store or the target cannot be written.
+    """
+    blob = store_blob(store, data)
+    try:
+        return link_blob(blob, target)
+    except FileNotFoundError:
+        if not target.parent.is_dir():
+            raise
+        # The blob was collected between storing and linking: store it again
+        return link_blob(store_blob(store, data), target)
+
+
+# =============================================================================
+# Garbage Collection
+# =============================================================================
+
+
+@dataclass
+class StoreGcResult:
+    """Outcome of a store garbage collection."""
+
+    store: Path
+    removed: list[str] = field(default_factory=list)  # digests
+    kept: int = 0
+    freed_bytes: int = 0
+    errors: list[str] = field(default_factory=list)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Get the result as JSON-serializable data."""
+        return {**vars(self), "store": str(self.store)}
+
+
+def gc_store(
+    store: Path, min_age: float = 3600.0, dry_run: bool = False
+) -> StoreGcResult:
+    """Remove blobs that no installed command file links to.
+
+    A blob is unreferenced when its link count is one (the store's own
+    entry). Blobs touched within the last ``min_age`` seconds are kept, so
+    an install running at the same time does not lose the blob it is about
+    to link. Copies and reflinks never reference their blob.
+
+    Args:
+        store: Store directory.
+        min_age: Keep blobs used more recently than this many seconds ago.
+        dry_run: Only report what would be removed.
+
+    Returns:
+        StoreGcResult listing the removed blobs.
+    """
+    result = StoreGcResult(store=store)
+    blobs_dir = store / "blobs"
+    cutoff = time.time() - min_age
+    try:
+        with os.scandir(blobs_dir) as it:
+            fanout = sorted(e.path for e in it if e.is_dir() and len(e.name) == 2)
+    except FileNotFoundError:
+        return result
+
+    for directory in fanout:
+        with os.scandir(directory) as it:
+            entries = sorted(
+                (e for e in it if len(e.name) == 62 and e.is_file()),
+                key=lambda e: e.name,
+            )
+        for entry in entries:
+            stat = entry.stat()
+            if stat.st_nlink > 1 or stat.st_mtime > cutoff:
+                result.kept += 1
+                continue
+            digest = os.path.basename(directory) + entry.name
+            if not dry_run:
+                try:
+                    os.unlink(entry.path)
+                except OSError as e:
+                    result.errors.append(f"{digest}: {e.strerror}")
+                    continue
+            result.removed.append(digest)
+            result.freed_bytes += stat.st_size
+        if not dry_run:
+            with contextlib.suppress(OSError):
+                os.rmdir(directory)  # only succeeds once it is empty
+    return result
@@ -0,0 +1,439 @@
+"""Trigger-phrase index for Skill and SubAgent activation.
+
+add-role-knowledge writes the activation triggers of a skill or agent as
+quoted phrases (「...」) into its ``description``, and repeats them in the
+activation rules of context-forge.md next to the skill or agent they select::
+
+    - ユーザーが「PRをレビューして」「コードレビュー」と言った場合、
+      必ず Task ツールで `pr-review-assistant` SubAgent を使用すること
+
+:func:`load_trigger_index` collects every phrase of every role plugin and of
+context-forge.md, compiles them into an Aho-Corasick automaton and caches it
+in ``.claude/context-forge.triggers.json``. :meth:`TriggerIndex.match` then
+finds all phrases contained in a prompt with one pass over its characters,
+however many phrases there are, and ranks the skills and agents they select.
+
+Phrases and prompts are compared after NFKC normalization and case folding,
+with whitespace removed (Japanese prompts rarely agree on spacing). The
+cache is keyed by the mtimes and sizes of context-forge.md (and its
+directory-scoped shards) and of every agent and skill file, so it is only
+rebuilt after one of them changed.
+"""
+
+import json
+import os
+import re
+import unicodedata
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from context_forge_cli.constants import (
+    ROLE_PLUGIN_PREFIX,
+    TRIGGER_INDEX_PATH,
+)
+from context_forge_cli.context_forge_md import parse_context_forge_md
+from context_forge_cli.fileio import write_if_changed
+from context_forge_cli.plugin_migration import normalize_frontmatter
+from context_forge_cli.role_plugins import find_role_plugins
+from context_forge_cli.scopes import scoped_rule_files
+
+# Bump when the cache layout or the extraction rules change
+INDEX_VERSION = 1
+
+_PHRASE = re.compile(r"「([^「」\n]+)」")
+# `pr-review-assistant` SubAgent / `react-best-practices` Skill
+_RULE_TARGET = re.compile(r"`([^`\n]+)`\s*(SubAgent|Skill)")
+_NAME_LINE = re.compile(r"^name:\s*(.+?)\s*$", re.MULTILINE)
+_WHITESPACE = re.compile(r"\s+")
+
+_RULE_KINDS = {"SubAgent": "agent", "Skill": "skill"}
+
+
+def normalize_trigger(text: str) -> str:
+    """Get the form of a phrase or prompt that matching compares."""
+    return _WHITESPACE.sub("", unicodedata.normalize("NFKC", text).casefold())
+
+
+@dataclass(frozen=True)
+class TriggerTarget:
+    """A skill or agent that trigger phrases select."""
+
+    kind: str  # "skill" or "agent"
+    name: str
+    role: str
+
+
+@dataclass
+class TriggerMatch:
+    """A skill or agent selected by a prompt."""
+
+    kind: str
+    name: str
+    role: str
+    score: int  # total length of the matched phrases
+    phrases: list[str] = field(default_factory=list)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Get the match as JSON-serializable data."""
+        return dict(vars(self))
+
+
+# =============================================================================
+# Phrase Extraction
+# =============================================================================
+
+
+def _file_triggers(
+    path: str, kind: str, name: str, role: str
+) -> list[tuple[str, TriggerTarget]]:
+    """Get the phrases in the frontmatter description of a skill or agent."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            text = f.read()
+    except (OSError, UnicodeDecodeError):
+        return []
+    _, _, description = normalize_frontmatter(text, name)
+    if not description:
+        return []
+    frontmatter = text.split("\n---", 1)[0]
+    declared = _NAME_LINE.search(frontmatter)
+    target = TriggerTarget(kind, declared.group(1) if declared else name, role)
+    return [(phrase, target) for phrase in _PHRASE.findall(description)]
+
+
+def _plugin_files(plugin_dir: str) -> list[tuple[str, str, str]]:
+    """List the (path, kind, default name) of a plugin's agents and skills.
+
+    Paths stay strings: this runs on every cache check, for every plugin.
+    """
+    files: list[tuple[str, str, str]] = []
+    try:
+        with os.scandir(os.path.join(plugin_dir, "agents")) as it:
+            files += [
+                (e.path, "agent", e.name[:-3])
+                for e in it
+                if e.name.endswith(".md") and e.is_file()
+            ]
+    except OSError:
+        pass
+    try:
+        with os.scandir(os.path.join(plugin_dir, "skills")) as it:
+            files += [
+                (os.path.join(e.path, "SKILL.md"), "skill", e.name)
+                for e in it
+                if e.is_dir() and not e.name.startswith(".")
+            ]
+    except OSError:
+        pass
+    return sorted(files)
+
+
+def _rule_triggers(content: str) -> list[tuple[str, TriggerTarget]]:
+    """Get the phrases of the activation rules in context-forge.md.
+
+    A rule is a ``- `` line of a role section plus the indented lines that
+    continue it; the skill or agent is the backquoted name before
+    ``Skill``/``SubAgent``. Rules without one select nothing.
+    """
+    parsed = parse_context_forge_md(content)
+    triggers: list[tuple[str, TriggerTarget]] = []
+    for role, section in parsed.sections.items():
+        rules: list[str] = []
+        continued = False
+        for line in content[section.body_start : section.rules_end].split("\n"):
+            if line.startswith("- "):
+                rules.append(line)
+                continued = True
+            elif continued and line[:1].isspace() and line.strip():
+                rules[-1] += line
+            else:
+                continued = False
+        for rule in rules:
+            target = _RULE_TARGET.search(rule)
+            if target is None:
+                continue
+            name, kind = target.group(1), _RULE_KINDS[target.group(2)]
+            selected = TriggerTarget(kind, name, role)
+            triggers += [(phrase, selected) for phrase in _PHRASE.findall(rule)]
+    return triggers
+
+
+def _stamp(project_root: Path) -> dict[str, list[int]]:
+    """Get the mtime and size of every file phrases are read from."""
+    root = os.path.join(project_root, "")
+    paths = [root + path for path in scoped_rule_files(project_root)]
+    for plugin_dir in find_role_plugins(project_root):
+        paths += [path for path, _, _ in _plugin_files(str(plugin_dir))]
+    stamp: dict[str, list[int]] = {}
+    for path in paths:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        relative = path[len(root) :].replace(os.sep, "/")
+        stamp[relative] = [stat.st_mtime_ns, stat.st_size]
+    return stamp
+
+
+def collect_triggers(project_root: Path) -> list[tuple[str, TriggerTarget]]:
+    """Read every trigger phrase of a project.
+
+    Args:
+        project_root: Path to the project root directory.
+
+    Returns:
+        (phrase, target) pairs from the role plugins' agents and skills,
+        followed by those of the activation rules in context-forge.md and
+        its directory-scoped shards.
+    """
+    triggers: list[tuple[str, TriggerTarget]] = []
+    for plugin_dir in find_role_plugins(project_root):
+        role = plugin_dir.name.removeprefix(ROLE_PLUGIN_PREFIX)
+        for path, kind, name in _plugin_files(str(plugin_dir)):
+            triggers += _file_triggers(path, kind, name, role)
+    for path in scoped_rule_files(project_root):
+        try:
+            content = (project_root / path).read_text(encoding="utf-8")
+        except (OSError, UnicodeDecodeError):
+            continue
+        triggers += _rule_triggers(content)
+    return triggers
+
+
+# =============================================================================
+# Index
+# =============================================================================
+
+
+@dataclass
+class TriggerIndex:
+    """Aho-Corasick automaton over the trigger phrases of a project.
+
+    State 0 is the root. ``goto[s]`` maps a character to the next state,
+    ``fail[s]`` is the longest proper suffix state, and ``output[s]`` lists
+    every phrase that ends in state ``s`` (failure outputs included), so
+    matching never follows failure links just to collect outputs.
+
+    Most states are in the middle of a phrase: they have a single child,
+    numbered right after them, and no output. Their ``goto`` entry is just
+    that child's character, and only the states that end a phrase have an
+    output entry. This keeps the cache file small and fast to load.
+    """
+
+    phrases: list[str]  # as first written
+    phrase_targets: list[list[int]]  # phrase -> indices into targets
+    targets: list[TriggerTarget]
+    goto: list[str | dict[str, int]]  # a str leads to state s + 1
+    fail: list[int]
+    output: dict[int, list[int]]
+    stamp: dict[str, list[int]] = field(default_factory=dict)
+    version: int = INDEX_VERSION
+
+    def match(self, prompt: str, limit: int | None = None) -> list[TriggerMatch]:
+        """Find the skills and agents whose phrases occur in a prompt.
+
+        Args:
+            prompt: User prompt.
+            limit: Return at most this many matches.
+
+        Returns:
+            Matches ranked by score (the total length of their matched
+            phrases, so specific phrases outweigh short ones), then by the
+            number of phrases, kind and name.
+        """
+        goto, fail, output = self.goto, self.fail, self.output
+        found: set[int] = set()
+        state = 0
+        for char in normalize_trigger(prompt):
+            while True:
+                edges = goto[state]
+                if isinstance(edges, str):
+                    if edges == char:
+                        state += 1
+                        break
+                elif char in edges:
+                    state = edges[char]
+                    break
+                if not state:
+                    break
+                state = fail[state]
+            hits = output.get(state)
+            if hits:
+                found.update(hits)
+
+        matches: dict[int, TriggerMatch] = {}
+        for phrase_id in sorted(found):
+            phrase = self.phrases[phrase_id]
+            for target_id in self.phrase_targets[phrase_id]:
+                match = matches.get(target_id)
+                if match is None:
+                    target = self.targets[target_id]
+                    match = TriggerMatch(target.kind, target.name, target.role, 0)
+                    matches[target_id] = match
+                match.score += len(normalize_trigger(phrase))
+                match.phrases.append(phrase)
+        ranked = sorted(
+            matches.values(),
+            key=lambda m: (-m.score, -len(m.phrases), m.kind, m.name, m.role),
+        )
+        return ranked if limit is None else ranked[:limit]
+
+
+def build_trigger_index(
+    triggers: list[tuple[str, TriggerTarget]],
+    stamp: dict[str, list[int]] | None = None,
+) -> TriggerIndex:
+    """Compile trigger phrases into an index.
+
+    Args:
+        triggers: (phrase, target) pairs; phrases equal after normalization
+            are merged.
+        stamp: File stamps the phrases were read with, kept for the cache.
+
+    Returns:
+        TriggerIndex over the phrases.
+    """
+    phrases: list[str] = []
+    phrase_targets: list[list[int]] = []
+    targets: list[TriggerTarget] = []
+    target_ids: dict[TriggerTarget, int] = {}
+    goto: list[dict[str, int]] = [{}]
+    output: dict[int, list[int]] = {}
+    phrase_ids: dict[str, int] = {}
+
+    for phrase, target in triggers:
+        key = normalize_trigger(phrase)
+        if not key:
+            continue
+        target_id = target_ids.setdefault(target, len(targets))
+        if target_id == len(targets):
+            targets.append(target)
+        phrase_id = phrase_ids.get(key)
+        if phrase_id is None:
+            phrase_id = phrase_ids[key] = len(phrases)
+            phrases.append(phrase.strip())
+            phrase_targets.append([])
+            state = 0
+            for char in key:
+                next_state = goto[state].get(char)
+                if next_state is None:
+                    next_state = goto[state][char] = len(goto)
+                    goto.append({})
+                state = next_state
+            output.setdefault(state, []).append(phrase_id)
+        if target_id not in phrase_targets[phrase_id]:
+            phrase_targets[phrase_id].append(target_id)
+
+    # Breadth-first, so a state's failure target is final before its children
+    fail = [0] * len(goto)
+    queue = deque(goto[0].values())
+    while queue:
+        state = queue.popleft()
+        for char, child in goto[state].items():
+            queue.append(child)
+            suffix = fail[state]
+            while suffix and char not in goto[suffix]:
+                suffix = fail[suffix]
+            fail[child] = goto[suffix].get(char, 0)
+            if fail[child] in output:
+                output.setdefault(child, []).extend(output[fail[child]])
+
+    # Phrases are inserted a character at a time, so a state with one child
+    # is usually followed by that child
+    packed: list[str | dict[str, int]] = [
+        next(iter(edges)) if len(edges) == 1 and state + 1 in edges.values() else edges
+        for state, edges in enumerate(goto)
+    ]
+
+    return TriggerIndex(
+        phrases=phrases,
+        phrase_targets=phrase_targets,
+        targets=targets,
+        goto=packed,
+        fail=fail,
+        output=output,
+        stamp=stamp or {},
+    )
+
+
+def _parse_index(text: str) -> TriggerIndex | None:
+    """Deserialize an index, or None if it is malformed or outdated."""
+    try:
+        raw = json.loads(text)
+        if raw.get("version") != INDEX_VERSION:
+            return None
+        raw["targets"] = [TriggerTarget(*target) for target in raw["targets"]]
+        raw["output"] = {row[0]: row[1:] for row in raw["output"]}
+        return TriggerIndex(**raw)
+    except (ValueError, KeyError, TypeError, AttributeError):
+        return None
+
+
+def save_trigger_index(project_root: Path, index: TriggerIndex) -> None:
+    """Write the index to its cache file; failures are ignored.
+
+    Args:
+        project_root: Path to the project root directory.
+        index: Index to save.
+    """
+    raw = {
+        **vars(index),
+        "targets": [[t.kind, t.name, t.role] for t in index.targets],
+        "output": [[state, *ids] for state, ids in index.output.items()],
+    }
+    text = json.dumps(raw, ensure_ascii=False, separators=(",", ":"))
+    try:
+        write_if_changed(project_root / TRIGGER_INDEX_PATH, text + "\n")
+    except OSError:
+        pass  # the cache is optional
+
+
+def load_trigger_index(project_root: Path, use_cache: bool = True) -> TriggerIndex:
+    """Get the trigger index of a project, rebuilding it if a source changed.
+
+    Checking the cache costs one directory listing per role plugin and one
+    stat() per agent and skill file; the phrases are only read again when a
+    stamp differs.
+
+    Args:
+        project_root: Path to the project root directory.
+        use_cache: Reuse and update the cached index.
+
+    Returns:
+        TriggerIndex over the current phrases (empty without any).
+    """
+    stamp = _stamp(project_root)
+    cache_path = project_root / TRIGGER_INDEX_PATH
+    if use_cache:
+        try:
+            index = _parse_index(cache_path.read_text(encoding="utf-8"))
+        except OSError:
+            index = None
+        if index is not None and index.stamp == stamp:
+            return index
+
+    index = build_trigger_index(collect_triggers(project_root), stamp)
+    if use_cache:
+        save_trigger_index(project_root, index)
+    return index
+
+
+def match_triggers(
+    project_root: Path, prompt: str, limit: int | None = None
+) -> list[TriggerMatch]:
+    """Rank the skills and agents a prompt activates.
+
+    Callers matching many prompts should keep the result of
+    :func:`load_trigger_index` and call :meth:`TriggerIndex.match` instead.
+
+    Args:
+        project_root: Path to the project root directory.
+        prompt: User prompt.
+        limit: Return at most this many matches.
+
+    Returns:
+        Ranked matches; empty if no phrase occurs in the prompt.
+    """
+    return load_trigger_index(project_root).match(prompt, limit)
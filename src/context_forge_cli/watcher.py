@@ -0,0 +1,264 @@
+"""Watch mode: revalidate what changed in .claude/ as it changes.
+
+:class:`Watcher` polls ``CLAUDE.md`` and the ``.claude/`` tree with stat()
+only (no external dependencies). A directory is listed again only when its
+own mtime changed, so a quiet cycle costs one stat() per file and directory
+and reads nothing. Each changed file is then handled on its own:
+
+- ``CLAUDE.md``: the context-forge reference is restored if it was removed
+- ``.claude/context-forge.md``: the role index is rebuilt
+- role plugin agents: linted against the Sub Agent quality rules
+- other role plugin files: the plugin's ``plugin.json`` and ``hooks.json``
+  are checked
+
+The caches context-forge keeps in ``.claude/`` and temporary files from
+atomic writes are ignored, so the watcher's own writes do not wake it up.
+"""
+
+import os
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from context_forge_cli.constants import (
+    CONTEXT_FORGE_INDEX_PATH,
+    CONTEXT_FORGE_MD_PATH,
+    LINT_CACHE_PATH,
+    MIGRATE_STATE_PATH,
+    PLUGINS_DIR,
+    ROLE_PLUGIN_PREFIX,
+    ROLE_PLUGINS_CACHE_PATH,
+    TRIGGER_INDEX_PATH,
+)
+
+# Files under .claude/ written by context-forge itself
+IGNORED_FILES = frozenset(
+    {
+        CONTEXT_FORGE_INDEX_PATH,
+        ROLE_PLUGINS_CACHE_PATH,
+        MIGRATE_STATE_PATH,
+        LINT_CACHE_PATH,
+        TRIGGER_INDEX_PATH,
+    }
+)
+
+
+@dataclass
+class WatchReport:
+    """What one polling cycle found and did."""
+
+    changes: dict[str, str] = field(default_factory=dict)  # path -> kind
+    messages: list[str] = field(default_factory=list)
+    problems: list[str] = field(default_factory=list)
+    elapsed_ms: float = 0.0
+
+
+class Watcher:
+    """Stat-based poller that revalidates changed files."""
+
+    def __init__(self, project_root: Path) -> None:
+        self.project_root = project_root
+        # Directory -> (mtime_ns, [(name, is_dir)]) from its last listing
+        self._dirs: dict[str, tuple[int, list[tuple[str, bool]]]] = {}
+        # Relative file path -> (mtime_ns, size)
+        self._files: dict[str, tuple[int, int]] = {}
+
+    # -------------------------------------------------------------------------
+    # Change detection
+    # -------------------------------------------------------------------------
+
+    def _listing(self, directory: str) -> list[tuple[str, bool]] | None:
+        """List a directory, reusing the last listing if its mtime is the same."""
+        try:
+            mtime_ns = os.stat(directory).st_mtime_ns
+        except OSError:
+            return None
+        cached = self._dirs.get(directory)
+        if cached is not None and cached[0] == mtime_ns:
+            return cached[1]
+        try:
+            with os.scandir(directory) as it:
+                entries = [(e.name, e.is_dir(follow_symlinks=False)) for e in it]
+        except OSError:
+            return None
+        self._dirs[directory] = (mtime_ns, entries)
+        return entries
+
+    def _stat_files(self) -> dict[str, tuple[int, int]]:
+        """Get (mtime_ns, size) of every watched file."""
+        root = str(self.project_root)
+        files: dict[str, tuple[int, int]] = {}
+        visited: set[str] = set()
+        pending = [os.path.join(root, ".claude")]
+        candidates = [os.path.join(root, "CLAUDE.md")]
+        while pending:
+            directory = pending.pop()
+            entries = self._listing(directory)
+            if entries is None:
+                continue
+            visited.add(directory)
+            for name, is_dir in entries:
+                path = os.path.join(directory, name)
+                if is_dir:
+                    pending.append(path)
+                elif not (name.startswith(".") and name.endswith(".tmp")):
+                    candidates.append(path)
+
+        for path in candidates:
+            relative = os.path.relpath(path, root).replace(os.sep, "/")
+            if relative in IGNORED_FILES:
+                continue
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            files[relative] = (stat.st_mtime_ns, stat.st_size)
+
+        # Forget directories that are gone
+        for directory in self._dirs.keys() - visited:
+            del self._dirs[directory]
+        return files
+
+    def poll(self) -> dict[str, str]:
+        """Find the files created, modified or deleted since the last poll.
+
+        Returns:
+            Relative path -> "created", "modified" or "deleted".
+        """
+        files = self._stat_files()
+        changes = {
+            path: "created" if path not in self._files else "modified"
+            for path, stamp in files.items()
+            if self._files.get(path) != stamp
+        }
+        changes.update(dict.fromkeys(self._files.keys() - files.keys(), "deleted"))
+        self._files = files
+        return changes
+
+    # -------------------------------------------------------------------------
+    # Revalidation
+    # -------------------------------------------------------------------------
+
+    def _check_claude_md(self, report: WatchReport) -> None:
+        from context_forge_cli.claude_md import read_claude_md
+        from context_forge_cli.initializer import ensure_claude_md_reference
+
+        claude_md = read_claude_md(self.project_root)
+        if claude_md is None or claude_md.has_reference:
+            return
+        if not (self.project_root / CONTEXT_FORGE_MD_PATH).exists():
+            return
+        try:
+            ensure_claude_md_reference(self.project_root, claude_md)
+        except OSError as e:
+            report.problems.append(f"CLAUDE.md: cannot restore the reference ({e})")
+            return
+        report.messages.append("CLAUDE.md: restored the context-forge reference")
+        # Record our own write so the next poll does not report it
+        stat = claude_md.path.stat()
+        self._files["CLAUDE.md"] = (stat.st_mtime_ns, stat.st_size)
+
+    def _check_context_forge_md(self, report: WatchReport) -> None:
+        from context_forge_cli.role_index import load_role_index
+
+        index = load_role_index(self.project_root)
+        if index is None:
+            report.problems.append(f"{CONTEXT_FORGE_MD_PATH}: file was deleted")
+            return
+        rules = sum(entry.rule_count for entry in index.roles.values())
+        report.messages.append(
+            f"{CONTEXT_FORGE_MD_PATH}: reindexed {len(index.roles)} roles, "
+            f"{rules} rules"
+        )
+
+    def _check_agents(self, paths: list[str], report: WatchReport) -> None:
+        from context_forge_cli.agent_lint import lint_agents
+
+        results = lint_agents(
+            self.project_root,
+            [self.project_root / p for p in paths],
+            jobs=1,
+            prune_cache=False,
+        )
+        for relative, result in zip(paths, results, strict=True):
+            if result.error:
+                report.problems.append(f"{relative}: {result.error}")
+            report.problems += [
+                f"{relative}:{issue.line}: {issue.rule.value} {issue.message}"
+                for issue in result.issues
+            ]
+            if not result.issues and not result.error:
+                report.messages.append(f"{relative}: lint passed")
+
+    def _check_plugins(self, plugin_names: set[str], report: WatchReport) -> None:
+        from context_forge_cli.role_plugins import scan_role_plugin
+
+        plugins_dir = self.project_root / PLUGINS_DIR
+        for name in sorted(plugin_names):
+            if not (plugins_dir / name).is_dir():
+                report.messages.append(f"{PLUGINS_DIR}/{name}: plugin removed")
+                continue
+            plugin = scan_role_plugin(plugins_dir / name)
+            if plugin.error:
+                report.problems.append(f"{PLUGINS_DIR}/{name}: {plugin.error}")
+            else:
+                report.messages.append(
+                    f"{PLUGINS_DIR}/{name}: {plugin.knowledge_count} knowledge items"
+                )
+
+    def check(self, changes: dict[str, str]) -> WatchReport:
+        """Revalidate the changed files.
+
+        Args:
+            changes: Result of :meth:`poll`.
+
+        Returns:
+            WatchReport with what was done and the problems found.
+        """
+        start = time.perf_counter()
+        report = WatchReport(changes=changes)
+        agents: list[str] = []
+        plugins: set[str] = set()
+        for path, kind in sorted(changes.items()):
+            if path == "CLAUDE.md" and kind != "deleted":
+                self._check_claude_md(report)
+            elif path == CONTEXT_FORGE_MD_PATH:
+                self._check_context_forge_md(report)
+            elif path.startswith(f"{PLUGINS_DIR}/{ROLE_PLUGIN_PREFIX}"):
+                plugin, _, inside = path.removeprefix(f"{PLUGINS_DIR}/").partition("/")
+                if inside.startswith("agents/") and inside.endswith(".md"):
+                    if kind != "deleted":
+                        agents.append(path)
+                else:
+                    plugins.add(plugin)
+        if agents:
+            self._check_agents(agents, report)
+        if plugins:
+            self._check_plugins(plugins, report)
+        report.elapsed_ms = (time.perf_counter() - start) * 1000
+        return report
+
+    def run(
+        self,
+        on_report: Callable[[WatchReport], None],
+        interval: float = 0.5,
+        cycles: int | None = None,
+    ) -> None:
+        """Poll and revalidate until interrupted.
+
+        The first cycle records the current state and checks every file.
+
+        Args:
+            on_report: Called with each report that has changes.
+            interval: Seconds between polls.
+            cycles: Stop after this many polls (default: run forever).
+        """
+        count = 0
+        while cycles is None or count < cycles:
+            if count:
+                time.sleep(interval)
+            changes = self.poll()
+            if changes:
+                on_report(self.check(changes))
+            count += 1
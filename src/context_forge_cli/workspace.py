@@ -0,0 +1,129 @@
+"""Workspace mode: initialize many projects under one root in parallel."""
+
+import os
+from collections.abc import Iterator, Sequence
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from context_forge_cli.constants import EXIT_ERROR
+from context_forge_cli.initializer import (
+    ConflictPolicy,
+    ProjectInitResult,
+    init_project,
+)
+
+# Files or directories whose presence marks a directory as a project root
+PROJECT_ROOT_MARKERS = (".git", "CLAUDE.md")
+
+# Directories never searched for projects (in addition to hidden ones)
+SKIPPED_DIR_NAMES = frozenset({"node_modules", "venv", "__pycache__"})
+
+
+def find_project_roots(workspace_root: Path) -> list[Path]:
+    """Find project roots under a workspace directory.
+
+    A project root is a directory containing ``.git`` or ``CLAUDE.md``. The
+    search does not descend into a project root once found, so subdirectories
+    of a monorepo are not treated as separate projects. Hidden directories
+    and dependency folders such as ``node_modules`` are skipped.
+
+    Args:
+        workspace_root: Directory to search.
+
+    Returns:
+        Sorted list of project root paths.
+    """
+    roots: list[Path] = []
+    pending = [str(workspace_root)]
+
+    while pending:
+        directory = pending.pop()
+        try:
+            with os.scandir(directory) as it:
+                entries = list(it)
+        except OSError:
+            # Unreadable directory: nothing we could initialize there anyway
+            continue
+
+        names = {entry.name for entry in entries}
+        if any(marker in names for marker in PROJECT_ROOT_MARKERS):
+            roots.append(Path(directory))
+            continue
+
+        for entry in entries:
+            if (
+                entry.name.startswith(".")
+                or entry.name in SKIPPED_DIR_NAMES
+                or not entry.is_dir(follow_symlinks=False)
+            ):
+                continue
+            pending.append(entry.path)
+
+    return sorted(roots)
+
+
+def _init_project_safely(
+    project_root: Path,
+    skip_install: bool,
+    on_conflict: ConflictPolicy,
+    store: Path | None = None,
+    gitignore: bool = True,
+) -> ProjectInitResult:
+    """Run init_project, turning unexpected exceptions into a failed result."""
+    try:
+        return init_project(project_root, skip_install, on_conflict, store, gitignore)
+    except Exception as e:  # One project must not abort the whole run
+        return ProjectInitResult(
+            project_root=project_root, error=str(e), exit_code=EXIT_ERROR
+        )
+
+
+def run_workspace_init(
+    project_roots: Sequence[Path],
+    jobs: int | None = None,
+    skip_install: bool = False,
+    on_conflict: ConflictPolicy = ConflictPolicy.SKIP,
+    store: Path | None = None,
+    gitignore: bool = True,
+) -> Iterator[ProjectInitResult]:
+    """Initialize projects in parallel worker processes.
+
+    Args:
+        project_roots: Projects to initialize.
+        jobs: Number of worker processes (default: CPU count). With one job,
+            or a single project, everything runs in the current process.
+        skip_install: Skip installation of the available commands.
+        on_conflict: Policy for existing command files with different content.
+        store: Shared template store to hardlink command files from.
+        gitignore: List context-forge's caches in .claude/.gitignore.
+
+    Yields:
+        ProjectInitResult for each project, in completion order.
+    """
+    workers = min(jobs or os.cpu_count() or 1, len(project_roots))
+    if workers <= 1:
+        for project_root in project_roots:
+            yield _init_project_safely(
+                project_root, skip_install, on_conflict, store, gitignore
+            )
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(
+                _init_project_safely,
+                root,
+                skip_install,
+                on_conflict,
+                store,
+                gitignore,
+            ): root
+            for root in project_roots
+        }
+        for future in as_completed(futures):
+            try:
+                yield future.result()
+            except Exception as e:  # e.g. the worker process was killed
+                yield ProjectInitResult(
+                    project_root=futures[future], error=str(e), exit_code=EXIT_ERROR
+                )
@@ -1,5 +1,6 @@
 """Integration tests for context-forge CLI."""
 
+import json
 import os
 from collections.abc import Generator
 from pathlib import Path
@@ -12,6 +13,12 @@ from context_forge_cli import (
     CLAUDE_MD_START_MARKER,
     CONTEXT_FORGE_MD_PATH,
     CONTEXT_FORGE_MD_REFERENCE,
+    CONTEXT_FORGE_ROLES_DIR,
+    EXIT_BUDGET_EXCEEDED,
+    EXIT_ERROR,
+    EXIT_FILE_ERROR,
+    EXIT_PARTIAL_FAILURE,
+    RULE_JOURNAL_PATH,
     __version__,
     app,
 )
@@ -116,8 +123,10 @@ def test_init_command_existing_directory(in_temp_dir: Path) -> None:
 
 def test_init_command_overwrite_prompt(in_temp_dir: Path) -> None:
     """Test that init prompts for overwrite when files exist."""
-    # First init
+    # First init, then edit the installed files so they differ from templates
     runner.invoke(app, ["init"])
+    for command_file in (in_temp_dir / ".claude" / "commands").glob("*.md"):
+        command_file.write_text("locally edited", encoding="utf-8")
 
     # Second init - should prompt for each file, decline with 'n'
     # Need to provide 'n' for each template file (add-role-knowledge.md, migrate.md)
@@ -127,6 +136,23 @@ def test_init_command_overwrite_prompt(in_temp_dir: Path) -> None:
     assert "Skipped" in result.stdout or "already" in result.stdout.lower()
 
 
+def test_init_command_unchanged_files_do_not_prompt(in_temp_dir: Path) -> None:
+    """Test that identical installed files are reported unchanged, not rewritten."""
+    runner.invoke(app, ["init"])
+    command_file = (
+        in_temp_dir / ".claude" / "commands" / "context-forge.add-role-knowledge.md"
+    )
+    os.utime(command_file, (0, 0))
+
+    # No input: a prompt would abort the command
+    result = runner.invoke(app, ["init"])
+
+    assert result.exit_code == 0
+    assert "Unchanged 'add-role-knowledge'" in result.stdout
+    assert "0 installed, 2 unchanged" in result.stdout
+    assert command_file.stat().st_mtime == 0
+
+
 def test_init_command_force_flag(in_temp_dir: Path) -> None:
     """Test that --force flag skips overwrite confirmation."""
     # First init
@@ -142,6 +168,48 @@ def test_init_command_force_flag(in_temp_dir: Path) -> None:
     assert add_role_knowledge.exists()
 
 
+def test_init_on_conflict_fail(in_temp_dir: Path) -> None:
+    """Test that --on-conflict=fail exits non-zero instead of prompting."""
+    runner.invoke(app, ["init"])
+    command_file = (
+        in_temp_dir / ".claude" / "commands" / "context-forge.add-role-knowledge.md"
+    )
+    command_file.write_text("locally edited", encoding="utf-8")
+
+    result = runner.invoke(app, ["init", "--on-conflict", "fail"])
+
+    assert result.exit_code == EXIT_ERROR
+    assert "Failed 'add-role-knowledge'" in result.stdout
+    assert command_file.read_text(encoding="utf-8") == "locally edited"
+
+
+def test_init_on_conflict_if_changed(in_temp_dir: Path) -> None:
+    """Test that --on-conflict=if-changed rewrites only files that differ."""
+    runner.invoke(app, ["init"])
+    commands_dir = in_temp_dir / ".claude" / "commands"
+    edited = commands_dir / "context-forge.add-role-knowledge.md"
+    edited.write_text("locally edited", encoding="utf-8")
+
+    result = runner.invoke(app, ["init", "--on-conflict", "if-changed"])
+
+    assert result.exit_code == 0
+    assert "1 installed, 1 unchanged, 0 skipped" in result.stdout
+    assert edited.read_text(encoding="utf-8") != "locally edited"
+
+
+def test_init_on_conflict_skip(in_temp_dir: Path) -> None:
+    """Test that --on-conflict=skip keeps modified files without prompting."""
+    runner.invoke(app, ["init"])
+    edited = in_temp_dir / ".claude" / "commands" / "context-forge.migrate.md"
+    edited.write_text("locally edited", encoding="utf-8")
+
+    result = runner.invoke(app, ["init", "--on-conflict", "skip"])
+
+    assert result.exit_code == 0
+    assert "Skipped 'migrate'" in result.stdout
+    assert edited.read_text(encoding="utf-8") == "locally edited"
+
+
 # =============================================================================
 # User Story 2: CLAUDE.md 肥大化防止 (T009-T013a)
 # =============================================================================
@@ -162,6 +230,23 @@ def test_init_creates_context_forge_md(in_temp_dir: Path) -> None:
     assert "## Skill/SubAgent 発動ルール" in content
 
 
+def test_init_gitignore_and_opt_out(in_temp_dir: Path) -> None:
+    """Test that init lists caches in .claude/.gitignore unless told not to."""
+    from context_forge_cli import run_init_json
+
+    gitignore = in_temp_dir / ".claude" / ".gitignore"
+    result = runner.invoke(app, ["init", "--skip-install", "--no-gitignore"])
+    assert result.exit_code == 0
+    assert not gitignore.exists()
+
+    assert run_init_json(["--json", "--skip-install", "--no-gitignore"]) == 0
+    assert not gitignore.exists()
+
+    result = runner.invoke(app, ["init", "--skip-install"])
+    assert result.exit_code == 0
+    assert "context-forge.index.json" in gitignore.read_text(encoding="utf-8")
+
+
 def test_init_creates_claude_md_with_reference_when_not_exists(
     in_temp_dir: Path,
 ) -> None:
@@ -249,3 +334,519 @@ def test_claude_md_reference_is_under_10_lines(in_temp_dir: Path) -> None:
     # CLAUDE.md should have 10 or fewer lines when created fresh
     # (This verifies SC-002: CLAUDE.md reference should be minimal)
     assert len(lines) <= 10, f"CLAUDE.md has {len(lines)} lines, expected <= 10"
+
+
+# =============================================================================
+# Workspace Mode: init --workspace
+# =============================================================================
+
+
+def test_init_workspace_initializes_all_projects(tmp_path: Path) -> None:
+    """Test that init --workspace initializes every project non-interactively."""
+    for name in ("service-a", "service-b"):
+        (tmp_path / name / ".git").mkdir(parents=True)
+    # An already-initialized project must not prompt in workspace mode
+    runner.invoke(app, ["init", "--workspace", str(tmp_path), "--jobs", "1"])
+
+    result = runner.invoke(app, ["init", "--workspace", str(tmp_path), "-j", "2"])
+
+    assert result.exit_code == 0
+    assert "service-a" in result.stdout
+    assert "2 succeeded, 0 failed" in result.stdout
+    for name in ("service-a", "service-b"):
+        assert (tmp_path / name / CONTEXT_FORGE_MD_PATH).exists()
+
+
+def test_init_workspace_partial_failure_exit_code(tmp_path: Path) -> None:
+    """Test that a failing project yields the partial-failure exit code."""
+    (tmp_path / "good" / ".git").mkdir(parents=True)
+    (tmp_path / "bad" / ".git").mkdir(parents=True)
+    (tmp_path / "bad" / ".claude").write_text("not a directory", encoding="utf-8")
+
+    result = runner.invoke(app, ["init", "--workspace", str(tmp_path)])
+
+    assert result.exit_code == EXIT_PARTIAL_FAILURE
+    assert "1 succeeded, 1 failed" in result.stdout
+
+
+def test_init_workspace_without_projects(tmp_path: Path) -> None:
+    """Test that init --workspace fails when no projects are found."""
+    result = runner.invoke(app, ["init", "--workspace", str(tmp_path)])
+    assert result.exit_code == EXIT_ERROR
+
+
+def test_init_jobs_requires_workspace(in_temp_dir: Path) -> None:
+    """Test that --jobs without --workspace is rejected."""
+    result = runner.invoke(app, ["init", "--jobs", "2"])
+    assert result.exit_code == EXIT_ERROR
+
+
+# =============================================================================
+# Add Rules Command
+# =============================================================================
+
+
+def test_add_rules_from_stdin(in_temp_dir: Path) -> None:
+    """Test that add-rules reads JSON from stdin and writes all rules."""
+    runner.invoke(app, ["init", "--skip-install"])
+
+    result = runner.invoke(
+        app, ["add-rules"], input='{"software-engineer": ["- a", "- b"], "qa": "c"}'
+    )
+
+    assert result.exit_code == 0
+    assert "3 rules" in result.stdout
+    content = (in_temp_dir / CONTEXT_FORGE_MD_PATH).read_text(encoding="utf-8")
+    assert "### software-engineer ロール\n\n- a\n- b\n" in content
+    assert "### qa ロール\n\n- c\n" in content
+
+
+def test_add_rules_from_yaml_file(in_temp_dir: Path) -> None:
+    """Test that add-rules reads a YAML file and extends existing roles."""
+    runner.invoke(app, ["add-rules"], input='{"qa": ["- first"]}')
+    rules_file = in_temp_dir / "rules.yaml"
+    rules_file.write_text("qa:\n  - second\n", encoding="utf-8")
+
+    result = runner.invoke(app, ["add-rules", str(rules_file)])
+
+    assert result.exit_code == 0
+    content = (in_temp_dir / CONTEXT_FORGE_MD_PATH).read_text(encoding="utf-8")
+    assert "### qa ロール\n\n- first\n- second\n" in content
+
+
+def test_add_rules_invalid_input(in_temp_dir: Path) -> None:
+    """Test that add-rules rejects malformed input."""
+    result = runner.invoke(app, ["add-rules"], input="[1, 2]")
+    assert result.exit_code == EXIT_ERROR
+    assert not (in_temp_dir / CONTEXT_FORGE_MD_PATH).exists()
+
+
+def test_add_rules_skips_existing_rules(in_temp_dir: Path) -> None:
+    """Test that add-rules does not add a rule the role already has."""
+    runner.invoke(app, ["add-rules"], input='{"eng": ["- rule"]}')
+    result = runner.invoke(app, ["add-rules"], input='{"eng": ["- Rule"]}')
+
+    assert result.exit_code == 0
+    assert "Added 0 rules" in result.stdout
+    content = (in_temp_dir / CONTEXT_FORGE_MD_PATH).read_text(encoding="utf-8")
+    assert content.count("- rule") == 1
+
+
+# =============================================================================
+# Compact Command
+# =============================================================================
+
+
+def test_compact_removes_duplicates(in_temp_dir: Path) -> None:
+    """Test that compact rewrites the file and reports the savings."""
+    path = in_temp_dir / CONTEXT_FORGE_MD_PATH
+    path.parent.mkdir()
+    content = "### a ロール\n\n- x\n- x\n\n### a ロール\n\n- y\n"
+    path.write_text(content, encoding="utf-8")
+
+    dry_run = runner.invoke(app, ["compact", "--dry-run"])
+    assert dry_run.exit_code == 0
+    assert "Would remove 1 duplicate rules" in dry_run.stdout
+    assert path.read_text(encoding="utf-8") == content
+
+    result = runner.invoke(app, ["compact"])
+    assert result.exit_code == 0
+    assert "merged 1 duplicate role sections" in result.stdout
+    assert path.read_text(encoding="utf-8") == "### a ロール\n\n- x\n- y\n"
+
+    again = runner.invoke(app, ["compact"])
+    assert "already compact" in again.stdout
+
+
+def test_compact_without_file(in_temp_dir: Path) -> None:
+    """Test that compact fails when context-forge.md does not exist."""
+    result = runner.invoke(app, ["compact"])
+    assert result.exit_code == EXIT_FILE_ERROR
+
+
+# =============================================================================
+# Stats Command
+# =============================================================================
+
+
+def test_stats_json_report(in_temp_dir: Path) -> None:
+    """Test that stats --json reports totals and per-role usage."""
+    runner.invoke(app, ["init"])
+    runner.invoke(app, ["add-rules"], input='{"eng": ["- rule"]}')
+
+    result = runner.invoke(app, ["stats", "--json"])
+
+    assert result.exit_code == 0
+    report = json.loads(result.stdout)
+    assert report["total"]["always_tokens"] > 0
+    assert report["total"]["on_demand_tokens"] > 0  # installed command bodies
+    assert "eng" in report["by_role"]
+    assert ".claude/context-forge.md" in report["by_file"]
+
+
+def test_stats_budget_exceeded_fails(in_temp_dir: Path) -> None:
+    """Test that stats exits non-zero when a budget is exceeded."""
+    runner.invoke(app, ["init"])
+
+    within = runner.invoke(app, ["stats", "--max-always-tokens", "100000"])
+    over = runner.invoke(app, ["stats", "--max-always-tokens", "1"])
+
+    assert within.exit_code == 0
+    assert over.exit_code == EXIT_BUDGET_EXCEEDED
+    assert "Always loaded" in over.stdout
+
+
+# =============================================================================
+# Roles Command
+# =============================================================================
+
+
+def test_roles_list_json(in_temp_dir: Path) -> None:
+    """Test that roles list --json reports each role plugin's counts."""
+    plugin_dir = in_temp_dir / ".claude" / "plugins" / "context-forge.role-eng"
+    (plugin_dir / ".claude-plugin").mkdir(parents=True)
+    (plugin_dir / ".claude-plugin" / "plugin.json").write_text(
+        '{"name": "context-forge.role-eng", "description": "エンジニア"}',
+        encoding="utf-8",
+    )
+    (plugin_dir / "commands").mkdir()
+    (plugin_dir / "commands" / "review.md").write_text("x", encoding="utf-8")
+    (plugin_dir / "skills" / "react").mkdir(parents=True)
+
+    result = runner.invoke(app, ["roles", "list", "--json"])
+
+    assert result.exit_code == 0
+    [plugin] = json.loads(result.stdout)
+    assert plugin["role"] == "eng"
+    assert plugin["description"] == "エンジニア"
+    assert (plugin["commands"], plugin["skills"]) == (1, 1)
+    assert plugin["knowledge_count"] == 2
+
+
+def test_roles_list_without_plugins(in_temp_dir: Path) -> None:
+    """Test that roles list reports when there are no role plugins."""
+    result = runner.invoke(app, ["roles", "list"])
+
+    assert result.exit_code == 0
+    assert "No role plugins" in result.stdout
+
+
+# =============================================================================
+# Migrate Command
+# =============================================================================
+
+
+def test_migrate_updates_plugin_version(in_temp_dir: Path) -> None:
+    """Test that migrate brings plugin.json to the current version."""
+    manifest = (
+        in_temp_dir
+        / ".claude"
+        / "plugins"
+        / "context-forge.role-eng"
+        / ".claude-plugin"
+        / "plugin.json"
+    )
+    manifest.parent.mkdir(parents=True)
+    manifest.write_text('{"name": "x", "version": "0.0.1"}', encoding="utf-8")
+
+    result = runner.invoke(app, ["migrate", "eng"])
+
+    assert result.exit_code == 0
+    assert "Updated" in result.stdout
+    assert json.loads(manifest.read_text(encoding="utf-8"))["version"] == __version__
+
+
+def test_migrate_unknown_plugin_fails(in_temp_dir: Path) -> None:
+    """Test that migrate fails for a plugin that does not exist."""
+    result = runner.invoke(app, ["migrate", "missing"])
+
+    assert result.exit_code == EXIT_ERROR
+
+
+# =============================================================================
+# Lint Command
+# =============================================================================
+
+
+def test_lint_reports_and_fixes_issues(in_temp_dir: Path) -> None:
+    """Test that lint fails on issues and --fix repairs the fixable ones."""
+    agent = (
+        in_temp_dir
+        / ".claude"
+        / "plugins"
+        / "context-forge.role-eng"
+        / "agents"
+        / "review.md"
+    )
+    agent.parent.mkdir(parents=True)
+    agent.write_text("# Review\n\n```bash\ngit add $FILE\n```\n", encoding="utf-8")
+
+    report = runner.invoke(app, ["lint", "--json"])
+    fixed = runner.invoke(app, ["lint", "--fix"])
+    clean = runner.invoke(app, ["lint"])
+
+    assert report.exit_code == EXIT_ERROR
+    assert json.loads(report.stdout)["summary"]["fixable"] == 3
+    assert fixed.exit_code == 0
+    assert "Fixed 3 issues" in fixed.stdout
+    assert clean.exit_code == 0
+
+
+# =============================================================================
+# Watch Command
+# =============================================================================
+
+
+def test_watch_once_restores_claude_md_reference(in_temp_dir: Path) -> None:
+    """Test that watch --once puts back a removed CLAUDE.md reference."""
+    runner.invoke(app, ["init", "--skip-install"])
+    (in_temp_dir / "CLAUDE.md").write_text("# Project\n", encoding="utf-8")
+
+    result = runner.invoke(app, ["watch", "--once"])
+
+    assert result.exit_code == 0
+    assert "restored the context-forge reference" in result.stdout
+    assert "context-forge.md" in (in_temp_dir / "CLAUDE.md").read_text()
+
+
+def test_watch_without_claude_dir_fails(in_temp_dir: Path) -> None:
+    """Test that watch fails outside an initialized project."""
+    result = runner.invoke(app, ["watch", "--once"])
+
+    assert result.exit_code == EXIT_ERROR
+
+
+# =============================================================================
+# Profiling
+# =============================================================================
+
+
+def test_profile_json_and_cprofile(in_temp_dir: Path) -> None:
+    """Test that --profile-json and --cprofile write their files."""
+    import pstats
+
+    result = runner.invoke(
+        app,
+        [
+            "--profile-json",
+            "profile.json",
+            "--cprofile",
+            "init.prof",
+            "init",
+            "--skip-install",
+        ],
+    )
+
+    assert result.exit_code == 0
+    profile = json.loads((in_temp_dir / "profile.json").read_text())
+    assert "create directories" in [s["name"] for s in profile["spans"]]
+    assert profile["counters"]["directories created"] == 2
+    assert pstats.Stats(str(in_temp_dir / "init.prof")).total_calls > 0
+
+
+# =============================================================================
+# Init JSON Output
+# =============================================================================
+
+
+def test_init_json_reports_files_and_commands(in_temp_dir: Path) -> None:
+    """Test that init --json prints one report without rich output."""
+    result = runner.invoke(app, ["init", "--json"])
+
+    assert result.exit_code == 0
+    report = json.loads(result.stdout)
+    [project] = report["projects"]
+    assert project["created_files"] == [
+        ".claude/context-forge.md",
+        ".claude/.gitignore",
+        "CLAUDE.md",
+    ]
+    assert "add-role-knowledge" in project["installed_commands"]
+    assert report["summary"]["failed"] == 0
+    assert report["exit_code"] == 0
+
+
+def test_init_json_fast_path_usage_error(
+    in_temp_dir: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    """Test that the fast path reports bad options as a JSON error."""
+    from context_forge_cli import run_init_json
+
+    exit_code = run_init_json(["--json", "--on-conflict", "sometimes"])
+
+    report = json.loads(capsys.readouterr().out)
+    assert exit_code == EXIT_ERROR
+    assert report["exit_code"] == EXIT_ERROR
+    assert "--on-conflict" in report["error"]
+    assert not (in_temp_dir / ".claude").exists()
+
+
+# =============================================================================
+# Template Store
+# =============================================================================
+
+
+def test_init_link_and_gc(in_temp_dir: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that init --link installs hardlinks and gc keeps linked blobs."""
+    monkeypatch.setenv("CONTEXT_FORGE_STORE", str(in_temp_dir / "store"))
+
+    result = runner.invoke(app, ["init", "--link"])
+    kept = runner.invoke(app, ["gc", "--min-age", "0", "--json"])
+    (in_temp_dir / ".claude" / "commands" / "context-forge.migrate.md").unlink()
+    collected = runner.invoke(app, ["gc", "--min-age", "0", "--json"])
+
+    assert result.exit_code == 0
+    assert "(hardlink)" in result.stdout
+    assert json.loads(kept.stdout)["removed"] == []
+    assert len(json.loads(collected.stdout)["removed"]) == 1
+
+
+# =============================================================================
+# Match Command
+# =============================================================================
+
+
+def test_match_ranks_agents_and_skills(in_temp_dir: Path) -> None:
+    """Test that match ranks the targets of the phrases in a prompt."""
+    agents = in_temp_dir / ".claude" / "plugins" / "context-forge.role-eng" / "agents"
+    agents.mkdir(parents=True)
+    (agents / "reviewer.md").write_text(
+        "---\nname: reviewer\ndescription: >\n"
+        "  ユーザーが「PRをレビューして」「コードレビュー」と言った場合に使用。\n---\n",
+        encoding="utf-8",
+    )
+    (in_temp_dir / ".claude" / "context-forge.md").write_text(
+        "### eng ロール\n\n"
+        "- ユーザーが「設計レビュー」について質問した場合、`design` Skill を参照\n",
+        encoding="utf-8",
+    )
+
+    result = runner.invoke(
+        app, ["match", "--json", "設計レビューとコードレビューをお願い"]
+    )
+    table = runner.invoke(app, ["match", "関係のない依頼"])
+
+    assert result.exit_code == 0
+    assert [(m["kind"], m["name"]) for m in json.loads(result.stdout)] == [
+        ("agent", "reviewer"),
+        ("skill", "design"),
+    ]
+    assert "No skill or agent matches" in table.stdout
+
+
+# =============================================================================
+# Hook Server
+# =============================================================================
+
+
+def test_hook_client_runs_handler_without_server(
+    in_temp_dir: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that hook-client runs the handler in-process when no server runs."""
+    monkeypatch.setenv("XDG_RUNTIME_DIR", str(in_temp_dir / "run"))
+    monkeypatch.delenv("CLAUDE_PROJECT_DIR", raising=False)
+    hooks = in_temp_dir / ".claude" / "plugins" / "context-forge.role-eng" / "hooks"
+    hooks.mkdir(parents=True)
+    (hooks / "guard.py").write_text(
+        "def handle(event):\n    return {'seen': event['tool_name']}\n",
+        encoding="utf-8",
+    )
+
+    event = '{"tool_name": "Bash"}'
+    result = runner.invoke(app, ["hook-client", "eng/guard"], input=event)
+    status = runner.invoke(app, ["hook-server", "status"])
+
+    assert result.exit_code == 0
+    assert json.loads(result.stdout) == {"seen": "Bash"}
+    assert status.exit_code == EXIT_ERROR
+
+
+# =============================================================================
+# Scope Commands
+# =============================================================================
+
+
+def test_scope_moves_role_rules_into_subdirectory(in_temp_dir: Path) -> None:
+    """Test that scope add/report/remove move rules and report savings."""
+    (in_temp_dir / "frontend").mkdir()
+    runner.invoke(app, ["init", "--skip-install"])
+    rules = {"frontend-engineer": ["- " + "画面のルール" * 20], "common": ["- 共通"]}
+    runner.invoke(app, ["add-rules"], input=json.dumps(rules))
+
+    added = runner.invoke(app, ["scope", "add", "frontend", "frontend-engineer"])
+    report = runner.invoke(app, ["scope", "report", "--json"])
+    removed = runner.invoke(app, ["scope", "remove", "frontend"])
+    missing = runner.invoke(app, ["scope", "add", "nowhere", "common"])
+
+    assert added.exit_code == 0
+    assert "frontend/.claude/context-forge.md" in added.stdout
+    usages = {u["directory"]: u for u in json.loads(report.stdout)}
+    assert usages["."]["roles"] == ["common"]
+    assert usages["."]["saved_bytes"] > 0
+    assert usages["frontend"]["roles"] == ["common", "frontend-engineer"]
+    assert removed.exit_code == 0
+    assert "frontend-engineer" in (in_temp_dir / CONTEXT_FORGE_MD_PATH).read_text(
+        encoding="utf-8"
+    )
+    assert missing.exit_code == EXIT_ERROR
+
+
+# =============================================================================
+# Layout Command
+# =============================================================================
+
+
+def test_layout_shards_and_merges_role_rules(in_temp_dir: Path) -> None:
+    """Test that layout sharded/single move rules and add-rules follow them."""
+    runner.invoke(app, ["init", "--skip-install"])
+    runner.invoke(app, ["add-rules"], input=json.dumps({"common": ["- 共通"]}))
+
+    sharded = runner.invoke(app, ["layout", "sharded"])
+    added = runner.invoke(app, ["add-rules"], input=json.dumps({"qa": ["- 検証"]}))
+    shown = runner.invoke(app, ["layout"])
+    roles_dir = in_temp_dir / CONTEXT_FORGE_ROLES_DIR
+    role_files = sorted(p.name for p in roles_dir.iterdir())
+    single = runner.invoke(app, ["layout", "single"])
+
+    assert sharded.exit_code == 0
+    assert added.exit_code == 0
+    assert "Layout: sharded" in shown.stdout
+    assert role_files == ["common.md", "qa.md"]
+    assert single.exit_code == 0
+    assert not roles_dir.exists()
+    content = (in_temp_dir / CONTEXT_FORGE_MD_PATH).read_text(encoding="utf-8")
+    assert "- 共通" in content
+    assert "- 検証" in content
+
+
+# =============================================================================
+# Rule Journal
+# =============================================================================
+
+
+def test_pending_journal_rules_are_folded(in_temp_dir: Path) -> None:
+    """Test that rules left in the journal are folded by the next command."""
+    runner.invoke(app, ["init", "--skip-install"])
+    added = runner.invoke(app, ["add-rules"], input='{"eng": ["- rule"]}')
+    record = {"rules": [["eng", "- 中断された書き込み"]], "compact": False}
+    (in_temp_dir / RULE_JOURNAL_PATH).write_text(
+        json.dumps(record) + "\n", encoding="utf-8"
+    )
+
+    result = runner.invoke(app, ["stats"])
+
+    assert "Added 1 rules" in added.stdout
+    assert result.exit_code == 0
+    assert not (in_temp_dir / RULE_JOURNAL_PATH).exists()
+    content = (in_temp_dir / CONTEXT_FORGE_MD_PATH).read_text(encoding="utf-8")
+    assert "- rule\n- 中断された書き込み" in content
+
+
+def test_rule_commands_do_not_create_claude_dir(in_temp_dir: Path) -> None:
+    """Test that compact and scope sync outside a project leave no .claude/."""
+    compacted = runner.invoke(app, ["compact"])
+    synced = runner.invoke(app, ["scope", "sync"])
+
+    assert compacted.exit_code == EXIT_FILE_ERROR
+    assert synced.exit_code == 0
+    assert list(in_temp_dir.iterdir()) == []
@@ -0,0 +1,105 @@
+"""Tests for the lazy-import startup path of the context-forge entry point."""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from context_forge_cli import FAST_HELP, __version__, app
+
+HEAVY_MODULES = ("typer", "rich", "yaml", "importlib.metadata")
+
+
+def _loaded_heavy_modules(code: str) -> list[str]:
+    """Run code in a fresh interpreter and report which heavy modules it loaded."""
+    probe = (
+        f"{code}\n"
+        "import sys\n"
+        f"loaded = [m for m in {HEAVY_MODULES!r} if m in sys.modules]\n"
+        "print('loaded:' + ','.join(loaded))\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", probe], capture_output=True, text=True, check=True
+    )
+    loaded = result.stdout.rpartition("loaded:")[2].strip()
+    return [m for m in loaded.split(",") if m]
+
+
+def test_package_import_is_lightweight() -> None:
+    """Importing the package must not pull in typer, rich, yaml or metadata."""
+    assert _loaded_heavy_modules("import context_forge_cli") == []
+
+
+@pytest.mark.parametrize("flag", ["--version", "-v", "--help"])
+def test_fast_path_skips_heavy_imports(flag: str) -> None:
+    """--version and --help are answered without importing the full CLI."""
+    code = (
+        "import sys\n"
+        f"sys.argv = ['context-forge', {flag!r}]\n"
+        "import context_forge_cli\n"
+        "context_forge_cli.main()"
+    )
+    assert _loaded_heavy_modules(code) == []
+
+
+def test_fast_path_version_output() -> None:
+    """Fast path --version prints the same line as the typer callback."""
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import context_forge_cli; context_forge_cli.main()",
+            "--version",
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert result.stdout == f"context-forge-cli v{__version__}\n"
+
+
+def test_fast_help_lists_every_command() -> None:
+    """FAST_HELP must stay in sync with the commands registered on the app."""
+    names = []
+    for command in app.registered_commands:
+        assert command.callback is not None
+        names.append(command.name or command.callback.__name__.replace("_", "-"))
+    # Subcommand groups such as "roles" and "scope"
+    names += [group.name for group in app.registered_groups if group.name]
+    assert len(names) == len(app.registered_commands) + len(app.registered_groups)
+    for name in names:
+        assert f"\n  {name} " in FAST_HELP, f"'{name}' missing from FAST_HELP"
+
+
+def test_init_json_skips_heavy_imports(tmp_path: Path) -> None:
+    """init --json is answered without importing typer or rich."""
+    code = (
+        "import os, sys\n"
+        f"os.chdir({str(tmp_path)!r})\n"
+        "sys.argv = ['context-forge', 'init', '--json', '--skip-install']\n"
+        "import context_forge_cli\n"
+        "try:\n"
+        "    context_forge_cli.main()\n"
+        "except SystemExit as e:\n"
+        "    assert e.code == 0, e.code\n"
+    )
+    assert _loaded_heavy_modules(code) == []
+    assert (tmp_path / "CLAUDE.md").exists()
+
+
+def test_hook_client_skips_heavy_imports(tmp_path: Path) -> None:
+    """hook-client forwards an event without importing typer or rich."""
+    code = (
+        "import io, os, sys\n"
+        f"os.chdir({str(tmp_path)!r})\n"
+        f"os.environ['XDG_RUNTIME_DIR'] = {str(tmp_path)!r}\n"
+        "sys.stdin = io.TextIOWrapper(io.BytesIO(b'{}'))\n"
+        "sys.argv = ['context-forge', 'hook-client', 'eng/missing']\n"
+        "import context_forge_cli\n"
+        "try:\n"
+        "    context_forge_cli.main()\n"
+        "except SystemExit as e:\n"
+        "    assert e.code == 1, e.code\n"
+    )
+    assert _loaded_heavy_modules(code) == []
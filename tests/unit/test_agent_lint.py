@@ -0,0 +1,159 @@
+"""Unit tests for the Sub Agent linter."""
+
+from pathlib import Path
+
+import pytest
+
+from context_forge_cli import (
+    LINT_CACHE_PATH,
+    LintRule,
+    agent_lint,
+    find_agent_files,
+    fix_agent,
+    lint_agent,
+    lint_agents,
+)
+
+SECTIONS = """
+## トラブルシューティング
+
+- 再実行する
+
+## 注意事項
+
+- 確認する
+"""
+
+
+def _agent(code: str, sections: str = SECTIONS) -> str:
+    return (
+        f"---\nname: x\n---\n\n# X\n\n## 実行手順\n\n```bash\n{code}\n```\n{sections}"
+    )
+
+
+def _rules(text: str) -> list[LintRule]:
+    return [issue.rule for issue in lint_agent(text)]
+
+
+class TestLintAgent:
+    """Tests for lint_agent function."""
+
+    def test_clean_agent_passes(self) -> None:
+        """Quoted variables with checked command results pass."""
+        code = (
+            "RUN_ID=$(gh run list --limit 1 --json databaseId -q '.[0].databaseId')\n"
+            'if [ -n "$RUN_ID" ]; then\n'
+            '  gh run view "$RUN_ID" --log-failed\n'
+            "fi"
+        )
+        assert lint_agent(_agent(code)) == []
+
+    def test_detects_placeholders(self) -> None:
+        """<xxx> and {xxx} are placeholders; ${VAR} and jq filters are not."""
+        code = "gh run view <run-id>\ngh api repos/{owner}/x\necho \"${OK}\" | jq '{a}'"
+        issues = lint_agent(_agent(code))
+
+        assert [(i.rule, i.line) for i in issues] == [
+            (LintRule.PLACEHOLDER, 10),
+            (LintRule.PLACEHOLDER, 11),
+        ]
+        assert all(i.fixable for i in issues)
+
+    def test_detects_unquoted_variables(self) -> None:
+        """$VAR outside double quotes is reported, including inside $(...)."""
+        code = 'git add $FILE\necho "$(cat $PATH_A)" "$OK"\nX=$SAFE # $COMMENT'
+
+        assert _rules(_agent(code)) == [LintRule.UNQUOTED_VARIABLE] * 2
+
+    def test_detects_git_add_all_and_error_handling(self) -> None:
+        """git add -A and unchecked command results are reported, unfixable."""
+        issues = lint_agent(_agent('git add -A\nREPO=$(gh repo view)\necho "$REPO"'))
+
+        assert [i.rule for i in issues] == [
+            LintRule.GIT_ADD_ALL,
+            LintRule.MISSING_ERROR_HANDLING,
+        ]
+        assert not any(i.fixable for i in issues)
+
+    def test_detects_missing_sections(self) -> None:
+        """Both required sections are checked."""
+        assert _rules(_agent("echo ok", sections="")) == [
+            LintRule.MISSING_TROUBLESHOOTING,
+            LintRule.MISSING_NOTES,
+        ]
+
+
+class TestFixAgent:
+    """Tests for fix_agent function."""
+
+    def test_fixes_fixable_rules(self) -> None:
+        """Placeholders, quoting and sections are fixed; the rest remains."""
+        text = _agent("gh run view <run-id>\ngit add $FILE\ngit add -A", sections="")
+
+        fixed = fix_agent(text)
+
+        assert 'gh run view "$RUN_ID"\ngit add "$FILE"\n' in fixed
+        assert _rules(fixed) == [LintRule.GIT_ADD_ALL]
+        assert fix_agent(fixed) == fixed
+
+
+class TestLintAgents:
+    """Tests for lint_agents function."""
+
+    def _write(self, root: Path, name: str, text: str) -> Path:
+        agents_dir = root / ".claude" / "plugins" / "context-forge.role-eng" / "agents"
+        agents_dir.mkdir(parents=True, exist_ok=True)
+        path = agents_dir / name
+        path.write_text(text, encoding="utf-8")
+        return path
+
+    def test_lints_files_in_worker_processes(self, tmp_path: Path) -> None:
+        """Results come back in path order from several workers."""
+        self._write(tmp_path, "a.md", _agent("git add $A"))
+        self._write(tmp_path, "b.md", _agent("echo ok"))
+
+        paths = find_agent_files(tmp_path)
+        results = lint_agents(tmp_path, paths, jobs=2)
+
+        assert [r.path.name for r in results] == ["a.md", "b.md"]
+        assert [len(r.issues) for r in results] == [1, 0]
+        assert (tmp_path / LINT_CACHE_PATH).exists()
+
+    def test_cached_files_are_not_linted_again(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """A file whose content hash is cached is skipped."""
+        path = self._write(tmp_path, "a.md", _agent("git add $A"))
+        first = lint_agents(tmp_path, [path])
+
+        def fail(text: str, fix: bool) -> None:
+            raise AssertionError("linted again")
+
+        monkeypatch.setattr(agent_lint, "_lint_text", fail)
+        [result] = lint_agents(tmp_path, [path])
+
+        assert result.cached
+        assert result.issues == first[0].issues
+
+    def test_fix_writes_file_and_caches_result(self, tmp_path: Path) -> None:
+        """--fix rewrites the file and caches the fixed content's result."""
+        path = self._write(tmp_path, "a.md", _agent("git add $A", sections=""))
+
+        [result] = lint_agents(tmp_path, [path], fix=True)
+
+        assert result.fixed == 3
+        assert result.issues == []
+        assert 'git add "$A"' in path.read_text(encoding="utf-8")
+        [again] = lint_agents(tmp_path, [path])
+        assert again.cached
+
+    def test_partial_lint_keeps_other_cache_entries(self, tmp_path: Path) -> None:
+        """With prune_cache=False, results of files not linted are kept."""
+        a = self._write(tmp_path, "a.md", _agent("git add $A"))
+        b = self._write(tmp_path, "b.md", _agent("echo ok"))
+        lint_agents(tmp_path, [a])
+
+        lint_agents(tmp_path, [b], prune_cache=False)
+
+        [again] = lint_agents(tmp_path, [a])
+        assert again.cached
@@ -6,6 +6,7 @@ from context_forge_cli import (
     CLAUDE_MD_END_MARKER,
     CLAUDE_MD_START_MARKER,
     CONTEXT_FORGE_MD_REFERENCE,
+    ClaudeMdContent,
     read_claude_md,
     write_claude_md_reference,
 )
@@ -80,6 +81,78 @@ Some instructions.
         assert result.has_reference is False
 
 
+class TestLegacySettingsScan:
+    """Tests for legacy settings detection in read_claude_md."""
+
+    def _read(self, tmp_path: Path, content: str) -> ClaudeMdContent:
+        (tmp_path / "CLAUDE.md").write_text(content, encoding="utf-8")
+        result = read_claude_md(tmp_path)
+        assert result is not None
+        return result
+
+    def test_detects_each_pattern_case_insensitively(self, tmp_path: Path) -> None:
+        """Every legacy pattern is found, regardless of case."""
+        for text in (
+            "Uses Context-Forge roles\n",
+            "@.claude/plugins/context-forge.role-engineer/SKILL.md\n",
+            "## Skill/SubAgent 発動ルール\n",
+            "## skill/subagent\u3000発動ルール\n",  # ideographic space
+        ):
+            assert self._read(tmp_path, text).has_legacy_settings, text
+
+    def test_records_span_of_first_match(self, tmp_path: Path) -> None:
+        """The span locates the match in the file's bytes."""
+        content = "# プロジェクト\n\nSkill/SubAgent 発動ルール\n"
+        result = self._read(tmp_path, content)
+
+        assert result.legacy_settings_span is not None
+        start, end = result.legacy_settings_span
+        data = content.encode("utf-8")
+        assert data[start:end].decode("utf-8") == "Skill/SubAgent 発動"
+
+    def test_ignores_reference_block(self, tmp_path: Path) -> None:
+        """The context-forge reference itself is not a legacy setting."""
+        content = f"""# My Project
+
+{CLAUDE_MD_START_MARKER}
+{CONTEXT_FORGE_MD_REFERENCE}
+{CLAUDE_MD_END_MARKER}
+"""
+        result = self._read(tmp_path, content)
+
+        assert result.has_reference is True
+        assert result.has_legacy_settings is False
+        assert result.legacy_settings_content is None
+
+    def test_legacy_content_excludes_reference_block(self, tmp_path: Path) -> None:
+        """legacy_settings_content is the file minus the reference block."""
+        content = (
+            f"Skill/SubAgent 発動\n{CLAUDE_MD_START_MARKER}\n"
+            f"{CONTEXT_FORGE_MD_REFERENCE}\n{CLAUDE_MD_END_MARKER}\ntail\n"
+        )
+        result = self._read(tmp_path, content)
+
+        assert result.legacy_settings_content == "Skill/SubAgent 発動\n\ntail\n"
+
+    def test_memory_does_not_grow_with_file_size(self, tmp_path: Path) -> None:
+        """Scanning a large file keeps no copy of its content in memory."""
+        import tracemalloc
+
+        filler = "Some instructions that are not legacy settings.\n" * 200_000
+        content = f"{filler}Skill/SubAgent 発動\n"
+        (tmp_path / "CLAUDE.md").write_text(content, encoding="utf-8")
+
+        tracemalloc.start()
+        try:
+            result = read_claude_md(tmp_path)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        assert result is not None and result.has_legacy_settings
+        assert peak < len(content) // 100
+
+
 class TestWriteClaudeMdReference:
     """Tests for write_claude_md_reference function."""
 
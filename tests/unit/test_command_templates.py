@@ -0,0 +1,115 @@
+"""Unit tests for command template loading and the template manifest."""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from context_forge_cli import __version__, command_templates
+from context_forge_cli.command_templates import (
+    get_template_manifest,
+    get_templates_path,
+    list_available_templates,
+    load_template,
+    render_template,
+)
+from context_forge_cli.template_manifest import (
+    build_manifest,
+    build_manifest_entry,
+    render_manifest_module,
+)
+
+
+class TestBuildManifestEntry:
+    """Tests for build_manifest_entry function."""
+
+    def test_parses_frontmatter_and_body_offsets(self) -> None:
+        """Body offsets should select the stripped text after the frontmatter."""
+        content = "---\ndescription: テスト\nargs: [a]\n---\n\n# Body\n\ntext\n"
+        entry = build_manifest_entry(content.encode("utf-8"))
+
+        assert entry["description"] == "テスト"
+        assert entry["metadata"] == {"description": "テスト", "args": ["a"]}
+        assert content[entry["body_start"] : entry["body_end"]] == "# Body\n\ntext"
+        assert entry["size"] == len(content.encode("utf-8"))
+
+    def test_without_frontmatter(self) -> None:
+        """Content without frontmatter is used as-is."""
+        entry = build_manifest_entry(b"# Title\n")
+
+        assert entry["metadata"] == {}
+        assert (entry["body_start"], entry["body_end"]) == (0, len("# Title\n"))
+
+    def test_invalid_yaml_uses_content_as_is(self) -> None:
+        """Invalid YAML frontmatter falls back to the whole content."""
+        content = "---\n: [unclosed\n---\nbody\n"
+        entry = build_manifest_entry(content.encode("utf-8"))
+
+        assert entry["description"] == ""
+        assert content[entry["body_start"] : entry["body_end"]] == content
+
+
+def test_render_manifest_module_round_trips(tmp_path: Path) -> None:
+    """The generated module should define TEMPLATES equal to the manifest."""
+    manifest = build_manifest(get_templates_path() / "commands")
+    namespace: dict[str, object] = {}
+
+    exec(render_manifest_module(manifest), namespace)
+
+    assert namespace["TEMPLATES"] == manifest
+
+
+class TestLoadTemplate:
+    """Tests for manifest-backed template loading."""
+
+    def test_lists_every_packaged_template(self) -> None:
+        """Listing should come from the manifest and cover the templates dir."""
+        commands_dir = get_templates_path() / "commands"
+        packaged = sorted(p.stem for p in commands_dir.glob("*.md"))
+        assert sorted(list_available_templates()) == packaged
+
+    def test_loads_template_from_manifest(self) -> None:
+        """Loading should match parsing the template file from scratch."""
+        template = load_template("add-role-knowledge")
+        assert template is not None
+
+        entry = build_manifest_entry(template.path.read_bytes())
+        content = template.path.read_text(encoding="utf-8")
+        assert template.command.description == entry["description"]
+        body = content[entry["body_start"] : entry["body_end"]]
+        assert template.command.content == body
+        assert render_template(template) == content.replace("{{VERSION}}", __version__)
+
+    def test_returns_none_for_unknown_template(self) -> None:
+        """Unknown names are not in the manifest."""
+        assert load_template("does-not-exist") is None
+
+    def test_stale_manifest_entry_is_reparsed(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """A template edited after the build is parsed again instead of trusted."""
+        manifest = dict(get_template_manifest())
+        manifest["migrate"] = {**manifest["migrate"], "sha256": "0", "body_end": 1}
+        monkeypatch.setattr(command_templates, "_manifest_cache", manifest)
+
+        template = load_template("migrate")
+
+        assert template is not None
+        assert template.command.content.startswith("# Role Plugin")
+
+
+def test_install_path_does_not_import_yaml() -> None:
+    """Listing, loading and rendering templates must not import PyYAML."""
+    code = (
+        "import sys\n"
+        "from context_forge_cli.command_templates import (\n"
+        "    list_available_templates, load_template, render_template)\n"
+        "for name in list_available_templates():\n"
+        "    render_template(load_template(name))\n"
+        "print('yaml' in sys.modules)\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == "False"
@@ -2,10 +2,19 @@
 
 from pathlib import Path
 
+import pytest
+
 from context_forge_cli import (
     CONTEXT_FORGE_MD_PATH,
+    ContextForgeMdContent,
+    compact_context_forge_md,
+    load_rule_batch,
+    merge_role_sections,
+    parse_context_forge_md,
     read_context_forge_md,
+    split_role_sections,
     write_context_forge_md,
+    write_context_forge_md_rules,
 )
 
 
@@ -211,3 +220,306 @@ class TestWriteContextForgeMd:
         result = read_context_forge_md(tmp_path)
         assert result is not None
         assert result.roles == {}
+
+
+class TestParseContextForgeMd:
+    """Tests for the offset-indexed parse_context_forge_md function."""
+
+    CONTENT = """# context-forge 設定
+
+### software-engineer ロール
+
+- rule-a
+  - rule-b
+
+### メモ
+
+手動で追加した内容
+
+### frontend-engineer ロール
+
+- rule-c
+"""
+
+    def test_records_rule_spans(self) -> None:
+        """Rule spans should slice the exact rule text out of the content."""
+        parsed = parse_context_forge_md(self.CONTENT)
+
+        spans = parsed.rule_spans("software-engineer")
+        rules = [self.CONTENT[start:end] for start, end in spans]
+        assert rules == ["- rule-a", "- rule-b"]
+        assert parsed.roles["software-engineer"] == rules
+
+    def test_section_offsets(self) -> None:
+        """Header offsets point at the role header; end at the next ### line."""
+        parsed = parse_context_forge_md(self.CONTENT)
+
+        section = parsed.sections["software-engineer"]
+        header = "### software-engineer ロール"
+        assert self.CONTENT.startswith(header, section.header_start)
+        assert self.CONTENT.startswith("\n### メモ", section.end)
+        assert parsed.sections["frontend-engineer"].end == len(self.CONTENT)
+
+    def test_rules_after_non_role_header_stay_with_role(self) -> None:
+        """A non-role ### header does not start a new role (legacy behavior)."""
+        content = "### a ロール\n\n- one\n\n### Notes\n\n- two\n"
+        parsed = parse_context_forge_md(content)
+
+        assert parsed.roles == {"a": ["- one", "- two"]}
+        spans = parsed.rule_spans("a")
+        assert [content[start:end] for start, end in spans] == ["- one", "- two"]
+
+    def test_write_splices_before_non_role_header(self, tmp_path: Path) -> None:
+        """New rules go at the end of the role section, keeping manual content."""
+        context_forge_md = tmp_path / CONTEXT_FORGE_MD_PATH
+        context_forge_md.parent.mkdir(parents=True, exist_ok=True)
+        context_forge_md.write_text(self.CONTENT, encoding="utf-8")
+
+        existing = read_context_forge_md(tmp_path)
+        write_context_forge_md(tmp_path, existing, "software-engineer", "- rule-new")
+
+        content = context_forge_md.read_text(encoding="utf-8")
+        assert "  - rule-b\n- rule-new\n\n### メモ\n\n手動で追加した内容" in content
+        assert content.endswith("### frontend-engineer ロール\n\n- rule-c\n")
+
+    def test_write_without_blank_line_before_next_header(self, tmp_path: Path) -> None:
+        """A rule goes on its own line when no blank line precedes a header."""
+        existing = parse_context_forge_md("### a ロール\n- one\n### b ロール\n- two\n")
+
+        write_context_forge_md_rules(tmp_path, existing, [("a", "- new"), ("b", "- 3")])
+
+        content = (tmp_path / CONTEXT_FORGE_MD_PATH).read_text(encoding="utf-8")
+        assert content == "### a ロール\n- one\n- new\n### b ロール\n- two\n- 3\n"
+
+    def test_repeated_role_sections_collect_all_rules(self, tmp_path: Path) -> None:
+        """A repeated role keeps the rules of every section; none is re-added."""
+        content = "### a ロール\n\n- x\n\n### a ロール\n\n- y\n"
+        context_forge_md = tmp_path / CONTEXT_FORGE_MD_PATH
+        context_forge_md.parent.mkdir(parents=True, exist_ok=True)
+        context_forge_md.write_text(content, encoding="utf-8")
+
+        assert parse_context_forge_md(content).roles == {"a": ["- x", "- y"]}
+        write_context_forge_md(tmp_path, read_context_forge_md(tmp_path), "a", "- x")
+        write_context_forge_md(tmp_path, read_context_forge_md(tmp_path), "a", "- y")
+
+        assert context_forge_md.read_text(encoding="utf-8") == content
+
+    def test_write_without_offsets_reindexes(self, tmp_path: Path) -> None:
+        """Content built without section offsets is indexed before splicing."""
+        existing = ContextForgeMdContent(
+            full_content="### a ロール\n\n- one\n\n### b ロール\n\n- two\n",
+            roles={"a": ["- one"], "b": ["- two"]},
+        )
+        write_context_forge_md(tmp_path, existing, "a", "- three")
+
+        result = read_context_forge_md(tmp_path)
+        assert result is not None
+        assert result.roles == {"a": ["- one", "- three"], "b": ["- two"]}
+
+
+class TestWriteContextForgeMdRules:
+    """Tests for the batched write_context_forge_md_rules function."""
+
+    def test_matches_one_at_a_time_writes(self, tmp_path: Path) -> None:
+        """A batch should produce the same file as sequential single writes."""
+        initial = (
+            "# 設定\n\n### a ロール\n\n- a1\n\n### メモ\n\nメモ\n\n### b ロール\n\n- b1"
+        )
+        rules = [("b", "- b2"), ("new", "- n1"), ("a", "- a2"), ("new", "- n2")]
+
+        sequential = tmp_path / "sequential"
+        batched = tmp_path / "batched"
+        for root in (sequential, batched):
+            (root / ".claude").mkdir(parents=True)
+            (root / CONTEXT_FORGE_MD_PATH).write_text(initial, encoding="utf-8")
+
+        for role, rule in rules:
+            write_context_forge_md(
+                sequential, read_context_forge_md(sequential), role, rule
+            )
+        write_context_forge_md_rules(batched, read_context_forge_md(batched), rules)
+
+        expected = (sequential / CONTEXT_FORGE_MD_PATH).read_text(encoding="utf-8")
+        actual = (batched / CONTEXT_FORGE_MD_PATH).read_text(encoding="utf-8")
+        assert actual == expected
+        result = read_context_forge_md(batched)
+        assert result is not None
+        assert result.roles == {
+            "a": ["- a1", "- a2"],
+            "b": ["- b1", "- b2"],
+            "new": ["- n1", "- n2"],
+        }
+
+    def test_creates_file_from_template(self, tmp_path: Path) -> None:
+        """Should create the file from the template and add rules in one write."""
+        write_context_forge_md_rules(tmp_path, None, [("a", "- a1")])
+
+        content = (tmp_path / CONTEXT_FORGE_MD_PATH).read_text(encoding="utf-8")
+        assert content.startswith("# context-forge 設定")
+        assert content.endswith("### a ロール\n\n- a1\n")
+
+    def test_skips_rules_the_role_already_has(self, tmp_path: Path) -> None:
+        """Repeated adds do not grow the file with duplicate rules."""
+        write_context_forge_md_rules(tmp_path, None, [("a", "- Use X")])
+        before = (tmp_path / CONTEXT_FORGE_MD_PATH).read_text(encoding="utf-8")
+
+        write_context_forge_md_rules(
+            tmp_path,
+            read_context_forge_md(tmp_path),
+            [("a", "-  use x "), ("b", "- y"), ("b", "- Y")],
+        )
+
+        result = read_context_forge_md(tmp_path)
+        assert result is not None
+        assert result.roles == {"a": ["- Use X"], "b": ["- y"]}
+        content = (tmp_path / CONTEXT_FORGE_MD_PATH).read_text(encoding="utf-8")
+        assert content.startswith(before)
+
+    def test_skips_rules_of_repeated_sections(self, tmp_path: Path) -> None:
+        """Rules in any section of a repeated role are not added again."""
+        content = "### a ロール\n\n- x\n\n### a ロール\n\n- y\n"
+        existing = parse_context_forge_md(content)
+
+        write_context_forge_md_rules(
+            tmp_path, existing, [("a", "- x"), ("a", "- Y"), ("a", "- z")]
+        )
+
+        written = (tmp_path / CONTEXT_FORGE_MD_PATH).read_text(encoding="utf-8")
+        assert written == "### a ロール\n\n- x\n- z\n\n### a ロール\n\n- y\n"
+
+
+class TestCompactContextForgeMd:
+    """Tests for compact_context_forge_md function."""
+
+    CONTENT = """# 設定
+
+### a ロール
+
+- one
+- One
+-   one
+
+### メモ
+
+手動で追加した内容
+
+### b ロール
+
+- b
+- b
+
+### a ロール
+
+- one
+- two
+手動メモ
+"""
+
+    def test_removes_duplicates_and_merges_sections(self) -> None:
+        """Duplicates go, later sections fold into the first, notes stay."""
+        result = compact_context_forge_md(self.CONTENT)
+
+        assert result.content == (
+            "# 設定\n\n### a ロール\n\n- one\n- two\n手動メモ\n\n"
+            "### メモ\n\n手動で追加した内容\n\n### b ロール\n\n- b\n"
+        )
+        assert result.removed_rules == 4
+        assert result.merged_sections == 1
+        assert result.bytes_saved == len(self.CONTENT.encode()) - len(
+            result.content.encode()
+        )
+        assert result.tokens_saved > 0
+
+    def test_is_idempotent(self) -> None:
+        """Compacting compact content changes nothing."""
+        once = compact_context_forge_md(self.CONTENT).content
+        again = compact_context_forge_md(once)
+
+        assert not again.changed
+        assert again.bytes_saved == 0
+
+    def test_is_idempotent_ending_in_bare_header(self) -> None:
+        """A file ending in a repeated role header without a newline."""
+        content = "### b ロール  \n- n2\n### a ロール\n### b ロール  \n### a ロール"
+
+        once = compact_context_forge_md(content).content
+
+        assert once == "### b ロール  \n- n2\n### a ロール\n"
+        assert not compact_context_forge_md(once).changed
+
+    def test_keeps_content_without_roles(self) -> None:
+        """Files without role sections are returned unchanged."""
+        content = "# 設定\n\n- not a role rule\n- not a role rule\n"
+        assert compact_context_forge_md(content).content == content
+
+    def test_auto_compaction_on_write(self, tmp_path: Path) -> None:
+        """write_context_forge_md_rules(compact=True) compacts in the same write."""
+        path = tmp_path / CONTEXT_FORGE_MD_PATH
+        path.parent.mkdir(parents=True)
+        path.write_text(self.CONTENT, encoding="utf-8")
+
+        write_context_forge_md_rules(
+            tmp_path, read_context_forge_md(tmp_path), [("b", "- c")], compact=True
+        )
+
+        result = read_context_forge_md(tmp_path)
+        assert result is not None
+        assert result.roles == {"a": ["- one", "- two"], "b": ["- b", "- c"]}
+
+
+class TestSplitAndMergeRoleSections:
+    """Tests for split_role_sections and merge_role_sections functions."""
+
+    CONTENT = "# 設定\n\n### a ロール\n\n- one\n\n### b ロール\n\n- b\n"
+
+    def test_cuts_sections_out(self) -> None:
+        """Cut sections keep their text; the rest keeps its layout."""
+        remaining, sections = split_role_sections(self.CONTENT, {"a"})
+
+        assert remaining == "# 設定\n\n### b ロール\n\n- b\n"
+        assert sections == {"a": "### a ロール\n\n- one\n"}
+
+    def test_cutting_the_last_section_trims_blank_lines(self) -> None:
+        """No blank lines are left behind at the end of the file."""
+        remaining, sections = split_role_sections(self.CONTENT, {"b", "missing"})
+
+        assert remaining == "# 設定\n\n### a ロール\n\n- one\n"
+        assert list(sections) == ["b"]
+
+    def test_repeated_sections_are_merged(self) -> None:
+        """All sections of a role are cut out as one."""
+        content = self.CONTENT + "\n### a ロール\n\n- two\n- one\n"
+
+        remaining, sections = split_role_sections(content, {"a"})
+
+        assert remaining == "# 設定\n\n### b ロール\n\n- b\n"
+        assert sections == {"a": "### a ロール\n\n- one\n- two\n"}
+
+    def test_merge_round_trips(self) -> None:
+        """Merging cut sections back appends new roles and adds new rules."""
+        remaining, sections = split_role_sections(self.CONTENT, {"a"})
+        merged = merge_role_sections(remaining, sections)
+        again = merge_role_sections(merged, {"a": "### a ロール\n\n- one\n- three\n"})
+
+        assert merged == "# 設定\n\n### b ロール\n\n- b\n\n### a ロール\n\n- one\n"
+        assert parse_context_forge_md(again).roles["a"] == ["- one", "- three"]
+
+
+class TestLoadRuleBatch:
+    """Tests for load_rule_batch function."""
+
+    def test_loads_json_mapping(self) -> None:
+        """Should read a role -> rules mapping and add missing list markers."""
+        rules = load_rule_batch('{"a": ["- one", "two"], "b": "three"}')
+        assert rules == [("a", "- one"), ("a", "- two"), ("b", "- three")]
+
+    def test_loads_yaml_entry_list(self) -> None:
+        """Should read a YAML list of role/rule entries."""
+        text = "- role: a\n  rule: one\n- role: b\n  rules: [two, three]\n"
+        rules = load_rule_batch(text)
+        assert rules == [("a", "- one"), ("b", "- two"), ("b", "- three")]
+
+    def test_rejects_multiline_rules(self) -> None:
+        """Rules must be single lines so they cannot break the file structure."""
+        with pytest.raises(ValueError):
+            load_rule_batch('{"a": ["one\\n### b ロール"]}')
@@ -0,0 +1,154 @@
+"""Unit tests for context budget analysis."""
+
+from pathlib import Path
+
+from context_forge_cli import (
+    CONTEXT_FORGE_MD_REFERENCE,
+    collect_context_stats,
+    estimate_tokens,
+)
+
+SKILL = """---
+name: react
+description: React の知見
+---
+
+# React
+
+Use function components.
+"""
+
+
+def _make_project(root: Path) -> None:
+    claude_dir = root / ".claude"
+    (claude_dir / "commands").mkdir(parents=True)
+    (root / "CLAUDE.md").write_text(
+        f"# Project\n\n{CONTEXT_FORGE_MD_REFERENCE}\n", encoding="utf-8"
+    )
+    (claude_dir / "context-forge.md").write_text(
+        "# 設定\n\n### eng ロール\n\n- rule one\n- rule two\n"
+        "\n### qa ロール\n\n- rule\n",
+        encoding="utf-8",
+    )
+    (claude_dir / "commands" / "hello.md").write_text(
+        "---\ndescription: Say hello\n---\n\nHello body.\n", encoding="utf-8"
+    )
+    skill_dir = claude_dir / "plugins" / "context-forge.role-eng" / "skills" / "react"
+    skill_dir.mkdir(parents=True)
+    (skill_dir / "SKILL.md").write_text(SKILL, encoding="utf-8")
+    agents_dir = claude_dir / "plugins" / "other-plugin" / "agents"
+    agents_dir.mkdir(parents=True)
+    (agents_dir / "reviewer.md").write_text("No frontmatter.\n", encoding="utf-8")
+
+
+class TestEstimateTokens:
+    """Tests for estimate_tokens function."""
+
+    def test_ascii_is_about_four_characters_per_token(self) -> None:
+        """ASCII text counts one token per four characters, rounded up."""
+        assert estimate_tokens(b"") == 0
+        assert estimate_tokens(b"abcd") == 1
+        assert estimate_tokens(b"abcde") == 2
+
+    def test_non_ascii_characters_count_one_token_each(self) -> None:
+        """Japanese characters count one token each, not one per byte."""
+        assert estimate_tokens("ロール".encode()) == 3
+        assert estimate_tokens("ロール abc".encode()) == 4
+
+
+class TestCollectContextStats:
+    """Tests for collect_context_stats function."""
+
+    def test_follows_imports_and_splits_by_role(self, tmp_path: Path) -> None:
+        """context-forge.md is reached through CLAUDE.md and split per role."""
+        _make_project(tmp_path)
+
+        stats = collect_context_stats(tmp_path)
+
+        by_file = stats.breakdown("path")
+        cf_md = (tmp_path / ".claude" / "context-forge.md").read_bytes()
+        assert by_file[".claude/context-forge.md"].always_bytes == len(cf_md)
+        assert by_file["CLAUDE.md"].on_demand_bytes == 0
+        assert set(stats.breakdown("role")) == {"eng", "qa"}
+
+    def test_frontmatter_is_always_loaded_and_body_on_demand(
+        self, tmp_path: Path
+    ) -> None:
+        """Commands and skills split at the end of their frontmatter."""
+        _make_project(tmp_path)
+
+        stats = collect_context_stats(tmp_path)
+
+        skill = stats.breakdown("path")[
+            ".claude/plugins/context-forge.role-eng/skills/react/SKILL.md"
+        ]
+        frontmatter_end = SKILL.index("\n# React")
+        assert skill.always_bytes == len(SKILL[:frontmatter_end].encode())
+        assert skill.on_demand_bytes == len(SKILL[frontmatter_end:].encode())
+
+        agent = stats.breakdown("path")[
+            ".claude/plugins/other-plugin/agents/reviewer.md"
+        ]
+        assert agent.always_bytes == 0
+
+    def test_breaks_down_by_plugin_and_role(self, tmp_path: Path) -> None:
+        """Role plugins count towards their role; other plugins only by name."""
+        _make_project(tmp_path)
+
+        stats = collect_context_stats(tmp_path)
+
+        by_plugin = stats.breakdown("plugin")
+        assert set(by_plugin) == {
+            "context-forge.role-eng",
+            "context-forge.role-qa",
+            "other-plugin",
+        }
+        eng = stats.breakdown("role")["eng"]
+        assert eng.on_demand_bytes > 0  # skill body
+        total = stats.total
+        assert total.always_bytes == sum(
+            u.always_bytes for u in stats.breakdown("path").values()
+        )
+
+    def test_repeated_role_sections_count_toward_the_role(self, tmp_path: Path) -> None:
+        """Every section of a repeated role header is attributed to the role."""
+        (tmp_path / "CLAUDE.md").write_text(
+            CONTEXT_FORGE_MD_REFERENCE, encoding="utf-8"
+        )
+        (tmp_path / ".claude").mkdir()
+        eng = "### eng ロール\n\n- one\n\n"
+        qa = "### qa ロール\n\n- two\n\n"
+        again = "### eng ロール\n\n- three\n"
+        (tmp_path / ".claude" / "context-forge.md").write_text(
+            f"# 設定\n\n{eng}{qa}{again}", encoding="utf-8"
+        )
+
+        stats = collect_context_stats(tmp_path)
+
+        rules = {e.role: e.bytes for e in stats.entries if e.kind == "rules"}
+        assert rules == {"eng": len((eng + again).encode()), "qa": len(qa.encode())}
+        memory = [e for e in stats.entries if e.kind == "memory"]
+        cf_memory = [e for e in memory if e.path == ".claude/context-forge.md"]
+        assert [e.bytes for e in cf_memory] == [len("# 設定\n\n".encode())]
+
+    def test_ignores_missing_and_cyclic_imports(self, tmp_path: Path) -> None:
+        """Imports of missing files are skipped and cycles are read once."""
+        (tmp_path / "CLAUDE.md").write_text(
+            "@docs/a.md @missing.md\n", encoding="utf-8"
+        )
+        (tmp_path / "docs").mkdir()
+        (tmp_path / "docs" / "a.md").write_text("@../CLAUDE.md\n", encoding="utf-8")
+
+        stats = collect_context_stats(tmp_path)
+
+        assert sorted(entry.path for entry in stats.entries) == [
+            "CLAUDE.md",
+            "docs/a.md",
+        ]
+
+    def test_empty_project(self, tmp_path: Path) -> None:
+        """A project without any context files reports zero."""
+        stats = collect_context_stats(tmp_path)
+
+        assert stats.entries == []
+        assert stats.to_dict()["total"]["always_tokens"] == 0
@@ -0,0 +1,89 @@
+"""Unit tests for the shared file write layer."""
+
+import os
+import stat
+from pathlib import Path
+
+from context_forge_cli.fileio import (
+    WriteOutcome,
+    atomic_append_bytes,
+    has_content,
+    write_if_changed,
+)
+
+
+class TestWriteIfChanged:
+    """Tests for write_if_changed function."""
+
+    def test_creates_missing_file(self, tmp_path: Path) -> None:
+        """Should create the file and report CREATED."""
+        path = tmp_path / "file.md"
+
+        assert write_if_changed(path, "hello\n") == WriteOutcome.CREATED
+        assert path.read_text(encoding="utf-8") == "hello\n"
+
+    def test_skips_identical_content(self, tmp_path: Path) -> None:
+        """Should not touch a file that already holds the same bytes."""
+        path = tmp_path / "file.md"
+        path.write_text("ロール\n", encoding="utf-8")
+        os.utime(path, (0, 0))
+
+        assert write_if_changed(path, "ロール\n") == WriteOutcome.UNCHANGED
+        assert path.stat().st_mtime == 0
+
+    def test_updates_same_size_different_content(self, tmp_path: Path) -> None:
+        """Equal sizes alone must not be mistaken for equal content."""
+        path = tmp_path / "file.md"
+        path.write_text("aaaa", encoding="utf-8")
+
+        assert write_if_changed(path, "bbbb") == WriteOutcome.UPDATED
+        assert path.read_text(encoding="utf-8") == "bbbb"
+
+    def test_preserves_mode_and_leaves_no_temp_files(self, tmp_path: Path) -> None:
+        """Replacing a file keeps its permissions and cleans up the temp file."""
+        path = tmp_path / "file.md"
+        path.write_text("old", encoding="utf-8")
+        path.chmod(0o640)
+
+        write_if_changed(path, "new")
+
+        assert stat.S_IMODE(path.stat().st_mode) == 0o640
+        assert [p.name for p in tmp_path.iterdir()] == ["file.md"]
+
+    def test_writes_through_symlink(self, tmp_path: Path) -> None:
+        """A symlinked file is updated in place of its target."""
+        target = tmp_path / "AGENTS.md"
+        target.write_text("old", encoding="utf-8")
+        link = tmp_path / "CLAUDE.md"
+        link.symlink_to(target)
+
+        write_if_changed(link, "new")
+
+        assert link.is_symlink()
+        assert target.read_text(encoding="utf-8") == "new"
+
+
+def test_has_content(tmp_path: Path) -> None:
+    """has_content should compare size and digest of the file."""
+    path = tmp_path / "file.md"
+
+    assert not has_content(path, "x")
+    path.write_text("x", encoding="utf-8")
+    assert has_content(path, "x")
+    assert not has_content(path, "y")
+
+
+class TestAtomicAppendBytes:
+    """Tests for atomic_append_bytes function."""
+
+    def test_appends_and_preserves_mode(self, tmp_path: Path) -> None:
+        """The file is extended in place of a copy that keeps its mode."""
+        path = tmp_path / "CLAUDE.md"
+        path.write_bytes(b"# Project\n" * 10_000)
+        os.chmod(path, 0o640)
+
+        atomic_append_bytes(path, b"tail\n")
+
+        assert path.read_bytes() == b"# Project\n" * 10_000 + b"tail\n"
+        assert stat.S_IMODE(path.stat().st_mode) == 0o640
+        assert [p.name for p in tmp_path.iterdir()] == ["CLAUDE.md"]
@@ -0,0 +1,287 @@
+"""Unit tests for the hook server and its client shim."""
+
+import contextlib
+import io
+import json
+import os
+import socket
+import sys
+import tempfile
+import threading
+from collections.abc import Generator
+from pathlib import Path
+
+import pytest
+
+from context_forge_cli import (
+    HookHandlers,
+    find_hook_handlers,
+    handler_path,
+    hook_client,
+    hook_server,
+    run_handler,
+    serve_hooks,
+    server_status,
+    socket_path,
+    stop_server,
+)
+from context_forge_cli.hook_client import (
+    UntrustedSocketError,
+    WrongProjectError,
+    check_socket_dir,
+    main,
+    request,
+)
+
+GUARD = """import sys
+
+
+def handle(event):
+    if "rm -rf" in event["tool_input"]["command"]:
+        print("Blocked: rm -rf", file=sys.stderr)
+        sys.exit(2)
+    return {"decision": "approve"}
+"""
+
+
+def _write_handler(root: Path, name: str, source: str) -> Path:
+    path = handler_path(root, name)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(source, encoding="utf-8")
+    return path
+
+
+def _event(command: str) -> bytes:
+    return json.dumps({"tool_input": {"command": command}}).encode()
+
+
+class TestHandlerPath:
+    """Tests for handler names."""
+
+    def test_maps_name_to_plugin_hooks_dir(self, tmp_path: Path) -> None:
+        """ROLE/HANDLER names a module in the role plugin's hooks dir."""
+        path = handler_path(tmp_path, "eng/guard")
+
+        assert path == (
+            tmp_path
+            / ".claude"
+            / "plugins"
+            / "context-forge.role-eng"
+            / "hooks"
+            / "guard.py"
+        )
+
+    @pytest.mark.parametrize("name", ["guard", "../x/guard", "eng/../guard", "eng/"])
+    def test_rejects_malformed_names(self, tmp_path: Path, name: str) -> None:
+        """Names that are not ROLE/HANDLER or leave the plugin are rejected."""
+        with pytest.raises(ValueError, match="Invalid hook handler name"):
+            handler_path(tmp_path, name)
+
+    def test_finds_handlers_of_every_role(self, tmp_path: Path) -> None:
+        """Every hooks/*.py of a role plugin is listed."""
+        _write_handler(tmp_path, "eng/guard", GUARD)
+        _write_handler(tmp_path, "ops/audit", GUARD)
+
+        assert find_hook_handlers(tmp_path) == ["eng/guard", "ops/audit"]
+
+
+class TestHookHandlers:
+    """Tests for running handlers in-process."""
+
+    def test_returned_dict_is_printed_as_json(self, tmp_path: Path) -> None:
+        """A dict result becomes the handler's JSON output."""
+        _write_handler(tmp_path, "eng/guard", GUARD)
+
+        response = HookHandlers(tmp_path).run("eng/guard", _event("ls"))
+
+        assert response.exit_code == 0
+        assert json.loads(response.stdout) == {"decision": "approve"}
+        assert response.stderr == ""
+
+    def test_sys_exit_sets_exit_code(self, tmp_path: Path) -> None:
+        """sys.exit(2) blocks the call and keeps the handler's stderr."""
+        _write_handler(tmp_path, "eng/guard", GUARD)
+
+        response = HookHandlers(tmp_path).run("eng/guard", _event("rm -rf /"))
+
+        assert response.exit_code == 2
+        assert response.stdout == ""
+        assert response.stderr == "Blocked: rm -rf\n"
+
+    def test_exception_is_reported(self, tmp_path: Path) -> None:
+        """A failing handler exits with 1 and names the error."""
+        _write_handler(tmp_path, "eng/guard", GUARD)
+
+        response = HookHandlers(tmp_path).run("eng/guard", b"not json")
+
+        assert response.exit_code == 1
+        assert "eng/guard" in response.stderr
+
+    def test_reloads_edited_handler(self, tmp_path: Path) -> None:
+        """A handler is re-imported after its file changes."""
+        path = _write_handler(tmp_path, "eng/echo", "def handle(e):\n    return 'a'\n")
+        handlers = HookHandlers(tmp_path)
+        first = handlers.run("eng/echo", b"{}")
+
+        path.write_text("def handle(e):\n    return 'b'\n", encoding="utf-8")
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        second = handlers.run("eng/echo", b"{}")
+
+        assert (first.stdout, second.stdout) == ("a", "b")
+        assert handlers.loaded == ["eng/echo"]
+
+    def test_missing_handler(self, tmp_path: Path) -> None:
+        """An unknown handler fails without raising."""
+        response = run_handler(tmp_path, "eng/missing", b"{}")
+
+        assert response.exit_code == 1
+        assert "eng/missing" in response.stderr
+
+
+class TestHookServer:
+    """Tests for the socket server."""
+
+    @pytest.fixture
+    def server_root(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> Generator[Path, None, None]:
+        """A project with a guard handler and a running hook server."""
+        # Socket paths are limited to about 100 bytes, so keep the dir short
+        runtime_dir = tempfile.TemporaryDirectory(prefix="cf-", dir="/tmp")
+        monkeypatch.setenv("XDG_RUNTIME_DIR", runtime_dir.name)
+        root = tmp_path.resolve()
+        _write_handler(root, "eng/guard", GUARD)
+
+        ready = threading.Event()
+        thread = threading.Thread(target=serve_hooks, args=(root, ready), daemon=True)
+        thread.start()
+        assert ready.wait(10)
+        yield root
+        stop_server(root)
+        thread.join(10)
+        runtime_dir.cleanup()
+
+    def test_runs_handlers_over_the_socket(self, server_root: Path) -> None:
+        """Events sent to the server get the handler's output and exit code."""
+        path = socket_path(str(server_root))
+
+        allowed = request(path, "run", str(server_root), "eng/guard", _event("ls"))
+        blocked = request(path, "run", str(server_root), "eng/guard", _event("rm -rf"))
+
+        assert allowed[0] == 0
+        assert json.loads(allowed[1]) == {"decision": "approve"}
+        assert blocked == (2, b"", b"Blocked: rm -rf\n")
+
+    def test_reports_status_and_stops(self, server_root: Path) -> None:
+        """The status lists preloaded handlers; stop removes the socket."""
+        status = server_status(server_root)
+
+        assert status is not None
+        assert status.pid == os.getpid()
+        assert status.handlers == ["eng/guard"]
+        assert stop_server(server_root) is True
+        assert server_status(server_root) is None
+        assert not os.path.exists(socket_path(str(server_root)))
+
+    def test_rejects_other_projects(self, server_root: Path) -> None:
+        """A request for a different project root is refused."""
+        path = socket_path(str(server_root))
+
+        with pytest.raises(WrongProjectError):
+            request(path, "run", "/elsewhere", "eng/guard", b"{}")
+
+    def test_socket_name_collision(
+        self,
+        server_root: Path,
+        tmp_path_factory: pytest.TempPathFactory,
+        monkeypatch: pytest.MonkeyPatch,
+        capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        """Another project on the same socket runs in-process, never replaces it."""
+        path = socket_path(str(server_root))
+        other = tmp_path_factory.mktemp("other").resolve()
+        _write_handler(other, "eng/guard", "def handle(event):\n    return 'other'\n")
+        monkeypatch.setattr(hook_client, "socket_path", lambda root: path)
+        monkeypatch.setattr(hook_server, "socket_path", lambda root: path)
+        monkeypatch.setenv("CLAUDE_PROJECT_DIR", str(other))
+        monkeypatch.setattr(sys, "stdin", io.TextIOWrapper(io.BytesIO(b"{}")))
+
+        assert main(["eng/guard"]) == 0
+        assert capsys.readouterr().out == "other"
+        with pytest.raises(RuntimeError, match="another project"):
+            serve_hooks(other)
+        assert server_status(server_root) is not None
+
+    def test_refuses_socket_dir_open_to_others(self, server_root: Path) -> None:
+        """Neither client nor server use a socket dir others can write to."""
+        path = socket_path(str(server_root))
+        os.chmod(os.path.dirname(path), 0o777)
+
+        with pytest.raises(UntrustedSocketError):
+            request(path, "status", str(server_root))
+        with pytest.raises(UntrustedSocketError):
+            serve_hooks(server_root)
+        os.chmod(os.path.dirname(path), 0o700)
+
+
+class TestSocketDir:
+    """Tests for the ownership check of the socket directory."""
+
+    def test_accepts_private_dir(self, tmp_path: Path) -> None:
+        """A directory of the current user with mode 0700 is used."""
+        directory = tmp_path / "sockets"
+        directory.mkdir(mode=0o700)
+        os.chmod(directory, 0o700)
+
+        check_socket_dir(str(directory))
+
+    def test_rejects_symlink_and_shared_dir(self, tmp_path: Path) -> None:
+        """A symlink or a directory open to group or others is refused."""
+        directory = tmp_path / "sockets"
+        directory.mkdir()
+        os.chmod(directory, 0o700)
+        link = tmp_path / "link"
+        link.symlink_to(directory)
+        shared = tmp_path / "shared"
+        shared.mkdir()
+        os.chmod(shared, 0o1777)
+
+        with pytest.raises(UntrustedSocketError):
+            check_socket_dir(str(link))
+        with pytest.raises(UntrustedSocketError):
+            check_socket_dir(str(shared))
+
+    def test_client_ignores_planted_socket(
+        self, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        """A socket in a dir others can write to is not asked to approve."""
+        runtime_dir = tempfile.TemporaryDirectory(prefix="cf-", dir="/tmp")
+        monkeypatch.setenv("XDG_RUNTIME_DIR", runtime_dir.name)
+        root = Path(runtime_dir.name).resolve()
+        _write_handler(root, "eng/guard", GUARD)
+        path = socket_path(str(root))
+        os.makedirs(os.path.dirname(path), mode=0o777)
+        os.chmod(os.path.dirname(path), 0o777)
+        planted = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        planted.bind(path)
+        planted.listen()
+
+        def approve_everything() -> None:
+            with contextlib.suppress(OSError):  # closed without a connection
+                connection, _ = planted.accept()
+                connection.sendall(b"0 0\n")
+                connection.close()
+
+        threading.Thread(target=approve_everything, daemon=True).start()
+        monkeypatch.setenv("CLAUDE_PROJECT_DIR", str(root))
+        monkeypatch.setattr(
+            sys, "stdin", io.TextIOWrapper(io.BytesIO(_event("rm -rf")))
+        )
+
+        try:
+            assert main(["eng/guard"]) == 2
+            assert capsys.readouterr().err == "Blocked: rm -rf\n"
+        finally:
+            planted.close()
+            runtime_dir.cleanup()
@@ -0,0 +1,160 @@
+"""Unit tests for command installation and conflict policies."""
+
+import os
+from collections.abc import Callable
+from pathlib import Path
+
+from context_forge_cli import (
+    CLAUDE_GITIGNORE_PATH,
+    GENERATED_PATHS,
+    ConflictPolicy,
+    InstallResult,
+    InstallTarget,
+    WriteOutcome,
+    ensure_claude_gitignore,
+    install_commands,
+    list_available_templates,
+)
+
+COMMAND = "add-role-knowledge"
+
+
+def _command_file(project_root: Path) -> Path:
+    return project_root / ".claude" / "commands" / f"context-forge.{COMMAND}.md"
+
+
+def _install(
+    project_root: Path,
+    policy: ConflictPolicy,
+    confirm: Callable[[Path], bool] | None = None,
+) -> dict[str, InstallResult]:
+    (project_root / ".claude" / "commands").mkdir(parents=True, exist_ok=True)
+    target = InstallTarget(project_root=project_root)
+    results = install_commands(list_available_templates(), target, policy, confirm)
+    return {r.command_name: r for r in results}
+
+
+class TestInstallCommands:
+    """Tests for install_commands()."""
+
+    def test_installs_all_templates_in_order(self, tmp_path: Path) -> None:
+        """Every template is installed and results keep the input order."""
+        names = list_available_templates()
+        target = InstallTarget(project_root=tmp_path)
+        target.commands_dir.mkdir(parents=True)
+
+        results = install_commands(names, target, ConflictPolicy.SKIP, max_workers=4)
+
+        assert [r.command_name for r in results] == names
+        assert all(r.success and not r.unchanged for r in results)
+        assert all(r.target_path.exists() for r in results)
+
+    def test_identical_files_are_unchanged(self, tmp_path: Path) -> None:
+        """Files matching the template are left alone by every policy but overwrite."""
+        _install(tmp_path, ConflictPolicy.SKIP)
+
+        for policy in (
+            ConflictPolicy.SKIP,
+            ConflictPolicy.IF_CHANGED,
+            ConflictPolicy.FAIL,
+            ConflictPolicy.PROMPT,
+        ):
+            assert _install(tmp_path, policy)[COMMAND].unchanged
+
+    def test_skip_keeps_modified_file(self, tmp_path: Path) -> None:
+        """SKIP leaves a locally edited file as it is."""
+        _install(tmp_path, ConflictPolicy.SKIP)
+        _command_file(tmp_path).write_text("locally edited", encoding="utf-8")
+
+        result = _install(tmp_path, ConflictPolicy.SKIP)[COMMAND]
+
+        assert result.success and result.skipped
+        assert _command_file(tmp_path).read_text(encoding="utf-8") == "locally edited"
+
+    def test_if_changed_rewrites_modified_file(self, tmp_path: Path) -> None:
+        """IF_CHANGED restores a file whose content differs."""
+        _install(tmp_path, ConflictPolicy.SKIP)
+        _command_file(tmp_path).write_text("locally edited", encoding="utf-8")
+
+        result = _install(tmp_path, ConflictPolicy.IF_CHANGED)[COMMAND]
+
+        assert result.success and result.overwritten
+        assert "locally edited" not in _command_file(tmp_path).read_text(
+            encoding="utf-8"
+        )
+
+    def test_overwrite_rewrites_identical_file(self, tmp_path: Path) -> None:
+        """OVERWRITE writes the file even when its content already matches."""
+        _install(tmp_path, ConflictPolicy.SKIP)
+        command_file = _command_file(tmp_path)
+        os.utime(command_file, (0, 0))
+
+        result = _install(tmp_path, ConflictPolicy.OVERWRITE)[COMMAND]
+
+        assert result.success and result.overwritten and not result.unchanged
+        assert command_file.stat().st_mtime > 0
+
+    def test_fail_reports_conflict(self, tmp_path: Path) -> None:
+        """FAIL returns an error result and keeps the existing file."""
+        _install(tmp_path, ConflictPolicy.SKIP)
+        _command_file(tmp_path).write_text("locally edited", encoding="utf-8")
+
+        result = _install(tmp_path, ConflictPolicy.FAIL)[COMMAND]
+
+        assert not result.success
+        assert result.error is not None and "different content" in result.error
+        assert _command_file(tmp_path).read_text(encoding="utf-8") == "locally edited"
+
+    def test_prompt_uses_confirm_callback(self, tmp_path: Path) -> None:
+        """PROMPT asks the callback and skips without one."""
+        _install(tmp_path, ConflictPolicy.SKIP)
+        _command_file(tmp_path).write_text("locally edited", encoding="utf-8")
+        asked: list[Path] = []
+
+        def confirm(path: Path) -> bool:
+            asked.append(path)
+            return True
+
+        assert _install(tmp_path, ConflictPolicy.PROMPT)[COMMAND].skipped
+        result = _install(tmp_path, ConflictPolicy.PROMPT, confirm)[COMMAND]
+
+        assert asked == [_command_file(tmp_path)]
+        assert result.success and result.overwritten
+
+    def test_unknown_command_fails(self, tmp_path: Path) -> None:
+        """Unknown or invalid command names produce failed results."""
+        target = InstallTarget(project_root=tmp_path)
+
+        results = install_commands(
+            ["no-such-command", "bad name"], target, ConflictPolicy.SKIP
+        )
+
+        assert [r.success for r in results] == [False, False]
+
+
+class TestEnsureClaudeGitignore:
+    """Tests for ensure_claude_gitignore function."""
+
+    def test_lists_every_generated_file(self, tmp_path: Path) -> None:
+        """Caches and runtime files are ignored; context-forge.md is not."""
+        (tmp_path / ".claude").mkdir()
+
+        assert ensure_claude_gitignore(tmp_path) == WriteOutcome.CREATED
+        assert ensure_claude_gitignore(tmp_path) == WriteOutcome.UNCHANGED
+
+        lines = (tmp_path / CLAUDE_GITIGNORE_PATH).read_text().splitlines()
+        assert sorted(lines[1:]) == sorted(Path(p).name for p in GENERATED_PATHS)
+        assert "context-forge.md" not in lines
+
+    def test_keeps_existing_entries(self, tmp_path: Path) -> None:
+        """A hand-written .gitignore is extended with the missing entries."""
+        path = tmp_path / CLAUDE_GITIGNORE_PATH
+        path.parent.mkdir()
+        path.write_text("settings.local.json\n/context-forge.lock", encoding="utf-8")
+
+        assert ensure_claude_gitignore(tmp_path) == WriteOutcome.UPDATED
+
+        lines = path.read_text(encoding="utf-8").splitlines()
+        assert lines[:2] == ["settings.local.json", "/context-forge.lock"]
+        assert lines.count("context-forge.lock") == 0
+        assert "context-forge.index.json" in lines
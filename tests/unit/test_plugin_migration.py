@@ -0,0 +1,157 @@
+"""Unit tests for role plugin migration."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from context_forge_cli import (
+    MIGRATE_STATE_PATH,
+    __version__,
+    migrate_plugins,
+    normalize_frontmatter,
+    plugin_migration,
+)
+
+AGENT = """\
+---
+tools: Bash
+description: >
+  PR をレビューする。ユーザーが「レビューして」と言った場合に
+  このSubAgentを使用すること。
+name: pr-review
+---
+
+# PR Review
+
+## 実行手順
+
+1. 差分を読む
+
+## 注意事項
+
+- 差分だけを見る
+"""
+
+
+def _make_plugin(root: Path, role: str = "eng", version: str = "0.0.1") -> Path:
+    plugin_dir = root / ".claude" / "plugins" / f"context-forge.role-{role}"
+    (plugin_dir / ".claude-plugin").mkdir(parents=True)
+    (plugin_dir / ".claude-plugin" / "plugin.json").write_text(
+        json.dumps({"name": plugin_dir.name, "version": version}), encoding="utf-8"
+    )
+    (plugin_dir / "agents").mkdir()
+    (plugin_dir / "agents" / "pr-review.md").write_text(AGENT, encoding="utf-8")
+    (plugin_dir / "skills" / "react").mkdir(parents=True)
+    (plugin_dir / "skills" / "react" / "SKILL.md").write_text(
+        "---\ndescription: React の知見\n---\n\n# React\n", encoding="utf-8"
+    )
+    return plugin_dir
+
+
+class TestNormalizeFrontmatter:
+    """Tests for normalize_frontmatter function."""
+
+    def test_orders_keys_and_keeps_block_text(self) -> None:
+        """name and description move first; other keys keep their text."""
+        text, changes, description = normalize_frontmatter(AGENT, "pr-review")
+
+        assert text.startswith(
+            "---\nname: pr-review\ndescription: >\n  PR をレビューする。"
+        )
+        assert "\ntools: Bash\n---\n" in text
+        assert changes == ["name/description を先頭に移動"]
+        assert "と言った場合に" in description
+
+    def test_adds_missing_name_and_normalizes_line_endings(self) -> None:
+        """CRLF becomes LF and a missing name comes from the file name."""
+        text, changes, description = normalize_frontmatter(
+            "---\r\ndescription: Deploy  \r\n---\r\nbody\r\n", "deploy"
+        )
+
+        assert text == "---\nname: deploy\ndescription: Deploy\n---\nbody\n"
+        assert len(changes) == 3
+        assert description == "Deploy"
+
+    def test_is_idempotent(self) -> None:
+        """Normalized frontmatter is left as it is."""
+        text, _, _ = normalize_frontmatter(AGENT, "pr-review")
+
+        assert normalize_frontmatter(text, "pr-review")[:2] == (text, [])
+
+
+class TestMigratePlugins:
+    """Tests for migrate_plugins function."""
+
+    def test_migrates_plugin(self, tmp_path: Path) -> None:
+        """Version, frontmatter and agent sections are brought up to date."""
+        plugin_dir = _make_plugin(tmp_path)
+
+        [result] = migrate_plugins(tmp_path, [plugin_dir])
+
+        assert result.migrated
+        manifest = json.loads(
+            (plugin_dir / ".claude-plugin" / "plugin.json").read_text(encoding="utf-8")
+        )
+        assert manifest["version"] == __version__
+        agent = (plugin_dir / "agents" / "pr-review.md").read_text(encoding="utf-8")
+        assert agent.index("## トラブルシューティング") < agent.index("## 注意事項")
+        assert "- 差分だけを見る" in agent
+        skill = (plugin_dir / "skills" / "react" / "SKILL.md").read_text(
+            encoding="utf-8"
+        )
+        assert skill.startswith("---\nname: react\n")
+        assert result.warnings == [
+            "skills/react/SKILL.md: description にトリガー表現がありません"
+        ]
+
+    def test_dry_run_writes_nothing(self, tmp_path: Path) -> None:
+        """A dry run reports changes but leaves files and state alone."""
+        plugin_dir = _make_plugin(tmp_path)
+        before = (plugin_dir / "agents" / "pr-review.md").read_text(encoding="utf-8")
+
+        [result] = migrate_plugins(tmp_path, [plugin_dir], dry_run=True)
+
+        assert result.migrated
+        after = (plugin_dir / "agents" / "pr-review.md").read_text(encoding="utf-8")
+        assert after == before
+        assert not (tmp_path / MIGRATE_STATE_PATH).exists()
+
+    def test_skips_current_plugins(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """A migrated, unchanged plugin is skipped and keeps its warnings."""
+        plugin_dirs = [_make_plugin(tmp_path, role) for role in ("eng", "qa")]
+        first = migrate_plugins(tmp_path, plugin_dirs)
+
+        def fail(*args: object) -> None:
+            raise AssertionError("frontmatter normalized again")
+
+        monkeypatch.setattr(plugin_migration, "normalize_frontmatter", fail)
+        second = migrate_plugins(tmp_path, plugin_dirs)
+
+        assert all(r.skipped and not r.migrated for r in second)
+        assert [r.warnings for r in second] == [r.warnings for r in first]
+
+    def test_edited_plugin_is_migrated_again(self, tmp_path: Path) -> None:
+        """Changing a file invalidates the recorded content hash."""
+        plugin_dir = _make_plugin(tmp_path)
+        migrate_plugins(tmp_path, [plugin_dir])
+        agent = plugin_dir / "agents" / "new.md"
+        agent.write_text("---\ndescription: x\n---\n", encoding="utf-8")
+
+        [result] = migrate_plugins(tmp_path, [plugin_dir])
+
+        assert not result.skipped
+        assert "agents/new.md: name を追加" in result.changes
+
+    def test_invalid_plugin_json_is_reported(self, tmp_path: Path) -> None:
+        """A plugin that cannot be read fails without stopping the others."""
+        broken = _make_plugin(tmp_path, "broken")
+        (broken / ".claude-plugin" / "plugin.json").write_text("{", encoding="utf-8")
+        healthy = _make_plugin(tmp_path, "eng")
+
+        results = migrate_plugins(tmp_path, [broken, healthy])
+
+        assert results[0].error is not None
+        assert results[1].migrated
@@ -0,0 +1,86 @@
+"""Unit tests for profiling spans and counters."""
+
+import threading
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from context_forge_cli import init_project, start_profile, stop_profile
+from context_forge_cli.profiling import count, span
+
+
+@pytest.fixture(autouse=True)
+def _stop_profile() -> Iterator[None]:
+    yield
+    stop_profile()
+
+
+class TestSpans:
+    """Tests for span and count functions."""
+
+    def test_inactive_records_nothing(self) -> None:
+        """Without start_profile, spans and counters are no-ops."""
+        with span("phase"):
+            count("files read")
+
+        assert stop_profile() is None
+
+    def test_records_nested_spans_and_counters(self) -> None:
+        """Spans keep their nesting depth and counters add up."""
+        start_profile()
+        with span("outer"):
+            with span("inner"):
+                count("files read", 2)
+            count("files read")
+
+        profile = stop_profile()
+
+        assert profile is not None
+        assert [(s.name, s.depth) for s in profile.spans] == [
+            ("inner", 1),
+            ("outer", 0),
+        ]
+        assert profile.counters == {"files read": 3}
+        assert profile.total_ms >= profile.spans[1].duration_ms
+
+    def test_spans_from_threads(self) -> None:
+        """Each thread nests its own spans and is recorded by name."""
+        start_profile()
+
+        def work() -> None:
+            with span("worker"):
+                count("files written")
+
+        threads = [threading.Thread(target=work, name=f"t{i}") for i in range(4)]
+        with span("main"):
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        profile = stop_profile()
+
+        assert profile is not None
+        workers = [s for s in profile.spans if s.name == "worker"]
+        assert sorted(s.thread for s in workers) == ["t0", "t1", "t2", "t3"]
+        assert all(s.depth == 0 for s in workers)
+        assert profile.counters["files written"] == 4
+
+    def test_init_project_phases(self, tmp_path: Path) -> None:
+        """init_project reports its phases and file counts."""
+        start_profile()
+        init_project(tmp_path)
+
+        profile = stop_profile()
+
+        assert profile is not None
+        names = {s.name for s in profile.spans}
+        assert {
+            "create directories",
+            "write context-forge.md",
+            "write CLAUDE.md reference",
+            "install commands",
+        } <= names
+        assert profile.counters["directories created"] == 2
+        assert profile.to_dict()["counters"]["files written"] >= 2
@@ -0,0 +1,168 @@
+"""Unit tests for the context-forge.md role index."""
+
+import os
+from dataclasses import asdict
+from pathlib import Path
+
+from context_forge_cli import (
+    CONTEXT_FORGE_INDEX_PATH,
+    CONTEXT_FORGE_MD_PATH,
+    add_rules_indexed,
+    build_role_index,
+    load_role_index,
+    read_context_forge_md,
+    write_context_forge_md_rules,
+)
+
+CONTENT = (
+    "# 設定\n\n### eng ロール\n\n- rule one\n\n### メモ\n\nメモ\n"
+    "\n### qa ロール\n### ops ロール\n- deploy\n"
+)
+
+
+def _write(root: Path, content: str) -> Path:
+    path = root / CONTEXT_FORGE_MD_PATH
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content, encoding="utf-8")
+    return path
+
+
+def _assert_index_current(root: Path) -> None:
+    """The saved index equals one built from scratch."""
+    path = root / CONTEXT_FORGE_MD_PATH
+    index = load_role_index(root)
+    assert index is not None
+    fresh = build_role_index(path.read_bytes(), path.stat())
+    assert asdict(index) == asdict(fresh)
+
+
+class TestLoadRoleIndex:
+    """Tests for load_role_index function."""
+
+    def test_returns_none_without_context_forge_md(self, tmp_path: Path) -> None:
+        """No context-forge.md means no index."""
+        assert load_role_index(tmp_path) is None
+        assert not (tmp_path / CONTEXT_FORGE_INDEX_PATH).exists()
+
+    def test_builds_and_saves_index(self, tmp_path: Path) -> None:
+        """Roles, rules and byte offsets are indexed."""
+        _write(tmp_path, CONTENT)
+
+        index = load_role_index(tmp_path)
+
+        assert index is not None
+        assert (tmp_path / CONTEXT_FORGE_INDEX_PATH).exists()
+        assert set(index.roles) == {"eng", "qa", "ops"}
+        assert index.has_rule("eng", "-  Rule ONE ")
+        assert not index.has_rule("qa", "- rule one")
+        assert index.roles["ops"].rule_count == 1
+        data = CONTENT.encode("utf-8")
+        entry = index.roles["ops"]
+        assert data[entry.header_start :].startswith("### ops ロール".encode())
+
+    def test_rebuilds_after_hand_edit(self, tmp_path: Path) -> None:
+        """An index that no longer matches the file is rebuilt."""
+        path = _write(tmp_path, CONTENT)
+        load_role_index(tmp_path)
+
+        path.write_text(CONTENT + "\n### new ロール\n\n- new\n", encoding="utf-8")
+        index = load_role_index(tmp_path)
+
+        assert index is not None
+        assert index.has_rule("new", "- new")
+
+    def test_touch_only_updates_mtime(self, tmp_path: Path) -> None:
+        """A touched but unchanged file keeps its index."""
+        path = _write(tmp_path, CONTENT)
+        index = load_role_index(tmp_path)
+        assert index is not None
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        touched = load_role_index(tmp_path)
+
+        assert touched is not None
+        assert touched.mtime_ns == stat.st_mtime_ns + 1_000_000_000
+        assert touched.roles == index.roles
+
+    def test_corrupt_index_is_rebuilt(self, tmp_path: Path) -> None:
+        """A malformed index file is ignored and replaced."""
+        _write(tmp_path, CONTENT)
+        (tmp_path / CONTEXT_FORGE_INDEX_PATH).write_text("{not json", encoding="utf-8")
+
+        index = load_role_index(tmp_path)
+
+        assert index is not None
+        assert index.has_role("eng")
+        _assert_index_current(tmp_path)
+
+
+class TestAddRulesIndexed:
+    """Tests for add_rules_indexed function."""
+
+    BATCHES = [
+        [("eng", "- rule two"), ("qa", "- check"), ("ops", "- rollback")],
+        [("eng", "- RULE one"), ("new", "- first"), ("qa", "- check")],
+        [("ops", "- page"), ("eng", "- rule three"), ("new", "- second")],
+    ]
+
+    def test_matches_parse_based_write(self, tmp_path: Path) -> None:
+        """Indexed and parse-based writes produce the same file and index."""
+        indexed, parsed = tmp_path / "indexed", tmp_path / "parsed"
+        _write(indexed, CONTENT)
+        _write(parsed, CONTENT)
+
+        for batch in self.BATCHES:
+            add_rules_indexed(indexed, batch)
+            existing = read_context_forge_md(parsed)
+            write_context_forge_md_rules(parsed, existing, batch)
+
+            assert (indexed / CONTEXT_FORGE_MD_PATH).read_bytes() == (
+                parsed / CONTEXT_FORGE_MD_PATH
+            ).read_bytes()
+            _assert_index_current(indexed)
+
+    def test_returns_only_new_rules(self, tmp_path: Path) -> None:
+        """Rules a role already has are skipped, in the file and the batch."""
+        _write(tmp_path, CONTENT)
+
+        added = add_rules_indexed(
+            tmp_path, [("eng", "- rule one"), ("eng", "- b"), ("eng", "- B")]
+        )
+
+        assert added == [("eng", "- b")]
+
+    def test_creates_missing_file(self, tmp_path: Path) -> None:
+        """Without context-forge.md the file is created from the template."""
+        added = add_rules_indexed(tmp_path, [("eng", "- rule")])
+
+        assert added == [("eng", "- rule")]
+        result = read_context_forge_md(tmp_path)
+        assert result is not None
+        assert result.roles["eng"] == ["- rule"]
+        _assert_index_current(tmp_path)
+
+    def test_header_without_body_keeps_next_header_intact(self, tmp_path: Path) -> None:
+        """A rule for a role with no body lines goes on its own line."""
+        _write(tmp_path, CONTENT)
+
+        add_rules_indexed(tmp_path, [("qa", "- check")])
+
+        content = (tmp_path / CONTEXT_FORGE_MD_PATH).read_text(encoding="utf-8")
+        assert "### qa ロール\n- check\n### ops ロール\n" in content
+        _assert_index_current(tmp_path)
+
+    def test_repeated_role_sections(self, tmp_path: Path) -> None:
+        """Rules in any section of a repeated role count as present."""
+        path = _write(tmp_path, "### a ロール\n\n- x\n\n### a ロール\n\n- y\n")
+        index = load_role_index(tmp_path)
+        assert index is not None
+        assert index.has_rule("a", "- x")
+        assert index.has_rule("a", "- y")
+
+        added = add_rules_indexed(tmp_path, [("a", "- x"), ("a", "- y"), ("a", "- z")])
+
+        assert added == [("a", "- z")]
+        content = path.read_text(encoding="utf-8")
+        assert content == "### a ロール\n\n- x\n- z\n\n### a ロール\n\n- y\n"
+        _assert_index_current(tmp_path)
@@ -0,0 +1,114 @@
+"""Unit tests for the role plugin scanner."""
+
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from context_forge_cli import ROLE_PLUGINS_CACHE_PATH, role_plugins, scan_role_plugins
+
+HOOKS = {
+    "hooks": {
+        "PostToolUse": [
+            {"matcher": "Edit", "hooks": [{"type": "command", "command": "a"}]},
+            {"matcher": "Write", "hooks": [{"type": "command", "command": "b"}]},
+        ],
+        "Stop": [{"hooks": [{"type": "command", "command": "c"}]}],
+    }
+}
+
+
+def _make_plugin(root: Path, role: str) -> Path:
+    plugin_dir = root / ".claude" / "plugins" / f"context-forge.role-{role}"
+    (plugin_dir / ".claude-plugin").mkdir(parents=True)
+    (plugin_dir / ".claude-plugin" / "plugin.json").write_text(
+        json.dumps(
+            {
+                "name": plugin_dir.name,
+                "description": f"{role} の知見",
+                "version": "0.3.0",
+            }
+        ),
+        encoding="utf-8",
+    )
+    for kind in ("commands", "agents"):
+        (plugin_dir / kind).mkdir()
+        (plugin_dir / kind / f"{role}-one.md").write_text("x", encoding="utf-8")
+    (plugin_dir / "commands" / "notes.txt").write_text("x", encoding="utf-8")
+    for skill in ("react", "testing"):
+        (plugin_dir / "skills" / skill).mkdir(parents=True)
+        (plugin_dir / "skills" / skill / "SKILL.md").write_text("x", encoding="utf-8")
+    (plugin_dir / "hooks").mkdir()
+    (plugin_dir / "hooks" / "hooks.json").write_text(
+        json.dumps(HOOKS), encoding="utf-8"
+    )
+    return plugin_dir
+
+
+class TestScanRolePlugins:
+    """Tests for scan_role_plugins function."""
+
+    def test_returns_empty_without_plugins_dir(self, tmp_path: Path) -> None:
+        """No .claude/plugins means no role plugins."""
+        assert scan_role_plugins(tmp_path) == []
+
+    def test_counts_knowledge_items(self, tmp_path: Path) -> None:
+        """Commands, agents, skills and hook matcher groups are counted."""
+        _make_plugin(tmp_path, "eng")
+        (tmp_path / ".claude" / "plugins" / "other-plugin").mkdir()
+
+        [plugin] = scan_role_plugins(tmp_path)
+
+        assert plugin.role == "eng"
+        assert plugin.description == "eng の知見"
+        assert plugin.version == "0.3.0"
+        assert (plugin.commands, plugin.agents, plugin.skills, plugin.hooks) == (
+            1,
+            1,
+            2,
+            3,
+        )
+        assert plugin.knowledge_count == 7
+        assert plugin.error is None
+
+    def test_reports_invalid_plugin_json(self, tmp_path: Path) -> None:
+        """A broken plugin.json is reported but does not stop the scan."""
+        plugin_dir = _make_plugin(tmp_path, "eng")
+        (plugin_dir / ".claude-plugin" / "plugin.json").write_text(
+            "{", encoding="utf-8"
+        )
+
+        [plugin] = scan_role_plugins(tmp_path)
+
+        assert plugin.error is not None
+        assert plugin.commands == 1
+
+    def test_unchanged_plugins_come_from_cache(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """A second scan of unchanged plugins does not read them again."""
+        _make_plugin(tmp_path, "eng")
+        first = scan_role_plugins(tmp_path)
+        assert (tmp_path / ROLE_PLUGINS_CACHE_PATH).exists()
+
+        def fail(plugin_dir: Path) -> None:
+            raise AssertionError(f"rescanned {plugin_dir}")
+
+        monkeypatch.setattr(role_plugins, "scan_role_plugin", fail)
+        assert scan_role_plugins(tmp_path) == first
+
+    def test_changed_directory_is_rescanned(self, tmp_path: Path) -> None:
+        """Adding a knowledge item invalidates the plugin's cache entry."""
+        plugin_dir = _make_plugin(tmp_path, "eng")
+        scan_role_plugins(tmp_path)
+
+        commands_dir = plugin_dir / "commands"
+        (commands_dir / "two.md").write_text("x", encoding="utf-8")
+        # Make the change visible even on filesystems with coarse mtimes
+        stat = commands_dir.stat()
+        os.utime(commands_dir, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+        [plugin] = scan_role_plugins(tmp_path)
+
+        assert plugin.commands == 2
@@ -0,0 +1,160 @@
+"""Unit tests for the sharded layout of context-forge.md."""
+
+from pathlib import Path
+
+import pytest
+
+from context_forge_cli import (
+    CONTEXT_FORGE_MD_PATH,
+    CONTEXT_FORGE_ROLES_DIR,
+    compact_role_files,
+    is_sharded,
+    read_context_forge_md,
+    referenced_roles,
+    role_path,
+    shard_context_forge_md,
+    unshard_context_forge_md,
+    write_context_forge_md_rules,
+    write_role_rules,
+)
+
+ROOT_MD = """# context-forge 設定
+
+### frontend ロール
+
+- フロントエンドのルール
+
+### backend ロール
+
+- バックエンドのルール
+"""
+
+
+@pytest.fixture
+def project(tmp_path: Path) -> Path:
+    """A sharded project with two roles."""
+    (tmp_path / ".claude").mkdir()
+    (tmp_path / CONTEXT_FORGE_MD_PATH).write_text(ROOT_MD, encoding="utf-8")
+    shard_context_forge_md(tmp_path)
+    return tmp_path
+
+
+class TestShardContextForgeMd:
+    """Tests for shard_context_forge_md and unshard_context_forge_md."""
+
+    def test_moves_sections_into_role_files(self, project: Path) -> None:
+        """The root file keeps only the preamble and one reference per role."""
+        root = (project / CONTEXT_FORGE_MD_PATH).read_text(encoding="utf-8")
+
+        assert is_sharded(project)
+        assert "ロール" not in root
+        assert referenced_roles(root) == ["frontend", "backend"]
+        frontend = role_path(project, "frontend").read_text(encoding="utf-8")
+        assert frontend.startswith("### frontend ロール")
+
+    def test_round_trip(self, project: Path) -> None:
+        """Unsharding restores the rules and removes the roles directory."""
+        moved = unshard_context_forge_md(project)
+
+        assert moved == ["frontend", "backend"]
+        assert not is_sharded(project)
+        assert not (project / CONTEXT_FORGE_ROLES_DIR).parent.exists()
+        content = read_context_forge_md(project)
+        assert content is not None
+        assert dict(content.roles) == {
+            "frontend": ["- フロントエンドのルール"],
+            "backend": ["- バックエンドのルール"],
+        }
+
+    def test_stray_root_sections_are_moved(self, project: Path) -> None:
+        """Sections added to the root file later are merged into role files."""
+        with (project / CONTEXT_FORGE_MD_PATH).open("a", encoding="utf-8") as f:
+            f.write("\n### backend ロール\n\n- 追加のルール\n")
+
+        assert shard_context_forge_md(project) == ["backend"]
+        content = read_context_forge_md(project)
+        assert content is not None
+        assert content.roles["backend"] == ["- バックエンドのルール", "- 追加のルール"]
+
+
+class TestRolePath:
+    """Tests for role_path function."""
+
+    @pytest.mark.parametrize("role_name", ["../escape", "a/b", ".hidden", ""])
+    def test_rejects_names_unusable_as_files(self, role_name: str) -> None:
+        """Role names that are not plain file names are rejected."""
+        with pytest.raises(ValueError):
+            role_path(Path("."), role_name)
+
+
+class TestReadShardedContextForgeMd:
+    """Tests for reading a sharded project."""
+
+    def test_role_files_read_lazily(self, project: Path) -> None:
+        """Listing roles reads no role file; a lookup reads only its own."""
+        role_path(project, "backend").unlink()
+
+        content = read_context_forge_md(project)
+
+        assert content is not None
+        assert list(content.roles) == ["frontend", "backend"]
+        assert "backend" in content.roles
+        assert content.roles["frontend"] == ["- フロントエンドのルール"]
+        assert content.roles["backend"] == []
+        with pytest.raises(KeyError):
+            content.roles["qa"]
+
+
+class TestWriteRoleRules:
+    """Tests for write_role_rules function."""
+
+    def test_rewrites_only_the_role_concerned(self, project: Path) -> None:
+        """Other role files and the root file are left untouched."""
+        root = project / CONTEXT_FORGE_MD_PATH
+        backend = role_path(project, "backend")
+        before = (root.stat().st_mtime_ns, backend.stat().st_mtime_ns)
+
+        write_role_rules(project, [("frontend", "- 新しいルール")])
+
+        assert (root.stat().st_mtime_ns, backend.stat().st_mtime_ns) == before
+        content = read_context_forge_md(project)
+        assert content is not None
+        assert content.roles["frontend"][-1] == "- 新しいルール"
+
+    def test_new_role_is_referenced(self, project: Path) -> None:
+        """A new role gets its own file and a reference in the root file."""
+        existing = read_context_forge_md(project)
+
+        write_context_forge_md_rules(project, existing, [("qa", "- テストのルール")])
+
+        root = (project / CONTEXT_FORGE_MD_PATH).read_text(encoding="utf-8")
+        assert referenced_roles(root) == ["frontend", "backend", "qa"]
+        assert role_path(project, "qa").exists()
+
+    def test_bad_name_writes_nothing(self, project: Path) -> None:
+        """An invalid role name fails before any file is written."""
+        with pytest.raises(ValueError):
+            write_role_rules(project, [("frontend", "- a"), ("../x", "- b")])
+
+        content = read_context_forge_md(project)
+        assert content is not None
+        assert content.roles["frontend"] == ["- フロントエンドのルール"]
+
+
+class TestCompactRoleFiles:
+    """Tests for compact_role_files function."""
+
+    def test_removes_duplicates_across_role_files(self, project: Path) -> None:
+        """Duplicate rules in each role file are reported and removed."""
+        path = role_path(project, "backend")
+        path.write_text(
+            path.read_text(encoding="utf-8") + "- バックエンドのルール\n",
+            encoding="utf-8",
+        )
+
+        preview = compact_role_files(project, dry_run=True)
+        result = compact_role_files(project)
+
+        assert preview.removed_rules == result.removed_rules == 1
+        assert path.read_text(encoding="utf-8").count("バックエンドのルール") == 1
+        assert compact_role_files(project).removed_rules == 0
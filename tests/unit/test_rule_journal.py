@@ -0,0 +1,181 @@
+"""Unit tests for the rule journal and the rules lock."""
+
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+import pytest
+
+from context_forge_cli import (
+    CONTEXT_FORGE_MD_PATH,
+    RULE_JOURNAL_PATH,
+    add_rules_journaled,
+    append_rule_record,
+    context_forge_md,
+    fold_rule_journal,
+    load_role_index,
+    locked_rule_files,
+    read_context_forge_md,
+    read_rule_journal,
+    role_index,
+    rules_lock,
+    shard_context_forge_md,
+)
+
+
+@pytest.fixture
+def project(tmp_path: Path) -> Path:
+    """A project with one role in context-forge.md."""
+    (tmp_path / ".claude").mkdir()
+    (tmp_path / CONTEXT_FORGE_MD_PATH).write_text(
+        "# context-forge 設定\n\n### eng ロール\n\n- 既存のルール\n", encoding="utf-8"
+    )
+    return tmp_path
+
+
+def _rules(project: Path, role_name: str) -> list[str]:
+    content = read_context_forge_md(project)
+    assert content is not None
+    return content.roles.get(role_name, [])
+
+
+class TestRulesLock:
+    """Tests for rules_lock function."""
+
+    def test_reentrant(self, project: Path) -> None:
+        """Nested uses in one thread keep the outer lock instead of blocking."""
+        with rules_lock(project), rules_lock(project), rules_lock(project, True):
+            pass
+        with rules_lock(project):
+            pass
+
+    def test_never_creates_claude_directory(self, tmp_path: Path) -> None:
+        """Without .claude/ the lock fails instead of creating the directory."""
+        with pytest.raises(FileNotFoundError), rules_lock(tmp_path):
+            pass
+        with locked_rule_files(tmp_path):
+            pass
+
+        assert list(tmp_path.iterdir()) == []
+
+    def test_cannot_upgrade_shared_lock(self, project: Path) -> None:
+        """The exclusive lock cannot be taken while holding the shared one."""
+        with rules_lock(project, shared=True), pytest.raises(RuntimeError):
+            with rules_lock(project):
+                pass
+
+
+class TestRuleJournal:
+    """Tests for appending to and folding the rule journal."""
+
+    def test_fold_applies_records_in_order(self, project: Path) -> None:
+        """Pending records are added to context-forge.md and the journal goes."""
+        append_rule_record(project, [("eng", "- 一つ目"), ("qa", "- 検証")])
+        append_rule_record(project, [("eng", "- 二つ目"), ("eng", "- 既存のルール")])
+
+        added = fold_rule_journal(project)
+
+        assert added == [("eng", "- 一つ目"), ("qa", "- 検証"), ("eng", "- 二つ目")]
+        assert _rules(project, "eng") == ["- 既存のルール", "- 一つ目", "- 二つ目"]
+        assert not (project / RULE_JOURNAL_PATH).exists()
+        assert fold_rule_journal(project) == []
+
+    def test_torn_record_is_skipped(self, project: Path) -> None:
+        """A record cut off by a killed writer does not block the others."""
+        append_rule_record(project, [("eng", "- 完全な記録")], compact=True)
+        with (project / RULE_JOURNAL_PATH).open("a", encoding="utf-8") as f:
+            f.write('{"rules": [["eng", "- 途中')
+
+        assert read_rule_journal(project) == ([("eng", "- 完全な記録")], True)
+
+    def test_add_rules_journaled(self, project: Path) -> None:
+        """Rules are in the file on return; only new ones are reported."""
+        append_rule_record(project, [("eng", "- 保留中")])
+
+        added = add_rules_journaled(
+            project,
+            [("eng", "- 保留中"), ("eng", "- 新しい"), ("eng", "- 既存のルール")],
+        )
+
+        assert added == [("eng", "- 新しい")]
+        assert _rules(project, "eng") == ["- 既存のルール", "- 保留中", "- 新しい"]
+        assert not (project / RULE_JOURNAL_PATH).exists()
+
+    def test_append_does_not_parse_context_forge_md(
+        self, project: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Known rules come from the role index, not from a full parse."""
+        path = project / CONTEXT_FORGE_MD_PATH
+        path.write_text(
+            "### eng ロール\n\n- a\n\n### qa ロール\n\n- b\n", encoding="utf-8"
+        )
+        load_role_index(project)
+
+        def fail(content: str) -> None:
+            raise AssertionError("context-forge.md was parsed")
+
+        monkeypatch.setattr(context_forge_md, "parse_context_forge_md", fail)
+        monkeypatch.setattr(role_index, "parse_context_forge_md", fail)
+
+        assert add_rules_journaled(project, [("eng", "- a"), ("eng", "- c")]) == [
+            ("eng", "- c")
+        ]
+        assert "- a\n- c\n" in path.read_text(encoding="utf-8")
+
+    def test_bad_role_name_is_not_journaled(self, project: Path) -> None:
+        """In the sharded layout an unusable role name fails before appending."""
+        shard_context_forge_md(project)
+
+        with pytest.raises(ValueError):
+            add_rules_journaled(project, [("../x", "- ルール")])
+        assert not (project / RULE_JOURNAL_PATH).exists()
+
+
+WRITER = textwrap.dedent(
+    """
+    import sys
+    from pathlib import Path
+
+    from context_forge_cli import add_rules_journaled
+
+    root, writer, count = Path(sys.argv[1]), sys.argv[2], int(sys.argv[3])
+    for i in range(count):
+        role = "eng" if i % 2 else f"role-{writer}"
+        add_rules_journaled(root, [(role, f"- writer {writer} rule {i}")])
+    """
+)
+
+
+class TestConcurrentWriters:
+    """Stress test: many writer processes adding rules at once."""
+
+    @pytest.mark.parametrize("sharded", [False, True], ids=["single", "sharded"])
+    def test_no_rules_lost(self, project: Path, sharded: bool) -> None:
+        """Every rule of every writer ends up in the rule files."""
+        writers, rules_per_writer = 12, 8
+        if sharded:
+            shard_context_forge_md(project)
+
+        command = [sys.executable, "-c", WRITER, str(project)]
+        processes = [
+            subprocess.Popen(
+                [*command, str(w), str(rules_per_writer)], stderr=subprocess.PIPE
+            )
+            for w in range(writers)
+        ]
+        for process in processes:
+            _, stderr = process.communicate(timeout=120)
+            assert process.returncode == 0, stderr.decode()
+
+        content = read_context_forge_md(project)
+        assert content is not None
+        found = {rule for rules in content.roles.values() for rule in rules}
+        expected = {
+            f"- writer {w} rule {i}"
+            for w in range(writers)
+            for i in range(rules_per_writer)
+        }
+        assert expected <= found
+        assert len(content.roles["eng"]) == 1 + writers * rules_per_writer // 2
+        assert not (project / RULE_JOURNAL_PATH).exists()
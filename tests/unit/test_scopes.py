@@ -0,0 +1,196 @@
+"""Unit tests for directory-scoped context-forge.md shards."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from context_forge_cli import (
+    CLAUDE_MD_START_MARKER,
+    CONTEXT_FORGE_MD_PATH,
+    CONTEXT_FORGE_MD_REFERENCE,
+    SCOPES_PATH,
+    assign_roles,
+    collect_triggers,
+    load_scopes,
+    normalize_scope_dir,
+    parse_context_forge_md,
+    read_context_forge_md,
+    scope_report,
+    sync_scopes,
+    unassign_roles,
+)
+
+ROOT_MD = """# context-forge 設定
+
+### common ロール
+
+- 共通ルール
+
+### frontend ロール
+
+- ユーザーが「画面設計」について質問した場合、`ui-guide` Skill を参照すること
+- フロントエンドのルール
+
+### backend ロール
+
+- バックエンドのルール
+"""
+
+
+@pytest.fixture
+def project(tmp_path: Path) -> Path:
+    """A project with three roles in its root context-forge.md."""
+    (tmp_path / ".claude").mkdir()
+    (tmp_path / CONTEXT_FORGE_MD_PATH).write_text(ROOT_MD, encoding="utf-8")
+    (tmp_path / "web").mkdir()
+    (tmp_path / "services" / "api").mkdir(parents=True)
+    return tmp_path
+
+
+def _roles(path: Path) -> dict[str, list[str]]:
+    content = read_context_forge_md(path)
+    assert content is not None
+    return content.roles
+
+
+class TestNormalizeScopeDir:
+    """Tests for normalize_scope_dir function."""
+
+    def test_relative_and_absolute_paths(self, project: Path) -> None:
+        """Directories are keyed relative to the project, in POSIX form."""
+        assert normalize_scope_dir(project, "services/api/") == "services/api"
+        assert normalize_scope_dir(project, project / "web") == "web"
+
+    @pytest.mark.parametrize("directory", [".", "../elsewhere", "/tmp"])
+    def test_rejects_root_and_outside(self, project: Path, directory: str) -> None:
+        """The root itself and directories outside the project are rejected."""
+        with pytest.raises(ValueError):
+            normalize_scope_dir(project, directory)
+
+
+class TestSyncScopes:
+    """Tests for assign_roles and sync_scopes functions."""
+
+    def test_moves_sections_and_links_claude_md(self, project: Path) -> None:
+        """Scoped sections move to the shard, which CLAUDE.md references."""
+        result = assign_roles(project, "web", ["frontend"])
+
+        assert result.to_dict() == {"moved": {"web": ["frontend"]}, "linked": ["web"]}
+        assert _roles(project) == {
+            "common": ["- 共通ルール"],
+            "backend": ["- バックエンドのルール"],
+        }
+        assert list(_roles(project / "web")) == ["frontend"]
+        claude_md = (project / "web" / "CLAUDE.md").read_text(encoding="utf-8")
+        assert CLAUDE_MD_START_MARKER in claude_md
+        assert CONTEXT_FORGE_MD_REFERENCE in claude_md
+        assert load_scopes(project) == {"web": ["frontend"]}
+
+    def test_sync_moves_new_rules_on(self, project: Path) -> None:
+        """Rules added to the root later are merged into the shard."""
+        assign_roles(project, "web", ["frontend"])
+        with (project / CONTEXT_FORGE_MD_PATH).open("a", encoding="utf-8") as f:
+            f.write(
+                "\n### frontend ロール\n\n- 新しいルール\n- フロントエンドのルール\n"
+            )
+
+        result = sync_scopes(project)
+        again = sync_scopes(project)
+
+        assert result.moved == {"web": ["frontend"]}
+        assert _roles(project / "web")["frontend"][-1] == "- 新しいルール"
+        assert len(_roles(project / "web")["frontend"]) == 3
+        assert "frontend" not in _roles(project)
+        assert again.to_dict() == {"moved": {}, "linked": []}
+
+    def test_role_in_several_directories(self, project: Path) -> None:
+        """A role assigned to two directories is copied to both shards."""
+        assign_roles(project, "web", ["common"])
+        assign_roles(project, "services/api", ["common", "backend"])
+
+        assert _roles(project / "web") == {"common": ["- 共通ルール"]}
+        assert sorted(_roles(project / "services" / "api")) == ["backend", "common"]
+        assert list(_roles(project)) == ["frontend"]
+
+    def test_missing_directory(self, project: Path) -> None:
+        """Nothing moves while a scoped directory is missing."""
+        (project / SCOPES_PATH).write_text(
+            json.dumps({"scopes": {"gone": ["backend"]}}), encoding="utf-8"
+        )
+
+        with pytest.raises(ValueError, match="gone"):
+            sync_scopes(project)
+        assert (project / CONTEXT_FORGE_MD_PATH).read_text(encoding="utf-8") == ROOT_MD
+
+    def test_trigger_phrases_include_shards(self, project: Path) -> None:
+        """Rules in shards still select their skills and agents."""
+        assign_roles(project, "web", ["frontend"])
+
+        triggers = collect_triggers(project)
+
+        assert [(p, t.name, t.role) for p, t in triggers] == [
+            ("画面設計", "ui-guide", "frontend")
+        ]
+
+
+class TestUnassignRoles:
+    """Tests for unassign_roles function."""
+
+    def test_moves_rules_back_and_removes_empty_shard(self, project: Path) -> None:
+        """Unscoped rules go back to the root; an empty shard is deleted."""
+        assign_roles(project, "web", ["frontend"])
+
+        returned = unassign_roles(project, "web")
+
+        assert returned == ["frontend"]
+        original = parse_context_forge_md(ROOT_MD).roles["frontend"]
+        assert _roles(project)["frontend"] == original
+        assert not (project / "web" / CONTEXT_FORGE_MD_PATH).exists()
+        assert load_scopes(project) == {}
+
+    def test_keeps_rules_scoped_elsewhere(self, project: Path) -> None:
+        """A role still assigned to another directory stays out of the root."""
+        assign_roles(project, "web", ["common", "frontend"])
+        assign_roles(project, "services/api", ["common"])
+
+        returned = unassign_roles(project, "web", ["common"])
+
+        assert returned == []
+        assert list(_roles(project / "web")) == ["frontend"]
+        assert "common" not in _roles(project)
+
+    def test_unknown_role(self, project: Path) -> None:
+        """Unassigning a role the directory does not have fails."""
+        with pytest.raises(ValueError, match="No such roles"):
+            unassign_roles(project, "web", ["backend"])
+
+
+class TestScopeReport:
+    """Tests for scope_report function."""
+
+    def test_reports_bytes_per_directory(self, project: Path) -> None:
+        """Each directory loads the root file and the shards above it."""
+        unscoped = len(ROOT_MD.encode())
+        assign_roles(project, "web", ["frontend"])
+        assign_roles(project, "services/api", ["backend"])
+
+        usages = {u.directory: u for u in scope_report(project)}
+
+        root_bytes = (project / CONTEXT_FORGE_MD_PATH).stat().st_size
+        assert list(usages) == [".", "services/api", "web"]
+        assert usages["."].roles == ["common"]
+        assert usages["."].always_bytes == root_bytes
+        assert usages["."].saved_bytes > 0
+        assert usages["web"].roles == ["common", "frontend"]
+        assert usages["web"].always_bytes > root_bytes
+        assert usages["web"].unscoped_bytes == pytest.approx(unscoped, abs=8)
+        assert usages["web"].to_dict()["saved_bytes"] == usages["web"].saved_bytes
+
+    def test_project_without_scopes(self, project: Path) -> None:
+        """Without scopes the root loads everything and nothing is saved."""
+        (usage,) = scope_report(project)
+
+        assert usage.directory == "."
+        assert usage.always_bytes == usage.unscoped_bytes == len(ROOT_MD.encode())
+        assert usage.saved_bytes == 0
@@ -0,0 +1,180 @@
+"""Unit tests for zip/tar template packs."""
+
+import io
+import random
+import tarfile
+import zipfile
+from collections.abc import Callable, Iterator
+from pathlib import Path
+
+import pytest
+
+from context_forge_cli import (
+    TEMPLATE_PACKS_ENV,
+    TemplatePack,
+    init_project,
+    list_available_templates,
+    load_template,
+    register_template_pack,
+    run_workspace_init,
+    start_profile,
+    stop_profile,
+)
+
+DEPLOY = "---\ndescription: Team deploy\n---\n\n# Deploy {{VERSION}}\n"
+MIGRATE = "---\ndescription: Team migrate\n---\n\n# Our migrate\n"
+MEMBERS = {
+    "team/commands/deploy.md": DEPLOY,
+    "team/commands/migrate.md": MIGRATE,
+    "team/README.md": "not a command",
+}
+
+
+def _make_zip(path: Path) -> Path:
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as archive:
+        for name, text in MEMBERS.items():
+            archive.writestr(name, text)
+    return path
+
+
+def _make_tar(path: Path, mode: str) -> Path:
+    with tarfile.open(path, mode) as archive:
+        for name, text in MEMBERS.items():
+            data = text.encode("utf-8")
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            archive.addfile(info, io.BytesIO(data))
+    return path
+
+
+@pytest.fixture(autouse=True)
+def _no_packs(monkeypatch: pytest.MonkeyPatch) -> Iterator[None]:
+    # setenv first so that the packs registered by a test are unset afterwards
+    monkeypatch.setenv(TEMPLATE_PACKS_ENV, "")
+    monkeypatch.delenv(TEMPLATE_PACKS_ENV)
+    yield
+    stop_profile()
+
+
+class TestTemplatePack:
+    """Tests for TemplatePack class."""
+
+    @pytest.mark.parametrize(
+        ("filename", "make"),
+        [
+            ("team.zip", _make_zip),
+            ("team.tar", lambda p: _make_tar(p, "w")),
+            ("team.tar.gz", lambda p: _make_tar(p, "w:gz")),
+        ],
+    )
+    def test_reads_commands(
+        self, tmp_path: Path, filename: str, make: Callable[[Path], Path]
+    ) -> None:
+        """Only commands/<name>.md members are commands."""
+        pack = TemplatePack(make(tmp_path / filename))
+
+        assert pack.commands == ["deploy", "migrate"]
+        assert pack.read("deploy") == DEPLOY.encode("utf-8")
+        assert pack.read("README") is None
+        entry = pack.entry("deploy")
+        assert entry is not None and entry["description"] == "Team deploy"
+
+    def test_zip_listing_reads_no_member(self, tmp_path: Path) -> None:
+        """Listing a zip uses the central directory; members are read once."""
+        start_profile()
+        pack = TemplatePack(_make_zip(tmp_path / "team.zip"))
+        names = pack.commands
+        pack.read("deploy")
+        pack.read("deploy")
+
+        profile = stop_profile()
+
+        assert names == ["deploy", "migrate"]
+        assert profile is not None
+        assert profile.counters["template pack members read"] == 1
+
+    def test_damaged_member(self, tmp_path: Path) -> None:
+        """A member that fails to decompress is reported as a ValueError."""
+        path = _make_zip(tmp_path / "team.zip")
+        pack = register_template_pack(path)
+        with zipfile.ZipFile(path) as archive:
+            info = archive.getinfo("team/commands/deploy.md")
+        data = bytearray(path.read_bytes())
+        start = info.header_offset + 30 + len(info.filename)
+        data[start : start + info.compress_size] = b"\xff" * info.compress_size
+        path.write_bytes(bytes(data))
+
+        with pytest.raises(ValueError, match="Cannot read template pack"):
+            pack.read("deploy")
+
+        result = init_project(tmp_path / "project")
+        assert result.failed_commands == ["deploy"]
+        assert "Cannot read template pack" in result.command_errors["deploy"]
+
+    def test_rejects_other_files(self, tmp_path: Path) -> None:
+        """A file that is not an archive cannot be opened as a pack."""
+        path = tmp_path / "deploy.md"
+        path.write_text(DEPLOY, encoding="utf-8")
+
+        with pytest.raises(ValueError, match="Not a zip or tar archive"):
+            TemplatePack(path)
+
+
+class TestRegisteredPacks:
+    """Tests for loading templates from registered packs."""
+
+    def test_pack_commands_are_listed_and_override(self, tmp_path: Path) -> None:
+        """Pack commands are added and replace packaged ones of the same name."""
+        register_template_pack(_make_zip(tmp_path / "team.zip"))
+
+        names = list_available_templates()
+        migrate = load_template("migrate")
+        deploy = load_template("deploy")
+
+        assert names[-1] == "deploy"
+        assert names.count("migrate") == 1
+        assert migrate is not None and migrate.command.description == "Team migrate"
+        assert deploy is not None and deploy.path.name == "deploy.md"
+
+    def test_init_installs_pack_commands(self, tmp_path: Path) -> None:
+        """init_project installs rendered pack commands."""
+        register_template_pack(_make_tar(tmp_path / "team.tgz", "w:gz"))
+
+        result = init_project(tmp_path / "project")
+
+        assert "deploy" in result.installed_commands
+        installed = tmp_path / "project/.claude/commands/context-forge.deploy.md"
+        assert "{{VERSION}}" not in installed.read_text(encoding="utf-8")
+
+    @pytest.mark.parametrize("filename", ["big.zip", "big.tar"])
+    def test_workspace_workers_read_pack(self, tmp_path: Path, filename: str) -> None:
+        """Forked workers do not share the archive handle of the parent."""
+        rng = random.Random(0)
+        words = ["deploy", "review", "テスト", "release", "rollback", "config"]
+        members = {
+            f"commands/cmd{i}.md": "---\ndescription: Big\n---\n\n"
+            + " ".join(rng.choices(words, k=30_000))
+            for i in range(30)
+        }
+        path = tmp_path / filename
+        if filename.endswith(".zip"):
+            with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as archive:
+                for name, text in members.items():
+                    archive.writestr(name, text)
+        else:
+            with tarfile.open(path, "w") as archive:
+                for name, text in members.items():
+                    data = text.encode("utf-8")
+                    info = tarfile.TarInfo(name)
+                    info.size = len(data)
+                    archive.addfile(info, io.BytesIO(data))
+        register_template_pack(path)
+        roots = [tmp_path / f"project-{i}" for i in range(12)]
+
+        results = list(run_workspace_init(roots, jobs=4))
+
+        assert [r.error for r in results if not r.success] == []
+        installed = roots[5] / ".claude/commands/context-forge.cmd7.md"
+        assert installed.read_text(encoding="utf-8").endswith(
+            members["commands/cmd7.md"][-200:]
+        )
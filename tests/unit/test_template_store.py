@@ -0,0 +1,128 @@
+"""Unit tests for the shared content-addressed template store."""
+
+import os
+from pathlib import Path
+
+import pytest
+
+from context_forge_cli import (
+    ConflictPolicy,
+    blob_path,
+    gc_store,
+    init_project,
+    install_from_store,
+    store_blob,
+    template_store,
+)
+from context_forge_cli.fileio import content_digest
+
+DATA = b"# Command\n"
+
+
+class TestInstallFromStore:
+    """Tests for store_blob and install_from_store functions."""
+
+    def test_stores_content_once(self, tmp_path: Path) -> None:
+        """The same content maps to one read-only blob."""
+        first = store_blob(tmp_path, DATA)
+        second = store_blob(tmp_path, DATA)
+
+        assert first == second == blob_path(tmp_path, content_digest(DATA))
+        assert first.read_bytes() == DATA
+        assert first.stat().st_mode & 0o777 == 0o444
+
+    def test_hardlinks_target(self, tmp_path: Path) -> None:
+        """Targets become hardlinks to the blob, replacing existing files."""
+        target = tmp_path / "project" / "command.md"
+        target.parent.mkdir()
+        target.write_bytes(b"old")
+
+        method = install_from_store(tmp_path / "store", DATA, target)
+
+        assert method == "hardlink"
+        assert target.read_bytes() == DATA
+        assert target.stat().st_nlink == 2
+        assert install_from_store(tmp_path / "store", DATA, target) == "hardlink"
+
+    def test_falls_back_to_copy(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Without hardlinks or reflinks the blob is copied."""
+
+        def fail(*args: object) -> None:
+            raise OSError(18, "Invalid cross-device link")
+
+        monkeypatch.setattr(template_store.os, "link", fail)
+        monkeypatch.setattr(template_store, "_reflink", fail)
+        target = tmp_path / "command.md"
+
+        method = install_from_store(tmp_path / "store", DATA, target)
+
+        assert method == "copy"
+        assert target.read_bytes() == DATA
+        assert target.stat().st_nlink == 1
+
+
+class TestInitWithStore:
+    """Tests for init_project with a store."""
+
+    def test_links_and_relinks_identical_copies(self, tmp_path: Path) -> None:
+        """Installs link to the store; identical copies are swapped for links."""
+        store = tmp_path / "store"
+        init_project(tmp_path / "a")
+        init_project(tmp_path / "b", store=store)
+
+        relinked = init_project(tmp_path / "a", store=store)
+
+        commands = sorted((tmp_path / "a" / ".claude" / "commands").iterdir())
+        assert relinked.installed_commands == []
+        assert relinked.unchanged_commands
+        assert all(path.stat().st_nlink == 3 for path in commands)
+
+    def test_overwrite_policy_still_links(self, tmp_path: Path) -> None:
+        """OVERWRITE replaces files with links too."""
+        store = tmp_path / "store"
+
+        result = init_project(
+            tmp_path / "a", on_conflict=ConflictPolicy.OVERWRITE, store=store
+        )
+
+        assert result.success
+        commands = (tmp_path / "a" / ".claude" / "commands").iterdir()
+        assert all(path.stat().st_nlink == 2 for path in commands)
+
+
+class TestGcStore:
+    """Tests for gc_store function."""
+
+    def test_removes_only_unreferenced_blobs(self, tmp_path: Path) -> None:
+        """Blobs still linked from a project are kept."""
+        store = tmp_path / "store"
+        target = tmp_path / "command.md"
+        install_from_store(store, DATA, target)
+        orphan = store_blob(store, b"orphan\n")
+
+        dry = gc_store(store, min_age=0, dry_run=True)
+        result = gc_store(store, min_age=0)
+
+        assert dry.removed == result.removed == [content_digest(b"orphan\n")]
+        assert result.kept == 1
+        assert result.freed_bytes == len(b"orphan\n")
+        assert not orphan.exists()
+        assert not orphan.parent.exists()
+        assert target.read_bytes() == DATA
+
+    def test_keeps_recent_blobs(self, tmp_path: Path) -> None:
+        """Blobs used within min_age survive, older ones do not."""
+        store = tmp_path / "store"
+        blob = store_blob(store, DATA)
+
+        assert gc_store(store, min_age=3600).removed == []
+
+        old = blob.stat().st_mtime - 7200
+        os.utime(blob, (old, old))
+        assert gc_store(store, min_age=3600).removed == [content_digest(DATA)]
+
+    def test_missing_store(self, tmp_path: Path) -> None:
+        """A store that was never created has nothing to collect."""
+        assert gc_store(tmp_path / "store").removed == []
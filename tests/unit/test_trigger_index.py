@@ -0,0 +1,203 @@
+"""Unit tests for the trigger-phrase index."""
+
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from context_forge_cli import (
+    TRIGGER_INDEX_PATH,
+    TriggerTarget,
+    build_trigger_index,
+    collect_triggers,
+    load_trigger_index,
+    match_triggers,
+    trigger_index,
+)
+
+AGENT = """---
+name: pr-review-assistant
+description: >
+  PR のレビューを支援する。
+  ユーザーが「PRをレビューして」「プルリクを確認して」「コードレビュー」と言った場合に
+  このSubAgentを使用すること。
+tools: Bash, Read
+---
+
+# PR Review Assistant
+"""
+
+SKILL = """---
+name: react-best-practices
+description: >
+  React/TypeScript のベストプラクティス。
+  ユーザーが「Reactのベストプラクティス」「コンポーネントの書き方」について
+  質問・相談した場合に参照すること。
+---
+
+本文には「無関係な表現」がある。
+"""
+
+CONTEXT_FORGE_MD = """# context-forge 設定
+
+### software-engineer ロール
+
+- ユーザーが「差分を見て」「コードレビュー」と言った場合、
+  必ず Task ツールで `pr-review-assistant` SubAgent を使用すること
+
+- ユーザーが「設計ドキュメント」について質問した場合、
+  `architecture-guidelines` Skill を参照すること
+
+- 「対象のない表現」だけのルール
+
+## 他のセクション
+
+- 「ロール外の表現」
+"""
+
+
+def _make_project(root: Path) -> None:
+    plugins = root / ".claude" / "plugins"
+    agents = plugins / "context-forge.role-software-engineer" / "agents"
+    agents.mkdir(parents=True)
+    (agents / "pr-review.md").write_text(AGENT, encoding="utf-8")
+    skill = plugins / "context-forge.role-frontend" / "skills" / "react"
+    skill.mkdir(parents=True)
+    (skill / "SKILL.md").write_text(SKILL, encoding="utf-8")
+    (root / ".claude" / "context-forge.md").write_text(
+        CONTEXT_FORGE_MD, encoding="utf-8"
+    )
+
+
+class TestCollectTriggers:
+    """Tests for collect_triggers function."""
+
+    def test_reads_descriptions_and_rules(self, tmp_path: Path) -> None:
+        """Phrases come from descriptions and from rules naming a target."""
+        _make_project(tmp_path)
+
+        triggers = collect_triggers(tmp_path)
+
+        agent = TriggerTarget("agent", "pr-review-assistant", "software-engineer")
+        skill = TriggerTarget("skill", "react-best-practices", "frontend")
+        guidelines = TriggerTarget(
+            "skill", "architecture-guidelines", "software-engineer"
+        )
+        assert triggers == [
+            ("Reactのベストプラクティス", skill),
+            ("コンポーネントの書き方", skill),
+            ("PRをレビューして", agent),
+            ("プルリクを確認して", agent),
+            ("コードレビュー", agent),
+            ("差分を見て", agent),
+            ("コードレビュー", agent),
+            ("設計ドキュメント", guidelines),
+        ]
+
+    def test_empty_project(self, tmp_path: Path) -> None:
+        """A project without plugins or context-forge.md has no triggers."""
+        assert collect_triggers(tmp_path) == []
+
+
+class TestTriggerIndex:
+    """Tests for building and matching the index."""
+
+    def test_finds_overlapping_phrases(self) -> None:
+        """Every phrase in the prompt is found, including nested ones."""
+        targets = [TriggerTarget("skill", name, "r") for name in "abcd"]
+        index = build_trigger_index(
+            [
+                ("he", targets[0]),
+                ("she", targets[1]),
+                ("hers", targets[2]),
+                ("his", targets[3]),
+            ]
+        )
+
+        matches = index.match("ushers")
+
+        assert [(m.name, m.phrases) for m in matches] == [
+            ("c", ["hers"]),
+            ("b", ["she"]),
+            ("a", ["he"]),
+        ]
+
+    def test_normalizes_width_case_and_whitespace(self) -> None:
+        """Full-width, case and spacing differences still match."""
+        target = TriggerTarget("agent", "reviewer", "eng")
+        index = build_trigger_index([("PRをレビューして", target)])
+
+        assert index.match("ｐｒ を レビュー して ください")[0].name == "reviewer"
+        assert index.match("PRを見て") == []
+
+    def test_ranks_by_matched_phrase_length(self) -> None:
+        """Targets matching longer or more phrases rank first."""
+        short = TriggerTarget("skill", "short", "r")
+        long = TriggerTarget("skill", "long", "r")
+        index = build_trigger_index(
+            [("設計", short), ("設計ドキュメント", long), ("ADR", short)]
+        )
+
+        matches = index.match("設計ドキュメントを書く", limit=1)
+
+        assert [(m.name, m.score) for m in matches] == [("long", 8)]
+
+
+class TestLoadTriggerIndex:
+    """Tests for load_trigger_index function."""
+
+    def test_matches_project_prompt(self, tmp_path: Path) -> None:
+        """Description and rule phrases select the same agent."""
+        _make_project(tmp_path)
+
+        matches = match_triggers(tmp_path, "この PR をレビューして、差分を見て")
+
+        assert [m.to_dict() for m in matches] == [
+            {
+                "kind": "agent",
+                "name": "pr-review-assistant",
+                "role": "software-engineer",
+                "score": 14,
+                "phrases": ["PRをレビューして", "差分を見て"],
+            }
+        ]
+
+    def test_reuses_cache_until_a_file_changes(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """The cache is used while stamps match and rebuilt after an edit."""
+        _make_project(tmp_path)
+        load_trigger_index(tmp_path)
+        assert (tmp_path / TRIGGER_INDEX_PATH).exists()
+
+        calls: list[Path] = []
+        original = trigger_index.collect_triggers
+
+        def counting(project_root: Path) -> list[tuple[str, TriggerTarget]]:
+            calls.append(project_root)
+            return original(project_root)
+
+        monkeypatch.setattr(trigger_index, "collect_triggers", counting)
+        cached = load_trigger_index(tmp_path)
+        agent = next((tmp_path / ".claude" / "plugins").glob("*/agents/*.md"))
+        edited = AGENT.replace("コードレビュー", "差分チェック")
+        agent.write_text(edited, encoding="utf-8")
+        stat = agent.stat()
+        os.utime(agent, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        rebuilt = load_trigger_index(tmp_path)
+
+        assert len(calls) == 1
+        assert cached.match("差分チェック") == []
+        assert rebuilt.match("差分チェック")[0].name == "pr-review-assistant"
+
+    def test_ignores_corrupt_cache(self, tmp_path: Path) -> None:
+        """A corrupt cache file is rebuilt."""
+        _make_project(tmp_path)
+        (tmp_path / TRIGGER_INDEX_PATH).write_text("{not json", encoding="utf-8")
+
+        index = load_trigger_index(tmp_path)
+
+        assert index.match("コンポーネントの書き方")[0].name == "react-best-practices"
+        cache = json.loads((tmp_path / TRIGGER_INDEX_PATH).read_text(encoding="utf-8"))
+        assert cache["version"] == trigger_index.INDEX_VERSION
@@ -0,0 +1,102 @@
+"""Unit tests for the watch mode poller."""
+
+import os
+from pathlib import Path
+
+from context_forge_cli import LINT_CACHE_PATH, Watcher
+
+CONTEXT_FORGE_MD = "# context-forge\n\n### eng ロール\n- rule one\n- rule two\n"
+
+
+def _touch(path: Path, text: str) -> None:
+    """Write a file and move its mtime forward so the change is always seen."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def _agent_path(root: Path, name: str = "review.md") -> Path:
+    return root / ".claude" / "plugins" / "context-forge.role-eng" / "agents" / name
+
+
+class TestPoll:
+    """Tests for Watcher.poll method."""
+
+    def test_first_poll_reports_every_file(self, tmp_path: Path) -> None:
+        """Test that the first poll sees all watched files as created."""
+        _touch(tmp_path / "CLAUDE.md", "# Project\n")
+        _touch(tmp_path / ".claude" / "context-forge.md", CONTEXT_FORGE_MD)
+        _touch(tmp_path / "README.md", "not watched\n")
+
+        changes = Watcher(tmp_path).poll()
+
+        assert changes == {
+            "CLAUDE.md": "created",
+            ".claude/context-forge.md": "created",
+        }
+
+    def test_reports_only_changed_files(self, tmp_path: Path) -> None:
+        """Test that later polls report modified, created and deleted files."""
+        _touch(tmp_path / ".claude" / "context-forge.md", CONTEXT_FORGE_MD)
+        _touch(_agent_path(tmp_path), "old\n")
+        watcher = Watcher(tmp_path)
+        watcher.poll()
+
+        assert watcher.poll() == {}
+
+        _touch(tmp_path / ".claude" / "context-forge.md", CONTEXT_FORGE_MD + "- x\n")
+        _touch(_agent_path(tmp_path, "new.md"), "new\n")
+        _agent_path(tmp_path).unlink()
+
+        assert watcher.poll() == {
+            ".claude/context-forge.md": "modified",
+            ".claude/plugins/context-forge.role-eng/agents/new.md": "created",
+            ".claude/plugins/context-forge.role-eng/agents/review.md": "deleted",
+        }
+
+    def test_ignores_own_caches_and_temp_files(self, tmp_path: Path) -> None:
+        """Test that context-forge caches and atomic-write temp files are skipped."""
+        _touch(tmp_path / LINT_CACHE_PATH, "{}\n")
+        _touch(tmp_path / ".claude" / ".context-forge.md.1.ab.tmp", "x\n")
+
+        assert Watcher(tmp_path).poll() == {}
+
+
+class TestCheck:
+    """Tests for Watcher.check method."""
+
+    def test_reindexes_context_forge_md(self, tmp_path: Path) -> None:
+        """Test that a changed context-forge.md rebuilds the role index."""
+        _touch(tmp_path / ".claude" / "context-forge.md", CONTEXT_FORGE_MD)
+        watcher = Watcher(tmp_path)
+
+        report = watcher.check(watcher.poll())
+
+        assert report.messages == [
+            ".claude/context-forge.md: reindexed 1 roles, 2 rules"
+        ]
+        assert report.problems == []
+
+    def test_lints_changed_agents_only(self, tmp_path: Path) -> None:
+        """Test that only the agents that changed are linted."""
+        _touch(_agent_path(tmp_path), "# Review\n\n```bash\ngit add -A\n```\n")
+        watcher = Watcher(tmp_path)
+        watcher.poll()
+        _touch(_agent_path(tmp_path, "other.md"), "# Other\n")
+
+        report = watcher.check(watcher.poll())
+
+        assert report.problems
+        assert all("agents/other.md" in problem for problem in report.problems)
+
+    def test_restored_reference_is_not_reported_again(self, tmp_path: Path) -> None:
+        """Test that the watcher's own CLAUDE.md write does not trigger a poll."""
+        _touch(tmp_path / ".claude" / "context-forge.md", CONTEXT_FORGE_MD)
+        _touch(tmp_path / "CLAUDE.md", "# Project\n")
+        watcher = Watcher(tmp_path)
+
+        report = watcher.check(watcher.poll())
+
+        assert "CLAUDE.md: restored the context-forge reference" in report.messages
+        assert watcher.poll() == {}
@@ -0,0 +1,133 @@
+"""Unit tests for workspace mode helpers."""
+
+from pathlib import Path
+
+from context_forge_cli import (
+    CLAUDE_GITIGNORE_PATH,
+    CONTEXT_FORGE_MD_PATH,
+    EXIT_FILE_ERROR,
+    ConflictPolicy,
+    find_project_roots,
+    init_project,
+    run_workspace_init,
+)
+
+
+def _make_repo(path: Path, marker: str = ".git") -> Path:
+    path.mkdir(parents=True)
+    if marker == ".git":
+        (path / ".git").mkdir()
+    else:
+        (path / marker).write_text("# Project\n", encoding="utf-8")
+    return path
+
+
+class TestFindProjectRoots:
+    """Tests for find_project_roots function."""
+
+    def test_finds_git_and_claude_md_projects(self, tmp_path: Path) -> None:
+        """Should treat directories with .git or CLAUDE.md as project roots."""
+        a = _make_repo(tmp_path / "services" / "a")
+        b = _make_repo(tmp_path / "b", marker="CLAUDE.md")
+        (tmp_path / "not-a-project").mkdir()
+
+        assert find_project_roots(tmp_path) == sorted([a, b])
+
+    def test_does_not_descend_into_project_roots(self, tmp_path: Path) -> None:
+        """Subdirectories of a project (e.g. a monorepo) are not separate roots."""
+        mono = _make_repo(tmp_path / "mono")
+        _make_repo(mono / "packages" / "web", marker="CLAUDE.md")
+
+        assert find_project_roots(tmp_path) == [mono]
+
+    def test_skips_hidden_and_dependency_directories(self, tmp_path: Path) -> None:
+        """Should not search hidden directories or node_modules."""
+        _make_repo(tmp_path / ".cache" / "repo")
+        _make_repo(tmp_path / "node_modules" / "pkg")
+
+        assert find_project_roots(tmp_path) == []
+
+
+class TestInitProject:
+    """Tests for the non-interactive init_project function."""
+
+    def test_initializes_and_installs(self, tmp_path: Path) -> None:
+        """Should create files and install commands without prompting."""
+        result = init_project(tmp_path)
+
+        assert result.success
+        assert (tmp_path / CONTEXT_FORGE_MD_PATH).exists()
+        assert (tmp_path / "CLAUDE.md") in result.created_files
+        assert "add-role-knowledge" in result.installed_commands
+
+    def test_skips_existing_commands_without_force(self, tmp_path: Path) -> None:
+        """Modified command files are skipped, or overwritten with force."""
+        init_project(tmp_path)
+
+        unchanged = init_project(tmp_path)
+        assert unchanged.installed_commands == []
+        assert "add-role-knowledge" in unchanged.unchanged_commands
+
+        command_file = (
+            tmp_path / ".claude" / "commands" / "context-forge.add-role-knowledge.md"
+        )
+        command_file.write_text("locally edited", encoding="utf-8")
+
+        second = init_project(tmp_path)
+        assert second.success
+        assert second.installed_commands == []
+        assert "add-role-knowledge" in second.skipped_commands
+
+        forced = init_project(tmp_path, on_conflict=ConflictPolicy.IF_CHANGED)
+        assert "add-role-knowledge" in forced.installed_commands
+
+    def test_reports_legacy_settings(self, tmp_path: Path) -> None:
+        """Legacy settings are reported on the result instead of prompting."""
+        (tmp_path / "CLAUDE.md").write_text(
+            "# Project\n\nSkill/SubAgent 発動ルール\n", encoding="utf-8"
+        )
+
+        result = init_project(tmp_path, skip_install=True)
+
+        assert result.success
+        assert result.has_legacy_settings
+        assert (tmp_path / "CLAUDE.md") in result.updated_files
+
+    def test_to_dict_has_relative_paths(self, tmp_path: Path) -> None:
+        """to_dict lists files relative to the project, unchanged ones too."""
+        init_project(tmp_path, skip_install=True)
+        (tmp_path / ".claude" / "commands").rmdir()
+
+        data = init_project(tmp_path, skip_install=True).to_dict()
+
+        assert data["created_dirs"] == [".claude/commands"]
+        assert data["unchanged_files"] == [
+            CONTEXT_FORGE_MD_PATH,
+            CLAUDE_GITIGNORE_PATH,
+            "CLAUDE.md",
+        ]
+        assert data["success"] is True
+
+    def test_records_file_errors(self, tmp_path: Path) -> None:
+        """Errors are recorded on the result rather than raised."""
+        (tmp_path / ".claude").write_text("not a directory", encoding="utf-8")
+
+        result = init_project(tmp_path, skip_install=True)
+
+        assert not result.success
+        assert result.exit_code == EXIT_FILE_ERROR
+        assert result.error
+
+
+class TestRunWorkspaceInit:
+    """Tests for run_workspace_init function."""
+
+    def test_runs_all_projects_in_worker_processes(self, tmp_path: Path) -> None:
+        """Should yield one result per project when using a process pool."""
+        roots = [_make_repo(tmp_path / f"repo-{i}") for i in range(4)]
+
+        results = list(run_workspace_init(roots, jobs=2, skip_install=True))
+
+        assert sorted(r.project_root for r in results) == roots
+        assert all(r.success for r in results)
+        assert all((root / CONTEXT_FORGE_MD_PATH).exists() for root in roots)